@@ -0,0 +1,372 @@
+"""
+Live State Stream - Server-sent events for the web dashboard
+
+GET /stream?topics=trades,pnl pushes compact deltas of in-memory bot state
+to any number of dashboard clients. One sampler task reads the state once
+per interval, diffs it per topic and encodes each delta once; every client
+receives the same bytes. Sources are the materialized PortfolioView, the
+chain managers' dicts, the PluginProfiler call stats and the engine's
+PluginRouter.get_routing_stats() - never MT5 or SQLite - and nothing is
+sampled while no client is connected.
+
+Topics:
+    trades:   open positions keyed by trade id (price, PnL, SL/TP, chain level)
+    pnl:      total live PnL, balance/equity, today's figures, session status
+    chains:   re-entry and profit-booking chains keyed by "reentry:<id>"/"profit:<id>"
+    plugins:  enabled flag, worker hosting and call stats per plugin
+    routing:  PluginRouter routing counters (live delegation and shadow runs)
+
+Events:
+    snapshot  {"topic", "seq", "data"}          full topic state (on connect / resync)
+    delta     {"topic", "seq", "set", "del"}    changed keys and removed keys
+
+Each client has a bounded queue. A client that falls behind has its queue
+dropped and receives a fresh snapshot instead, so a slow browser costs a
+fixed amount of memory and never holds up the sampler or other clients.
+
+Config (live_stream):
+    enabled:            Serve /stream (default true)
+    interval_seconds:   Sampling interval (default 1.0)
+    client_queue_size:  Pending events per client before resync (default 64)
+    heartbeat_seconds:  Keep-alive comment interval (default 15)
+    max_clients:        Concurrent stream clients (default 100)
+
+Version: 1.0.0
+Date: 2026-01-14
+"""
+
+import asyncio
+import copy
+import itertools
+import json
+import logging
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+TOPICS = ("trades", "pnl", "chains", "plugins", "routing")
+HEARTBEAT = b": keepalive\n\n"
+
+_MISSING = object()
+
+
+def _frame(event: str, payload: Dict[str, Any]) -> bytes:
+    data = json.dumps(payload, default=str, separators=(",", ":"))
+    return f"event: {event}\ndata: {data}\n\n".encode()
+
+
+class LiveClient:
+    """One connected stream client"""
+
+    __slots__ = ("client_id", "topics", "queue", "queue_size", "wakeup",
+                 "needs_snapshot", "resyncs", "sent", "connected_at")
+
+    def __init__(self, client_id: int, topics: Set[str], queue_size: int):
+        self.client_id = client_id
+        self.topics = topics
+        self.queue: deque = deque()
+        self.queue_size = queue_size
+        self.wakeup = asyncio.Event()
+        self.needs_snapshot = True
+        self.resyncs = 0
+        self.sent = 0
+        self.connected_at = time.monotonic()
+
+    def offer(self, frame: bytes):
+        """Queue a delta; on overflow fall back to a snapshot"""
+        if self.needs_snapshot:
+            return  # The pending snapshot will include this change
+        if len(self.queue) >= self.queue_size:
+            self.queue.clear()
+            self.needs_snapshot = True
+            self.resyncs += 1
+        else:
+            self.queue.append(frame)
+        self.wakeup.set()
+
+
+class LiveStateHub:
+    """Samples bot state, computes per-topic deltas and fans them out"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None,
+                 sources: Optional[Dict[str, Callable[[], Dict[str, Any]]]] = None):
+        self.engine = None
+        self.router_source: Callable[[], Any] = self._default_router
+        self.sources: Dict[str, Callable[[], Dict[str, Any]]] = sources or {
+            "trades": self._collect_trades,
+            "pnl": self._collect_pnl,
+            "chains": self._collect_chains,
+            "plugins": self._collect_plugins,
+            "routing": self._collect_routing,
+        }
+        self.configure(config or {})
+
+        self._state: Dict[str, Dict[str, Any]] = {}
+        self._seq: Dict[str, int] = {}
+        self._snapshot_frames: Dict[str, tuple] = {}  # topic -> (seq, frame)
+        self._clients: Dict[int, LiveClient] = {}
+        self._ids = itertools.count(1)
+        self._task: Optional[asyncio.Task] = None
+        self.mounted = False
+        self.stats = {"samples": 0, "deltas": 0, "snapshots_sent": 0, "resyncs": 0,
+                      "source_errors": 0, "rejected": 0, "sample_ms": 0.0}
+
+    def configure(self, config: Dict[str, Any]):
+        self.config = config
+        self.enabled = config.get("enabled", True)
+        self.interval = config.get("interval_seconds", 1.0)
+        self.client_queue_size = config.get("client_queue_size", 64)
+        self.heartbeat = config.get("heartbeat_seconds", 15.0)
+        self.max_clients = config.get("max_clients", 100)
+
+    def attach(self, engine):
+        """Read state from a TradingEngine"""
+        self.engine = engine
+
+    # ------------------------------------------------------------------
+    # Sources (in-memory only)
+    # ------------------------------------------------------------------
+
+    def _portfolio(self):
+        portfolio = getattr(self.engine, 'portfolio', None)
+        return portfolio.snapshot() if portfolio is not None else None
+
+    def _collect_trades(self) -> Dict[str, Any]:
+        snapshot = self._portfolio()
+        if snapshot is None:
+            return {}
+        return {
+            str(p.trade_id): {
+                "symbol": p.symbol, "direction": p.direction, "lot": p.lot_size,
+                "entry": p.entry, "sl": p.sl, "tp": p.tp, "price": p.current_price,
+                "pips": round(p.pips, 1), "pnl": round(p.pnl, 2), "strategy": p.strategy,
+                "chain_level": p.chain_level, "profit_level": p.profit_level,
+            }
+            for p in snapshot.positions
+        }
+
+    def _collect_pnl(self) -> Dict[str, Any]:
+        snapshot = self._portfolio()
+        if snapshot is None:
+            return {}
+        return {
+            "total_pnl": round(snapshot.total_pnl, 2),
+            "open_trades": snapshot.open_count,
+            "balance": snapshot.balance,
+            "equity": snapshot.equity,
+            "today": snapshot.today,
+            "daily_loss": snapshot.daily_loss,
+            "win_rate": round(snapshot.win_rate, 1),
+            "trading_enabled": snapshot.trading_enabled,
+            "session": snapshot.session,
+        }
+
+    def _collect_chains(self) -> Dict[str, Any]:
+        engine = self.engine
+        chains = {}
+        reentry = getattr(getattr(engine, 'reentry_manager', None), 'active_chains', {})
+        for chain_id, chain in list(reentry.items()):
+            chains[f"reentry:{chain_id}"] = {
+                "symbol": chain.symbol, "direction": chain.direction, "level": chain.current_level,
+                "max_level": chain.max_level, "status": chain.status,
+                "total_profit": round(chain.total_profit, 2),
+            }
+        profit = getattr(getattr(engine, 'profit_booking_manager', None), 'active_chains', {})
+        for chain_id, chain in list(profit.items()):
+            chains[f"profit:{chain_id}"] = {
+                "symbol": chain.symbol, "direction": chain.direction, "level": chain.current_level,
+                "max_level": chain.max_level, "status": chain.status,
+                "total_profit": round(chain.total_profit, 2),
+                "orders": len(chain.active_orders),
+            }
+        return chains
+
+    def _collect_plugins(self) -> Dict[str, Any]:
+        registry = getattr(self.engine, 'plugin_registry', None)
+        if registry is None:
+            return {}
+        usage = registry.profiler.get_stats()
+        plugins = {}
+        for plugin_id, plugin in list(registry.plugins.items()):
+            stats = usage.get(plugin_id, {})
+            plugins[plugin_id] = {
+                "enabled": plugin.enabled,
+                "worker": registry.is_worker_hosted(plugin_id),
+                "calls": stats.get("calls", 0),
+                "errors": stats.get("errors", 0),
+                "avg_ms": stats.get("avg_call_ms", 0.0),
+                "p95_ms": stats.get("p95_call_ms", 0.0),
+            }
+        return plugins
+
+    def _default_router(self):
+        router = getattr(self.engine, 'plugin_router', None)
+        if router is None:
+            from src.core.plugin_router import current_plugin_router
+            router = current_plugin_router()
+        return router
+
+    def _collect_routing(self) -> Dict[str, Any]:
+        router = self.router_source()
+        if router is None:
+            return {}
+        stats = copy.deepcopy(router.get_routing_stats())  # Nested counters mutate in place
+        stats.pop("last_reset", None)
+        return stats
+
+    # ------------------------------------------------------------------
+    # Sampling
+    # ------------------------------------------------------------------
+
+    def _active_topics(self) -> Set[str]:
+        return set().union(*(c.topics for c in self._clients.values())) if self._clients else set()
+
+    def _refresh(self, topic: str) -> Optional[bytes]:
+        """Collect one topic; returns the encoded delta or None if unchanged"""
+        try:
+            new = self.sources[topic]()
+        except Exception as e:
+            self.stats["source_errors"] += 1
+            logger.debug(f"[LiveStream] {topic} source failed: {e}")
+            return None
+        old = self._state.get(topic, {})
+        changed = {k: v for k, v in new.items() if old.get(k, _MISSING) != v}
+        removed = [k for k in old if k not in new]
+        if topic in self._state and not changed and not removed:
+            return None
+        self._state[topic] = new
+        seq = self._seq[topic] = self._seq.get(topic, 0) + 1
+        return _frame("delta", {"topic": topic, "seq": seq, "set": changed, "del": removed})
+
+    def sample(self) -> int:
+        """Collect every subscribed topic once and fan out deltas; returns deltas sent"""
+        started = time.perf_counter()
+        sent = 0
+        for topic in self._active_topics():
+            frame = self._refresh(topic)
+            if frame is None:
+                continue
+            self.stats["deltas"] += 1
+            for client in list(self._clients.values()):
+                if topic in client.topics:
+                    client.offer(frame)
+                    sent += 1
+        self.stats["samples"] += 1
+        self.stats["sample_ms"] = round((time.perf_counter() - started) * 1000.0, 3)
+        self.stats["resyncs"] = sum(c.resyncs for c in self._clients.values())
+        return sent
+
+    def snapshot_frame(self, topic: str) -> bytes:
+        """Full state of a topic, encoded once per sequence number"""
+        seq = self._seq.get(topic, 0)
+        cached = self._snapshot_frames.get(topic)
+        if cached is None or cached[0] != seq:
+            frame = _frame("snapshot", {"topic": topic, "seq": seq,
+                                        "data": self._state.get(topic, {})})
+            cached = self._snapshot_frames[topic] = (seq, frame)
+        return cached[1]
+
+    async def _run(self):
+        while self._clients:
+            try:
+                self.sample()
+            except Exception as e:
+                logger.error(f"[LiveStream] Sampling failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    # ------------------------------------------------------------------
+    # Clients
+    # ------------------------------------------------------------------
+
+    def connect(self, topics: Optional[Iterable[str]] = None) -> Optional[LiveClient]:
+        """Register a client; None if the stream is disabled or full"""
+        if not self.enabled or len(self._clients) >= self.max_clients:
+            self.stats["rejected"] += 1
+            return None
+        wanted = {t for t in (topics or TOPICS) if t in self.sources} or set(self.sources)
+        # Topics nobody was subscribed to are stale; refresh them for the snapshot
+        for topic in wanted - self._active_topics():
+            self._refresh(topic)
+        client = LiveClient(next(self._ids), wanted, self.client_queue_size)
+        self._clients[client.client_id] = client
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return client
+
+    def disconnect(self, client: LiveClient):
+        self._clients.pop(client.client_id, None)
+
+    async def stream(self, client: LiveClient) -> AsyncIterator[bytes]:
+        """SSE byte stream for one client; ends when the consumer stops iterating"""
+        try:
+            yield f"retry: {int(self.interval * 2000)}\n\n".encode()
+            while True:
+                if client.needs_snapshot:
+                    client.needs_snapshot = False
+                    client.queue.clear()
+                    for topic in sorted(client.topics):
+                        self.stats["snapshots_sent"] += 1
+                        client.sent += 1
+                        yield self.snapshot_frame(topic)
+                    continue
+                if client.queue:
+                    client.sent += 1
+                    yield client.queue.popleft()
+                    continue
+                client.wakeup.clear()
+                try:
+                    await asyncio.wait_for(client.wakeup.wait(), self.heartbeat)
+                except asyncio.TimeoutError:
+                    yield HEARTBEAT
+        finally:
+            self.disconnect(client)
+
+    async def stop(self):
+        """Drop all clients and stop sampling"""
+        self._clients.clear()
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def mount(self, app, path: str = "/stream"):
+        """Add the GET {path}?topics=a,b SSE route to a FastAPI app"""
+        from fastapi.responses import JSONResponse, StreamingResponse
+
+        async def live_stream(topics: str = ""):
+            client = self.connect([t.strip() for t in topics.split(",") if t.strip()])
+            if client is None:
+                return JSONResponse(status_code=503,
+                                    content={"status": "error", "message": "Live stream unavailable"})
+            return StreamingResponse(
+                self.stream(client),
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+            )
+
+        app.add_api_route(path, live_stream, methods=["GET"], include_in_schema=False)
+        self.mounted = True
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "clients": len(self._clients),
+            "topics": sorted(self._active_topics()),
+            "seq": dict(self._seq),
+            **self.stats,
+        }
+
+
+_live_stream: Optional[LiveStateHub] = None
+
+
+def get_live_stream(config: Dict[str, Any] = None) -> LiveStateHub:
+    """Process-wide hub shared by the app server routes"""
+    global _live_stream
+    if _live_stream is None:
+        _live_stream = LiveStateHub(config)
+    elif config is not None:
+        _live_stream.configure(config)
+    return _live_stream
@@ -26,19 +26,21 @@ app = FastAPI(
 _plugin_router: Optional[PluginRouter] = None
 
 
-def init_plugin_router(plugin_registry) -> PluginRouter:
+def init_plugin_router(plugin_registry, shadow_manager=None) -> PluginRouter:
     """
     Initialize the plugin router with a registry.
     Must be called before handling webhooks.
     
     Args:
         plugin_registry: PluginRegistry instance
+        shadow_manager: Optional ShadowModeManager; shadow plugins then run
+            in the background after each live decision
         
     Returns:
         Initialized PluginRouter
     """
     global _plugin_router
-    _plugin_router = _get_router(plugin_registry)
+    _plugin_router = _get_router(plugin_registry, shadow_manager=shadow_manager)
     logger.info("Webhook handler initialized with plugin router")
     return _plugin_router
 
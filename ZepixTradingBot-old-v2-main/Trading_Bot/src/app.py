@@ -24,7 +24,10 @@ from src.core.trading_engine import TradingEngine
 from src.processors.alert_processor import AlertProcessor
 from src.managers.session_manager import SessionManager
 from src.database import TradeDatabase
+from src.core.database_access import configure_database_access, close_all_pools, get_query_stats
 from src.telegram.core.multi_bot_manager import MultiBotManager
+from src.telegram.webhook_ingress import get_webhook_ingress
+from src.api.live_stream import get_live_stream
 
 # Setup logging
 logging.basicConfig(
@@ -50,6 +53,15 @@ mt5_client = None
 trading_engine = None
 telegram_manager = None
 
+# Telegram webhook route (POST {path_prefix}/{bot}/{secret}, re-mounted if configure() changes the
+# prefix); only used when a public URL is configured
+telegram_ingress = get_webhook_ingress()
+telegram_ingress.mount(app)
+
+# Dashboard live state (GET /stream?topics=trades,pnl,chains,plugins,routing, server-sent events)
+live_stream = get_live_stream()
+live_stream.mount(app)
+
 
 @app.on_event("startup")
 async def startup_event():
@@ -64,6 +76,9 @@ async def startup_event():
         # 1. Load Configuration
         logger.info("Loading configuration...")
         config = Config()
+        configure_database_access(config.get("database_access", {}) or {})
+        telegram_ingress.configure(config.get("telegram_webhook", {}) or {})
+        live_stream.configure(config.get("live_stream", {}) or {})
         logger.info("✅ Configuration loaded")
         
         # 2. Initialize MT5 Client
@@ -111,6 +126,7 @@ async def startup_event():
         # 8. Wire Dependencies
         logger.info("Wiring dependencies...")
         telegram_manager.set_dependencies(trading_engine)
+        live_stream.attach(trading_engine)
         logger.info("✅ Dependencies wired")
         
         # 9. Initialize Trading Engine
@@ -137,9 +153,33 @@ async def shutdown_event():
     """Cleanup on shutdown"""
     logger.info("Shutting down bot...")
     
+    await telegram_ingress.stop()
+    await live_stream.stop()
+    
+    # Finish queued close bookkeeping (chains, recovery windows) before snapshotting
+    if trading_engine and getattr(trading_engine, 'event_bus', None):
+        await trading_engine.event_bus.stop()
+    
+    if trading_engine and getattr(trading_engine, 'snapshot_store', None):
+        trading_engine.save_state_snapshot()
+    
+    if trading_engine and getattr(trading_engine, 'plugin_router', None):
+        await trading_engine.plugin_router.drain_shadow_tasks()
+    
+    if trading_engine and getattr(trading_engine, 'plugin_registry', None):
+        trading_engine.plugin_registry.shutdown_workers()
+    
+    if trading_engine and getattr(trading_engine, 'market_recorder', None):
+        trading_engine.market_recorder.stop()
+    
+    if trading_engine and getattr(trading_engine, 'account_coordinator', None):
+        await trading_engine.account_coordinator.stop()
+    
     if mt5_client:
         mt5_client.shutdown()
     
+    close_all_pools()
+    
     logger.info("Bot shutdown complete")
 
 
@@ -189,7 +229,8 @@ async def status():
             "balance": mt5_client.get_account_balance(),
             "equity": mt5_client.get_account_equity(),
             "margin_free": mt5_client.get_account_free_margin(),
-            "margin_level": mt5_client.get_account_margin_level()
+            "margin_level": mt5_client.get_account_margin_level(),
+            "cache": mt5_client.account_state.get_stats()
         }
     
     # Get plugin status
@@ -202,18 +243,60 @@ async def status():
                 "name": plugin.plugin_name
             }
     
+    # Mirrored accounts (multi-account execution)
+    coordinator = getattr(trading_engine, 'account_coordinator', None)
+    mirrored_accounts = coordinator.get_stats() if coordinator and coordinator.enabled else {}
+    
+    # Live portfolio view shared by the Telegram surfaces
+    portfolio = getattr(trading_engine, 'portfolio', None)
+    event_bus = getattr(trading_engine, 'event_bus', None)
+    market_recorder = getattr(trading_engine, 'market_recorder', None)
+    
     return {
         "status": "running",
         "account": account_info,
+        "mirrored_accounts": mirrored_accounts,
+        "portfolio": portfolio.get_stats() if portfolio else {},
+        "event_bus": event_bus.get_stats() if event_bus else {},
+        "market_recorder": market_recorder.get_stats() if market_recorder else {},
         "plugins": plugin_status,
         "telegram_bots": {
             "controller": telegram_manager.controller_bot is not None,
             "notification": telegram_manager.notification_bot is not None,
             "analytics": telegram_manager.analytics_bot is not None
-        }
+        },
+        "telegram_delivery": telegram_ingress.get_stats(),
+        "live_stream": live_stream.get_stats()
     }
 
 
+@app.get("/diagnostics/memory")
+async def memory_diagnostics(snapshot: bool = False):
+    """
+    Resident size by component and top allocation sites
+    
+    Pass ?snapshot=true to take a fresh tracemalloc snapshot first.
+    """
+    telemetry = getattr(trading_engine, 'memory_telemetry', None)
+    if not telemetry:
+        return {"status": "initializing"}
+    
+    if snapshot:
+        await asyncio.get_running_loop().run_in_executor(None, telemetry.take_snapshot)
+    
+    return telemetry.get_report()
+
+
+@app.get("/diagnostics/database")
+async def database_diagnostics(top: int = 20):
+    """Per-statement query-time histograms, pool stats and archive lifecycle"""
+    stats = get_query_stats(top)
+    lifecycle = getattr(trading_engine, 'data_lifecycle', None)
+    if lifecycle:
+        stats["lifecycle"] = lifecycle.get_stats()
+    return stats
+
+
 @app.post("/webhook")
 async def webhook(request: Request):
     """
@@ -0,0 +1,196 @@
+"""
+Account State Service - Short-lived cache of broker account figures
+
+Balance, equity and margin are read by lot sizing, margin health checks,
+dual-order validation, the service API and the dashboard. Reading them
+straight from mt5.account_info() on every use costs one terminal round trip
+per consumer and lets two checks in the same decision see different numbers.
+
+AccountStateService keeps one immutable AccountSnapshot that:
+- Is reloaded once it is older than ttl_seconds
+- Is invalidated immediately on order fills, closes and modifications
+- Is shared by all consumers, so one decision sees one consistent state
+- Keeps serving the previous snapshot when a reload fails, but only until
+  it is max_stale_seconds old; after that readers get None (balance 0)
+
+Config:
+- account_state_ttl_seconds: Maximum snapshot age before reload (default 1.0)
+- account_state_max_stale_seconds: Oldest snapshot served after failed reloads
+  (default 30 x TTL)
+
+Version: 1.0.0
+Date: 2026-01-14
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Callable
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class AccountSnapshot:
+    """Balance, equity and margin figures read from the broker at one instant"""
+    balance: float
+    equity: float
+    margin: float
+    free_margin: float
+    margin_level: float
+    leverage: int = 1
+    taken_at: float = 0.0
+    version: int = 0
+    source: str = "broker"
+
+    @property
+    def age(self) -> float:
+        """Seconds since the snapshot was taken"""
+        return time.time() - self.taken_at
+
+    def to_dict(self) -> Dict[str, float]:
+        """Dictionary form matching MT5Client.get_account_info_detailed()"""
+        return {
+            "balance": self.balance,
+            "equity": self.equity,
+            "free_margin": self.free_margin,
+            "margin": self.margin,
+            "margin_level": self.margin_level,
+        }
+
+    @classmethod
+    def from_account_info(cls, info: Any, version: int = 0, source: str = "broker") -> "AccountSnapshot":
+        """Build a snapshot from mt5.account_info() or an equivalent dict"""
+        if isinstance(info, dict):
+            get = info.get
+        else:
+            get = lambda key, default=None: getattr(info, key, default)
+        return cls(
+            balance=float(get("balance", 0.0) or 0.0),
+            equity=float(get("equity", 0.0) or 0.0),
+            margin=float(get("margin", 0.0) or 0.0),
+            free_margin=float(get("margin_free", get("free_margin", 0.0)) or 0.0),
+            margin_level=float(get("margin_level", 0.0) or 0.0),
+            leverage=int(get("leverage", 1) or 1),
+            taken_at=time.time(),
+            version=version,
+            source=get("source", None) or source,
+        )
+
+
+class AccountStateService:
+    """
+    TTL cache of the account snapshot with event-based invalidation.
+
+    Concurrent callers that find the snapshot expired share a single reload.
+    invalidate() is called from the order paths (fill, close, modify) so the
+    next reader sees the post-trade balance instead of waiting for the TTL.
+    """
+
+    def __init__(self, loader: Callable[[], Optional[Any]], ttl_seconds: float = 1.0,
+                 max_stale_seconds: Optional[float] = None):
+        """
+        Args:
+            loader: Callable returning mt5.account_info() (or a dict with the
+                    same fields), or None when the broker is unavailable
+            ttl_seconds: Maximum snapshot age before it is reloaded
+            max_stale_seconds: Oldest snapshot still served when reloads fail
+                               (defaults to 30 x ttl_seconds)
+        """
+        self._loader = loader
+        self.ttl_seconds = ttl_seconds
+        self.max_stale_seconds = ttl_seconds * 30 if max_stale_seconds is None else max_stale_seconds
+        self._snapshot: Optional[AccountSnapshot] = None
+        self._valid = False
+        self._version = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.last_invalidation: Optional[str] = None
+        self.stats = {"hits": 0, "misses": 0, "refreshes": 0,
+                      "invalidations": 0, "failures": 0, "expired": 0}
+
+    def _is_fresh(self, snapshot: Optional[AccountSnapshot], max_age: float) -> bool:
+        return (snapshot is not None and self._valid
+                and time.time() - snapshot.taken_at < max_age)
+
+    def get(self, max_age: Optional[float] = None) -> Optional[AccountSnapshot]:
+        """
+        Get the current account snapshot, reloading it if expired or invalidated.
+
+        Args:
+            max_age: Tighter freshness bound for this call (defaults to the TTL)
+
+        Returns None if no snapshot was ever loaded successfully, or if
+        reloads have been failing for longer than max_stale_seconds.
+        """
+        max_age = self.ttl_seconds if max_age is None else min(max_age, self.ttl_seconds)
+        snapshot = self._snapshot
+        if self._is_fresh(snapshot, max_age):
+            self.stats["hits"] += 1
+            return snapshot
+
+        with self._lock:
+            snapshot = self._snapshot
+            if self._is_fresh(snapshot, max_age):
+                # Another caller reloaded while we waited for the lock
+                self.stats["hits"] += 1
+                return snapshot
+
+            self.stats["misses"] += 1
+            generation = self._generation
+            loaded = self._load()
+            if loaded is None:
+                self.stats["failures"] += 1
+                if snapshot is not None and snapshot.age >= self.max_stale_seconds:
+                    # Too old to size or margin-check a trade against
+                    self.stats["expired"] += 1
+                    logger.warning(f"[ACCOUNT_STATE] Snapshot {snapshot.age:.1f}s old and "
+                                   f"reload failed, not serving it")
+                    return None
+                # Keep serving the last known state rather than failing the caller
+                return snapshot
+
+            self.stats["refreshes"] += 1
+            self._snapshot = loaded
+            # An invalidation that raced the load means it may predate the fill
+            self._valid = generation == self._generation
+            return loaded
+
+    def _load(self) -> Optional[AccountSnapshot]:
+        """Read account info from the broker"""
+        try:
+            info = self._loader() if self._loader else None
+        except Exception as e:
+            logger.error(f"[ACCOUNT_STATE] Failed to load account info: {e}")
+            return None
+        if info is None:
+            return None
+        self._version += 1
+        return AccountSnapshot.from_account_info(info, version=self._version)
+
+    def invalidate(self, reason: str = ""):
+        """Force the next get() to reload (call after fills, closes and modifications)"""
+        self._generation += 1
+        self._valid = False
+        self.last_invalidation = reason
+        self.stats["invalidations"] += 1
+        logger.debug(f"[ACCOUNT_STATE] Invalidated: {reason or 'manual'}")
+
+    def peek(self) -> Optional[AccountSnapshot]:
+        """Last loaded snapshot without triggering a reload"""
+        return self._snapshot
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache statistics for diagnostics"""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        snapshot = self._snapshot
+        return {
+            **self.stats,
+            "hit_rate": round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+            "ttl_seconds": self.ttl_seconds,
+            "max_stale_seconds": self.max_stale_seconds,
+            "version": snapshot.version if snapshot else 0,
+            "age_seconds": round(snapshot.age, 3) if snapshot else None,
+            "last_invalidation": self.last_invalidation,
+        }
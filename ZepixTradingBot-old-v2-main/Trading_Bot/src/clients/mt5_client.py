@@ -7,10 +7,13 @@ except ImportError:
 
 import time
 import logging
-from typing import Dict, Any, Optional, List
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Callable
 from src.config import Config
 from src.models import Trade
 from src.utils.optimized_logger import logger as opt_logger
+from src.clients.symbol_registry import SymbolRegistry, SymbolMetadata
+from src.clients.account_state import AccountStateService, AccountSnapshot
 
 logger = logging.getLogger(__name__)
 
@@ -22,11 +25,53 @@ class MT5Client:
         self.symbol_mapping = config.get("symbol_mapping", {})
         # Cache for symbol mappings to avoid repeated lookups and debug logs
         self.symbol_cache = {}
+        # Broker symbol metadata (digits, point, stops level, ...) loaded once per session
+        self.symbol_registry = SymbolRegistry(
+            loader=self._load_symbol_info,
+            config=config,
+            symbol_mapper=self._map_symbol,
+            refresh_interval=config.get("symbol_metadata_refresh_seconds", 3600)
+        )
+        # Balance/equity/margin snapshot shared by all consumers, invalidated on fills and closes
+        self.account_state = AccountStateService(
+            loader=self._load_account_info,
+            ttl_seconds=config.get("account_state_ttl_seconds", 1.0),
+            max_stale_seconds=config.get("account_state_max_stale_seconds")
+        )
         
         # Connection health monitoring
         self.connection_errors = 0
         self.max_connection_errors = 5
         self.telegram_bot = None  # Will be set externally after initialization
+        # Called with ("place" | "close" | "modify", payload) after each successful execution
+        self.execution_listeners: List[Callable[[str, Dict[str, Any]], None]] = []
+        # Called with (symbol, bid, ask, volume) for every polled broker tick (e.g. market recording);
+        # simulation-mode dummy prices are not reported
+        self.tick_listeners: List[Callable[[str, float, float, float], None]] = []
+
+    def add_execution_listener(self, listener: Callable[[str, Dict[str, Any]], None]):
+        """Subscribe to successful place/close/modify executions (e.g. account mirroring)"""
+        if listener not in self.execution_listeners:
+            self.execution_listeners.append(listener)
+
+    def _notify_execution(self, event: str, **payload):
+        for listener in list(self.execution_listeners):
+            try:
+                listener(event, payload)
+            except Exception as e:
+                logger.error(f"Execution listener error ({event}): {e}")
+
+    def add_tick_listener(self, listener: Callable[[str, float, float, float], None]):
+        """Subscribe to polled ticks; listeners run on the polling path and must be cheap"""
+        if listener not in self.tick_listeners:
+            self.tick_listeners.append(listener)
+
+    def _notify_tick(self, symbol: str, bid: float, ask: float, volume: float = 0.0):
+        for listener in self.tick_listeners:
+            try:
+                listener(symbol, bid, ask, volume)
+            except Exception as e:
+                logger.error(f"Tick listener error ({symbol}): {e}")
 
     def _map_symbol(self, symbol: str) -> str:
         """
@@ -51,6 +96,73 @@ class MT5Client:
         
         return mapped
 
+    def _load_symbol_info(self, mt5_symbol: str):
+        """Raw broker lookup used by SymbolRegistry (None in simulation mode)"""
+        if not MT5_AVAILABLE or self.config.get("simulate_orders", True):
+            return None
+        return mt5.symbol_info(mt5_symbol)
+
+    def _load_account_info(self):
+        """Raw account lookup used by AccountStateService (dummy values in simulation mode)"""
+        if not MT5_AVAILABLE or self.config.get("simulate_orders", True):
+            return {
+                "balance": 10000.0,
+                "equity": 10000.0,
+                "free_margin": 9000.0,
+                "margin": 1000.0,
+                "margin_level": 1000.0,  # percentage
+                "leverage": 100,
+                "source": "simulation"
+            }
+        return mt5.account_info()
+
+    def get_account_snapshot(self, max_age: Optional[float] = None) -> Optional[AccountSnapshot]:
+        """Consistent balance/equity/margin snapshot (cached, see account_state_ttl_seconds)"""
+        if not self.initialized:
+            if not self.initialize():
+                return None
+        return self.account_state.get(max_age)
+
+    def get_symbol_metadata(self, symbol: str) -> Optional[SymbolMetadata]:
+        """Get cached broker metadata for a TradingView symbol"""
+        return self.symbol_registry.get(symbol)
+
+    def get_symbol_info(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """
+        Get symbol info as a dict (cached metadata plus live spread in points)
+        Used by MarketDataService and ServiceAPI
+        """
+        meta = self.symbol_registry.get(symbol)
+        if meta is None:
+            return None
+        info = meta.to_dict()
+        tick = self.get_symbol_tick(symbol)
+        if tick and meta.point:
+            info['spread'] = int(round((tick['ask'] - tick['bid']) / meta.point))
+        else:
+            info['spread'] = 0
+        return info
+
+    def get_symbol_tick(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Get latest tick (bid/ask/last/volume) for a TradingView symbol"""
+        if not MT5_AVAILABLE or self.config.get("simulate_orders", True):
+            price = self.get_current_price(symbol)
+            if price is None:
+                return None
+            return {'bid': price, 'ask': price, 'last': price, 'volume': 0, 'time': int(time.time())}
+        
+        try:
+            tick = mt5.symbol_info_tick(self._map_symbol(symbol))
+            if tick is None:
+                return None
+            if self.tick_listeners:
+                self._notify_tick(symbol, tick.bid, tick.ask, tick.volume)
+            return {'bid': tick.bid, 'ask': tick.ask, 'last': tick.last,
+                    'volume': tick.volume, 'time': tick.time}
+        except Exception as e:
+            logger.error(f"Error getting tick for {symbol}: {str(e)}")
+            return None
+
     def initialize(self) -> bool:
         """Initialize MT5 connection with retry logic"""
         if not MT5_AVAILABLE:
@@ -60,7 +172,10 @@ class MT5Client:
             
         for i in range(self.config["mt5_retries"]):
             try:
-                if not mt5.initialize():
+                # A dedicated terminal per account when several run on one host
+                terminal_path = self.config.get("mt5_terminal_path")
+                connected = mt5.initialize(path=terminal_path) if terminal_path else mt5.initialize()
+                if not connected:
                     print(f"MT5 initialization failed, retry {i+1}/{self.config['mt5_retries']}")
                     time.sleep(self.config["mt5_wait"])
                     continue
@@ -130,6 +245,8 @@ class MT5Client:
                 if success:
                     opt_logger.info("✅ MT5 reconnection successful")
                     self.connection_errors = 0
+                    # Broker may have changed symbol specs while we were away
+                    self.symbol_registry.invalidate()
                     return True
                 else:
                     if self.connection_errors >= self.max_connection_errors:
@@ -172,8 +289,8 @@ class MT5Client:
             logger.info(f"VALIDATION: Symbol mapped {symbol} -> {mt5_symbol}")
         
         try:
-            # Get symbol info from MT5
-            symbol_info = mt5.symbol_info(mt5_symbol)
+            # Get cached symbol metadata (loaded from MT5 once per session)
+            symbol_info = self.symbol_registry.get(symbol)
             if symbol_info is None:
                 error_msg = f"Symbol {mt5_symbol} not found in MT5"
                 logger.error(f"VALIDATION FAILED: {error_msg}")
@@ -185,15 +302,11 @@ class MT5Client:
             )
             
             # Get minimum stops level (minimum distance from price)
-            stops_level = symbol_info.trade_stops_level
+            stops_level = symbol_info.stops_level
             point = symbol_info.point
             
-            # Calculate minimum distance required
-            if stops_level > 0:
-                min_distance = stops_level * point
-            else:
-                # Default to 10 points if stops_level is 0
-                min_distance = 10 * point
+            # Minimum distance required (defaults to 10 points if stops_level is 0)
+            min_distance = symbol_info.min_stop_distance
             
             logger.info(
                 f"VALIDATION: StopsLevel={stops_level}, Point={point}, "
@@ -283,14 +396,17 @@ class MT5Client:
             import random
             simulated_ticket = random.randint(100000, 999999)
             print(f"SIMULATED ORDER: {order_type.upper()} {lot_size} lots {symbol} @ {price}, SL={sl}, TP={tp} (Ticket #{simulated_ticket})")
+            self.account_state.invalidate("fill")
+            self._notify_execution("place", ticket=simulated_ticket, symbol=symbol, order_type=order_type,
+                                   lot_size=lot_size, price=price, sl=sl, tp=tp, comment=comment)
             return simulated_ticket
         
         # Map symbol for broker compatibility - CRITICAL FOR XM BROKER
         mt5_symbol = self._map_symbol(symbol)
         
         try:
-            # Get symbol info using the mapped broker symbol
-            symbol_info = mt5.symbol_info(mt5_symbol)
+            # Get cached symbol metadata for the mapped broker symbol
+            symbol_info = self.symbol_registry.get(symbol)
             if symbol_info is None:
                 print(f"ERROR: Symbol {mt5_symbol} not found in MT5")
                 return None
@@ -300,14 +416,16 @@ class MT5Client:
                 if not mt5.symbol_select(mt5_symbol, True):
                     print(f"ERROR: Failed to enable symbol {mt5_symbol}")
                     return None
+                self.symbol_registry.invalidate(symbol)
             
             # Determine order type and get current price
+            tick = mt5.symbol_info_tick(mt5_symbol)
             if order_type == "buy":
                 order_type_mt5 = mt5.ORDER_TYPE_BUY
-                price = mt5.symbol_info_tick(mt5_symbol).ask
+                price = tick.ask
             else:
                 order_type_mt5 = mt5.ORDER_TYPE_SELL
-                price = mt5.symbol_info_tick(mt5_symbol).bid
+                price = tick.bid
             
             # Round prices to symbol's digit precision
             digits = symbol_info.digits
@@ -351,6 +469,9 @@ class MT5Client:
                 return None
             
             print(f"SUCCESS: Order placed successfully: Ticket #{result.order}")
+            self.account_state.invalidate("fill")
+            self._notify_execution("place", ticket=result.order, symbol=symbol, order_type=order_type,
+                                   lot_size=lot_size, price=price, sl=sl, tp=tp, comment=comment)
             return result.order
             
         except Exception as e:
@@ -368,6 +489,8 @@ class MT5Client:
         # Simulation mode - always return success
         if not MT5_AVAILABLE or self.config.get("simulate_orders", True):
             print(f"SIMULATED CLOSE: Position #{position_id}")
+            self.account_state.invalidate("close")
+            self._notify_execution("close", ticket=position_id, percentage=percentage)
             return True
         
         try:
@@ -382,19 +505,21 @@ class MT5Client:
             
             if len(positions) == 0:
                 print(f"SUCCESS: Position {position_id} already closed (not found in MT5)")
+                self.account_state.invalidate("close")
+                self._notify_execution("close", ticket=position_id, percentage=percentage)
                 return True  # Position genuinely doesn't exist - already closed
                 
             position = positions[0]
             
             # Prepare close request
-            symbol_info = mt5.symbol_info(position.symbol)
+            tick = mt5.symbol_info_tick(position.symbol)
             
             if position.type == mt5.ORDER_TYPE_BUY:
                 order_type = mt5.ORDER_TYPE_SELL
-                price = mt5.symbol_info_tick(position.symbol).bid
+                price = tick.bid
             else:
                 order_type = mt5.ORDER_TYPE_BUY
-                price = mt5.symbol_info_tick(position.symbol).ask
+                price = tick.ask
             
             request = {
                 "action": mt5.TRADE_ACTION_DEAL,
@@ -414,6 +539,8 @@ class MT5Client:
             
             if result.retcode == mt5.TRADE_RETCODE_DONE:
                 print(f"SUCCESS: Position {position_id} closed successfully")
+                self.account_state.invalidate("close")
+                self._notify_execution("close", ticket=position_id, percentage=percentage)
                 return True
             else:
                 print(f"Failed to close position: {result.comment}")
@@ -448,28 +575,68 @@ class MT5Client:
         try:
             tick = mt5.symbol_info_tick(mt5_symbol)
             if tick:
+                if self.tick_listeners:
+                    self._notify_tick(symbol, tick.bid, tick.ask, tick.volume)
                 return (tick.ask + tick.bid) / 2
             return None
         except:
             return None
 
-    def get_account_balance(self) -> float:
-        """Get current account balance"""
+    def get_candles(self, symbol: str, timeframe: str = "15m", count: int = 20) -> List[Dict[str, Any]]:
+        """
+        Last `count` bars for a TradingView symbol, oldest first.
+        
+        The final bar is the one still forming. Each bar is a dict with
+        time (bar open, epoch seconds), open, high, low, close and
+        tick_volume. Returns [] in simulation mode or on error.
+        """
         if not self.initialized:
             if not self.initialize():
-                return 0.0
-        
-        # Simulation mode - return dummy balance
+                return []
         if not MT5_AVAILABLE or self.config.get("simulate_orders", True):
-            return 10000.0
+            return []
+        
+        # '15m' -> TIMEFRAME_M15, '1h' -> TIMEFRAME_H1, 'H4' passes through
+        tf = str(timeframe).strip().upper()
+        if tf[-1] in "MHD" and tf[:-1].isdigit():
+            tf = tf[-1] + tf[:-1]
+        mt5_timeframe = getattr(mt5, f"TIMEFRAME_{tf}", None)
+        if mt5_timeframe is None:
+            logger.error(f"Unknown candle timeframe: {timeframe}")
+            return []
         
         try:
-            account_info = mt5.account_info()
-            if account_info:
-                return account_info.balance
-            return 0.0
-        except:
-            return 0.0
+            rates = mt5.copy_rates_from_pos(self._map_symbol(symbol), mt5_timeframe, 0, count)
+            if rates is None:
+                return []
+            return [{'time': int(r['time']), 'open': float(r['open']), 'high': float(r['high']),
+                     'low': float(r['low']), 'close': float(r['close']),
+                     'tick_volume': int(r['tick_volume'])} for r in rates]
+        except Exception as e:
+            logger.error(f"Error getting candles for {symbol}: {str(e)}")
+            return []
+
+    def get_account_balance(self) -> float:
+        """Get current account balance"""
+        snapshot = self.get_account_snapshot()
+        return snapshot.balance if snapshot else 0.0
+
+    def get_account_equity(self) -> float:
+        """Get current account equity"""
+        snapshot = self.get_account_snapshot()
+        return snapshot.equity if snapshot else 0.0
+
+    def get_account_free_margin(self) -> float:
+        """Get current free margin (alias used by the status endpoint)"""
+        return self.get_free_margin()
+
+    def get_account_margin_level(self) -> float:
+        """Get current margin level percentage (alias used by the status endpoint)"""
+        return self.get_margin_level()
+
+    def is_connected(self) -> bool:
+        """True once the MT5 connection (or simulation mode) is initialized"""
+        return self.initialized
 
     def get_positions(self, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
         """
@@ -556,34 +723,8 @@ class MT5Client:
 
     def get_account_info_detailed(self) -> Dict[str, float]:
         """Get detailed account info including margins and equity"""
-        if not self.initialized:
-            if not self.initialize():
-                return {}
-        
-        # Simulation mode - return dummy values
-        if not MT5_AVAILABLE or self.config.get("simulate_orders", True):
-            return {
-                "balance": 10000.0,
-                "equity": 10000.0,
-                "free_margin": 9000.0,
-                "margin": 1000.0,
-                "margin_level": 1000.0  # percentage
-            }
-        
-        try:
-            account_info = mt5.account_info()
-            if account_info:
-                return {
-                    "balance": account_info.balance,
-                    "equity": account_info.equity,
-                    "free_margin": account_info.margin_free,
-                    "margin": account_info.margin,
-                    "margin_level": account_info.margin_level  # percentage (free_margin/margin * 100)
-                }
-            return {}
-        except Exception as e:
-            print(f"ERROR: Unable to get account info: {str(e)}")
-            return {}
+        snapshot = self.get_account_snapshot()
+        return snapshot.to_dict() if snapshot else {}
 
     def get_free_margin(self) -> float:
         """Get current free margin available for trading"""
@@ -612,6 +753,7 @@ class MT5Client:
         # Simulation mode
         if not MT5_AVAILABLE or self.config.get("simulate_orders", True):
             print(f"SIMULATED MODIFY: Ticket {ticket} -> SL={sl}, TP={tp}")
+            self._notify_execution("modify", ticket=ticket, sl=sl, tp=tp)
             return True
             
         try:
@@ -636,6 +778,8 @@ class MT5Client:
             result = mt5.order_send(request)
             if result.retcode == mt5.TRADE_RETCODE_DONE:
                 logger.info(f"SUCCESS: Position {ticket} modified. SL={sl}, TP={tp}")
+                self.account_state.invalidate("modify")
+                self._notify_execution("modify", ticket=ticket, sl=sl, tp=tp)
                 return True
             else:
                 logger.error(f"Failed to modify position {ticket}: {result.comment}")
@@ -660,31 +804,24 @@ class MT5Client:
             return lot_size * 100 * 10  # Rough estimate
         
         try:
-            # Map symbol if needed
-            mt5_symbol = self._map_symbol(symbol)
-            
-            # Get symbol info to get pip value and leverage
-            symbol_info = mt5.symbol_info(mt5_symbol)
+            # Get cached symbol metadata for pip value
+            symbol_info = self.symbol_registry.get(symbol)
             if not symbol_info:
-                print(f"WARNING: Could not get symbol info for {mt5_symbol}")
+                print(f"WARNING: Could not get symbol info for {self._map_symbol(symbol)}")
                 return 0.0
             
             # Get account leverage
-            account_info = mt5.account_info()
-            if not account_info:
+            snapshot = self.get_account_snapshot()
+            if not snapshot:
                 return 0.0
             
-            leverage = account_info.leverage if hasattr(account_info, 'leverage') else 1
+            leverage = snapshot.leverage or 1
             
             # Approximate required margin per lot based on pip value
             # This is a simplified calculation - actual margin may vary
-            tick = mt5.symbol_info_tick(mt5_symbol)
-            if tick:
-                pip_value = symbol_info.point * 10  # 1 pip in currency value per 1 lot
-                required_margin = (pip_value * lot_size * 100) / leverage  # Rough estimate
-                return required_margin
-            
-            return 0.0
+            pip_value = symbol_info.point * 10  # 1 pip in currency value per 1 lot
+            required_margin = (pip_value * lot_size * 100) / leverage  # Rough estimate
+            return required_margin
             
         except Exception as e:
             print(f"ERROR: Could not calculate required margin: {str(e)}")
@@ -696,8 +833,10 @@ class MT5Client:
         min_margin_level: minimum safe margin level percentage (default 100%)
         Returns: True if safe, False if risky
         """
-        margin_level = self.get_margin_level()
-        free_margin = self.get_free_margin()
+        # Read both figures from one snapshot so they describe the same instant
+        info = self.get_account_info_detailed()
+        margin_level = info.get("margin_level", 0.0)
+        free_margin = info.get("free_margin", 0.0)
         
         is_safe = margin_level >= min_margin_level and free_margin > 0
         
@@ -746,4 +885,31 @@ class MT5Client:
             
         except Exception as e:
             logger.error(f"Error fetching profit for ticket {ticket_id}: {e}")
+            return None
+    
+    def get_closed_trade_exit(self, ticket_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Fetch the broker's exit deal for a closed position.
+        
+        Args:
+            ticket_id: MT5 position ticket ID
+            
+        Returns:
+            Dict with the close 'price' and 'time' (datetime) of the last exit deal, or None if not found
+        """
+        if not self.initialized or not MT5_AVAILABLE:
+            return None
+        
+        try:
+            deals = mt5.history_deals_get(position=ticket_id)
+            exits = [deal for deal in deals or ()
+                     if deal.entry in (mt5.DEAL_ENTRY_OUT, mt5.DEAL_ENTRY_OUT_BY)]
+            if not exits:
+                return None
+            
+            last_exit = max(exits, key=lambda deal: deal.time)
+            return {"price": last_exit.price, "time": datetime.fromtimestamp(last_exit.time)}
+            
+        except Exception as e:
+            logger.error(f"Error fetching exit deal for ticket {ticket_id}: {e}")
             return None
\ No newline at end of file
@@ -0,0 +1,189 @@
+"""
+Paper Broker - Local stand-in for an MT5 account
+
+Implements the subset of MT5Client used by account workers (place, close,
+modify, prices, account info) entirely in memory, so multi-account fan-out
+can be run and load-tested on Linux without a terminal. Prices follow a
+seeded random walk, fills are immediate at the current price, and closed
+trades are booked into balance.
+
+Config (per account, `multi_account.accounts[]`):
+    broker:             "paper"
+    starting_balance:   Initial balance (default 10000)
+    leverage:           Account leverage (default 100)
+    latency_ms:         Simulated round trip per request (default 0)
+    reject_rate:        Fraction of orders rejected at random (default 0)
+    prices:             {"EURUSD": 1.1, ...} starting prices
+    seed:               Random seed for prices and rejections
+
+Version: 1.0.0
+Date: 2026-01-14
+"""
+
+import itertools
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+# Starting prices for symbols not listed in config
+DEFAULT_PRICES = {
+    "XAUUSD": 2000.0, "EURUSD": 1.1000, "GBPUSD": 1.2700, "USDJPY": 148.00,
+    "AUDUSD": 0.6600, "USDCAD": 1.3500, "EURJPY": 162.00, "GBPJPY": 188.00,
+}
+
+# Contract size per lot for P&L (gold is 100 oz, FX 100k units)
+CONTRACT_SIZE = {"XAUUSD": 100.0}
+
+
+class PaperBroker:
+    """In-memory broker account with the MT5Client calling convention"""
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+        self.balance = float(config.get("starting_balance", 10000.0))
+        self.leverage = int(config.get("leverage", 100))
+        self.latency = float(config.get("latency_ms", 0)) / 1000.0
+        self.reject_rate = float(config.get("reject_rate", 0.0))
+        self.initialized = False
+
+        self._random = random.Random(config.get("seed"))
+        self._prices: Dict[str, float] = {**DEFAULT_PRICES, **config.get("prices", {})}
+        self._positions: Dict[int, Dict[str, Any]] = {}
+        self._tickets = itertools.count(int(config.get("first_ticket", 500000)))
+        self._lock = threading.Lock()
+        self.stats = {"orders": 0, "rejects": 0, "closes": 0, "modifies": 0}
+
+    def initialize(self) -> bool:
+        self.initialized = True
+        return True
+
+    def shutdown(self):
+        self.initialized = False
+
+    def is_connected(self) -> bool:
+        return self.initialized
+
+    # ------------------------------------------------------------------
+    # Prices
+    # ------------------------------------------------------------------
+
+    def _tick(self, symbol: str) -> float:
+        price = self._prices.get(symbol, 1.0)
+        # Random walk of up to 2 bps per request
+        price *= 1 + self._random.uniform(-0.0002, 0.0002)
+        self._prices[symbol] = price
+        return price
+
+    def get_current_price(self, symbol: str) -> Optional[float]:
+        with self._lock:
+            return self._tick(symbol)
+
+    def set_price(self, symbol: str, price: float):
+        """Move the market (for scenarios)"""
+        with self._lock:
+            self._prices[symbol] = price
+
+    # ------------------------------------------------------------------
+    # Orders
+    # ------------------------------------------------------------------
+
+    def _delay(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    def place_order(self, symbol: str, order_type: str, lot_size: float,
+                    price: float = 0.0, sl: float = 0.0, tp: float = None,
+                    comment: str = "") -> Optional[int]:
+        self._delay()
+        with self._lock:
+            self.stats["orders"] += 1
+            if lot_size <= 0 or self._random.random() < self.reject_rate:
+                self.stats["rejects"] += 1
+                return None
+            ticket = next(self._tickets)
+            self._positions[ticket] = {
+                "ticket": ticket,
+                "symbol": symbol,
+                "type": order_type.lower(),
+                "volume": lot_size,
+                "price_open": self._tick(symbol),
+                "sl": sl,
+                "tp": tp or 0.0,
+                "comment": comment,
+            }
+            return ticket
+
+    def _profit(self, position: Dict[str, Any], volume: float, price: float) -> float:
+        sign = 1 if position["type"] == "buy" else -1
+        contract = CONTRACT_SIZE.get(position["symbol"], 100000.0)
+        profit = sign * (price - position["price_open"]) * volume * contract
+        if position["symbol"].endswith("JPY"):
+            profit /= price
+        return profit
+
+    def _notional(self, position: Dict[str, Any]) -> float:
+        """Position value in account currency (USD)"""
+        units = position["volume"] * CONTRACT_SIZE.get(position["symbol"], 100000.0)
+        if position["symbol"].startswith("USD"):
+            return units
+        return units * self._prices.get(position["symbol"], position["price_open"])
+
+    def close_position(self, position_id: int, percentage: float = 100) -> bool:
+        self._delay()
+        with self._lock:
+            position = self._positions.get(position_id)
+            if position is None:
+                return True  # Already closed, same as MT5Client
+            price = self._tick(position["symbol"])
+            volume = position["volume"] if percentage >= 100 else round(
+                position["volume"] * percentage / 100.0, 2)
+            self.balance += self._profit(position, volume, price)
+            position["volume"] = round(position["volume"] - volume, 2)
+            if position["volume"] <= 0:
+                del self._positions[position_id]
+            self.stats["closes"] += 1
+            return True
+
+    def modify_position(self, ticket: int, sl: float = None, tp: float = None) -> bool:
+        self._delay()
+        with self._lock:
+            position = self._positions.get(ticket)
+            if position is None:
+                return False
+            if sl is not None:
+                position["sl"] = sl
+            if tp is not None:
+                position["tp"] = tp
+            self.stats["modifies"] += 1
+            return True
+
+    # ------------------------------------------------------------------
+    # Account
+    # ------------------------------------------------------------------
+
+    def get_positions(self, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(p) for p in self._positions.values()
+                    if symbol is None or p["symbol"] == symbol]
+
+    def get_account_balance(self) -> float:
+        return self.balance
+
+    def get_account_equity(self) -> float:
+        with self._lock:
+            floating = sum(self._profit(p, p["volume"], self._prices.get(p["symbol"], p["price_open"]))
+                           for p in self._positions.values())
+        return self.balance + floating
+
+    def get_account_info_detailed(self) -> Dict[str, float]:
+        equity = self.get_account_equity()
+        with self._lock:
+            margin = sum(self._notional(p) for p in self._positions.values()) / self.leverage
+        return {
+            "balance": self.balance,
+            "equity": equity,
+            "margin": margin,
+            "free_margin": equity - margin,
+            "margin_level": (equity / margin * 100.0) if margin else 0.0,
+        }
@@ -0,0 +1,242 @@
+"""
+Symbol Metadata Registry - Session cache of broker symbol properties
+
+Loads digits, point, stops level, volume limits, contract size and tick value
+once per symbol per session and refreshes them on a fixed interval, so order
+validation and pip math do not hit mt5.symbol_info() on every call.
+
+Also owns the single price-distance <-> pips conversion rule that was
+previously duplicated in TradeDatabase and MarketDataService.
+
+Version: 1.0.0
+Date: 2026-01-14
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, Optional, Callable
+
+logger = logging.getLogger(__name__)
+
+METAL_SYMBOLS = ('XAU', 'XAG')
+
+
+def default_pip_size(symbol: str) -> float:
+    """
+    Heuristic pip size used when neither config nor broker metadata is available.
+    Metals: 0.1, JPY pairs: 0.01, other forex: 0.0001
+    """
+    symbol = (symbol or "").upper()
+    if symbol.startswith(METAL_SYMBOLS):
+        return 0.1
+    if "JPY" in symbol:
+        return 0.01
+    return 0.0001
+
+
+def price_to_pips(symbol: str, distance: float) -> float:
+    """Convert a raw price distance into pips using the shared symbol rule"""
+    return abs(distance) / default_pip_size(symbol)
+
+
+@dataclass(frozen=True)
+class SymbolMetadata:
+    """Static broker properties of a symbol (changes at most a few times a day)"""
+    symbol: str
+    broker_symbol: str
+    digits: int
+    point: float
+    stops_level: int = 0
+    volume_min: float = 0.01
+    volume_max: float = 100.0
+    volume_step: float = 0.01
+    contract_size: float = 100000.0
+    tick_value: float = 0.0
+    tick_size: float = 0.0
+    trade_mode: int = 0
+    visible: bool = True
+    loaded_at: float = 0.0
+    source: str = "broker"
+
+    @property
+    def min_stop_distance(self) -> float:
+        """Minimum SL/TP distance from price (defaults to 10 points)"""
+        if self.stops_level > 0:
+            return self.stops_level * self.point
+        return 10 * self.point
+
+    def normalize_price(self, price: float) -> float:
+        """Round a price to the symbol's digit precision"""
+        return round(price, self.digits)
+
+    def normalize_volume(self, volume: float) -> float:
+        """Clamp and floor a lot size to the broker's volume step"""
+        step = self.volume_step or 0.01
+        steps = int(round(volume / step, 8))
+        volume = round(steps * step, 8)
+        return max(self.volume_min, min(self.volume_max, volume))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Dictionary form matching the keys of mt5.symbol_info()._asdict()"""
+        data = asdict(self)
+        data['trade_stops_level'] = self.stops_level
+        data['trade_contract_size'] = self.contract_size
+        data['trade_tick_value'] = self.tick_value
+        data['trade_tick_size'] = self.tick_size
+        return data
+
+
+class SymbolRegistry:
+    """
+    Per-session registry of SymbolMetadata.
+
+    Entries are loaded lazily on first use and reloaded once they are older
+    than refresh_interval seconds. When the broker is unavailable (simulation
+    mode) metadata is derived from config["symbol_config"].
+    """
+
+    def __init__(self, loader: Callable[[str], Optional[Any]], config=None,
+                 symbol_mapper: Optional[Callable[[str], str]] = None,
+                 refresh_interval: float = 3600.0):
+        """
+        Args:
+            loader: Callable returning the raw mt5 symbol_info for a broker symbol
+                    (or None when unavailable)
+            config: Bot config used for the simulation fallback and pip sizes
+            symbol_mapper: Maps TradingView symbols to broker symbols
+            refresh_interval: Seconds before an entry is reloaded from the broker
+        """
+        self._loader = loader
+        self._config = config
+        self._map_symbol = symbol_mapper or (lambda s: s)
+        self.refresh_interval = refresh_interval
+        self._entries: Dict[str, SymbolMetadata] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "loads": 0, "refreshes": 0, "failures": 0}
+
+    def get(self, symbol: str, force_refresh: bool = False) -> Optional[SymbolMetadata]:
+        """
+        Get metadata for a TradingView symbol, loading or refreshing as needed.
+
+        Returns None if the symbol is unknown to both broker and config.
+        """
+        now = time.time()
+        entry = self._entries.get(symbol)
+        if entry and not force_refresh and now - entry.loaded_at < self.refresh_interval:
+            self.stats["hits"] += 1
+            return entry
+
+        with self._lock:
+            entry = self._entries.get(symbol)
+            if entry and not force_refresh and now - entry.loaded_at < self.refresh_interval:
+                self.stats["hits"] += 1
+                return entry
+
+            loaded = self._load(symbol)
+            if loaded is None:
+                self.stats["failures"] += 1
+                # Keep serving the stale entry rather than failing the order path
+                return entry
+
+            self.stats["refreshes" if entry else "loads"] += 1
+            self._entries[symbol] = loaded
+            return loaded
+
+    def _load(self, symbol: str) -> Optional[SymbolMetadata]:
+        """Load metadata from the broker, falling back to config"""
+        broker_symbol = self._map_symbol(symbol)
+        info = None
+        try:
+            info = self._loader(broker_symbol) if self._loader else None
+        except Exception as e:
+            logger.error(f"[SYMBOL_REGISTRY] Failed to load {broker_symbol}: {e}")
+
+        if info is not None:
+            return SymbolMetadata(
+                symbol=symbol,
+                broker_symbol=broker_symbol,
+                digits=int(info.digits),
+                point=float(info.point),
+                stops_level=int(getattr(info, 'trade_stops_level', 0) or 0),
+                volume_min=float(getattr(info, 'volume_min', 0.01) or 0.01),
+                volume_max=float(getattr(info, 'volume_max', 100.0) or 100.0),
+                volume_step=float(getattr(info, 'volume_step', 0.01) or 0.01),
+                contract_size=float(getattr(info, 'trade_contract_size', 100000.0) or 100000.0),
+                tick_value=float(getattr(info, 'trade_tick_value', 0.0) or 0.0),
+                tick_size=float(getattr(info, 'trade_tick_size', 0.0) or 0.0),
+                trade_mode=int(getattr(info, 'trade_mode', 0) or 0),
+                visible=bool(getattr(info, 'visible', True)),
+                loaded_at=time.time(),
+                source="broker",
+            )
+
+        return self._from_config(symbol, broker_symbol)
+
+    def _from_config(self, symbol: str, broker_symbol: str) -> Optional[SymbolMetadata]:
+        """Build metadata from config["symbol_config"] (simulation / offline)"""
+        symbol_config = {}
+        if self._config is not None:
+            symbol_config = (self._config.get("symbol_config", {}) or {}).get(symbol, {})
+        if not symbol_config:
+            return None
+
+        pip_size = symbol_config.get("pip_size", default_pip_size(symbol))
+        # Forex quotes carry one digit more than the pip (fractional pips)
+        is_metal = symbol_config.get("is_gold", False) or symbol.upper().startswith(METAL_SYMBOLS)
+        point = pip_size if is_metal else pip_size / 10
+        digits = max(0, len(f"{point:.10f}".rstrip('0').split('.')[1]))
+        return SymbolMetadata(
+            symbol=symbol,
+            broker_symbol=broker_symbol,
+            digits=digits,
+            point=point,
+            volume_max=float(symbol_config.get("max_lots", 100.0)),
+            contract_size=float(symbol_config.get("contract_size", 100000.0)),
+            loaded_at=time.time(),
+            source="config",
+        )
+
+    def pip_size(self, symbol: str) -> float:
+        """
+        Pip size for a symbol.
+        Priority: config pip_size -> broker digits -> symbol heuristic
+        """
+        if self._config is not None:
+            symbol_config = (self._config.get("symbol_config", {}) or {}).get(symbol, {})
+            if "pip_size" in symbol_config:
+                return symbol_config["pip_size"]
+
+        meta = self.get(symbol)
+        if meta and meta.source == "broker":
+            return meta.point * 10 if meta.digits in (3, 5) else meta.point
+        return default_pip_size(symbol)
+
+    def pip_value(self, symbol: str, lot_size: float) -> float:
+        """Monetary value of one pip for lot_size, from broker tick value"""
+        meta = self.get(symbol)
+        if not meta or not meta.tick_value or not meta.tick_size:
+            return 0.0
+        return self.pip_size(symbol) / meta.tick_size * meta.tick_value * lot_size
+
+    def refresh_stale(self) -> int:
+        """Reload every entry older than refresh_interval. Returns count refreshed."""
+        now = time.time()
+        stale = [s for s, m in list(self._entries.items())
+                 if now - m.loaded_at >= self.refresh_interval]
+        for symbol in stale:
+            self.get(symbol, force_refresh=True)
+        return len(stale)
+
+    def invalidate(self, symbol: Optional[str] = None):
+        """Drop one symbol (or all) so the next access reloads from the broker"""
+        with self._lock:
+            if symbol is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(symbol, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache statistics for diagnostics"""
+        return {**self.stats, "symbols": len(self._entries)}
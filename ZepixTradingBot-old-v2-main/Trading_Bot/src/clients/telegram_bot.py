@@ -5,11 +5,13 @@ import time
 import sys
 import logging
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, Any, TYPE_CHECKING, List, Optional
 from queue import Queue
 from src.config import Config
 from src.managers.risk_manager import RiskManager
+from src.core.portfolio_view import PortfolioView
 from src.services.analytics_engine import AnalyticsEngine
 from src.managers.timeframe_trend_manager import TimeframeTrendManager
 from src.clients.menu_callback_handler import MenuCallbackHandler
@@ -36,6 +38,7 @@ class TelegramBot:
         self.polling_thread = None
         self.http409_count = 0  # Track consecutive 409 errors
         self.polling_enabled = True  # ENABLED - polling now works with proper webhook cleanup and DEBUG logging
+        self._snapshot_executor: Optional[ThreadPoolExecutor] = None  # /memory snapshot, created on first use
         
         # Initialize MenuManager
         self.menu_manager = None
@@ -131,6 +134,7 @@ class TelegramBot:
             "/view_logic_settings": self.handle_view_logic_settings,
             "/reset_timeframe_default": self.handle_reset_timeframe_default,
             "/panic": self.handle_panic_close,
+            "/memory": self.handle_memory_diagnostics,
             
             # Help command
             "/help": self.handle_help,
@@ -1491,6 +1495,34 @@ class TelegramBot:
         
         self.send_message(msg)
 
+    def handle_memory_diagnostics(self, message):
+        """Show resident size by component: /memory [snapshot]"""
+        self._ensure_dependencies()
+        telemetry = getattr(self.trading_engine, 'memory_telemetry', None)
+        if not telemetry:
+            self.send_message("❌ Bot still initializing. Please wait a moment.")
+            return
+        
+        parts = message.get('text', '').split()
+        if len(parts) > 1 and parts[1].lower() == 'snapshot':
+            # A snapshot walks every traced allocation; reply from the executor
+            # instead of holding up command handling
+            if self._snapshot_executor is None:
+                self._snapshot_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="memory-snapshot")
+            self.send_message("⏳ Taking memory snapshot...")
+            self._snapshot_executor.submit(self._send_memory_snapshot, telemetry)
+            return
+        
+        self.send_message(telemetry.format_report())
+    
+    def _send_memory_snapshot(self, telemetry):
+        try:
+            telemetry.take_snapshot()
+            self.send_message(telemetry.format_report())
+        except Exception as e:
+            self.logger.error(f"[MEMORY] Snapshot failed: {e}")
+            self.send_message(f"❌ Memory snapshot failed: {e}")
+
     def handle_pair_report(self, message):
         """Show detailed performance by symbol pair"""
         self._ensure_dependencies()
@@ -3874,22 +3906,34 @@ class TelegramBot:
             if not self.risk_manager:
                 print("WARNING: RiskManager not available, using fallback values")
             
+            # One consistent portfolio snapshot when the engine maintains it
+            portfolio = getattr(self.trading_engine, 'portfolio', None)
+            snapshot = portfolio.snapshot() if isinstance(portfolio, PortfolioView) else None
+            
             # Get live data with safe fallbacks
             try:
-                account_balance = self.mt5_client.get_account_balance() if self.mt5_client else 0.0
+                if snapshot is not None:
+                    account_balance = snapshot.balance
+                else:
+                    account_balance = self.mt5_client.get_account_balance() if self.mt5_client else 0.0
             except Exception as e:
                 print(f"DEBUG: Error getting account balance: {e}")
                 account_balance = 0.0
             
             try:
-                trading_enabled = self.trading_engine.trading_enabled if self.trading_engine else False
+                if snapshot is not None:
+                    trading_enabled = snapshot.trading_enabled
+                else:
+                    trading_enabled = self.trading_engine.trading_enabled if self.trading_engine else False
             except Exception as e:
                 print(f"DEBUG: Error getting trading_enabled: {e}")
                 trading_enabled = False
             
             # Get PnL data with safe fallbacks
             try:
-                if all([self.risk_manager, self.trading_engine, self.mt5_client, self.pip_calculator]):
+                if snapshot is not None:
+                    live_pnl_data = snapshot.live_pnl()
+                elif all([self.risk_manager, self.trading_engine, self.mt5_client, self.pip_calculator]):
                     live_pnl_data = self.risk_manager.get_live_open_trades_pnl(
                         self.trading_engine, self.mt5_client, self.pip_calculator
                     )
@@ -3904,7 +3948,9 @@ class TelegramBot:
             
             # Get today's performance with safe fallbacks
             try:
-                if self.risk_manager and self.db:
+                if snapshot is not None:
+                    today_data = dict(snapshot.today)
+                elif self.risk_manager and self.db:
                     today_data = self.risk_manager.get_todays_performance(self.db)
                 else:
                     print("DEBUG: Missing RiskManager or DB for today's performance")
@@ -4958,6 +5004,116 @@ _Use /dashboard to return to main view_"""
 
 
 
+    def process_update(self, update: Dict[str, Any]):
+        """
+        Handle one Telegram update (button press or text command).
+        Called by the polling loop and by webhook delivery.
+        """
+        # CRITICAL DEBUG: Log what type of update
+        self.logger.info(f"[POLLING-UPDATE] Processing update_id={update.get('update_id')}, keys={list(update.keys())}")
+        
+        # Handle callback queries (inline keyboard buttons)
+        if "callback_query" in update:
+            callback_query = update["callback_query"]
+            user_id = callback_query["from"]["id"]
+            callback_data = callback_query.get("data", "")
+            
+            # CRITICAL DEBUG: Log callback details
+            self.logger.info(f"[CALLBACK] 🔘 Button clicked! user_id={user_id}, data='{callback_data}'")
+            self.logger.info(f"[CALLBACK] Allowed user: {self.config['allowed_telegram_user']}, Match: {user_id == self.config['allowed_telegram_user']}")
+            
+            if user_id == self.config["allowed_telegram_user"]:
+                try:
+                    start_time = time.time()
+                    self.logger.info(f"[CALLBACK] ✅ Processing authorized callback: {callback_data}")
+                    
+                    self.handle_callback_query(callback_query)
+                    
+                    elapsed = time.time() - start_time
+                    self.logger.info(f"[CALLBACK] ✅ Completed in {elapsed:.2f}s")
+                    # NOTE: handle_callback_query already answers the callback - no redundant call needed
+                except Exception as e:
+                    self.logger.error(f"[CALLBACK] ❌ Error: {e}")
+                    print(f"Callback query error: {e}")
+                    import traceback
+                    traceback.print_exc()
+            else:
+                self.logger.warning(f"[CALLBACK] ❌ UNAUTHORIZED user {user_id} tried to use button")
+            return
+        
+        if "message" in update and "text" in update["message"]:
+            message_data = update["message"]
+            user_id = message_data["from"]["id"]
+            text = message_data["text"].strip()
+            
+            self.logger.info(f"[TELEGRAM] 📨 Received message from user {user_id}: {text}")
+            sys.stdout.flush()
+            
+            if user_id == self.config["allowed_telegram_user"]:
+                # CRITICAL: Check if waiting for custom input
+                if self.menu_manager and hasattr(self.menu_manager, 'context'):
+                    try:
+                        context = self.menu_manager.context.get_context(user_id)
+                        self.logger.debug(f"[POLLING CUSTOM INPUT CHECK] Context type: {type(context)}, Context: {context}")
+                        waiting_for = context.get('waiting_for_input')
+                        self.logger.debug(f"[POLLING CUSTOM INPUT CHECK] Waiting for: {waiting_for}")
+                    except TypeError as te:
+                        self.logger.error(f"[POLLING] TypeError getting context: {te}")
+                        import traceback
+                        self.logger.error(f"[POLLING] Traceback:\n{traceback.format_exc()}")
+                        context = {}
+                        waiting_for = None
+                    
+                    if waiting_for:
+                        # Process custom input
+                        self.logger.info(f"[CUSTOM INPUT] Received value for {waiting_for}: {text}")
+                        self._process_custom_input(user_id, waiting_for, text)
+                        return
+                    
+                    # [ZERO-TYPING UI] Interceptor
+                    # Check if text matches a Reply Keyboard button
+                    if text in REPLY_MENU_MAP:
+                        self.logger.info(f"[INTERCEPTOR] 🔄 Translating text '{text}' to callback")
+                        callback_data = REPLY_MENU_MAP[text]
+                        
+                        # Create synthetic callback query
+                        synthetic_callback = {
+                            "id": f"synthetic_{int(time.time()*1000)}",
+                            "from": message_data["from"],
+                            "message": message_data,
+                            "data": callback_data,
+                            "chat_instance": str(message_data["chat"]["id"]) if "chat" in message_data else "0"
+                        }
+                        
+                        self.handle_callback_query(synthetic_callback)
+                        return
+                
+                command_parts = text.split()
+                if command_parts:
+                    command = command_parts[0]
+                    
+                    self.logger.debug(f"[TELEGRAM] ✅ Processing command: {command}")
+                    sys.stdout.flush()
+                    
+                    if command in self.command_handlers:
+                        try:
+                            self.logger.debug(f"[TELEGRAM] 🔄 Executing handler for: {command}")
+                            sys.stdout.flush()
+                            self.command_handlers[command](message_data)
+                            self.logger.info(f"[TELEGRAM] ✅ Command {command} executed successfully")
+                            sys.stdout.flush()
+                        except Exception as e:
+                            error_msg = f"❌ Error executing {command}: {str(e)}"
+                            self.send_message(error_msg)
+                            self.logger.error(f"[TELEGRAM] ❌ Command error: {e}")
+                            sys.stdout.flush()
+                    else:
+                        self.logger.debug(f"[TELEGRAM] ⚠️ Unknown command: {command}")
+                        sys.stdout.flush()
+            else:
+                self.logger.warning(f"[TELEGRAM] ❌ Unauthorized user: {user_id}")
+                sys.stdout.flush()
+
     def start_polling(self):
         """Start polling for Telegram commands"""
         if not self.polling_enabled:
@@ -5043,111 +5199,7 @@ _Use /dashboard to return to main view_"""
                     
                     for update in updates:
                         offset = update["update_id"] + 1
-                        
-                        # CRITICAL DEBUG: Log what type of update
-                        self.logger.info(f"[POLLING-UPDATE] Processing update_id={update.get('update_id')}, keys={list(update.keys())}")
-                        
-                        # Handle callback queries (inline keyboard buttons)
-                        if "callback_query" in update:
-                            callback_query = update["callback_query"]
-                            user_id = callback_query["from"]["id"]
-                            callback_data = callback_query.get("data", "")
-                            
-                            # CRITICAL DEBUG: Log callback details
-                            self.logger.info(f"[CALLBACK] 🔘 Button clicked! user_id={user_id}, data='{callback_data}'")
-                            self.logger.info(f"[CALLBACK] Allowed user: {self.config['allowed_telegram_user']}, Match: {user_id == self.config['allowed_telegram_user']}")
-                            
-                            if user_id == self.config["allowed_telegram_user"]:
-                                try:
-                                    start_time = time.time()
-                                    self.logger.info(f"[CALLBACK] ✅ Processing authorized callback: {callback_data}")
-                                    
-                                    self.handle_callback_query(callback_query)
-                                    
-                                    elapsed = time.time() - start_time
-                                    self.logger.info(f"[CALLBACK] ✅ Completed in {elapsed:.2f}s")
-                                    # NOTE: handle_callback_query already answers the callback - no redundant call needed
-                                except Exception as e:
-                                    self.logger.error(f"[CALLBACK] ❌ Error: {e}")
-                                    print(f"Callback query error: {e}")
-                                    import traceback
-                                    traceback.print_exc()
-                            else:
-                                self.logger.warning(f"[CALLBACK] ❌ UNAUTHORIZED user {user_id} tried to use button")
-                            continue
-                        
-                        if "message" in update and "text" in update["message"]:
-                            message_data = update["message"]
-                            user_id = message_data["from"]["id"]
-                            text = message_data["text"].strip()
-                            
-                            self.logger.info(f"[TELEGRAM] 📨 Received message from user {user_id}: {text}")
-                            sys.stdout.flush()
-                            
-                            if user_id == self.config["allowed_telegram_user"]:
-                                # CRITICAL: Check if waiting for custom input
-                                if self.menu_manager and hasattr(self.menu_manager, 'context'):
-                                    try:
-                                        context = self.menu_manager.context.get_context(user_id)
-                                        self.logger.debug(f"[POLLING CUSTOM INPUT CHECK] Context type: {type(context)}, Context: {context}")
-                                        waiting_for = context.get('waiting_for_input')
-                                        self.logger.debug(f"[POLLING CUSTOM INPUT CHECK] Waiting for: {waiting_for}")
-                                    except TypeError as te:
-                                        self.logger.error(f"[POLLING] TypeError getting context: {te}")
-                                        import traceback
-                                        self.logger.error(f"[POLLING] Traceback:\n{traceback.format_exc()}")
-                                        context = {}
-                                        waiting_for = None
-                                    
-                                    if waiting_for:
-                                        # Process custom input
-                                        self.logger.info(f"[CUSTOM INPUT] Received value for {waiting_for}: {text}")
-                                        self._process_custom_input(user_id, waiting_for, text)
-                                        continue
-                                    
-                                    # [ZERO-TYPING UI] Interceptor
-                                    # Check if text matches a Reply Keyboard button
-                                    if text in REPLY_MENU_MAP:
-                                        self.logger.info(f"[INTERCEPTOR] 🔄 Translating text '{text}' to callback")
-                                        callback_data = REPLY_MENU_MAP[text]
-                                        
-                                        # Create synthetic callback query
-                                        synthetic_callback = {
-                                            "id": f"synthetic_{int(time.time()*1000)}",
-                                            "from": message_data["from"],
-                                            "message": message_data,
-                                            "data": callback_data,
-                                            "chat_instance": str(message_data["chat"]["id"]) if "chat" in message_data else "0"
-                                        }
-                                        
-                                        self.handle_callback_query(synthetic_callback)
-                                        continue
-                                
-                                command_parts = text.split()
-                                if command_parts:
-                                    command = command_parts[0]
-                                    
-                                    self.logger.debug(f"[TELEGRAM] ✅ Processing command: {command}")
-                                    sys.stdout.flush()
-                                    
-                                    if command in self.command_handlers:
-                                        try:
-                                            self.logger.debug(f"[TELEGRAM] 🔄 Executing handler for: {command}")
-                                            sys.stdout.flush()
-                                            self.command_handlers[command](message_data)
-                                            self.logger.info(f"[TELEGRAM] ✅ Command {command} executed successfully")
-                                            sys.stdout.flush()
-                                        except Exception as e:
-                                            error_msg = f"❌ Error executing {command}: {str(e)}"
-                                            self.send_message(error_msg)
-                                            self.logger.error(f"[TELEGRAM] ❌ Command error: {e}")
-                                            sys.stdout.flush()
-                                    else:
-                                        self.logger.debug(f"[TELEGRAM] ⚠️ Unknown command: {command}")
-                                        sys.stdout.flush()
-                            else:
-                                self.logger.warning(f"[TELEGRAM] ❌ Unauthorized user: {user_id}")
-                                sys.stdout.flush()
+                        self.process_update(update)
                 
                 except Exception as e:
                     self.logger.debug(f"[POLLING-DEBUG] EXCEPTION in cycle {cycle}: {type(e).__name__}: {str(e)}")
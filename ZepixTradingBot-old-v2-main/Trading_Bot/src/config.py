@@ -1,6 +1,8 @@
 import json
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, Optional
+
+from src.core.config_snapshot import ConfigSnapshot, ConfigSnapshotStore, ConfigFileWatcher
 
 def safe_int_from_env(env_var: str, default: int = 0) -> int:
     """Safely parse integer from environment variable with normalization"""
@@ -23,6 +25,9 @@ def safe_int_from_env(env_var: str, default: int = 0) -> int:
 class Config:
     def __init__(self):
         self.config_file = "config/config.json"
+        # Compiled, immutable view of self.config for hot paths (see ConfigSnapshotStore)
+        self.snapshots = ConfigSnapshotStore(self.config_file)
+        self._watcher: Optional[ConfigFileWatcher] = None
         self.default_config = {
             "telegram_token": os.getenv("TELEGRAM_TOKEN", ""),
             "telegram_chat_id": safe_int_from_env("TELEGRAM_CHAT_ID", 0),
@@ -161,6 +166,7 @@ class Config:
         else:
             self.config = self.default_config
             self.save_config()
+        self.refresh_snapshot()
 
     def save_config(self):
         """Save config to file with error handling (optimized for speed)"""
@@ -182,6 +188,8 @@ class Config:
                 os.replace(temp_file, self.config_file)  # Atomic on POSIX, near-atomic on Windows
             else:
                 os.rename(temp_file, self.config_file)
+            
+            self.refresh_snapshot()
                 
         except Exception as e:
             print(f"[CONFIG SAVE ERROR] Failed to save config: {e}", flush=True)
@@ -198,6 +206,10 @@ class Config:
     def __getitem__(self, key):
         return self.config.get(key)
     
+    def __setitem__(self, key, value):
+        self.config[key] = value
+        self.refresh_snapshot()
+    
     def get(self, key, default=None):
         return self.config.get(key, default)
     
@@ -224,7 +236,42 @@ class Config:
         
         # Set the final value
         current[keys[-1]] = value
+        self.refresh_snapshot()
     
     def save(self):
         """Alias for save_config() for compatibility"""
-        self.save_config()
\ No newline at end of file
+        self.save_config()
+    
+    @property
+    def snapshot(self) -> ConfigSnapshot:
+        """Current immutable compiled config (attribute access, atomically swapped)"""
+        return self.snapshots.current
+
+    def refresh_snapshot(self):
+        """Recompile self.config into a new snapshot; notifies changed sections only"""
+        return self.snapshots.publish(self.config)
+
+    def subscribe(self, callback, sections: Optional[Iterable[str]] = None):
+        """Register callback(changed_sections, snapshot) for config section changes"""
+        self.snapshots.subscribe(callback, sections)
+
+    def start_watching(self, poll_interval: float = 2.0):
+        """Reload config.json automatically when it changes on disk"""
+        if self._watcher and self._watcher.is_running:
+            return
+        self._watcher = ConfigFileWatcher(
+            self._on_config_file_changed, poll_interval=poll_interval, name="ConfigFileWatcher"
+        )
+        self._watcher.watch_file(self.config_file)
+        self._watcher.start()
+
+    def stop_watching(self):
+        if self._watcher:
+            self._watcher.stop()
+            self._watcher = None
+
+    def _on_config_file_changed(self, path: str):
+        try:
+            self.load_config()
+        except Exception as e:
+            print(f"[CONFIG RELOAD ERROR] Keeping previous config: {e}", flush=True)
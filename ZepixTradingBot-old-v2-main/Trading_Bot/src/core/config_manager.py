@@ -5,7 +5,8 @@ Part of V5 Hybrid Plugin Architecture - Batch 09
 Enables runtime config changes without bot restart.
 
 Features:
-- File watching for config changes (watchdog or polling fallback)
+- File watching for config changes (inotify or polling fallback)
+- Compiled immutable snapshots, swapped atomically on reload
 - JSON schema validation before applying changes
 - Observer pattern for notifying plugins of config changes
 - Thread-safe config access
@@ -16,7 +17,6 @@ Version: 1.0.0
 
 import json
 import os
-import time
 import threading
 import logging
 from typing import Dict, Any, List, Callable, Optional
@@ -24,6 +24,8 @@ from dataclasses import dataclass
 from enum import Enum
 from datetime import datetime
 
+from src.core.config_snapshot import ConfigSnapshot, ConfigSnapshotStore, ConfigFileWatcher
+
 logger = logging.getLogger(__name__)
 
 
@@ -62,21 +64,27 @@ class ConfigManager:
     
     def __init__(self, config_path: str = "config/config.json",
                  plugin_config_dir: str = "config/plugins",
-                 watch_interval: float = 2.0, enable_watching: bool = True):
+                 watch_interval: float = 2.0, enable_watching: bool = True,
+                 use_inotify: bool = True):
         self.config_path = config_path
         self.plugin_config_dir = plugin_config_dir
         self.watch_interval = watch_interval
         self.enable_watching = enable_watching
+        self.use_inotify = use_inotify
         
         self.config: Dict[str, Any] = {}
         self.plugin_configs: Dict[str, Dict[str, Any]] = {}
         
+        # Compiled read-only views (main config + one store per plugin)
+        self.snapshots = ConfigSnapshotStore(config_path)
+        self.plugin_snapshots: Dict[str, ConfigSnapshotStore] = {}
+        
         self._observers: List[Callable[[List[ConfigChange]], None]] = []
         self._plugin_observers: Dict[str, List[Callable[[List[ConfigChange]], None]]] = {}
         
         self._lock = threading.RLock()
         self._running = False
-        self._watch_thread: Optional[threading.Thread] = None
+        self._watcher: Optional[ConfigFileWatcher] = None
         
         self._last_modified: Dict[str, float] = {}
         self._change_history: List[ConfigChange] = []
@@ -118,6 +126,7 @@ class ConfigManager:
                     logger.warning(f"Config file not found: {self.config_path}")
                     self.config = {}
                 
+                self.snapshots.publish(self.config)
                 return self.config.copy()
                 
             except json.JSONDecodeError as e:
@@ -147,6 +156,7 @@ class ConfigManager:
                     
                     self.plugin_configs[plugin_id] = config
                     self._last_modified[config_file] = os.path.getmtime(config_file)
+                    self._plugin_store(plugin_id).publish(config)
                     logger.info(f"Plugin config loaded: {plugin_id}")
                     return config.copy()
                 else:
@@ -199,6 +209,7 @@ class ConfigManager:
             except Exception as e:
                 logger.error(f"Error reloading config: {e}")
                 self.config = old_config
+                self.snapshots.publish(self.config)
                 raise
     
     def reload_plugin_config(self, plugin_id: str) -> List[ConfigChange]:
@@ -230,6 +241,7 @@ class ConfigManager:
             except Exception as e:
                 logger.error(f"Error reloading plugin config {plugin_id}: {e}")
                 self.plugin_configs[plugin_id] = old_config
+                self._plugin_store(plugin_id).publish(old_config)
                 raise
     
     def _diff_config(
@@ -400,62 +412,101 @@ class ConfigManager:
             self._change_history = self._change_history[-self._max_history:]
     
     def start_watching(self):
-        """Start watching config files for changes."""
+        """Start watching config files for changes (inotify, else polling)."""
         if self._running:
             return
         
-        self._running = True
-        self._watch_thread = threading.Thread(
-            target=self._watch_loop,
-            daemon=True,
+        self._watcher = ConfigFileWatcher(
+            self._on_file_changed,
+            poll_interval=self.watch_interval,
+            use_inotify=self.use_inotify,
             name="ConfigWatcher"
         )
-        self._watch_thread.start()
-        logger.info(f"Config watcher started (interval: {self.watch_interval}s)")
+        self._watcher.watch_file(self.config_path)
+        self._watcher.watch_directory(self.plugin_config_dir, suffix="_config.json")
+        self._watcher.start()
+        self._running = True
+        logger.info(f"Config watcher started (backend: {self._watcher.backend})")
     
     def stop_watching(self):
         """Stop watching config files."""
         self._running = False
-        if self._watch_thread:
-            self._watch_thread.join(timeout=5.0)
-            self._watch_thread = None
+        if self._watcher:
+            self._watcher.stop()
+            self._watcher = None
         logger.info("Config watcher stopped")
     
-    def _watch_loop(self):
-        """Main watch loop - polls for file changes."""
-        while self._running:
+    def _on_file_changed(self, path: str):
+        """
+        Watcher callback - reload the main config or one plugin config.
+        
+        Files we just wrote ourselves (_save_config) are skipped by comparing
+        against the recorded mtime.
+        """
+        path = os.path.abspath(path)
+        if not os.path.exists(path):
+            return
+        
+        mtime = os.path.getmtime(path)
+        
+        if path == os.path.abspath(self.config_path):
+            if mtime == self._last_modified.get(self.config_path):
+                return
+            logger.info("Main config file changed, reloading...")
             try:
-                if os.path.exists(self.config_path):
-                    current_mtime = os.path.getmtime(self.config_path)
-                    last_mtime = self._last_modified.get(self.config_path, 0)
-                    
-                    if current_mtime > last_mtime:
-                        logger.info("Main config file changed, reloading...")
-                        try:
-                            self.reload_config()
-                        except Exception as e:
-                            logger.error(f"Failed to reload config: {e}")
-                
-                if os.path.exists(self.plugin_config_dir):
-                    for filename in os.listdir(self.plugin_config_dir):
-                        if filename.endswith('_config.json'):
-                            config_file = os.path.join(self.plugin_config_dir, filename)
-                            plugin_id = filename.replace('_config.json', '')
-                            
-                            current_mtime = os.path.getmtime(config_file)
-                            last_mtime = self._last_modified.get(config_file, 0)
-                            
-                            if current_mtime > last_mtime:
-                                logger.info(f"Plugin config changed: {plugin_id}")
-                                try:
-                                    self.reload_plugin_config(plugin_id)
-                                except Exception as e:
-                                    logger.error(f"Failed to reload plugin config {plugin_id}: {e}")
-                
+                self.reload_config()
             except Exception as e:
-                logger.error(f"Error in config watch loop: {e}")
-            
-            time.sleep(self.watch_interval)
+                logger.error(f"Failed to reload config: {e}")
+            return
+        
+        filename = os.path.basename(path)
+        if filename.endswith('_config.json'):
+            config_file = os.path.join(self.plugin_config_dir, filename)
+            if mtime == self._last_modified.get(config_file):
+                return
+            plugin_id = filename.replace('_config.json', '')
+            logger.info(f"Plugin config changed: {plugin_id}")
+            try:
+                self.reload_plugin_config(plugin_id)
+            except Exception as e:
+                logger.error(f"Failed to reload plugin config {plugin_id}: {e}")
+    
+    def _plugin_store(self, plugin_id: str) -> ConfigSnapshotStore:
+        """Snapshot store for a plugin config (created on first use)."""
+        store = self.plugin_snapshots.get(plugin_id)
+        if store is None:
+            store = ConfigSnapshotStore(f"plugins.{plugin_id}")
+            self.plugin_snapshots[plugin_id] = store
+        return store
+    
+    def get_snapshot(self) -> ConfigSnapshot:
+        """
+        Current compiled main config.
+        
+        Lock-free: the snapshot is immutable and replaced wholesale on reload.
+        """
+        return self.snapshots.current
+    
+    def get_plugin_snapshot(self, plugin_id: str) -> ConfigSnapshot:
+        """Current compiled config for a plugin (empty snapshot if not loaded)."""
+        return self._plugin_store(plugin_id).current
+    
+    def subscribe_sections(self, callback: Callable[[Dict[str, Any], ConfigSnapshot], None],
+                           sections: Optional[List[str]] = None):
+        """
+        Register callback(changed_sections, snapshot) for main config.
+        
+        Args:
+            callback: Receives only the top-level sections that changed
+            sections: Restrict notifications to these sections (None = all)
+        """
+        self.snapshots.subscribe(callback, sections)
+    
+    def subscribe_plugin_sections(self, plugin_id: str,
+                                  callback: Callable[[Dict[str, Any], ConfigSnapshot], None],
+                                  sections: Optional[List[str]] = None):
+        """Register section-level callback for one plugin's config."""
+        self._plugin_store(plugin_id).subscribe(callback, sections)
     
     def get(self, key: str, default: Any = None) -> Any:
         """
@@ -520,6 +571,7 @@ class ConfigManager:
                 
                 if save:
                     self._save_config()
+                self.snapshots.publish(self.config)
                 
                 change = ConfigChange(
                     key=key,
@@ -613,6 +665,7 @@ class ConfigManager:
                 
                 if save:
                     self._save_config()
+                self.snapshots.publish(self.config)
                 
                 self._notify_observers(changes)
                 logger.info(f"Batch update: {len(updates)} values updated")
@@ -622,6 +675,7 @@ class ConfigManager:
                 logger.error(f"Error in batch update: {e}")
                 # Rollback
                 self.config = self.previous_config.copy()
+                self.snapshots.publish(self.config)
                 return False
     
     def _record_change(self, change: ConfigChange):
@@ -668,7 +722,9 @@ class ConfigManager:
         with self._lock:
             return {
                 "watching": self._running,
+                "watch_backend": self._watcher.backend if self._watcher else None,
                 "watch_interval": self.watch_interval,
+                "snapshot_version": self.snapshots.version,
                 "config_path": self.config_path,
                 "plugin_config_dir": self.plugin_config_dir,
                 "loaded_plugins": list(self.plugin_configs.keys()),
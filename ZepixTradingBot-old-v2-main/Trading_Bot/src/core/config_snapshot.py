@@ -0,0 +1,415 @@
+"""
+Config Snapshot - Compiled, immutable configuration views
+
+Config dicts are compiled into frozen snapshot objects with attribute access
+(nested dicts become FrozenSection, lists become tuples). A reload builds a
+new snapshot off to the side and swaps it in with a single reference
+assignment, so readers never observe a half-applied config. Subscribers are
+told only which top-level sections actually changed.
+
+File changes are picked up by ConfigFileWatcher, which uses Linux inotify
+when available and falls back to mtime polling everywhere else.
+
+Usage:
+    store = ConfigSnapshotStore("config/config.json")
+    store.publish(config_dict)
+    store.subscribe(on_change, sections=("re_entry_config",))
+    enabled = store.current.re_entry_config.sl_hunt_reentry_enabled
+
+Version: 1.0.0
+Date: 2026-01-14
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def freeze_value(value: Any) -> Any:
+    """Recursively convert dicts/lists into FrozenSection/tuples"""
+    if isinstance(value, FrozenSection):
+        return value
+    if isinstance(value, Mapping):
+        return FrozenSection(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze_value(v) for v in value)
+    return value
+
+
+def thaw_value(value: Any) -> Any:
+    """Inverse of freeze_value (returns plain, mutable JSON-style data)"""
+    if isinstance(value, FrozenSection):
+        return {k: thaw_value(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [thaw_value(v) for v in value]
+    return value
+
+
+class FrozenSection(Mapping):
+    """
+    Read-only config section.
+
+    Keys that are valid identifiers are exposed as plain instance attributes
+    (section.sl_hunt_reentry_enabled); every key is reachable via [] and get().
+    """
+
+    def __init__(self, data: Mapping):
+        frozen = {str(k): freeze_value(v) for k, v in data.items()}
+        object.__setattr__(self, "_data", frozen)
+        for key, value in frozen.items():
+            if key.isidentifier() and not hasattr(FrozenSection, key):
+                self.__dict__[key] = value
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for names not set as attributes
+        raise AttributeError(f"Config section has no key '{name}'")
+
+    def __setattr__(self, name: str, value: Any):
+        raise TypeError("Config snapshots are immutable")
+
+    def __delattr__(self, name: str):
+        raise TypeError("Config snapshots are immutable")
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f"FrozenSection({list(self._data.keys())})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return thaw_value(self)
+
+
+_MISSING = object()
+
+
+class ConfigSnapshot:
+    """
+    Immutable compiled view of one version of a config file.
+
+    Top-level sections are attributes (snapshot.re_entry_config); scalar
+    top-level keys come back as-is (snapshot.simulate_orders).
+    """
+
+    def __init__(self, data: Mapping, version: int = 1, source: str = ""):
+        root = data if isinstance(data, FrozenSection) else FrozenSection(data or {})
+        object.__setattr__(self, "root", root)
+        object.__setattr__(self, "version", version)
+        object.__setattr__(self, "source", source)
+        object.__setattr__(self, "loaded_at", datetime.now())
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self.root[name]
+        except KeyError:
+            raise AttributeError(f"Config has no section '{name}'")
+
+    def __setattr__(self, name: str, value: Any):
+        raise TypeError("Config snapshots are immutable")
+
+    def __getitem__(self, key: str) -> Any:
+        return self.root[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.root
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.root.get(key, default)
+
+    def section(self, name: str) -> FrozenSection:
+        """Section by name, or an empty section if missing / not a dict"""
+        value = self.root.get(name)
+        return value if isinstance(value, FrozenSection) else EMPTY_SECTION
+
+    def changed_sections(self, other: Optional["ConfigSnapshot"]) -> Tuple[str, ...]:
+        """Top-level keys whose values differ between other and this snapshot"""
+        if other is None:
+            return tuple(self.root.keys())
+        keys = set(self.root.keys()) | set(other.root.keys())
+        return tuple(sorted(
+            key for key in keys
+            if self.root.get(key, _MISSING) != other.root.get(key, _MISSING)
+        ))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self.root.to_dict()
+
+
+EMPTY_SECTION = FrozenSection({})
+
+# callback(changed_sections, snapshot): changed_sections maps section name to
+# its new value (None when the section was removed)
+SnapshotCallback = Callable[[Dict[str, Any], ConfigSnapshot], None]
+
+
+class ConfigSnapshotStore:
+    """
+    Holds the current ConfigSnapshot and fans out section-level changes.
+
+    publish() compiles outside the lock, swaps the reference atomically and
+    notifies each subscriber only when a section it asked for changed.
+    """
+
+    def __init__(self, source: str = ""):
+        self.source = source
+        self._current = ConfigSnapshot({}, version=0, source=source)
+        self._lock = threading.Lock()
+        self._subscribers: List[Tuple[SnapshotCallback, Optional[frozenset]]] = []
+
+    @property
+    def current(self) -> ConfigSnapshot:
+        return self._current
+
+    @property
+    def version(self) -> int:
+        return self._current.version
+
+    def publish(self, data: Mapping) -> Tuple[str, ...]:
+        """
+        Compile data into a new snapshot and swap it in.
+
+        Returns:
+            Names of the top-level sections that changed (empty if none)
+        """
+        root = FrozenSection(data or {})
+        with self._lock:
+            previous = self._current
+            snapshot = ConfigSnapshot(root, version=previous.version + 1, source=self.source)
+            changed = snapshot.changed_sections(previous if previous.version else None)
+            if previous.version and not changed:
+                return ()
+            self._current = snapshot
+            subscribers = list(self._subscribers)
+
+        logger.debug(f"[CONFIG_SNAPSHOT] {self.source or 'config'} v{snapshot.version}: "
+                     f"{len(changed)} section(s) changed")
+        self._notify(subscribers, changed, snapshot)
+        return changed
+
+    def subscribe(self, callback: SnapshotCallback, sections: Optional[Iterable[str]] = None):
+        """
+        Register callback for section changes.
+
+        Args:
+            callback: callback(changed_sections, snapshot)
+            sections: Only notify when one of these sections changes (None = any)
+        """
+        wanted = frozenset(sections) if sections is not None else None
+        with self._lock:
+            if not any(cb == callback for cb, _ in self._subscribers):
+                self._subscribers.append((callback, wanted))
+
+    def unsubscribe(self, callback: SnapshotCallback):
+        with self._lock:
+            self._subscribers = [(cb, s) for cb, s in self._subscribers if cb != callback]
+
+    @staticmethod
+    def _notify(subscribers, changed: Tuple[str, ...], snapshot: ConfigSnapshot):
+        for callback, wanted in subscribers:
+            names = [name for name in changed if wanted is None or name in wanted]
+            if not names:
+                continue
+            try:
+                callback({name: snapshot.get(name) for name in names}, snapshot)
+            except Exception as e:
+                logger.error(f"[CONFIG_SNAPSHOT] Subscriber "
+                             f"{getattr(callback, '__name__', callback)} failed: {e}")
+
+
+class _Inotify:
+    """Minimal ctypes binding for Linux inotify (directory watches only)"""
+
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._libc = libc
+        self.fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: Dict[int, str] = {}
+
+    def add_directory(self, path: str):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), self.MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path}")
+        self._dirs[wd] = path
+
+    def read(self, timeout: float) -> List[str]:
+        """Paths touched since the last read (blocks up to timeout)"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            buffer = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        paths = []
+        offset = 0
+        while offset + self._EVENT.size <= len(buffer):
+            wd, _mask, _cookie, length = self._EVENT.unpack_from(buffer, offset)
+            offset += self._EVENT.size
+            name = buffer[offset:offset + length].rstrip(b"\0").decode(errors="replace")
+            offset += length
+            if wd in self._dirs and name:
+                paths.append(os.path.join(self._dirs[wd], name))
+        return paths
+
+    def close(self):
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+
+class ConfigFileWatcher:
+    """
+    Watches config files and directories and reports changed paths.
+
+    Directories are watched rather than files, so atomic "write temp file +
+    os.replace" saves are seen. Bursts of events for the same file are
+    coalesced into one callback per check.
+    """
+
+    def __init__(self, callback: Callable[[str], None], poll_interval: float = 2.0,
+                 use_inotify: bool = True, name: str = "ConfigWatcher"):
+        self.callback = callback
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.name = name
+        self.backend: Optional[str] = None
+        self._files: set = set()
+        self._dirs: Dict[str, str] = {}   # directory -> filename suffix
+        self._mtimes: Dict[str, Tuple[int, int]] = {}
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self._inotify: Optional[_Inotify] = None
+
+    def watch_file(self, path: str):
+        self._files.add(os.path.abspath(path))
+
+    def watch_directory(self, path: str, suffix: str = ""):
+        self._dirs[os.path.abspath(path)] = suffix
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+    def start(self):
+        if self._running:
+            return
+        self._mtimes = {path: self._stat(path) for path in self._candidates()}
+        self._inotify = self._open_inotify() if self.use_inotify else None
+        self.backend = "inotify" if self._inotify else "polling"
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True, name=self.name)
+        self._thread.start()
+        logger.info(f"[CONFIG_WATCHER] Started ({self.backend})")
+
+    def stop(self, timeout: float = 5.0):
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        if self._inotify:
+            self._inotify.close()
+            self._inotify = None
+
+    def _open_inotify(self) -> Optional[_Inotify]:
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            notifier = _Inotify()
+            directories = set(self._dirs) | {os.path.dirname(p) for p in self._files}
+            for directory in directories:
+                if os.path.isdir(directory):
+                    notifier.add_directory(directory)
+            return notifier
+        except (OSError, AttributeError) as e:
+            logger.warning(f"[CONFIG_WATCHER] inotify unavailable, polling instead: {e}")
+            return None
+
+    def _is_watched(self, path: str) -> bool:
+        if path in self._files:
+            return True
+        suffix = self._dirs.get(os.path.dirname(path))
+        return suffix is not None and path.endswith(suffix)
+
+    def _candidates(self) -> List[str]:
+        paths = list(self._files)
+        for directory, suffix in self._dirs.items():
+            if os.path.isdir(directory):
+                paths.extend(
+                    os.path.join(directory, name) for name in os.listdir(directory)
+                    if name.endswith(suffix)
+                )
+        return paths
+
+    @staticmethod
+    def _stat(path: str) -> Tuple[int, int]:
+        try:
+            st = os.stat(path)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return (0, 0)
+
+    def check(self, paths: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Compare stat of paths (default: every watched path) against the last
+        check and fire the callback for each one that changed.
+        """
+        changed = []
+        for path in sorted(set(paths if paths is not None else self._candidates())):
+            if not self._is_watched(path):
+                continue
+            current = self._stat(path)
+            if current != self._mtimes.get(path):
+                self._mtimes[path] = current
+                if current != (0, 0):
+                    changed.append(path)
+        for path in changed:
+            try:
+                self.callback(path)
+            except Exception as e:
+                logger.error(f"[CONFIG_WATCHER] Callback failed for {path}: {e}")
+        return changed
+
+    def _run(self):
+        while self._running:
+            try:
+                if self._inotify:
+                    paths = self._inotify.read(timeout=1.0)
+                    if paths:
+                        time.sleep(0.05)  # let the writer finish before we read
+                        paths += self._inotify.read(timeout=0)
+                        self.check(paths)
+                else:
+                    self.check()
+                    time.sleep(self.poll_interval)
+            except Exception as e:
+                logger.error(f"[CONFIG_WATCHER] Watch loop error: {e}")
+                time.sleep(self.poll_interval)
@@ -0,0 +1,475 @@
+"""
+Data Lifecycle Manager - Hot/archive tiers and background SQLite maintenance
+
+Trades, sessions, SL/profit-booking events, plugin signal logs and health
+snapshots only ever grow, so dashboard and analytics queries get slower month
+after month. This manager keeps the live databases small:
+
+- Closed rows older than the table's retention move to monthly archive files
+  (data/archive/<db>_YYYY_MM.db), in short batches under the pool's writer
+  lock. Copies use INSERT OR IGNORE on the row's primary key, so a batch
+  interrupted between the archive commit and the hot delete is simply
+  repeated on the next pass.
+- ANALYZE (bounded by analysis_limit) and incremental vacuum run only in
+  quiet market hours (daily rollover window and weekends by default).
+- query_with_archives() attaches the archives that overlap a date range
+  read-only on a pooled reader and unions them with the hot table, so
+  long-range reports see one continuous history.
+
+Only TradeDatabase.get_trade_history/get_trades_by_date read through
+query_with_archives so far; the all-time aggregates (analytics queries,
+plugin analytics, session breakdowns, risk manager performance) still read
+the hot tables alone. Archiving is therefore opt-in until they are routed
+through the archives too.
+
+Config (`data_lifecycle` section):
+    enabled:                 Run the background loop (default false)
+    interval_seconds:        Loop interval (default 3600)
+    retention_days:          Default hot retention (default 90)
+    table_retention_days:    Per-table overrides ({"plugin_health_snapshots": 14})
+    databases:               Database files to manage (default: trading_bot.db,
+                             zepix_health.db and every data/zepix_*.db)
+    batch_size:              Rows moved per transaction (default 500)
+    quiet_hours_utc:         [start, end) UTC hours for maintenance (default [21, 23])
+    weekends_quiet:          Treat Saturday/Sunday as quiet (default true)
+    analysis_limit:          Rows sampled per index by ANALYZE (default 1000)
+    vacuum_pages:            Free pages released per incremental vacuum (default 2000)
+    enable_incremental_vacuum: Convert databases to auto_vacuum=INCREMENTAL
+                             with a one-time VACUUM in quiet hours (default true)
+
+Version: 1.0.0
+Date: 2026-01-14
+"""
+
+import asyncio
+import glob
+import logging
+import os
+import re
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from src.core.database_access import DatabasePool, get_db_pool
+
+logger = logging.getLogger(__name__)
+
+# SQLite's default SQLITE_MAX_ATTACHED is 10; leave room for callers
+MAX_ATTACHED = 8
+
+
+@dataclass(frozen=True)
+class ArchivePolicy:
+    """Which rows of a table may leave the hot database"""
+    table: str
+    time_columns: Tuple[str, ...]   # First one present in the table is used
+    closed_predicate: str = ""       # Only rows matching this are archived
+    retention_days: Optional[int] = None  # None: manager default
+
+
+DEFAULT_POLICIES = (
+    # trading_bot.db uses close_time/'closed', plugin DBs exit_time/'CLOSED'
+    ArchivePolicy("trades", ("close_time", "exit_time"), "LOWER(status) = 'closed'"),
+    ArchivePolicy("trading_sessions", ("end_time",), "status <> 'ACTIVE'"),
+    ArchivePolicy("sl_events", ("hit_time",)),
+    ArchivePolicy("profit_booking_events", ("timestamp",)),
+    ArchivePolicy("tp_reentry_events", ("timestamp",)),
+    ArchivePolicy("reversal_exit_events", ("timestamp",)),
+    ArchivePolicy("signals_log", ("received_at",)),
+    ArchivePolicy("plugin_health_snapshots", ("timestamp",), retention_days=14),
+    ArchivePolicy("health_alerts", ("timestamp",), "resolved = 1", retention_days=30),
+)
+
+DEFAULT_DATABASES = ("data/trading_bot.db", "data/zepix_health.db", "data/zepix_*.db")
+
+
+# ----------------------------------------------------------------------
+# Archive files
+# ----------------------------------------------------------------------
+
+def archive_dir(db_path: str) -> str:
+    return os.path.join(os.path.dirname(os.path.abspath(db_path)), "archive")
+
+
+def archive_path(db_path: str, month: str) -> str:
+    """Archive file for a 'YYYY-MM' month"""
+    stem = os.path.splitext(os.path.basename(db_path))[0]
+    return os.path.join(archive_dir(db_path), f"{stem}_{month.replace('-', '_')}.db")
+
+
+def list_archives(db_path: str) -> Dict[str, str]:
+    """'YYYY-MM' -> archive file, for every archive of db_path on disk"""
+    stem = os.path.splitext(os.path.basename(db_path))[0]
+    pattern = re.compile(rf"^{re.escape(stem)}_(\d{{4}})_(\d{{2}})\.db$")
+    archives = {}
+    directory = archive_dir(db_path)
+    if os.path.isdir(directory):
+        for name in os.listdir(directory):
+            match = pattern.match(name)
+            if match:
+                archives[f"{match.group(1)}-{match.group(2)}"] = os.path.join(directory, name)
+    return archives
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _table_columns(conn: sqlite3.Connection, schema: str, table: str) -> List[Tuple[str, str]]:
+    rows = conn.execute(f"PRAGMA {schema}.table_info({_quote(table)})").fetchall()
+    return [(row[1], row[2]) for row in rows]
+
+
+# ----------------------------------------------------------------------
+# Union queries
+# ----------------------------------------------------------------------
+
+def query_with_archives(
+    pool: DatabasePool,
+    table: str,
+    time_column: str,
+    start: str,
+    end: Optional[str] = None,
+    where: str = "",
+    params: Sequence = (),
+    columns: Optional[Sequence[str]] = None,
+    descending: bool = False,
+    as_dicts: bool = False
+) -> List[Any]:
+    """
+    Rows of `table` with start <= time_column < end from the hot database and
+    every monthly archive overlapping the range.
+
+    Args:
+        pool: Pool of the hot database
+        start / end: ISO date or datetime strings (end defaults to open-ended)
+        where: Extra SQL condition applied to every source
+        params: Parameters for `where`
+        columns: Columns to return (default: all columns of the hot table);
+            columns missing from an older archive come back as NULL
+        descending: Order newest first
+        as_dicts: Return {column: value} dicts instead of rows
+
+    Returns:
+        Rows in time order, using the pool's row factory
+    """
+    rows, wanted = _union_query(pool, table, time_column, start, end, where, params, columns, descending)
+    if as_dicts:
+        return [dict(zip(wanted, row)) for row in rows]
+    return rows
+
+
+def _union_query(pool, table, time_column, start, end, where, params, columns, descending):
+    end = end or "9999-12-31"
+    months = [m for m in sorted(list_archives(pool.db_path)) if start[:7] <= m <= end[:7]]
+    archives = [archive_path(pool.db_path, m) for m in months]
+
+    with pool.reader() as conn:
+        hot_columns = [name for name, _ in _table_columns(conn, "main", table)]
+        wanted = list(columns) if columns else hot_columns
+        condition = f"{_quote(time_column)} >= ? AND {_quote(time_column)} < ?"
+        if where:
+            condition += f" AND ({where})"
+        order = f" ORDER BY {_quote(time_column)}{' DESC' if descending else ''}"
+
+        def select(schema: str, available: List[str]) -> str:
+            parts = [_quote(c) if c in available else f"NULL AS {_quote(c)}" for c in wanted]
+            return f"SELECT {', '.join(parts)} FROM {schema}.{_quote(table)} WHERE {condition}"
+
+        if not archives:
+            return conn.execute(select("main", hot_columns) + order,
+                                (start, end, *params)).fetchall(), wanted
+
+        rows: List[Any] = []
+        groups = [archives[i:i + MAX_ATTACHED] for i in range(0, len(archives), MAX_ATTACHED)]
+        for index, group in enumerate(groups):
+            attached = []
+            try:
+                for n, path in enumerate(group):
+                    alias = f"arc{n}"
+                    conn.execute(f"ATTACH DATABASE ? AS {alias}", (f"file:{path}?mode=ro",))
+                    attached.append(alias)
+                selects, args = [], []
+                if index == 0:
+                    selects.append(select("main", hot_columns))
+                    args.extend((start, end, *params))
+                for alias in attached:
+                    available = [name for name, _ in _table_columns(conn, alias, table)]
+                    if available:
+                        selects.append(select(alias, available))
+                        args.extend((start, end, *params))
+                if selects:
+                    rows.extend(conn.execute(" UNION ALL ".join(selects) + order, args).fetchall())
+            finally:
+                for alias in attached:
+                    conn.execute(f"DETACH DATABASE {alias}")
+
+        if len(groups) > 1:
+            position = wanted.index(time_column) if time_column in wanted else None
+            if position is not None:
+                rows.sort(key=lambda r: r[position] or "", reverse=descending)
+        return rows, wanted
+
+
+# ----------------------------------------------------------------------
+# Manager
+# ----------------------------------------------------------------------
+
+class DataLifecycleManager:
+    """
+    Moves cold rows to monthly archives and maintains the hot databases.
+
+    archive_database() and maintain_database() are synchronous and hold the
+    writer lock only per batch; run_once() runs them on the database executor.
+    """
+
+    def __init__(self, config: Dict = None, policies: Sequence[ArchivePolicy] = DEFAULT_POLICIES):
+        self.config = config or {}
+        self.policies = list(policies)
+        self.interval = self.config.get("interval_seconds", 3600)
+        self.default_retention = self.config.get("retention_days", 90)
+        self.table_retention = self.config.get("table_retention_days", {}) or {}
+        self.database_patterns = self.config.get("databases") or list(DEFAULT_DATABASES)
+        self.batch_size = self.config.get("batch_size", 500)
+        self.quiet_hours = tuple(self.config.get("quiet_hours_utc", (21, 23)))
+        self.weekends_quiet = self.config.get("weekends_quiet", True)
+        self.analysis_limit = self.config.get("analysis_limit", 1000)
+        self.vacuum_pages = self.config.get("vacuum_pages", 2000)
+        self.enable_incremental_vacuum = self.config.get("enable_incremental_vacuum", True)
+
+        self._running = False
+        self._task: Optional[asyncio.Task] = None
+        self.last_run: Optional[datetime] = None
+        self.last_maintenance: Optional[datetime] = None
+        self.stats = {"runs": 0, "rows_archived": 0, "analyze_runs": 0,
+                      "vacuum_runs": 0, "pages_freed": 0, "errors": 0}
+        self.archived_by_table: Dict[str, int] = {}
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    def is_quiet_time(self, now: Optional[datetime] = None) -> bool:
+        """True inside the configured quiet UTC hours or on weekends"""
+        now = now or datetime.now(timezone.utc)
+        if self.weekends_quiet and now.weekday() >= 5:
+            return True
+        start, end = self.quiet_hours
+        if start <= end:
+            return start <= now.hour < end
+        return now.hour >= start or now.hour < end  # Window wraps midnight
+
+    def retention_days(self, policy: ArchivePolicy) -> int:
+        if policy.table in self.table_retention:
+            return self.table_retention[policy.table]
+        if policy.retention_days is not None:
+            return policy.retention_days
+        return self.default_retention
+
+    def databases(self) -> List[str]:
+        paths = []
+        for pattern in self.database_patterns:
+            matches = sorted(glob.glob(pattern)) if any(c in pattern for c in "*?[") else [pattern]
+            for path in matches:
+                if os.path.exists(path) and path not in paths:
+                    paths.append(path)
+        return paths
+
+    # ------------------------------------------------------------------
+    # Archival
+    # ------------------------------------------------------------------
+
+    def archive_database(self, db_path: str, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Move eligible rows of every policy table in db_path; returns rows moved per table"""
+        now = now or datetime.now(timezone.utc)
+        pool = get_db_pool(db_path)
+        moved = {}
+        for policy in self.policies:
+            with pool.reader() as conn:
+                columns = _table_columns(conn, "main", policy.table)
+            names = [name for name, _ in columns]
+            time_column = next((c for c in policy.time_columns if c in names), None)
+            if not time_column:
+                continue
+            cutoff = (now - timedelta(days=self.retention_days(policy))).strftime("%Y-%m-%d")
+            count = self._archive_table(pool, policy, columns, time_column, cutoff)
+            if count:
+                moved[policy.table] = count
+                self.archived_by_table[policy.table] = self.archived_by_table.get(policy.table, 0) + count
+                self.stats["rows_archived"] += count
+                logger.info(f"[LIFECYCLE] Archived {count} rows from {os.path.basename(db_path)}.{policy.table}")
+        return moved
+
+    def _archive_table(self, pool: DatabasePool, policy: ArchivePolicy,
+                       columns: List[Tuple[str, str]], time_column: str, cutoff: str) -> int:
+        eligible = f"{_quote(time_column)} IS NOT NULL AND {_quote(time_column)} < ?"
+        if policy.closed_predicate:
+            eligible += f" AND ({policy.closed_predicate})"
+
+        with pool.reader() as conn:
+            months = [row[0] for row in conn.execute(
+                f"SELECT DISTINCT substr({_quote(time_column)}, 1, 7) FROM {_quote(policy.table)} "
+                f"WHERE {eligible}", (cutoff,)
+            ).fetchall()]
+
+        total = 0
+        for month in sorted(months):
+            target = archive_path(pool.db_path, month)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            condition = f"{eligible} AND substr({_quote(time_column)}, 1, 7) = ?"
+            while True:
+                count = self._move_batch(pool, policy.table, columns, target, condition, (cutoff, month))
+                total += count
+                if count < self.batch_size:
+                    break
+        return total
+
+    def _move_batch(self, pool: DatabasePool, table: str, columns: List[Tuple[str, str]],
+                    target: str, condition: str, params: Tuple) -> int:
+        """Copy one batch into the archive and delete it from the hot table"""
+        with pool.writer() as conn:
+            if conn.in_transaction:
+                conn.commit()
+            conn.execute("ATTACH DATABASE ? AS lifecycle_archive", (target,))
+            try:
+                self._ensure_archive_table(conn, table, columns)
+                rowids = [row[0] for row in conn.execute(
+                    f"SELECT rowid FROM main.{_quote(table)} WHERE {condition} LIMIT ?",
+                    (*params, self.batch_size)
+                ).fetchall()]
+                if not rowids:
+                    return 0
+                names = ", ".join(_quote(name) for name, _ in columns)
+                marks = ", ".join("?" * len(rowids))
+                try:
+                    conn.execute(
+                        f"INSERT OR IGNORE INTO lifecycle_archive.{_quote(table)} ({names}) "
+                        f"SELECT {names} FROM main.{_quote(table)} WHERE rowid IN ({marks})", rowids
+                    )
+                    conn.execute(f"DELETE FROM main.{_quote(table)} WHERE rowid IN ({marks})", rowids)
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+                return len(rowids)
+            finally:
+                conn.execute("DETACH DATABASE lifecycle_archive")
+
+    @staticmethod
+    def _ensure_archive_table(conn: sqlite3.Connection, table: str, columns: List[Tuple[str, str]]):
+        """Create the archive table from the hot schema, adding columns added since"""
+        existing = _table_columns(conn, "lifecycle_archive", table)
+        if not existing:
+            row = conn.execute("SELECT sql FROM main.sqlite_master WHERE type = 'table' AND name = ?",
+                               (table,)).fetchone()
+            create = re.sub(r"^\s*CREATE\s+TABLE\s+(IF\s+NOT\s+EXISTS\s+)?(\"?[\w]+\"?)",
+                            f"CREATE TABLE IF NOT EXISTS lifecycle_archive.{_quote(table)}",
+                            row[0], count=1, flags=re.IGNORECASE)
+            conn.execute(create)
+            return
+        present = {name for name, _ in existing}
+        for name, col_type in columns:
+            if name not in present:
+                conn.execute(f"ALTER TABLE lifecycle_archive.{_quote(table)} "
+                             f"ADD COLUMN {_quote(name)} {col_type}")
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def maintain_database(self, db_path: str) -> Dict[str, Any]:
+        """ANALYZE and incremental vacuum; call in quiet hours only"""
+        pool = get_db_pool(db_path)
+        result = {"analyzed": False, "pages_freed": 0, "converted": False}
+        with pool.writer() as conn:
+            if conn.in_transaction:
+                conn.commit()
+            conn.execute(f"PRAGMA analysis_limit={int(self.analysis_limit)}")
+            conn.execute("ANALYZE")
+            conn.commit()
+            result["analyzed"] = True
+            self.stats["analyze_runs"] += 1
+
+            auto_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+            if auto_vacuum != 2 and self.enable_incremental_vacuum:
+                # auto_vacuum mode only changes with a full rebuild; done once
+                conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                conn.execute("VACUUM")
+                result["converted"] = True
+                auto_vacuum = 2
+                logger.info(f"[LIFECYCLE] {os.path.basename(db_path)} converted to incremental vacuum")
+            if auto_vacuum == 2:
+                free_before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+                conn.execute(f"PRAGMA incremental_vacuum({int(self.vacuum_pages)})").fetchall()
+                free_after = conn.execute("PRAGMA freelist_count").fetchone()[0]
+                result["pages_freed"] = max(0, free_before - free_after)
+                self.stats["pages_freed"] += result["pages_freed"]
+                self.stats["vacuum_runs"] += 1
+        return result
+
+    def run_pass(self, now: Optional[datetime] = None, force_maintenance: bool = False) -> Dict[str, Any]:
+        """One synchronous pass over every managed database"""
+        now = now or datetime.now(timezone.utc)
+        quiet = force_maintenance or self.is_quiet_time(now)
+        report = {"archived": {}, "maintenance": {}, "quiet": quiet}
+        for db_path in self.databases():
+            try:
+                moved = self.archive_database(db_path, now)
+                if moved:
+                    report["archived"][db_path] = moved
+                if quiet:
+                    report["maintenance"][db_path] = self.maintain_database(db_path)
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(f"[LIFECYCLE] {db_path} failed: {e}")
+        self.stats["runs"] += 1
+        self.last_run = now
+        if quiet:
+            self.last_maintenance = now
+        return report
+
+    # ------------------------------------------------------------------
+    # Background loop
+    # ------------------------------------------------------------------
+
+    async def run_once(self, force_maintenance: bool = False) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, lambda: self.run_pass(force_maintenance=force_maintenance))
+
+    async def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._task = asyncio.create_task(self._loop())
+        logger.info(f"[LIFECYCLE] Started (every {self.interval}s, quiet hours {self.quiet_hours} UTC)")
+
+    async def stop(self):
+        self._running = False
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _loop(self):
+        while self._running:
+            try:
+                await self.run_once()
+                await asyncio.sleep(self.interval)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"[LIFECYCLE] Loop error: {e}")
+                await asyncio.sleep(self.interval)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "archived_by_table": dict(self.archived_by_table),
+            "last_run": self.last_run.isoformat() if self.last_run else None,
+            "last_maintenance": self.last_maintenance.isoformat() if self.last_maintenance else None,
+            "archives": {path: sorted(list_archives(path)) for path in self.databases()},
+        }
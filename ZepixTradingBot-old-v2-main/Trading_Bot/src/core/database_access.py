@@ -0,0 +1,509 @@
+"""
+Database Access Layer - Shared SQLite pools for every database file
+
+TradeDatabase, PluginDatabase, DatabaseService, the health monitor, the
+versioned plugin registry and the migration tool each used to open SQLite
+connections their own way - one connection shared across threads, a private
+pool, a connection per call - each with different PRAGMAs. This module
+owns one DatabasePool per database file instead:
+
+- one writer connection, serialised by a lock (SQLite allows one writer)
+- a small pool of reader connections, which under WAL read concurrently
+  with the writer
+- tuned PRAGMAs on every connection: WAL, synchronous=NORMAL, cache_size,
+  mmap_size, busy_timeout, foreign_keys, temp_store=MEMORY
+- a per-connection prepared statement cache (sqlite3 cached_statements);
+  callers keep the cache effective by using parameterised SQL
+- an executor-backed async API so the event loop never waits on disk
+- a per-statement query-time histogram for profiling
+
+Config (`database_access` section):
+    reader_pool_size:     Reader connections per file (default 4)
+    cache_size_kb:        Page cache per connection (default 8192)
+    mmap_size_mb:         Memory-mapped I/O window (default 64)
+    busy_timeout_ms:      Wait for locks before failing (default 30000)
+    statement_cache_size: Prepared statements kept per connection (default 256)
+    executor_workers:     Threads for the async API (default 4)
+
+Version: 1.0.0
+Date: 2026-01-14
+"""
+
+import asyncio
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache, partial
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds in milliseconds (last bucket is open-ended)
+BUCKETS_MS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0, 2500.0)
+
+DEFAULT_SETTINGS = {
+    "reader_pool_size": 4,
+    "cache_size_kb": 8192,
+    "mmap_size_mb": 64,
+    "busy_timeout_ms": 30000,
+    "statement_cache_size": 256,
+    "executor_workers": 4,
+}
+
+
+# ----------------------------------------------------------------------
+# Profiling
+# ----------------------------------------------------------------------
+
+@lru_cache(maxsize=2048)
+def normalize_sql(sql: str) -> str:
+    """Collapse whitespace so one statement maps to one histogram"""
+    return " ".join(sql.split())[:160]
+
+
+class StatementHistogram:
+    """Fixed-bucket latency histogram for one SQL statement"""
+
+    __slots__ = ("count", "total_ms", "max_ms", "errors", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.errors = 0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+
+    def record(self, elapsed_ms: float, failed: bool = False):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.max_ms:
+            self.max_ms = elapsed_ms
+        if failed:
+            self.errors += 1
+        for i, bound in enumerate(BUCKETS_MS):
+            if elapsed_ms <= bound:
+                self.buckets[i] += 1
+                return
+        self.buckets[-1] += 1
+
+    def percentile(self, pct: float) -> float:
+        """Upper bound of the bucket holding the given percentile"""
+        if not self.count:
+            return 0.0
+        target = self.count * pct / 100.0
+        seen = 0
+        for i, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= target:
+                return BUCKETS_MS[i] if i < len(BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total_ms": round(self.total_ms, 3),
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "buckets": dict(zip([f"<={b}" for b in BUCKETS_MS] + ["inf"], self.buckets)),
+        }
+
+
+class QueryProfiler:
+    """Per-statement histograms, shared by all pools"""
+
+    def __init__(self, max_statements: int = 500):
+        self.max_statements = max_statements
+        self._histograms: Dict[str, StatementHistogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, sql: str, elapsed_ms: float, failed: bool = False):
+        key = normalize_sql(sql)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                if len(self._histograms) >= self.max_statements:
+                    return  # Unparameterised SQL would grow this without bound
+                histogram = self._histograms[key] = StatementHistogram()
+            histogram.record(elapsed_ms, failed)
+
+    def snapshot(self, top: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """Statements ordered by total time spent"""
+        with self._lock:
+            items = sorted(self._histograms.items(), key=lambda kv: kv[1].total_ms, reverse=True)
+            if top:
+                items = items[:top]
+            return {sql: histogram.to_dict() for sql, histogram in items}
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+
+_profiler = QueryProfiler()
+
+
+class TimedCursor(sqlite3.Cursor):
+    """Cursor that records statement latency in the connection's profiler"""
+
+    def _timed(self, sql: str, call: Callable):
+        profiler = getattr(self.connection, "profiler", None)
+        if profiler is None:
+            return call()
+        started = time.perf_counter()
+        failed = False
+        try:
+            return call()
+        except Exception:
+            failed = True
+            raise
+        finally:
+            profiler.record(sql, (time.perf_counter() - started) * 1000.0, failed)
+
+    def execute(self, sql, parameters=()):
+        return self._timed(sql, lambda: super(TimedCursor, self).execute(sql, parameters))
+
+    def executemany(self, sql, seq_of_parameters):
+        return self._timed(sql, lambda: super(TimedCursor, self).executemany(sql, seq_of_parameters))
+
+    def executescript(self, sql_script):
+        return self._timed("<script>", lambda: super(TimedCursor, self).executescript(sql_script))
+
+
+class TimedConnection(sqlite3.Connection):
+    """Connection whose cursors (and shortcut execute methods) are timed"""
+
+    profiler: Optional[QueryProfiler] = None
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+
+# ----------------------------------------------------------------------
+# Pool
+# ----------------------------------------------------------------------
+
+class DatabasePool:
+    """
+    Connections for one SQLite file: a locked writer plus pooled readers.
+
+    Use transaction() / execute() for writes and reader() / query() for
+    reads. writer() hands out the writer connection under its lock without
+    committing, for legacy code that manages commits itself.
+    """
+
+    def __init__(self, db_path: str, settings: Dict[str, Any] = None,
+                 row_factory: Optional[Callable] = None,
+                 profiler: Optional[QueryProfiler] = None,
+                 executor: Optional[ThreadPoolExecutor] = None):
+        self.db_path = db_path
+        self.settings = dict(DEFAULT_SETTINGS, **(settings or {}))
+        self.row_factory = row_factory
+        self.profiler = profiler or _profiler
+        self._executor = executor
+        self.is_memory = db_path == ":memory:" or db_path.startswith("file::memory:")
+
+        directory = os.path.dirname(db_path)
+        if directory and not self.is_memory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._writer_lock = threading.RLock()
+        self._writer = self._connect()
+        self.journal_mode = self._writer.execute("PRAGMA journal_mode=WAL").fetchone()[0].lower()
+        self.inode = self._current_inode()
+
+        self._readers: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._reader_count = 0
+        self._readers_lock = threading.Lock()
+        self._closed = False
+        self.stats = {"writes": 0, "reads": 0, "reader_waits": 0, "dedicated": 0}
+
+    # ------------------------------------------------------------------
+    # Connections
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.settings["busy_timeout_ms"] / 1000.0,
+            check_same_thread=False,
+            cached_statements=self.settings["statement_cache_size"],
+            factory=TimedConnection,
+            uri=True  # Plain paths are unaffected; enables read-only ATTACH by URI
+        )
+        conn.profiler = self.profiler
+        if self.row_factory is not None:
+            conn.row_factory = self.row_factory
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA cache_size=-{int(self.settings['cache_size_kb'])}")
+        conn.execute(f"PRAGMA mmap_size={int(self.settings['mmap_size_mb']) * 1024 * 1024}")
+        conn.execute(f"PRAGMA busy_timeout={int(self.settings['busy_timeout_ms'])}")
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+
+    def connect(self, row_factory: Optional[Callable] = None) -> sqlite3.Connection:
+        """
+        Dedicated connection with the pool's PRAGMAs and profiling.
+
+        For batch jobs that own a long transaction and close the connection
+        themselves (migrations, bulk loads). Not returned to the pool.
+        """
+        conn = self._connect()
+        if row_factory is not None:
+            conn.row_factory = row_factory
+        self.stats["dedicated"] += 1
+        return conn
+
+    def _current_inode(self) -> Optional[int]:
+        if self.is_memory:
+            return None
+        try:
+            return os.stat(self.db_path).st_ino
+        except OSError:
+            return None
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @property
+    def is_stale(self) -> bool:
+        """True if the file was deleted or replaced since the pool opened it"""
+        return not self.is_memory and self._current_inode() != self.inode
+
+    @property
+    def writer_connection(self) -> sqlite3.Connection:
+        """The shared writer connection (for long-lived legacy owners)"""
+        return self._writer
+
+    @property
+    def split_reads(self) -> bool:
+        """Separate reader connections only make sense for a WAL file on disk"""
+        return self.journal_mode == "wal" and not self.is_memory
+
+    @contextmanager
+    def writer(self):
+        """Writer connection under the write lock; caller commits"""
+        with self._writer_lock:
+            yield self._writer
+
+    @contextmanager
+    def transaction(self):
+        """Writer connection under the write lock; commit on success, rollback on error"""
+        with self._writer_lock:
+            self.stats["writes"] += 1
+            try:
+                yield self._writer
+                self._writer.commit()
+            except Exception:
+                self._writer.rollback()
+                raise
+
+    @contextmanager
+    def reader(self):
+        """A pooled reader connection (the writer when reads cannot be split)"""
+        if not self.split_reads:
+            with self._writer_lock:
+                self.stats["reads"] += 1
+                yield self._writer
+            return
+
+        conn = self._checkout_reader()
+        self.stats["reads"] += 1
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            if self._closed:
+                conn.close()
+            else:
+                self._readers.put(conn)
+
+    def _checkout_reader(self) -> sqlite3.Connection:
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+        with self._readers_lock:
+            if self._reader_count < self.settings["reader_pool_size"]:
+                self._reader_count += 1
+                return self._connect()
+        self.stats["reader_waits"] += 1
+        return self._readers.get(timeout=self.settings["busy_timeout_ms"] / 1000.0)
+
+    # ------------------------------------------------------------------
+    # Sync API
+    # ------------------------------------------------------------------
+
+    def execute(self, sql: str, params: Sequence = ()) -> sqlite3.Cursor:
+        with self.transaction() as conn:
+            return conn.execute(sql, params)
+
+    def executemany(self, sql: str, seq_of_params: Iterable[Sequence]) -> sqlite3.Cursor:
+        with self.transaction() as conn:
+            return conn.executemany(sql, seq_of_params)
+
+    def executescript(self, script: str):
+        with self.transaction() as conn:
+            conn.executescript(script)
+
+    def query(self, sql: str, params: Sequence = ()) -> List[Any]:
+        with self.reader() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def query_one(self, sql: str, params: Sequence = ()) -> Optional[Any]:
+        with self.reader() as conn:
+            return conn.execute(sql, params).fetchone()
+
+    # ------------------------------------------------------------------
+    # Async API
+    # ------------------------------------------------------------------
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run a blocking callable on the database executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor or _get_executor(), partial(fn, *args, **kwargs))
+
+    async def aexecute(self, sql: str, params: Sequence = ()) -> sqlite3.Cursor:
+        return await self.run(self.execute, sql, params)
+
+    async def aexecutemany(self, sql: str, seq_of_params: Iterable[Sequence]) -> sqlite3.Cursor:
+        return await self.run(self.executemany, sql, list(seq_of_params))
+
+    async def aexecutescript(self, script: str):
+        return await self.run(self.executescript, script)
+
+    async def aquery(self, sql: str, params: Sequence = ()) -> List[Any]:
+        return await self.run(self.query, sql, params)
+
+    async def aquery_one(self, sql: str, params: Sequence = ()) -> Optional[Any]:
+        return await self.run(self.query_one, sql, params)
+
+    async def atransaction(self, fn: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Run fn(conn) inside one write transaction on the executor"""
+        def _run():
+            with self.transaction() as conn:
+                return fn(conn)
+        return await self.run(_run)
+
+    # ------------------------------------------------------------------
+    # Lifecycle / stats
+    # ------------------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "db_path": self.db_path,
+            "journal_mode": self.journal_mode,
+            "readers_open": self._reader_count,
+            "readers_idle": self._readers.qsize(),
+            **self.stats,
+        }
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._writer_lock:
+            self._writer.close()
+
+
+# ----------------------------------------------------------------------
+# Registry
+# ----------------------------------------------------------------------
+
+_settings: Dict[str, Any] = dict(DEFAULT_SETTINGS)
+_pools: Dict[str, DatabasePool] = {}
+_pools_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=_settings["executor_workers"],
+                                           thread_name_prefix="sqlite")
+        return _executor
+
+
+def configure_database_access(config: Dict[str, Any]):
+    """Apply the `database_access` config section to pools opened from now on"""
+    _settings.update({k: v for k, v in (config or {}).items() if k in DEFAULT_SETTINGS})
+
+
+def get_db_pool(db_path: str, row_factory: Optional[Callable] = None, **overrides) -> DatabasePool:
+    """
+    Shared pool for a database file.
+
+    All callers of one file share its pool, so the row factory and any
+    setting overrides are fixed by the first caller; a later caller asking
+    for a different row factory gets a warning and should set
+    cursor.row_factory instead. In-memory databases are never shared.
+    """
+    settings = dict(_settings, **{k: v for k, v in overrides.items() if k in DEFAULT_SETTINGS})
+    if db_path == ":memory:":
+        return DatabasePool(db_path, settings, row_factory=row_factory)
+
+    key = os.path.abspath(db_path)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is not None and (pool.closed or pool.is_stale):
+            pool.close()
+            pool = None
+        if pool is None:
+            pool = DatabasePool(db_path, settings, row_factory=row_factory)
+            _pools[key] = pool
+        elif row_factory is not None and pool.row_factory is not row_factory:
+            logger.warning(f"[DBAccess] {db_path} already open with row_factory={pool.row_factory}")
+        return pool
+
+
+def close_db_pool(db_path: str):
+    with _pools_lock:
+        pool = _pools.pop(os.path.abspath(db_path), None)
+    if pool is not None:
+        pool.close()
+
+
+def close_all_pools():
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+def get_query_stats(top: Optional[int] = 20) -> Dict[str, Any]:
+    """Per-statement histograms plus per-file pool stats"""
+    with _pools_lock:
+        pools = {path: pool.get_stats() for path, pool in _pools.items()}
+    return {"statements": _profiler.snapshot(top), "pools": pools}
+
+
+def reset_query_stats():
+    _profiler.reset()
@@ -0,0 +1,289 @@
+"""
+Engine Snapshot - Warm-restart state file for TradingEngine
+
+Periodically writes the in-memory engine state that is otherwise rebuilt
+piece by piece (or lost) on restart: open trades, re-entry and profit
+chains, PriceMonitorService pending re-entries, RecoveryWindowMonitor
+windows with their remaining time, and risk counters.
+
+File layout (little-endian):
+    magic (4s) | format version (H) | created_at epoch (d) | crc32 (I) | length (I)
+    zlib-compressed JSON payload
+
+Writes go to a temp file and are renamed into place, and are skipped when
+the payload is unchanged. A snapshot with a different format version, a bad
+checksum or older than max_age_seconds is ignored and startup falls back to
+the database / broker recovery path.
+
+Config (engine_snapshot):
+    enabled:           Write and load snapshots (default true)
+    path:              Snapshot file (default data/engine_snapshot.bin)
+    interval_seconds:  Minimum seconds between writes (default 30)
+    max_age_seconds:   Ignore older snapshots at startup (default 21600)
+
+Version: 1.0.0
+Date: 2026-01-14
+"""
+
+import json
+import logging
+import os
+import struct
+import zlib
+from datetime import date, datetime
+from typing import Any, Dict, Optional
+
+from src.models import Trade, ReEntryChain, ProfitBookingChain
+from src.utils.clock import Clock, get_clock
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"ZPXS"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHdII")
+
+# Models that may appear in the payload, by tag
+MODELS = {cls.__name__: cls for cls in (Trade, ReEntryChain, ProfitBookingChain)}
+
+
+def _encode(value):
+    """json default hook for the types engine state holds"""
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"$date": value.isoformat()}
+    if isinstance(value, (set, frozenset)):
+        return {"$set": list(value)}
+    name = type(value).__name__
+    if name in MODELS and isinstance(value, MODELS[name]):
+        return {"$model": name, "data": value.model_dump()}
+    return str(value)
+
+
+def _decode(obj: Dict[str, Any]):
+    """json object_hook reversing _encode"""
+    if len(obj) == 1:
+        if "$dt" in obj:
+            return datetime.fromisoformat(obj["$dt"])
+        if "$date" in obj:
+            return date.fromisoformat(obj["$date"])
+        if "$set" in obj:
+            return set(obj["$set"])
+    if "$model" in obj and obj["$model"] in MODELS:
+        return MODELS[obj["$model"]](**obj["data"])
+    return obj
+
+
+def encode_snapshot(state: Dict[str, Any], created_at: float) -> bytes:
+    payload = zlib.compress(json.dumps(state, default=_encode, separators=(",", ":")).encode())
+    return HEADER.pack(MAGIC, FORMAT_VERSION, created_at, zlib.crc32(payload), len(payload)) + payload
+
+
+def decode_snapshot(blob: bytes) -> Optional[Dict[str, Any]]:
+    """Payload dict with '_created_at', or None if the blob is not a valid snapshot"""
+    if len(blob) < HEADER.size:
+        return None
+    magic, version, created_at, crc, length = HEADER.unpack_from(blob)
+    payload = blob[HEADER.size:HEADER.size + length]
+    if magic != MAGIC:
+        logger.warning("[EngineSnapshot] Not a snapshot file")
+        return None
+    if version != FORMAT_VERSION:
+        logger.warning(f"[EngineSnapshot] Format v{version} not supported (expected v{FORMAT_VERSION})")
+        return None
+    if len(payload) != length or zlib.crc32(payload) != crc:
+        logger.warning("[EngineSnapshot] Checksum mismatch, snapshot ignored")
+        return None
+    state = json.loads(zlib.decompress(payload), object_hook=_decode)
+    state["_created_at"] = created_at
+    return state
+
+
+class EngineSnapshotStore:
+    """Captures, writes, loads and restores TradingEngine warm-restart state"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, clock: Optional[Clock] = None):
+        self.config = config or {}
+        self.clock = clock or get_clock()
+        self.enabled = self.config.get("enabled", True)
+        self.path = self.config.get("path", "data/engine_snapshot.bin")
+        self.interval_seconds = self.config.get("interval_seconds", 30)
+        self.max_age_seconds = self.config.get("max_age_seconds", 21600)
+        self._last_save = None  # monotonic time of last write check
+        self._last_crc = None
+        self.stats = {"writes": 0, "skipped_unchanged": 0, "bytes": 0, "restored": {}}
+
+    # ------------------------------------------------------------------
+    # Capture / restore
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def capture(engine) -> Dict[str, Any]:
+        """Collect engine state into a plain dict"""
+        autonomous = getattr(engine, 'autonomous_manager', None)
+        recovery_monitor = getattr(autonomous, 'recovery_monitor', None)
+        return {
+            "open_trades": [t for t in engine.open_trades if t.status != "closed"],
+            "trade_count": engine.trade_count,
+            "reentry_chains": dict(engine.reentry_manager.active_chains),
+            "profit_chains": dict(engine.profit_booking_manager.active_chains),
+            "price_monitor": engine.price_monitor.export_pending(),
+            "recovery_monitors": recovery_monitor.export_monitors() if recovery_monitor else [],
+            "risk_counters": engine.risk_manager.ledger.counters.to_dict(),
+        }
+
+    @staticmethod
+    def restore(engine, state: Dict[str, Any]) -> Dict[str, int]:
+        """
+        Apply a loaded snapshot to a freshly constructed engine.
+
+        Everything that can fail on a bad snapshot runs before the engine is
+        touched, so a failed restore leaves it as it was for full recovery.
+        """
+        plan = EngineSnapshotStore._plan_restore(engine, state)
+        return EngineSnapshotStore._apply_restore(engine, plan)
+
+    @staticmethod
+    def _plan_restore(engine, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Select and validate what restore() will add; no side effects"""
+        def typed(items, cls):
+            items = list(items)
+            for item in items:
+                if not isinstance(item, cls):
+                    raise ValueError(f"Expected {cls.__name__}, got {type(item).__name__}")
+            return items
+
+        known = {t.trade_id for t in engine.open_trades if t.trade_id is not None}
+        trades = [t for t in typed(state.get("open_trades", []), Trade)
+                  if t.status != "closed" and (t.trade_id is None or t.trade_id not in known)]
+
+        reentry_chains = state.get("reentry_chains", {})
+        typed(reentry_chains.values(), ReEntryChain)
+        profit_chains = state.get("profit_chains", {})
+        typed(profit_chains.values(), ProfitBookingChain)
+
+        autonomous = getattr(engine, 'autonomous_manager', None)
+        recovery_monitor = getattr(autonomous, 'recovery_monitor', None)
+        counters = state.get("risk_counters")
+        if counters is not None and not isinstance(counters, dict):
+            raise ValueError("risk_counters is not a mapping")
+        return {
+            "trades": trades,
+            "trade_count": int(state.get("trade_count", 0)),
+            "reentry_chains": {chain_id: chain for chain_id, chain in reentry_chains.items()
+                               if chain_id not in engine.reentry_manager.active_chains},
+            "profit_chains": profit_chains,
+            "pending": engine.price_monitor.select_pending(state.get("price_monitor", {})),
+            "recovery_monitor": recovery_monitor,
+            "monitors": (recovery_monitor.select_monitors(state.get("recovery_monitors", []))
+                         if recovery_monitor else {}),
+            # The risk ledger is the source of truth; counters only seed an empty one
+            "counters": counters if counters and engine.risk_manager.ledger.is_empty() else None,
+        }
+
+    @staticmethod
+    def _apply_restore(engine, plan: Dict[str, Any]) -> Dict[str, int]:
+        restored = {}
+        ledger = engine.risk_manager.ledger
+        if plan["counters"]:
+            # Only step with I/O, so it goes first
+            ledger.seed(plan["counters"])
+            ledger.replay()
+            restored["risk_counters"] = 1
+
+        for trade in plan["trades"]:
+            engine.open_trades.append(trade)
+            engine.risk_manager.add_open_trade(trade)
+        engine.trade_count = max(engine.trade_count, plan["trade_count"])
+        restored["open_trades"] = len(plan["trades"])
+
+        engine.reentry_manager.active_chains.update(plan["reentry_chains"])
+        restored["reentry_chains"] = len(plan["reentry_chains"])
+
+        restored["profit_chains"] = engine.profit_booking_manager.restore_chains(
+            plan["profit_chains"], engine.open_trades
+        )
+        restored["pending_reentries"] = engine.price_monitor.restore_pending(plan["pending"])
+        recovery_monitor = plan["recovery_monitor"]
+        restored["recovery_monitors"] = (
+            recovery_monitor.restore_monitors(plan["monitors"]) if recovery_monitor else 0
+        )
+        return restored
+
+    # ------------------------------------------------------------------
+    # File I/O
+    # ------------------------------------------------------------------
+
+    def save(self, engine, force: bool = True) -> bool:
+        """Write a snapshot now; returns False if unchanged or disabled"""
+        if not self.enabled:
+            return False
+        self._last_save = self.clock.monotonic()
+        state = self.capture(engine)
+        blob = encode_snapshot(state, self.clock.time())
+        crc = HEADER.unpack_from(blob)[3]
+        if crc == self._last_crc and not force:
+            self.stats["skipped_unchanged"] += 1
+            return False
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(blob)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._last_crc = crc
+        self.stats["writes"] += 1
+        self.stats["bytes"] = len(blob)
+        return True
+
+    def maybe_save(self, engine) -> bool:
+        """Write if interval_seconds have passed and state changed"""
+        if not self.enabled:
+            return False
+        now = self.clock.monotonic()
+        if self._last_save is not None and now - self._last_save < self.interval_seconds:
+            return False
+        try:
+            return self.save(engine, force=False)
+        except Exception as e:
+            logger.error(f"[EngineSnapshot] Write failed: {e}")
+            return False
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Read the snapshot file; None if missing, invalid or too old"""
+        if not self.enabled or not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, "rb") as f:
+                state = decode_snapshot(f.read())
+        except Exception as e:
+            logger.warning(f"[EngineSnapshot] Could not read {self.path}: {e}")
+            return None
+        if state is None:
+            return None
+        age = self.clock.time() - state["_created_at"]
+        if age > self.max_age_seconds:
+            logger.info(f"[EngineSnapshot] Snapshot is {age:.0f}s old, ignoring")
+            return None
+        return state
+
+    def load_and_restore(self, engine) -> Optional[Dict[str, int]]:
+        """Startup hook: restore from the snapshot file if there is a usable one"""
+        state = self.load()
+        if state is None:
+            return None
+        try:
+            restored = self.restore(engine, state)
+        except Exception as e:
+            logger.error(f"[EngineSnapshot] Restore failed, using full recovery: {e}")
+            return None
+        self.stats["restored"] = restored
+        logger.info(f"[EngineSnapshot] Warm restart: {restored}")
+        return restored
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self.stats, path=self.path, enabled=self.enabled)
@@ -0,0 +1,318 @@
+"""
+Order Event Bus - Typed in-process pub/sub for order lifecycle events
+
+Producers (TradingEngine, MT5 execution listener, TrendAnalyzer) publish
+frozen event objects; subscribers register per event type. Dispatch is a
+single dict lookup on type(event) - handlers and their sync/async nature
+are resolved once at subscribe time, never per event.
+
+Each subscriber has its own bounded queue drained by its own task, so
+publish() never waits on a subscriber and a slow one only delays itself.
+When a queue is full the oldest event is dropped and counted; lossless
+subscriptions (state bookkeeping that must see every close) are unbounded
+and only log a warning when they pass the limit.
+
+Config (event_bus):
+    queue_size:      Max queued events per subscriber (default 1000)
+    latency_window:  Samples kept per topic for latency percentiles (default 1000)
+    plugin_hooks:    Deliver SLHit/TPHit to plugin on_sl_hit/on_tp_hit (default false)
+
+Version: 1.0.0
+Date: 2026-01-14
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field, fields
+from typing import Any, Callable, Dict, List, Optional, Type
+
+logger = logging.getLogger(__name__)
+
+
+# ----------------------------------------------------------------------
+# Events
+# ----------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class BusEvent:
+    """Base class for bus events"""
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Event fields as a plain dict (object references excluded)"""
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.name != "trade"}
+
+
+@dataclass(frozen=True)
+class OrderOpened(BusEvent):
+    ticket: int
+    symbol: str
+    order_type: str
+    lot_size: float
+    price: float = 0.0
+    sl: float = 0.0
+    tp: float = 0.0
+    comment: str = ""
+
+
+@dataclass(frozen=True)
+class OrderModified(BusEvent):
+    ticket: int
+    sl: Optional[float] = None
+    tp: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class OrderClosed(BusEvent):
+    trade_id: Optional[int]
+    symbol: str
+    direction: str
+    reason: str
+    close_price: float
+    pnl: float
+    strategy: str = ""
+    trade: Any = field(default=None, compare=False, repr=False)
+
+
+@dataclass(frozen=True)
+class SLHit(BusEvent):
+    trade_id: Optional[int]
+    symbol: str
+    direction: str
+    sl_price: float
+    close_price: float
+    pnl: float
+    strategy: str = ""
+    trade: Any = field(default=None, compare=False, repr=False)
+
+
+@dataclass(frozen=True)
+class TPHit(BusEvent):
+    trade_id: Optional[int]
+    symbol: str
+    direction: str
+    tp_price: float
+    close_price: float
+    pnl: float
+    strategy: str = ""
+    trade: Any = field(default=None, compare=False, repr=False)
+
+
+@dataclass(frozen=True)
+class TickBatch(BusEvent):
+    prices: Dict[str, float]
+
+
+@dataclass(frozen=True)
+class TrendChanged(BusEvent):
+    symbol: str
+    timeframe: str
+    previous: Optional[str]
+    trend: str
+
+
+# ----------------------------------------------------------------------
+# Bus
+# ----------------------------------------------------------------------
+
+class TopicStats:
+    """Delivery counters and publish-to-handled latency for one event type"""
+
+    def __init__(self, window: int):
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+        self.latencies: deque = deque(maxlen=window)
+
+    def to_dict(self) -> Dict[str, Any]:
+        ordered = sorted(self.latencies)
+        count = len(ordered)
+        return {
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "avg_latency_ms": round(sum(ordered) / count, 3) if count else 0.0,
+            "p95_latency_ms": round(ordered[min(count - 1, int(count * 0.95))], 3) if count else 0.0,
+            "max_latency_ms": round(ordered[-1], 3) if count else 0.0,
+        }
+
+
+class Subscription:
+    """One handler on one event type, with its own queue (bounded unless lossless)"""
+
+    __slots__ = ("event_type", "name", "handler", "is_async", "queue", "queue_size",
+                 "lossless", "wakeup", "task", "busy")
+
+    def __init__(self, event_type: Type[BusEvent], name: str, handler: Callable, queue_size: int,
+                 lossless: bool = False):
+        self.event_type = event_type
+        self.name = name
+        self.handler = handler
+        self.is_async = asyncio.iscoroutinefunction(handler)
+        self.queue_size = queue_size
+        self.lossless = lossless
+        self.queue: deque = deque() if lossless else deque(maxlen=queue_size)
+        self.wakeup: Optional[asyncio.Event] = None
+        self.task: Optional[asyncio.Task] = None
+        self.busy = False
+
+
+class OrderEventBus:
+    """Async fan-out of typed events to per-subscriber queues"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.config = config or {}
+        self.queue_size = self.config.get("queue_size", 1000)
+        self.latency_window = self.config.get("latency_window", 1000)
+        self.plugin_hooks = self.config.get("plugin_hooks", False)
+        self._subscribers: Dict[Type[BusEvent], List[Subscription]] = {}
+        self._topics: Dict[Type[BusEvent], TopicStats] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _topic(self, event_type: Type[BusEvent]) -> TopicStats:
+        stats = self._topics.get(event_type)
+        if stats is None:
+            stats = self._topics[event_type] = TopicStats(self.latency_window)
+        return stats
+
+    def subscribe(
+        self,
+        event_type: Type[BusEvent],
+        handler: Callable,
+        name: Optional[str] = None,
+        queue_size: Optional[int] = None,
+        lossless: bool = False
+    ) -> Subscription:
+        """
+        Register handler(event) for event_type; async handlers are awaited.
+
+        With lossless=True the queue never drops: past queue_size it keeps
+        growing and logs a warning each time another queue_size events pile up.
+        """
+        subscription = Subscription(
+            event_type, name or getattr(handler, "__qualname__", repr(handler)),
+            handler, queue_size or self.queue_size, lossless
+        )
+        # Copy-on-write so publish() can iterate without locking
+        self._subscribers[event_type] = self._subscribers.get(event_type, []) + [subscription]
+        self._topic(event_type)
+        return subscription
+
+    def unsubscribe(self, name: str) -> int:
+        """Remove every subscription registered under name; returns how many"""
+        removed = 0
+        for event_type, subscriptions in list(self._subscribers.items()):
+            keep = [s for s in subscriptions if s.name != name]
+            for subscription in subscriptions:
+                if subscription.name == name:
+                    if subscription.task:
+                        subscription.task.cancel()
+                    removed += 1
+            self._subscribers[event_type] = keep
+        return removed
+
+    def publish(self, event: BusEvent) -> int:
+        """Queue event for every subscriber of its type; never blocks"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is None and self._loop is not None and self._loop.is_running():
+            # Called from another thread (e.g. an execution listener)
+            self._loop.call_soon_threadsafe(self.publish, event)
+            return 0
+        if loop is not None:
+            self._loop = loop
+
+        event_type = type(event)
+        stats = self._topic(event_type)
+        stats.published += 1
+        subscriptions = self._subscribers.get(event_type, ())
+        now = time.perf_counter()
+        for subscription in subscriptions:
+            if subscription.lossless:
+                depth = len(subscription.queue)
+                if depth and depth % subscription.queue_size == 0:
+                    logger.warning(f"[EventBus] {subscription.name} has {depth} queued "
+                                   f"{event_type.__name__} events (lossless, not dropping)")
+            elif len(subscription.queue) == subscription.queue.maxlen:
+                stats.dropped += 1
+                logger.warning(f"[EventBus] {subscription.name} queue full, dropping oldest "
+                               f"{event_type.__name__}")
+            subscription.queue.append((event, now))
+            if loop is not None:
+                self._wake(subscription, loop)
+        return len(subscriptions)
+
+    def _wake(self, subscription: Subscription, loop: asyncio.AbstractEventLoop):
+        task = subscription.task
+        if task is None or task.done() or task.get_loop() is not loop:
+            subscription.wakeup = asyncio.Event()
+            subscription.task = loop.create_task(self._worker(subscription))
+        subscription.wakeup.set()
+
+    async def _worker(self, subscription: Subscription):
+        stats = self._topic(subscription.event_type)
+        while True:
+            if not subscription.queue:
+                subscription.wakeup.clear()
+                await subscription.wakeup.wait()
+                continue
+            event, published_at = subscription.queue.popleft()
+            subscription.busy = True
+            try:
+                result = subscription.handler(event)
+                if subscription.is_async:
+                    await result
+                stats.delivered += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                stats.errors += 1
+                logger.error(f"[EventBus] {subscription.name} failed on "
+                             f"{type(event).__name__}: {e}")
+            finally:
+                subscription.busy = False
+                stats.latencies.append((time.perf_counter() - published_at) * 1000.0)
+
+    def _all_subscriptions(self) -> List[Subscription]:
+        return [s for subscriptions in self._subscribers.values() for s in subscriptions]
+
+    async def drain(self, timeout: float = 5.0) -> bool:
+        """Wait until every queue is empty and idle; False on timeout"""
+        loop = asyncio.get_running_loop()
+        self._loop = loop
+        deadline = time.monotonic() + timeout
+        while True:
+            pending = [s for s in self._all_subscriptions() if s.queue or s.busy]
+            if not pending:
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            for subscription in pending:
+                if subscription.queue:
+                    self._wake(subscription, loop)
+            await asyncio.sleep(0.001)
+
+    async def stop(self, timeout: float = 5.0):
+        """Deliver what is queued, then stop the subscriber tasks"""
+        await self.drain(timeout)
+        tasks = [s.task for s in self._all_subscriptions() if s.task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for subscription in self._all_subscriptions():
+            subscription.task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "topics": {event_type.__name__: stats.to_dict()
+                       for event_type, stats in self._topics.items()},
+            "subscribers": [
+                {"name": s.name, "topic": s.event_type.__name__, "queued": len(s.queue)}
+                for s in self._all_subscriptions()
+            ],
+        }
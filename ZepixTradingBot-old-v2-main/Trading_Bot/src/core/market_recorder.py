@@ -0,0 +1,385 @@
+"""
+Market Recorder - Compressed tick and alert recording for post-mortems
+
+Keeps the ticks the bot polled (MT5Client.get_current_price /
+get_symbol_tick) and the exact alert payloads it acted on
+(TradingEngine.process_alert), so a bad SL-hunt re-entry can be replayed
+against what the bot actually saw.
+
+Hot path cost is one deque append: rows are buffered in memory and a
+background thread groups them by UTC day and symbol and appends columnar
+blocks to segment files:
+
+    {path}/{YYYY-MM-DD}/{SYMBOL}.ticks       tick blocks
+    {path}/{YYYY-MM-DD}/{SYMBOL}.alerts      alert blocks
+    ... .idx                                 one fixed-size entry per block
+
+Block layout (little-endian):
+    header: magic (4s) | kind (B) | rows (I) | first/last time us (q q) |
+            raw length (I) | compressed length (I) | crc32 (I)
+    zlib payload, column by column:
+        ticks:  time deltas (i8) | bid (f8) | ask (f8) | volume (f8)
+        alerts: time deltas (i8) | payload lengths (u4) | JSON payloads
+
+MarketRecordingReader memory-maps the segments and uses the index to
+decompress only the blocks that overlap the requested time range.
+
+The writer thread deletes day directories older than retention_days when
+it starts and again whenever the UTC day changes.
+
+Config (market_recorder):
+    enabled:                 Record ticks and alerts (default true)
+    path:                    Root directory (default data/market_recordings)
+    retention_days:          Days of recordings kept, including today (default 14, 0 = keep all)
+    flush_interval_seconds:  Writer thread interval (default 1.0)
+    block_rows:              Max rows per block; a full buffer wakes the writer (default 4096)
+    max_pending:             Buffered rows before new ones are dropped (default 200000)
+    compression_level:       zlib level (default 6)
+
+Version: 1.0.0
+Date: 2026-01-14
+"""
+
+import json
+import logging
+import mmap
+import os
+import re
+import shutil
+import struct
+import threading
+import zlib
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from src.utils.clock import Clock, get_clock
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"ZREC"
+TICK = 1
+ALERT = 2
+EXTENSIONS = {TICK: ".ticks", ALERT: ".alerts"}
+BLOCK = struct.Struct("<4sBIqqIII")
+INDEX = struct.Struct("<QIqq")  # offset, rows, first us, last us
+TICK_COLUMNS = ("bid", "ask", "volume")
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9_.-]")
+_DAY_DIR = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+def _day(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%d")
+
+
+def _file_symbol(symbol: str) -> str:
+    return _UNSAFE.sub("_", symbol or "_") or "_"
+
+
+class MarketRecorder:
+    """Buffers ticks and alert payloads and writes them off-thread"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, clock: Optional[Clock] = None):
+        self.config = config or {}
+        self.clock = clock or get_clock()
+        self.enabled = self.config.get("enabled", True)
+        self.path = self.config.get("path", "data/market_recordings")
+        self.retention_days = self.config.get("retention_days", 14)
+        self.flush_interval = self.config.get("flush_interval_seconds", 1.0)
+        self.block_rows = self.config.get("block_rows", 4096)
+        self.max_pending = self.config.get("max_pending", 200000)
+        self.compression_level = self.config.get("compression_level", 6)
+
+        self._pending: deque = deque()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._write_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pruned_day: Optional[str] = None
+        self.stats = {"ticks": 0, "alerts": 0, "dropped": 0, "blocks": 0,
+                      "raw_bytes": 0, "written_bytes": 0, "write_errors": 0, "pruned_days": 0}
+
+    # ------------------------------------------------------------------
+    # Hot path
+    # ------------------------------------------------------------------
+
+    def record_tick(self, symbol: str, bid: float, ask: float, volume: float = 0.0,
+                    ts: Optional[float] = None):
+        """MT5Client tick listener"""
+        if not self.enabled:
+            return
+        pending = self._pending
+        if len(pending) >= self.max_pending:
+            self.stats["dropped"] += 1
+            return
+        pending.append((TICK, symbol, self.clock.time() if ts is None else ts,
+                        bid, ask, volume))
+        self.stats["ticks"] += 1
+        if len(pending) >= self.block_rows:
+            self._wakeup.set()
+
+    def record_alert(self, payload: Any, symbol: Optional[str] = None, ts: Optional[float] = None):
+        """Record an alert payload as received (serialized now, before plugins modify it)"""
+        if not self.enabled:
+            return
+        if len(self._pending) >= self.max_pending:
+            self.stats["dropped"] += 1
+            return
+        if symbol is None:
+            fields = payload
+            if isinstance(payload, (str, bytes, bytearray)):
+                try:
+                    fields = json.loads(payload)
+                except ValueError:
+                    fields = None
+            symbol = fields.get("symbol") if isinstance(fields, dict) else None
+        if isinstance(payload, (bytes, bytearray)):
+            blob = bytes(payload)
+        elif isinstance(payload, str):
+            blob = payload.encode()
+        else:
+            blob = json.dumps(payload, default=str, separators=(",", ":")).encode()
+        self._pending.append((ALERT, symbol or "_", self.clock.time() if ts is None else ts,
+                              blob, None, None))
+        self.stats["alerts"] += 1
+
+    # ------------------------------------------------------------------
+    # Writer
+    # ------------------------------------------------------------------
+
+    def segment_path(self, day: str, symbol: str, kind: int) -> str:
+        return os.path.join(self.path, day, _file_symbol(symbol) + EXTENSIONS[kind])
+
+    def flush(self) -> int:
+        """Write every buffered row now; returns rows written"""
+        with self._write_lock:
+            rows = []
+            pending = self._pending
+            while pending:
+                rows.append(pending.popleft())
+            if not rows:
+                return 0
+            groups: Dict[Tuple[int, str, str], list] = {}
+            for row in rows:
+                groups.setdefault((row[0], _day(row[2]), row[1]), []).append(row)
+            for (kind, day, symbol), group in groups.items():
+                group.sort(key=lambda row: row[2])
+                for start in range(0, len(group), self.block_rows):
+                    try:
+                        self._write_block(kind, self.segment_path(day, symbol, kind),
+                                          group[start:start + self.block_rows])
+                    except Exception as e:
+                        self.stats["write_errors"] += 1
+                        logger.error(f"[MarketRecorder] Write failed for {symbol} {day}: {e}")
+            return len(rows)
+
+    def _write_block(self, kind: int, path: str, rows: list):
+        times = np.rint(np.array([row[2] for row in rows], dtype=np.float64) * 1e6).astype("<i8")
+        deltas = np.diff(times, prepend=times[0])
+        if kind == TICK:
+            columns = [deltas] + [np.array([row[i] for row in rows], dtype="<f8") for i in (3, 4, 5)]
+            raw = b"".join(column.tobytes() for column in columns)
+        else:
+            blobs = [row[3] for row in rows]
+            lengths = np.array([len(blob) for blob in blobs], dtype="<u4")
+            raw = deltas.tobytes() + lengths.tobytes() + b"".join(blobs)
+        compressed = zlib.compress(raw, self.compression_level)
+        first, last = int(times[0]), int(times[-1])
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "ab") as f:
+            offset = f.tell()
+            f.write(BLOCK.pack(MAGIC, kind, len(rows), first, last, len(raw),
+                               len(compressed), zlib.crc32(compressed)))
+            f.write(compressed)
+        # Index after data: an entry always points at a complete block
+        with open(path + ".idx", "ab") as f:
+            f.write(INDEX.pack(offset, len(rows), first, last))
+        self.stats["blocks"] += 1
+        self.stats["raw_bytes"] += len(raw)
+        self.stats["written_bytes"] += BLOCK.size + len(compressed)
+
+    def prune(self) -> int:
+        """Delete day directories outside the retention window; returns days removed"""
+        if not self.retention_days or not os.path.isdir(self.path):
+            return 0
+        cutoff = _day(self.clock.time() - (self.retention_days - 1) * 86400)
+        removed = 0
+        for name in sorted(os.listdir(self.path)):
+            if not _DAY_DIR.match(name) or name >= cutoff:
+                continue
+            try:
+                shutil.rmtree(os.path.join(self.path, name))
+                removed += 1
+            except OSError as e:
+                logger.error(f"[MarketRecorder] Could not remove {name}: {e}")
+        if removed:
+            self.stats["pruned_days"] += removed
+            logger.info(f"[MarketRecorder] Removed {removed} day(s) older than {cutoff}")
+        return removed
+
+    def _prune_on_day_change(self):
+        today = _day(self.clock.time())
+        if today != self._pruned_day:
+            self._pruned_day = today
+            self.prune()
+
+    def _run(self):
+        while not self._stopping.is_set():
+            try:
+                self._prune_on_day_change()
+            except Exception as e:
+                logger.error(f"[MarketRecorder] Prune failed: {e}")
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"[MarketRecorder] Flush failed: {e}")
+        self.flush()
+
+    def start(self):
+        """Start the writer thread"""
+        if not self.enabled or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="market-recorder", daemon=True)
+        self._thread.start()
+        logger.info(f"[MarketRecorder] Recording to {self.path}")
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the writer thread after a final flush"""
+        thread = self._thread
+        if thread is None:
+            self.flush()
+            return
+        self._stopping.set()
+        self._wakeup.set()
+        thread.join(timeout)
+        self._thread = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        raw, written = self.stats["raw_bytes"], self.stats["written_bytes"]
+        return dict(self.stats, enabled=self.enabled, pending=len(self._pending),
+                    compression_ratio=round(raw / written, 2) if written else 0.0)
+
+
+class MarketRecordingReader:
+    """Range scans over recorded segments through memory maps"""
+
+    def __init__(self, path: str = "data/market_recordings"):
+        self.path = path
+
+    def days(self) -> List[str]:
+        if not os.path.isdir(self.path):
+            return []
+        return sorted(d for d in os.listdir(self.path) if os.path.isdir(os.path.join(self.path, d)))
+
+    def symbols(self, day: str, kind: int = TICK) -> List[str]:
+        directory = os.path.join(self.path, day)
+        if not os.path.isdir(directory):
+            return []
+        extension = EXTENSIONS[kind]
+        return sorted(name[:-len(extension)] for name in os.listdir(directory)
+                      if name.endswith(extension))
+
+    def _days_between(self, start: Optional[float], end: Optional[float]) -> List[str]:
+        days = self.days()
+        if start is None and end is None:
+            return days
+        first = _day(start) if start is not None else ""
+        last = _day(end) if end is not None else "9999-12-31"
+        return [d for d in days if first <= d <= last]
+
+    @staticmethod
+    def _index(path: str, mm: mmap.mmap) -> List[Tuple[int, int, int, int]]:
+        """Block index from the .idx sidecar, or by walking the headers"""
+        entries = []
+        try:
+            with open(path + ".idx", "rb") as f:
+                data = f.read()
+            usable = len(data) - len(data) % INDEX.size
+            entries = [INDEX.unpack_from(data, pos) for pos in range(0, usable, INDEX.size)]
+        except OSError:
+            pass
+        if entries:
+            return entries
+        offset = 0
+        while offset + BLOCK.size <= len(mm):
+            magic, _, rows, first, last, _, compressed, _ = BLOCK.unpack_from(mm, offset)
+            if magic != MAGIC or offset + BLOCK.size + compressed > len(mm):
+                break
+            entries.append((offset, rows, first, last))
+            offset += BLOCK.size + compressed
+        return entries
+
+    def _blocks(self, path: str, start_us: int, end_us: int) -> Iterator[Tuple[tuple, bytes]]:
+        """(header, raw column bytes) of every valid block overlapping the range"""
+        if not os.path.exists(path) or os.path.getsize(path) < BLOCK.size:
+            return
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for offset, _, first, last in self._index(path, mm):
+                if last < start_us or first > end_us or offset + BLOCK.size > len(mm):
+                    continue
+                header = BLOCK.unpack_from(mm, offset)
+                compressed = mm[offset + BLOCK.size:offset + BLOCK.size + header[6]]
+                if header[0] != MAGIC or len(compressed) != header[6] \
+                        or zlib.crc32(compressed) != header[7]:
+                    logger.warning(f"[MarketRecorder] Skipping corrupt block at {path}:{offset}")
+                    continue
+                yield header, zlib.decompress(compressed)
+
+    @staticmethod
+    def _bounds(start: Optional[float], end: Optional[float]) -> Tuple[int, int]:
+        start_us = int(round(start * 1e6)) if start is not None else -(2 ** 63)
+        end_us = int(round(end * 1e6)) if end is not None else 2 ** 63 - 1
+        return start_us, end_us
+
+    def read_ticks(self, symbol: str, start: Optional[float] = None,
+                   end: Optional[float] = None) -> Dict[str, np.ndarray]:
+        """Columns time (epoch seconds), bid, ask, volume for start <= time <= end"""
+        start_us, end_us = self._bounds(start, end)
+        parts: Dict[str, list] = {"time": [], **{name: [] for name in TICK_COLUMNS}}
+        for day in self._days_between(start, end):
+            path = os.path.join(self.path, day, _file_symbol(symbol) + EXTENSIONS[TICK])
+            for header, raw in self._blocks(path, start_us, end_us):
+                rows, first = header[2], header[3]
+                times = first + np.cumsum(np.frombuffer(raw, "<i8", rows, 0))
+                lo = np.searchsorted(times, start_us, "left")
+                hi = np.searchsorted(times, end_us, "right")
+                if lo >= hi:
+                    continue
+                parts["time"].append(times[lo:hi] / 1e6)
+                for i, name in enumerate(TICK_COLUMNS, start=1):
+                    parts[name].append(np.frombuffer(raw, "<f8", rows, rows * 8 * i)[lo:hi])
+        return {name: np.concatenate(chunks) if chunks else np.empty(0)
+                for name, chunks in parts.items()}
+
+    def read_alerts(self, symbol: Optional[str] = None, start: Optional[float] = None,
+                    end: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Alert payloads (decoded JSON) in time order; all symbols when symbol is None"""
+        start_us, end_us = self._bounds(start, end)
+        alerts = []
+        for day in self._days_between(start, end):
+            names = [_file_symbol(symbol)] if symbol else self.symbols(day, ALERT)
+            for name in names:
+                path = os.path.join(self.path, day, name + EXTENSIONS[ALERT])
+                for header, raw in self._blocks(path, start_us, end_us):
+                    rows, first = header[2], header[3]
+                    times = first + np.cumsum(np.frombuffer(raw, "<i8", rows, 0))
+                    lengths = np.frombuffer(raw, "<u4", rows, rows * 8)
+                    ends = rows * 12 + np.cumsum(lengths)
+                    for i in range(rows):
+                        if start_us <= times[i] <= end_us:
+                            blob = raw[ends[i] - lengths[i]:ends[i]]
+                            try:
+                                payload = json.loads(blob)
+                            except ValueError:
+                                payload = blob.decode(errors="replace")
+                            alerts.append({"time": times[i] / 1e6, "symbol": name,
+                                           "payload": payload})
+        alerts.sort(key=lambda alert: alert["time"])
+        return alerts
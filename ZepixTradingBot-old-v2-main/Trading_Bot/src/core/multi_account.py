@@ -0,0 +1,741 @@
+"""
+Multi-Account Execution - Fan one set of plugin decisions out to N accounts
+
+MT5Client wraps the process-global MetaTrader5 module, so a bot process can
+only drive one account. Instead of a full bot stack per account, the main
+bot stays the single decision maker (webhooks, Telegram, plugins) on its
+primary account, and every order it executes there is mirrored to extra
+accounts, each hosted in its own worker process:
+
+- Each worker owns its broker session (its own MetaTrader5 module, or the
+  in-memory PaperBroker) and its own risk state (daily loss limit, position
+  cap, lot bounds)
+- Lot sizes are scaled per account (fixed multiplier or by balance ratio)
+- Closes and SL/TP modifications follow the primary ticket to each mirror,
+  including primary closes the broker made itself (SL/TP, manual in MT5)
+- The primary -> mirror ticket map is persisted per account and reconciled
+  against the account's open positions on start and every status cycle
+- Results from all accounts are aggregated into one notification
+
+The coordinator subscribes to MT5Client execution events, so every order
+path (plugins, re-entries, profit booking, manual) is mirrored without
+changes to the callers.
+
+IPC protocol (pickled tuples over a multiprocessing Pipe):
+    core -> worker   ("place" | "close" | "modify" | "status", id, payload)
+                     ("stop", 0, None)
+    worker -> core   ("ready", 0, status) / ("init_error", 0, message)
+                     ("ok", id, result) / ("err", id, message)
+
+Config (`multi_account`):
+    enabled:                 Mirror primary executions to the accounts below
+    request_timeout_seconds: Per-account wait for a broker answer (default 15)
+    start_timeout_seconds:   Time allowed for a worker to log in (default 60)
+    reconcile_interval_seconds: Status/reconcile cycle per account (default 30)
+    state_dir:               Persisted mirror maps (default data/multi_account)
+    notify:                  Send an aggregated Telegram summary per order
+    accounts: [
+        {
+            "account_id": "prop_1",
+            "broker": "mt5" | "paper",
+            "login": 123, "password": "...", "server": "...",
+            "terminal_path": "C:/MT5_prop1/terminal64.exe",
+            "lot_scaling": "fixed" | "balance",
+            "lot_multiplier": 1.0,
+            "min_lot": 0.01, "max_lot": 10.0, "lot_step": 0.01,
+            "daily_loss_limit": 0,       # 0 disables
+            "max_open_positions": 0,     # 0 disables
+            "enabled": true
+        }
+    ]
+
+Version: 1.0.0
+Date: 2026-01-14
+"""
+
+import asyncio
+import concurrent.futures
+import itertools
+import json
+import logging
+import math
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.utils.clock import get_clock
+
+logger = logging.getLogger(__name__)
+
+# Main config keys a worker needs to build its own MT5Client
+BROKER_CONFIG_KEYS = ("symbol_mapping", "simulate_orders", "mt5_retries", "mt5_wait",
+                      "symbol_metadata_refresh_seconds", "account_state_ttl_seconds",
+                      "account_state_max_stale_seconds")
+
+
+class AccountWorkerError(RuntimeError):
+    """Account worker is not running or the broker call failed"""
+
+
+@dataclass
+class AccountSpec:
+    """One mirrored account from `multi_account.accounts`"""
+    account_id: str
+    broker: str = "mt5"
+    lot_scaling: str = "fixed"
+    lot_multiplier: float = 1.0
+    min_lot: float = 0.01
+    max_lot: float = 10.0
+    lot_step: float = 0.01
+    daily_loss_limit: float = 0.0
+    max_open_positions: int = 0
+    enabled: bool = True
+    state_path: str = ""
+    settings: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_config(cls, data: Dict[str, Any]) -> "AccountSpec":
+        return cls(
+            account_id=str(data.get("account_id") or data.get("login")),
+            broker=data.get("broker", "mt5"),
+            lot_scaling=data.get("lot_scaling", "fixed"),
+            lot_multiplier=float(data.get("lot_multiplier", 1.0)),
+            min_lot=float(data.get("min_lot", 0.01)),
+            max_lot=float(data.get("max_lot", 10.0)),
+            lot_step=float(data.get("lot_step", 0.01)),
+            daily_loss_limit=float(data.get("daily_loss_limit", 0.0)),
+            max_open_positions=int(data.get("max_open_positions", 0)),
+            enabled=data.get("enabled", True),
+            settings=dict(data),
+        )
+
+
+# ----------------------------------------------------------------------
+# Worker side
+# ----------------------------------------------------------------------
+
+class AccountRiskState:
+    """Per-account lot scaling and entry limits (lives in the worker)"""
+
+    def __init__(self, spec: AccountSpec):
+        self.spec = spec
+        self.day = None
+        self.day_start_balance = 0.0
+        self.halted_reason = ""
+
+    def roll_day(self, balance: float):
+        today = get_clock().today()
+        if self.day != today:
+            self.day = today
+            self.day_start_balance = balance
+            self.halted_reason = ""
+
+    def scale_lot(self, lot_size: float, balance: float, primary_balance: float) -> float:
+        """Primary lot scaled for this account, rounded down to the lot step (0 if too small)"""
+        lot = lot_size * self.spec.lot_multiplier
+        if self.spec.lot_scaling == "balance" and primary_balance > 0:
+            lot *= balance / primary_balance
+        step = self.spec.lot_step or 0.01
+        lot = round(math.floor(round(lot / step, 6)) * step, 2)
+        if lot < self.spec.min_lot:
+            return 0.0
+        return min(lot, self.spec.max_lot)
+
+    def daily_loss(self, equity: float) -> float:
+        return max(0.0, self.day_start_balance - equity)
+
+    def check_entry(self, equity: float, open_positions: int) -> Tuple[bool, str]:
+        """New entries only (closes and modifies are always mirrored)"""
+        limit = self.spec.daily_loss_limit
+        if limit and self.daily_loss(equity) >= limit:
+            self.halted_reason = f"daily loss limit ${limit:.2f} reached"
+            return False, self.halted_reason
+        cap = self.spec.max_open_positions
+        if cap and open_positions >= cap:
+            return False, f"max open positions ({cap}) reached"
+        return True, ""
+
+
+def _create_broker(spec: AccountSpec, broker_config: Dict[str, Any]):
+    if spec.broker == "paper":
+        from src.clients.paper_broker import PaperBroker
+        return PaperBroker(spec.settings)
+
+    from src.clients.mt5_client import MT5Client
+    config = {"mt5_retries": 3, "mt5_wait": 5, **broker_config}
+    config.update({
+        "mt5_login": spec.settings.get("login", 0),
+        "mt5_password": spec.settings.get("password", ""),
+        "mt5_server": spec.settings.get("server", ""),
+        "mt5_terminal_path": spec.settings.get("terminal_path"),
+    })
+    if "simulate_orders" in spec.settings:
+        config["simulate_orders"] = spec.settings["simulate_orders"]
+    return MT5Client(config)
+
+
+def _reports_positions(spec: AccountSpec, broker) -> bool:
+    """Simulated MT5 sessions list no positions, so their maps cannot be reconciled"""
+    if spec.broker == "paper":
+        return True
+    from src.clients.mt5_client import MT5_AVAILABLE
+    return MT5_AVAILABLE and not broker.config.get("simulate_orders", True)
+
+
+class _AccountRuntime:
+    """Serves one account inside the worker process"""
+
+    def __init__(self, conn, spec: AccountSpec, broker, reconcile_positions: bool = True):
+        self.conn = conn
+        self.spec = spec
+        self.broker = broker
+        self.risk = AccountRiskState(spec)
+        self.reconcile_positions = reconcile_positions
+        self.dropped_mirrors = 0
+        # Primary ticket -> this account's ticket (persisted, survives worker restarts)
+        self.mirrors: Dict[int, int] = self._load_mirrors()
+        self.reconcile()
+
+    def _load_mirrors(self) -> Dict[int, int]:
+        if not self.spec.state_path or not os.path.exists(self.spec.state_path):
+            return {}
+        try:
+            with open(self.spec.state_path) as f:
+                return {int(primary): int(mirror) for primary, mirror in json.load(f).items()}
+        except (OSError, ValueError) as e:
+            logger.error(f"[MultiAccount:{self.spec.account_id}] Could not load mirror map: {e}")
+            return {}
+
+    def _save_mirrors(self):
+        if not self.spec.state_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.spec.state_path) or ".", exist_ok=True)
+            tmp_path = self.spec.state_path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({str(primary): mirror for primary, mirror in self.mirrors.items()}, f)
+            os.replace(tmp_path, self.spec.state_path)
+        except OSError as e:
+            logger.error(f"[MultiAccount:{self.spec.account_id}] Could not save mirror map: {e}")
+
+    def reconcile(self) -> int:
+        """Drop mirrors whose position is gone (broker SL/TP, manual close); returns how many"""
+        if not self.reconcile_positions or not self.mirrors:
+            return 0
+        open_tickets = {p["ticket"] for p in self.broker.get_positions()}
+        gone = [primary for primary, mirror in self.mirrors.items() if mirror not in open_tickets]
+        for primary in gone:
+            del self.mirrors[primary]
+        if gone:
+            self.dropped_mirrors += len(gone)
+            self._save_mirrors()
+            logger.info(f"[MultiAccount:{self.spec.account_id}] {len(gone)} mirrored position(s) "
+                        f"closed at the broker")
+        return len(gone)
+
+    def status(self) -> Dict[str, Any]:
+        balance = self.broker.get_account_balance()
+        equity = self.broker.get_account_equity()
+        self.risk.roll_day(balance)
+        return {
+            "balance": balance,
+            "equity": equity,
+            "open_positions": len(self.mirrors),
+            "dropped_mirrors": self.dropped_mirrors,
+            "daily_loss": round(self.risk.daily_loss(equity), 2),
+            "halted": self.risk.halted_reason,
+        }
+
+    def place(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        balance = self.broker.get_account_balance()
+        self.risk.roll_day(balance)
+        self.reconcile()
+        allowed, reason = self.risk.check_entry(self.broker.get_account_equity(), len(self.mirrors))
+        if not allowed:
+            return {"status": "skipped", "reason": reason}
+
+        lot = self.risk.scale_lot(payload["lot_size"], balance, payload.get("primary_balance") or 0.0)
+        if lot <= 0:
+            return {"status": "skipped", "reason": f"scaled lot below minimum {self.spec.min_lot}"}
+
+        ticket = self.broker.place_order(
+            symbol=payload["symbol"], order_type=payload["order_type"], lot_size=lot,
+            price=payload.get("price", 0.0), sl=payload.get("sl", 0.0), tp=payload.get("tp"),
+            comment=payload.get("comment", "")
+        )
+        if not ticket:
+            return {"status": "rejected", "reason": "broker rejected order", "lot_size": lot}
+        self.mirrors[payload["ticket"]] = ticket
+        self._save_mirrors()
+        return {"status": "filled", "ticket": ticket, "lot_size": lot}
+
+    def close(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        ticket = self.mirrors.get(payload["ticket"])
+        if ticket is None:
+            return {"status": "skipped", "reason": "no mirrored position"}
+        percentage = payload.get("percentage", 100)
+        if not self.broker.close_position(ticket, percentage):
+            return {"status": "rejected", "ticket": ticket, "reason": "broker rejected close"}
+        if percentage >= 100:
+            del self.mirrors[payload["ticket"]]
+            self._save_mirrors()
+        return {"status": "closed", "ticket": ticket}
+
+    def modify(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        ticket = self.mirrors.get(payload["ticket"])
+        if ticket is None:
+            return {"status": "skipped", "reason": "no mirrored position"}
+        if not self.broker.modify_position(ticket, sl=payload.get("sl"), tp=payload.get("tp")):
+            return {"status": "rejected", "ticket": ticket, "reason": "broker rejected modify"}
+        return {"status": "modified", "ticket": ticket}
+
+    def run(self):
+        def status(payload):
+            self.reconcile()
+            return self.status()
+
+        handlers = {"place": self.place, "close": self.close, "modify": self.modify,
+                    "status": status}
+        while True:
+            try:
+                kind, msg_id, payload = self.conn.recv()
+            except (EOFError, OSError):
+                break
+            if kind == "stop":
+                break
+            try:
+                result = handlers[kind](payload)
+                if kind != "status":
+                    result["account"] = self.status()
+                self.conn.send(("ok", msg_id, result))
+            except Exception as e:
+                self.conn.send(("err", msg_id, f"{type(e).__name__}: {e}"))
+        try:
+            self.broker.shutdown()
+        except Exception:
+            pass
+
+
+def _account_worker_main(conn, spec: AccountSpec, broker_config: Dict[str, Any]):
+    """Process entry point"""
+    logging.basicConfig(level=logging.INFO)
+    try:
+        broker = _create_broker(spec, broker_config)
+        if not broker.initialize():
+            conn.send(("init_error", 0, "broker login failed"))
+            return
+        runtime = _AccountRuntime(conn, spec, broker, _reports_positions(spec, broker))
+        conn.send(("ready", 0, runtime.status()))
+    except Exception as e:
+        conn.send(("init_error", 0, f"{type(e).__name__}: {e}"))
+        return
+    runtime.run()
+
+
+# ----------------------------------------------------------------------
+# Core side
+# ----------------------------------------------------------------------
+
+class AccountWorkerHandle:
+    """Core-side connection to one account worker process"""
+
+    def __init__(self, spec: AccountSpec, broker_config: Dict[str, Any],
+                 request_timeout: float = 15.0, start_timeout: float = 60.0):
+        self.spec = spec
+        self.account_id = spec.account_id
+        self.broker_config = broker_config
+        self.request_timeout = request_timeout
+        self.start_timeout = start_timeout
+
+        self.process = None
+        self.conn = None
+        self.last_status: Dict[str, Any] = {}
+        self.restarts = 0
+        self.stats = {"requests": 0, "filled": 0, "rejected": 0, "skipped": 0,
+                      "errors": 0, "timeouts": 0, "last_latency_ms": 0.0}
+
+        self._send_lock = threading.Lock()
+        self._pending: Dict[int, concurrent.futures.Future] = {}
+        self._ids = itertools.count(1)
+
+    @property
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    def start(self) -> bool:
+        """Spawn the worker and wait for the broker login"""
+        context = multiprocessing.get_context("spawn")
+        parent_conn, child_conn = context.Pipe()
+        self.conn = parent_conn
+        self.process = context.Process(
+            target=_account_worker_main,
+            args=(child_conn, self.spec, self.broker_config),
+            name=f"account-{self.account_id}",
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+
+        try:
+            if not parent_conn.poll(self.start_timeout):
+                raise AccountWorkerError("worker did not report ready")
+            kind, _, payload = parent_conn.recv()
+            if kind != "ready":
+                raise AccountWorkerError(payload)
+        except (AccountWorkerError, EOFError, OSError) as e:
+            logger.error(f"[MultiAccount:{self.account_id}] Start failed: {e}")
+            self.stop()
+            return False
+
+        self.last_status = payload
+        threading.Thread(target=self._read_loop, args=(parent_conn,),
+                         name=f"account-handle-{self.account_id}", daemon=True).start()
+        logger.info(f"[MultiAccount:{self.account_id}] Worker started in process {self.process.pid} "
+                    f"(balance ${payload.get('balance', 0):.2f})")
+        return True
+
+    def stop(self, timeout: float = 5.0):
+        if self.conn is not None:
+            try:
+                with self._send_lock:
+                    self.conn.send(("stop", 0, None))
+            except Exception:
+                pass
+        if self.process is not None:
+            self.process.join(timeout)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join(timeout)
+        if self.conn is not None:
+            self.conn.close()
+        self._fail_pending(AccountWorkerError(f"account {self.account_id} stopped"))
+        self.process = None
+        self.conn = None
+
+    def send(self, kind: str, payload: Any) -> Tuple[int, concurrent.futures.Future]:
+        """Queue a request (synchronous, so requests reach the worker in call order)"""
+        if not self.is_alive or self.conn is None:
+            raise AccountWorkerError(f"account {self.account_id} is not running")
+        msg_id = next(self._ids)
+        future = concurrent.futures.Future()
+        self._pending[msg_id] = future
+        with self._send_lock:
+            self.conn.send((kind, msg_id, payload))
+        return msg_id, future
+
+    def try_send(self, kind: str, payload: Any):
+        """send() that returns the error instead of raising"""
+        try:
+            return self.send(kind, payload)
+        except AccountWorkerError as e:
+            return e
+
+    async def collect(self, kind: str, sent) -> Dict[str, Any]:
+        """Wait for the answer to a try_send() and update account stats"""
+        self.stats["requests"] += 1
+        if isinstance(sent, Exception):
+            self.stats["errors"] += 1
+            return {"status": "error", "reason": str(sent)}
+        msg_id, future = sent
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(asyncio.wrap_future(future), self.request_timeout)
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            return {"status": "error", "reason": f"timed out after {self.request_timeout}s"}
+        except AccountWorkerError as e:
+            self.stats["errors"] += 1
+            return {"status": "error", "reason": str(e)}
+        finally:
+            self._pending.pop(msg_id, None)
+
+        self.stats["last_latency_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        if kind == "status":
+            self.last_status = result
+        elif "account" in result:
+            self.last_status = result["account"]
+        status = result.get("status")
+        if status in ("filled", "rejected", "skipped"):
+            self.stats[status] += 1
+        return result
+
+    async def request(self, kind: str, payload: Any = None) -> Dict[str, Any]:
+        """Send a request and wait for the account's answer"""
+        return await self.collect(kind, self.try_send(kind, payload))
+
+    def _fail_pending(self, error: Exception):
+        for future in list(self._pending.values()):
+            if not future.done():
+                future.set_exception(error)
+        self._pending.clear()
+
+    def _read_loop(self, conn):
+        while True:
+            try:
+                kind, msg_id, payload = conn.recv()
+            except (EOFError, OSError):
+                if self.conn is conn:
+                    logger.error(f"[MultiAccount:{self.account_id}] Worker process exited")
+                    self._fail_pending(AccountWorkerError(f"account {self.account_id} exited"))
+                return
+            future = self._pending.get(msg_id)
+            if future is None or future.done():
+                continue
+            if kind == "ok":
+                future.set_result(payload)
+            else:
+                future.set_exception(AccountWorkerError(payload))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "pid": self.process.pid if self.process else None,
+            "alive": self.is_alive,
+            "broker": self.spec.broker,
+            "restarts": self.restarts,
+            **self.stats,
+            **self.last_status,
+        }
+
+
+class AccountCoordinator:
+    """
+    Mirrors primary-account executions to per-account worker processes.
+
+    Registered as an MT5Client execution listener. Listener calls only queue
+    the fan-out on the event loop; the primary order path never waits for
+    the mirrors.
+    """
+
+    def __init__(self, config: Dict[str, Any], broker_config: Optional[Dict[str, Any]] = None,
+                 primary_client=None, notifier: Optional[Callable[[str], Any]] = None):
+        self.config = config or {}
+        self.enabled = self.config.get("enabled", False)
+        self.notify = self.config.get("notify", True)
+        self.primary_client = primary_client
+        self.notifier = notifier
+        self.broker_config = broker_config or {}
+        self.reconcile_interval = self.config.get("reconcile_interval_seconds", 30.0)
+        state_dir = self.config.get("state_dir", "data/multi_account")
+
+        self.workers: Dict[str, AccountWorkerHandle] = {}
+        for data in self.config.get("accounts", []):
+            spec = AccountSpec.from_config(data)
+            if not spec.enabled:
+                continue
+            spec.state_path = os.path.join(state_dir, f"{spec.account_id}.mirrors.json")
+            self.workers[spec.account_id] = AccountWorkerHandle(
+                spec, self.broker_config,
+                request_timeout=self.config.get("request_timeout_seconds", 15.0),
+                start_timeout=self.config.get("start_timeout_seconds", 60.0)
+            )
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: set = set()
+        self._reconcile_task: Optional[asyncio.Task] = None
+        # Primary tickets whose full close was already mirrored by the execution listener
+        self._followed_closes: "OrderedDict[int, None]" = OrderedDict()
+        self.stats = {"fan_outs": 0, "failures": 0, "external_closes": 0}
+        self.last_results: List[Dict[str, Any]] = []
+
+    @classmethod
+    def from_config(cls, config, primary_client=None, notifier=None) -> "AccountCoordinator":
+        """Build from the main bot config"""
+        broker_config = {key: config.get(key) for key in BROKER_CONFIG_KEYS if config.get(key) is not None}
+        return cls(config.get("multi_account", {}), broker_config, primary_client, notifier)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    @property
+    def active_workers(self) -> List[AccountWorkerHandle]:
+        return [w for w in self.workers.values() if w.is_alive]
+
+    async def start(self) -> int:
+        """Start all account workers in parallel; returns how many logged in"""
+        self._loop = asyncio.get_running_loop()
+        started = await asyncio.gather(*(asyncio.to_thread(w.start) for w in self.workers.values()))
+        count = sum(1 for ok in started if ok)
+        logger.info(f"[MultiAccount] {count}/{len(self.workers)} account workers running")
+        if self.reconcile_interval and self._reconcile_task is None:
+            self._reconcile_task = asyncio.create_task(self._reconcile_loop())
+        return count
+
+    async def _reconcile_loop(self):
+        """Each status request makes the workers reconcile their maps against the broker"""
+        while True:
+            await asyncio.sleep(self.reconcile_interval)
+            try:
+                await self.refresh_status()
+            except Exception as e:
+                logger.error(f"[MultiAccount] Status cycle failed: {e}")
+
+    async def stop(self):
+        if self._reconcile_task is not None:
+            self._reconcile_task.cancel()
+            self._reconcile_task = None
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        await asyncio.gather(*(asyncio.to_thread(w.stop) for w in self.workers.values()))
+
+    async def restart_account(self, account_id: str) -> bool:
+        worker = self.workers.get(account_id)
+        if worker is None:
+            return False
+        await asyncio.to_thread(worker.stop)
+        worker.restarts += 1
+        return await asyncio.to_thread(worker.start)
+
+    # ------------------------------------------------------------------
+    # Fan-out
+    # ------------------------------------------------------------------
+
+    def on_primary_execution(self, event: str, payload: Dict[str, Any]):
+        """MT5Client execution listener ("place" / "close" / "modify")"""
+        if event == "close" and payload.get("percentage", 100) >= 100:
+            self._followed_closes[payload.get("ticket")] = None
+            while len(self._followed_closes) > 1000:
+                self._followed_closes.popitem(last=False)
+        self._dispatch(event, payload)
+
+    def on_primary_closed(self, event):
+        """
+        OrderClosed subscriber: mirrors closes the bot did not execute itself
+        (broker SL/TP, manual close in MT5 found by reconcile_with_mt5).
+        """
+        ticket = event.trade_id
+        if not ticket:
+            return
+        if ticket in self._followed_closes:
+            del self._followed_closes[ticket]
+            return
+        self.stats["external_closes"] += 1
+        self._dispatch("close", {"ticket": ticket, "percentage": 100, "reason": event.reason})
+
+    def _dispatch(self, event: str, payload: Dict[str, Any]):
+        if not self.active_workers or self._loop is None:
+            return
+        payload = dict(payload)
+        if event == "place" and self.primary_client is not None:
+            try:
+                payload["primary_balance"] = self.primary_client.get_account_balance()
+            except Exception:
+                payload["primary_balance"] = 0.0
+
+        # Send now, in execution order, and collect the answers on the loop
+        sent = [(w, w.try_send(event, payload)) for w in self.active_workers]
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._track(self._loop.create_task(self._collect(event, payload, sent)))
+        else:
+            self._loop.call_soon_threadsafe(
+                lambda: self._track(self._loop.create_task(self._collect(event, payload, sent))))
+
+    def _track(self, task: asyncio.Task):
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _collect(self, event: str, payload: Dict[str, Any], sent) -> Dict[str, Any]:
+        started = time.perf_counter()
+        answers = await asyncio.gather(*(w.collect(event, s) for w, s in sent))
+        results = {w.account_id: answer for (w, _), answer in zip(sent, answers)}
+        summary = self._summarize(event, payload, results, started)
+        self._record(summary)
+        await self._notify(summary)
+        return summary
+
+    async def fan_out(self, event: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Send one execution to every account and wait for all answers"""
+        started = time.perf_counter()
+        workers = self.active_workers
+        answers = await asyncio.gather(*(w.request(event, payload) for w in workers))
+        summary = self._summarize(event, payload, {w.account_id: a for w, a in zip(workers, answers)}, started)
+        self._record(summary)
+        return summary
+
+    async def drain(self):
+        """Wait for queued fan-outs (tests, shutdown)"""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def _summarize(self, event: str, payload: Dict[str, Any], results: Dict[str, Dict],
+                   started: float) -> Dict[str, Any]:
+        ok_states = {"filled", "closed", "modified"}
+        return {
+            "event": event,
+            "primary_ticket": payload.get("ticket"),
+            "symbol": payload.get("symbol"),
+            "order_type": payload.get("order_type"),
+            "lot_size": payload.get("lot_size"),
+            "accounts": results,
+            "succeeded": sum(1 for r in results.values() if r.get("status") in ok_states),
+            "skipped": sum(1 for r in results.values() if r.get("status") == "skipped"),
+            "failed": sum(1 for r in results.values() if r.get("status") in ("rejected", "error")),
+            "latency_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+
+    def _record(self, summary: Dict[str, Any]):
+        self.stats["fan_outs"] += 1
+        if summary["failed"]:
+            self.stats["failures"] += 1
+            logger.warning(f"[MultiAccount] {summary['event']} #{summary['primary_ticket']}: "
+                           f"{summary['failed']} account(s) failed")
+        self.last_results.append(summary)
+        del self.last_results[:-50]
+
+    @staticmethod
+    def format_summary(summary: Dict[str, Any]) -> str:
+        """Aggregated Telegram message for one fan-out"""
+        event = summary["event"]
+        if event == "place":
+            title = (f"📡 Mirrored {str(summary.get('order_type', '')).upper()} {summary.get('symbol')} "
+                     f"#{summary['primary_ticket']}")
+        else:
+            title = f"📡 Mirrored {event} #{summary['primary_ticket']}"
+        total = len(summary["accounts"])
+        lines = [title, f"✅ {summary['succeeded']}/{total} accounts"
+                        f" | ⏭ {summary['skipped']} skipped | ❌ {summary['failed']} failed"]
+        for account_id, result in summary["accounts"].items():
+            status = result.get("status")
+            if status == "filled":
+                lines.append(f"• {account_id}: {result['lot_size']} lots #{result['ticket']}")
+            elif status not in ("closed", "modified"):
+                lines.append(f"• {account_id}: {status} - {result.get('reason', '')}")
+        return "\n".join(lines)
+
+    async def _notify(self, summary: Dict[str, Any]):
+        # Entries always; closes/modifies only when an account did not follow
+        if not (self.notify and self.notifier):
+            return
+        if summary["event"] != "place" and not summary["failed"]:
+            return
+        try:
+            result = self.notifier(self.format_summary(summary))
+            if asyncio.iscoroutine(result):
+                await result
+        except Exception as e:
+            logger.error(f"[MultiAccount] Notification failed: {e}")
+
+    # ------------------------------------------------------------------
+    # Status
+    # ------------------------------------------------------------------
+
+    async def refresh_status(self) -> Dict[str, Dict[str, Any]]:
+        workers = self.active_workers
+        answers = await asyncio.gather(*(w.request("status") for w in workers))
+        return {w.account_id: a for w, a in zip(workers, answers)}
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "accounts": {account_id: w.get_stats() for account_id, w in self.workers.items()},
+            "pending_fan_outs": len(self._tasks),
+            **self.stats,
+        }
@@ -0,0 +1,369 @@
+"""
+Order Templates - Pre-armed order parameters per plugin, symbol, logic and direction
+
+Entry paths used to resolve the account tier lot, plugin sizing parameters,
+fallback SL pips and symbol constraints on every signal before place_order
+could run. Almost none of these inputs change between signals, so they are
+compiled once into an immutable OrderTemplate and kept warm.
+
+A template is rebuilt only when its fingerprint changes:
+- Balance tier (from the cached account snapshot)
+- Config version (Config.snapshot.version, plus explicit invalidation)
+- Symbol metadata (SymbolRegistry entry reload)
+
+At entry time a plugin only applies the live price to the template (pure
+arithmetic, no broker or config lookups) and sends the order.
+
+Config (order_templates section):
+- enabled: Keep templates warm in the background (default: True)
+- refresh_seconds: Interval between fingerprint checks (default: 5)
+- symbols: Symbols to pre-arm (default: keys of symbol_config)
+
+Version: 1.0.0
+Date: 2026-01-14
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Dict, Any, Optional, Callable, Iterable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+DIRECTIONS = ("BUY", "SELL")
+
+# MT5 SYMBOL_TRADE_MODE_DISABLED
+TRADE_MODE_DISABLED = 0
+
+TemplateKey = Tuple[str, str, str, str]
+ParamsProvider = Callable[[str, str], Dict[str, Any]]
+
+
+@dataclass(frozen=True)
+class OrderTemplate:
+    """Pre-computed, price-independent order parameters"""
+    plugin_id: str
+    symbol: str
+    logic: str
+    direction: str
+    base_lot: float
+    lot_multiplier: float = 1.0
+    split_ratio: float = 0.5
+    fixed_sl_dollars: float = 10.0
+    fixed_sl_pip_value: float = 10.0
+    fallback_sl_pips: float = 50.0
+    rr_ratio: float = 1.5
+    min_stop_distance: float = 0.0
+    valid: bool = True
+    reason: str = ""
+    fingerprint: Tuple = ()
+    built_at: float = 0.0
+
+    @property
+    def is_buy(self) -> bool:
+        return self.direction.lower() == "buy"
+
+    @staticmethod
+    def point_value(price: float) -> float:
+        """Price unit used by the fixed-dollar and fallback SL rules"""
+        return 0.01 if price > 100 else 0.0001
+
+    def lot_for(self, multiplier: float = 1.0) -> float:
+        """Final lot for this entry (base lot x plugin multiplier x signal multiplier)"""
+        return self.base_lot * self.lot_multiplier * multiplier
+
+    def split(self, lot_size: float) -> Tuple[float, float]:
+        """Split a lot into (Order A, Order B) by split_ratio"""
+        return lot_size * self.split_ratio, lot_size * (1 - self.split_ratio)
+
+    def _offset(self, price: float, distance: float) -> float:
+        return price - distance if self.is_buy else price + distance
+
+    def fixed_dollar_sl(self, price: float, lot_size: float) -> float:
+        """SL that risks fixed_sl_dollars at lot_size (pyramid Order B rule)"""
+        sl_distance_pips = self.fixed_sl_dollars / (lot_size * self.fixed_sl_pip_value)
+        return self._offset(price, sl_distance_pips * self.point_value(price) * 10)
+
+    def fallback_sl(self, price: float) -> float:
+        """SL fallback_sl_pips away from price (used when the alert carries no SL)"""
+        return self._offset(price, self.fallback_sl_pips * self.point_value(price))
+
+    def tp_for(self, price: float, sl_price: float, rr_ratio: Optional[float] = None) -> float:
+        """TP at rr_ratio times the SL distance"""
+        rr = self.rr_ratio if rr_ratio is None else rr_ratio
+        return self._offset(price, -abs(price - sl_price) * rr)
+
+    def check_stops(self, price: float, sl_price: float, tp_price: Optional[float] = None) -> Tuple[bool, str]:
+        """Cheap pre-send check of SL/TP side and broker minimum distance"""
+        if self.is_buy and sl_price >= price or not self.is_buy and sl_price <= price:
+            return False, f"SL {sl_price} on wrong side of entry {price}"
+        if abs(price - sl_price) < self.min_stop_distance:
+            return False, f"SL distance below broker minimum {self.min_stop_distance}"
+        if tp_price is not None and (self.is_buy and tp_price <= price or not self.is_buy and tp_price >= price):
+            return False, f"TP {tp_price} on wrong side of entry {price}"
+        return True, ""
+
+
+class OrderTemplateService:
+    """
+    Cache of OrderTemplates keyed by (plugin_id, symbol, logic, direction).
+
+    Plugins register a params provider returning their sizing parameters for a
+    logic route and direction; the service combines it with the tier lot and
+    symbol constraints. Keys used once stay armed and are rebuilt by refresh()
+    when their fingerprint moves, so the next entry finds them warm.
+    """
+
+    def __init__(self, config, mt5_client=None, risk_manager=None, refresh_interval: float = 5.0):
+        """
+        Args:
+            config: Bot config (fixed_lot_sizes, risk_config, symbol_config)
+            mt5_client: Source of the account snapshot and symbol metadata
+            risk_manager: Resolves the tier lot for a balance
+            refresh_interval: Seconds between background fingerprint checks
+        """
+        self.config = config
+        self.mt5_client = mt5_client
+        self.risk_manager = risk_manager
+        self.refresh_interval = refresh_interval
+        self._templates: Dict[TemplateKey, OrderTemplate] = {}
+        self._providers: Dict[str, ParamsProvider] = {}
+        self._logics: Dict[str, Tuple[str, ...]] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {"hits": 0, "builds": 0, "rebuilds": 0,
+                      "invalidations": 0, "failures": 0, "refresh_passes": 0}
+
+        if hasattr(config, "subscribe"):
+            config.subscribe(lambda changed, snapshot: self.invalidate(reason="config"))
+
+    # ------------------------------------------------------------------
+    # Registration
+    # ------------------------------------------------------------------
+
+    def register_plugin(self, plugin_id: str, params: Optional[ParamsProvider] = None,
+                        logics: Iterable[str] = ("default",)):
+        """
+        Register a plugin's sizing parameters.
+
+        Args:
+            plugin_id: Plugin identifier
+            params: Callable(logic, direction) -> dict with any OrderTemplate
+                    parameter (lot_multiplier, split_ratio, fixed_sl_dollars,
+                    rr_ratio, fallback_sl_pips)
+            logics: Logic routes to pre-arm for this plugin
+        """
+        if params is not None:
+            self._providers[plugin_id] = params
+        self._logics[plugin_id] = tuple(logics)
+        self.invalidate(plugin_id, reason="register")
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def get(self, plugin_id: str, symbol: str, logic: str = "default",
+            direction: str = "BUY") -> Optional[OrderTemplate]:
+        """Get the template for a key, building or rebuilding it if its inputs changed"""
+        key = (plugin_id, symbol, logic, direction.upper())
+        fingerprint = self._fingerprint(symbol)
+        template = self._templates.get(key)
+        if template and template.fingerprint == fingerprint:
+            self.stats["hits"] += 1
+            return template
+
+        with self._lock:
+            template = self._templates.get(key)
+            if template and template.fingerprint == fingerprint:
+                self.stats["hits"] += 1
+                return template
+
+            built = self._build(key, fingerprint)
+            if built is None:
+                self.stats["failures"] += 1
+                # Keep serving the previous template rather than blocking the entry
+                return template
+
+            self.stats["rebuilds" if template else "builds"] += 1
+            self._templates[key] = built
+            return built
+
+    def arm(self, plugin_id: str, symbols: Iterable[str], logics: Optional[Iterable[str]] = None,
+            directions: Iterable[str] = DIRECTIONS) -> int:
+        """Build templates ahead of the first signal. Returns count armed."""
+        logics = tuple(logics) if logics is not None else self._logics.get(plugin_id, ("default",))
+        count = 0
+        for symbol in symbols:
+            for logic in logics:
+                for direction in directions:
+                    if self.get(plugin_id, symbol, logic, direction) is not None:
+                        count += 1
+        return count
+
+    def refresh(self) -> int:
+        """Rebuild armed templates whose fingerprint changed. Returns count rebuilt."""
+        self.stats["refresh_passes"] += 1
+        rebuilt = 0
+        fingerprints: Dict[str, Tuple] = {}
+        for key, template in list(self._templates.items()):
+            symbol = key[1]
+            if symbol not in fingerprints:
+                fingerprints[symbol] = self._fingerprint(symbol)
+            if template.fingerprint != fingerprints[symbol]:
+                self.get(*key)
+                rebuilt += 1
+        return rebuilt
+
+    def invalidate(self, plugin_id: Optional[str] = None, symbol: Optional[str] = None, reason: str = ""):
+        """
+        Force rebuild of matching templates on next use.
+
+        Entries stay in place (so refresh() keeps them armed); bumping the
+        generation makes every fingerprint mismatch.
+        """
+        with self._lock:
+            if plugin_id is None and symbol is None:
+                self._generation += 1
+            else:
+                for key, template in list(self._templates.items()):
+                    if (plugin_id is None or key[0] == plugin_id) and (symbol is None or key[1] == symbol):
+                        self._templates[key] = _expire(template)
+        self.stats["invalidations"] += 1
+        logger.debug(f"[ORDER_TEMPLATES] Invalidated plugin={plugin_id} symbol={symbol}: {reason or 'manual'}")
+
+    # ------------------------------------------------------------------
+    # Fingerprint and build
+    # ------------------------------------------------------------------
+
+    def _balance(self) -> float:
+        if self.mt5_client is None:
+            return 0.0
+        if hasattr(self.mt5_client, "get_account_snapshot"):
+            snapshot = self.mt5_client.get_account_snapshot()
+            return snapshot.balance if snapshot else 0.0
+        return self.mt5_client.get_account_balance()
+
+    def _balance_tier(self, balance: float) -> Tuple:
+        """Balance-dependent inputs of RiskManager.get_fixed_lot_size"""
+        overrides = self.config.get("manual_lot_overrides", {}) or {}
+        override = int(balance) if str(int(balance)) in overrides else None
+        brackets = [int(k) for k in (self.config.get("fixed_lot_sizes", {}) or {})]
+        eligible = [b for b in brackets if balance >= b]
+        return (self.config.get("default_risk_tier"), override, max(eligible) if eligible else None)
+
+    def _config_version(self) -> int:
+        snapshot = getattr(self.config, "snapshot", None)
+        return getattr(snapshot, "version", 0)
+
+    def _symbol_metadata(self, symbol: str):
+        registry = getattr(self.mt5_client, "symbol_registry", None)
+        return registry.get(symbol) if registry is not None else None
+
+    def _fingerprint(self, symbol: str) -> Tuple:
+        balance = self._balance()
+        meta = self._symbol_metadata(symbol)
+        return (
+            self._generation,
+            self._balance_tier(balance),
+            self._config_version(),
+            meta.loaded_at if meta else None,
+        )
+
+    def _build(self, key: TemplateKey, fingerprint: Tuple) -> Optional[OrderTemplate]:
+        plugin_id, symbol, logic, direction = key
+        try:
+            balance = self._balance()
+            base_lot = self.risk_manager.get_fixed_lot_size(balance) if self.risk_manager else 0.01
+            meta = self._symbol_metadata(symbol)
+            risk_config = self.config.get("risk_config", {}) or {}
+
+            params = {"fallback_sl_pips": risk_config.get("default_sl_pips", 50)}
+            provider = self._providers.get(plugin_id)
+            if provider:
+                params.update(provider(logic, direction) or {})
+
+            valid, reason = True, ""
+            if base_lot <= 0:
+                valid, reason = False, f"No lot size for balance {balance}"
+            elif meta is not None and meta.source == "broker" and meta.trade_mode == TRADE_MODE_DISABLED:
+                valid, reason = False, f"Trading disabled for {symbol}"
+
+            return OrderTemplate(
+                plugin_id=plugin_id,
+                symbol=symbol,
+                logic=logic,
+                direction=direction,
+                base_lot=base_lot,
+                min_stop_distance=meta.min_stop_distance if meta else 0.0,
+                valid=valid,
+                reason=reason,
+                fingerprint=fingerprint,
+                built_at=time.time(),
+                **{k: v for k, v in params.items() if k in _PARAM_FIELDS},
+            )
+        except Exception as e:
+            logger.error(f"[ORDER_TEMPLATES] Failed to build {key}: {e}")
+            return None
+
+    # ------------------------------------------------------------------
+    # Background refresh
+    # ------------------------------------------------------------------
+
+    def armed_symbols(self) -> List[str]:
+        """Symbols to pre-arm (order_templates.symbols, else symbol_config keys)"""
+        section = self.config.get("order_templates", {}) or {}
+        symbols = section.get("symbols") or list((self.config.get("symbol_config", {}) or {}).keys())
+        return list(symbols)
+
+    def prewarm(self) -> int:
+        """Arm every registered plugin for the configured symbols"""
+        symbols = self.armed_symbols()
+        return sum(self.arm(plugin_id, symbols) for plugin_id in list(self._logics))
+
+    async def start(self):
+        """Pre-arm registered plugins and start the refresh loop"""
+        if self._task and not self._task.done():
+            return
+        self.prewarm()
+        self._task = asyncio.create_task(self._loop())
+        logger.info(f"[ORDER_TEMPLATES] Started ({len(self._templates)} templates armed)")
+
+    async def stop(self):
+        """Stop the refresh loop"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _loop(self):
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"[ORDER_TEMPLATES] Refresh error: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache statistics for diagnostics"""
+        lookups = self.stats["hits"] + self.stats["builds"] + self.stats["rebuilds"]
+        return {
+            **self.stats,
+            "templates": len(self._templates),
+            "plugins": sorted(self._logics),
+            "hit_rate": round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+        }
+
+
+_PARAM_FIELDS = {"lot_multiplier", "split_ratio", "fixed_sl_dollars",
+                 "fixed_sl_pip_value", "fallback_sl_pips", "rr_ratio"}
+
+
+def _expire(template: OrderTemplate) -> OrderTemplate:
+    """Copy of template whose fingerprint can never match"""
+    return replace(template, fingerprint=("expired",))
@@ -6,7 +6,8 @@ Provides isolated database access for each plugin with connection pooling.
 
 Features:
 - Per-plugin database isolation (V3 and V6 cannot access each other's data)
-- Thread-safe connection pooling
+- Thread-safe connection pooling (shared database access layer:
+  one writer plus pooled WAL readers per file)
 - Automatic schema creation
 - Transaction support
 - Query logging and statistics
@@ -23,7 +24,9 @@ from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 from contextlib import contextmanager
-from queue import Queue, Empty
+from queue import Empty
+
+from src.core.database_access import DatabasePool, get_db_pool, close_db_pool
 
 logger = logging.getLogger(__name__)
 
@@ -75,9 +78,7 @@ class PluginDatabase:
         
         self.db_path = os.path.join(db_dir, f"zepix_{plugin_id}.db")
         
-        self._pool: Queue = Queue(maxsize=pool_size)
-        self._pool_lock = threading.Lock()
-        self._local = threading.local()
+        self._db: Optional[DatabasePool] = None
         
         self.stats = DatabaseStats()
         self._stats_lock = threading.Lock()
@@ -90,9 +91,7 @@ class PluginDatabase:
         
         is_new_db = not os.path.exists(self.db_path)
         
-        for _ in range(self.pool_size):
-            conn = self._create_connection()
-            self._pool.put(conn)
+        self._db = self._open_pool()
         
         if is_new_db:
             logger.info(f"Creating new database for plugin: {self.plugin_id}")
@@ -103,42 +102,41 @@ class PluginDatabase:
         with self._stats_lock:
             self.stats.connection_count = self.pool_size
     
-    def _create_connection(self) -> sqlite3.Connection:
-        """Create a new database connection."""
-        conn = sqlite3.connect(
+    def _open_pool(self) -> DatabasePool:
+        """Get the shared pool for this plugin's database file."""
+        return get_db_pool(
             self.db_path,
-            timeout=self.timeout,
-            check_same_thread=False
+            row_factory=sqlite3.Row,
+            reader_pool_size=self.pool_size,
+            busy_timeout_ms=int(self.timeout * 1000)
         )
-        conn.row_factory = sqlite3.Row
-        
-        conn.execute("PRAGMA journal_mode=WAL")
-        conn.execute("PRAGMA synchronous=NORMAL")
-        conn.execute("PRAGMA foreign_keys=ON")
-        
-        return conn
+    
+    @property
+    def pool(self) -> DatabasePool:
+        """Shared pool, reopened if it was closed elsewhere."""
+        if self._db is None or self._db.closed:
+            self._db = self._open_pool()
+        return self._db
     
     @contextmanager
     def get_connection(self):
         """
-        Get a connection from the pool.
+        Get a reader connection from the pool.
+        
+        Use transaction() for writes.
         
         Usage:
             with db.get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT * FROM trades")
         """
-        conn = None
         try:
-            conn = self._pool.get(timeout=self.timeout)
-            yield conn
+            with self.pool.reader() as conn:
+                yield conn
         except Empty:
             raise ConnectionPoolExhausted(
                 f"Connection pool exhausted for plugin {self.plugin_id}"
             )
-        finally:
-            if conn:
-                self._pool.put(conn)
     
     @contextmanager
     def transaction(self):
@@ -150,17 +148,12 @@ class PluginDatabase:
                 conn.execute("INSERT INTO trades ...")
                 conn.execute("UPDATE stats ...")
         """
-        with self.get_connection() as conn:
-            try:
-                yield conn
-                conn.commit()
-            except Exception:
-                conn.rollback()
-                raise
+        with self.pool.transaction() as conn:
+            yield conn
     
     def _create_schema(self):
         """Create plugin database schema."""
-        with self.get_connection() as conn:
+        with self.transaction() as conn:
             cursor = conn.cursor()
             
             cursor.execute("""
@@ -239,7 +232,6 @@ class PluginDatabase:
                 VALUES (?, '1.0.0', ?)
             """, (self.plugin_id, datetime.now().isoformat()))
             
-            conn.commit()
             logger.info(f"Schema created for plugin: {self.plugin_id}")
     
     def save_trade(self, trade_data: Dict[str, Any]) -> int:
@@ -606,12 +598,8 @@ class PluginDatabase:
     
     def close(self):
         """Close all connections in the pool."""
-        while not self._pool.empty():
-            try:
-                conn = self._pool.get_nowait()
-                conn.close()
-            except Empty:
-                break
+        close_db_pool(self.db_path)
+        self._db = None
         
         logger.info(f"Database closed for plugin: {self.plugin_id}")
     
@@ -2,11 +2,16 @@
 Plugin Router
 Routes parsed signals to appropriate plugins
 
+Shadow plugins are evaluated after the live decision has been dispatched,
+concurrently on a background task group, each within a time budget, so
+shadow mode never adds latency to the live signal.
+
 Part of Plan 02: Webhook Routing & Signal Processing
 """
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Set
 import logging
 import asyncio
+import time
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -15,14 +20,23 @@ logger = logging.getLogger(__name__)
 class PluginRouter:
     """Routes signals to appropriate plugins"""
     
-    def __init__(self, plugin_registry):
+    def __init__(self, plugin_registry, shadow_manager=None,
+                 shadow_time_budget: float = 2.0, max_shadow_groups: int = 32):
         """
         Initialize the plugin router.
         
         Args:
             plugin_registry: PluginRegistry instance for plugin lookup
+            shadow_manager: Optional ShadowModeManager receiving shadow results
+            shadow_time_budget: Seconds each plugin gets in broadcast/shadow runs
+            max_shadow_groups: Pending shadow groups before new ones are dropped
         """
         self.registry = plugin_registry
+        self.shadow_manager = shadow_manager
+        self.shadow_time_budget = shadow_time_budget
+        self.max_shadow_groups = max_shadow_groups
+        self._shadow_tasks: Set[asyncio.Task] = set()
+        self._shadow_stats = {'dispatched': 0, 'dropped': 0, 'timeouts': 0, 'skipped_live': 0}
         self._routing_stats = {
             'total_routed': 0,
             'successful': 0,
@@ -63,17 +77,22 @@ class PluginRouter:
             plugin = self.registry.get_plugin(plugin_hint)
             if plugin and plugin.enabled:
                 logger.info(f"Routing to hinted plugin: {plugin_hint}")
-                return await self._execute_plugin(plugin, signal)
+                result = await self._execute_plugin(plugin, signal)
+                self.dispatch_shadow(signal, live_plugin_id=plugin.plugin_id, live_result=result)
+                return result
         
         # Try strategy + timeframe match using Plan 01's get_plugin_for_signal
         plugin = self.registry.get_plugin_for_signal(signal)
         if plugin:
             logger.info(f"Routing to matched plugin: {plugin.plugin_id}")
-            return await self._execute_plugin(plugin, signal)
+            result = await self._execute_plugin(plugin, signal)
+            self.dispatch_shadow(signal, live_plugin_id=plugin.plugin_id, live_result=result)
+            return result
         
         # No plugin found
         self._routing_stats['no_plugin_found'] += 1
         logger.warning(f"No plugin found for signal: {strategy}/{signal.get('timeframe')}")
+        self.dispatch_shadow(signal)
         return None
     
     async def _execute_plugin(self, plugin, signal: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -142,35 +161,116 @@ class PluginRouter:
         Broadcast signal to ALL capable plugins.
         Used for shadow mode comparison.
         
+        Plugins run concurrently, each limited to shadow_time_budget seconds.
+        
         Args:
             signal: Signal data to broadcast
             
         Returns:
-            List of results from all plugins
+            List of results from all plugins (in registry order)
         """
-        results = []
         matching_plugins = self.registry.broadcast_signal(signal)
+        return await self._run_plugins_concurrently(matching_plugins, signal)
+    
+    async def _run_plugins_concurrently(self, plugins: List[Any],
+                                        signal: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return list(await asyncio.gather(
+            *(self._run_with_budget(plugin, signal) for plugin in plugins)
+        ))
+    
+    async def _run_with_budget(self, plugin, signal: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one plugin under the time budget; never raises"""
+        started = time.perf_counter()
+        try:
+            if hasattr(plugin, 'process_signal'):
+                coro = plugin.process_signal(signal)
+            else:
+                coro = self._legacy_process(plugin, signal)
+            result = await asyncio.wait_for(coro, timeout=self.shadow_time_budget)
+            outcome = {'plugin_id': plugin.plugin_id, 'result': result, 'status': 'success'}
+        except asyncio.TimeoutError:
+            self._shadow_stats['timeouts'] += 1
+            logger.warning(f"Plugin {plugin.plugin_id} exceeded {self.shadow_time_budget}s budget")
+            outcome = {'plugin_id': plugin.plugin_id, 'error': 'time budget exceeded', 'status': 'timeout'}
+        except Exception as e:
+            outcome = {'plugin_id': plugin.plugin_id, 'error': str(e), 'status': 'error'}
+        outcome['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        return outcome
+    
+    def dispatch_shadow(self, signal: Dict[str, Any], live_plugin_id: str = None,
+                        live_result: Optional[Dict[str, Any]] = None) -> Optional[asyncio.Task]:
+        """
+        Schedule shadow evaluation of a signal without waiting for it.
+        
+        Runs every matching plugin that is enabled for shadow mode (except the
+        live one) concurrently on a background task; results are recorded in
+        the shadow manager and compared against live_result.
+        
+        Only instances built with shadow_mode=True (e.g. PluginHotReloader's
+        "<id>@next" candidates) are run: a plugin without it places real
+        orders, which must never happen off the live path.
+        
+        Returns:
+            The background task, or None if nothing was scheduled
+        """
+        manager = self.shadow_manager
+        if manager is None or not manager.is_shadow_mode_active():
+            return None
+        
+        plugins = []
+        for plugin in self.registry.broadcast_signal(signal):
+            if plugin.plugin_id == live_plugin_id or not manager.is_plugin_in_shadow(plugin.plugin_id):
+                continue
+            if not self._is_shadow_instance(plugin):
+                self._shadow_stats['skipped_live'] += 1
+                logger.warning(f"Plugin {plugin.plugin_id} is in the shadow set but not in "
+                               f"shadow_mode, skipping shadow run")
+                continue
+            plugins.append(plugin)
+        if not plugins:
+            return None
         
-        for plugin in matching_plugins:
+        if len(self._shadow_tasks) >= self.max_shadow_groups:
+            self._shadow_stats['dropped'] += 1
+            logger.warning("Shadow evaluation backlog full, skipping signal")
+            return None
+        
+        signal_id = signal.get('signal_id') or (
+            f"{signal.get('strategy', 'UNKNOWN')}_{signal.get('symbol', '')}_{time.time_ns()}"
+        )
+        # Plugins may mutate the signal - give the shadow group its own copy
+        task = asyncio.create_task(
+            self._run_shadow_group(plugins, dict(signal), signal_id, live_result)
+        )
+        self._shadow_tasks.add(task)
+        task.add_done_callback(self._shadow_tasks.discard)
+        self._shadow_stats['dispatched'] += 1
+        return task
+    
+    @staticmethod
+    def _is_shadow_instance(plugin) -> bool:
+        """True if the plugin was built to run without placing orders"""
+        if hasattr(plugin, 'shadow_mode'):
+            return plugin.shadow_mode is True
+        config = getattr(plugin, 'config', None)
+        return isinstance(config, dict) and config.get('shadow_mode') is True
+    
+    async def _run_shadow_group(self, plugins: List[Any], signal: Dict[str, Any],
+                                signal_id: str, live_result: Optional[Dict[str, Any]]):
+        outcomes = await self._run_plugins_concurrently(plugins, signal)
+        for outcome in outcomes:
             try:
-                if hasattr(plugin, 'process_signal'):
-                    result = await plugin.process_signal(signal)
-                else:
-                    result = await self._legacy_process(plugin, signal)
-                    
-                results.append({
-                    'plugin_id': plugin.plugin_id,
-                    'result': result,
-                    'status': 'success'
-                })
+                self.shadow_manager.record_shadow_result(
+                    outcome['plugin_id'], signal_id, outcome, live_result
+                )
             except Exception as e:
-                results.append({
-                    'plugin_id': plugin.plugin_id,
-                    'error': str(e),
-                    'status': 'error'
-                })
-        
-        return results
+                logger.error(f"Failed to record shadow result for {outcome['plugin_id']}: {e}")
+        return outcomes
+    
+    async def drain_shadow_tasks(self, timeout: float = 5.0):
+        """Wait for in-flight shadow evaluations (shutdown / tests)"""
+        if self._shadow_tasks:
+            await asyncio.wait(list(self._shadow_tasks), timeout=timeout)
     
     async def route_with_fallback(self, signal: Dict[str, Any], fallback_handler) -> Optional[Dict[str, Any]]:
         """
@@ -191,6 +291,34 @@ class PluginRouter:
         
         return result
     
+    def record_route(self, signal: Dict[str, Any], plugin_id: Optional[str] = None,
+                     success: bool = True):
+        """
+        Count a signal routed outside route_signal().
+        
+        TradingEngine.delegate_to_plugin picks and runs the plugin itself;
+        it reports each outcome here so the routing stats cover live traffic.
+        
+        Args:
+            signal: Signal that was routed
+            plugin_id: Plugin that handled it, or None if no plugin matched
+            success: Whether the plugin processed it without raising
+        """
+        stats = self._routing_stats
+        stats['total_routed'] += 1
+        strategy = signal.get('strategy', 'UNKNOWN')
+        stats['by_strategy'][strategy] = stats['by_strategy'].get(strategy, 0) + 1
+        if plugin_id is None:
+            stats['no_plugin_found'] += 1
+            return
+        by_plugin = stats['by_plugin'].setdefault(plugin_id, {'success': 0, 'failed': 0})
+        if success:
+            stats['successful'] += 1
+            by_plugin['success'] += 1
+        else:
+            stats['failed'] += 1
+            by_plugin['failed'] += 1
+    
     def get_routing_stats(self) -> Dict[str, Any]:
         """
         Return routing statistics.
@@ -200,6 +328,7 @@ class PluginRouter:
         """
         stats = self._routing_stats.copy()
         stats['last_reset'] = self._last_reset.isoformat()
+        stats['shadow'] = {**self._shadow_stats, 'pending': len(self._shadow_tasks)}
         
         # Calculate success rate
         total = stats['total_routed']
@@ -258,12 +387,13 @@ class PluginRouter:
 _router_instance = None
 
 
-def get_plugin_router(plugin_registry=None) -> PluginRouter:
+def get_plugin_router(plugin_registry=None, shadow_manager=None) -> PluginRouter:
     """
     Get or create PluginRouter singleton.
     
     Args:
         plugin_registry: PluginRegistry instance (required on first call)
+        shadow_manager: Optional ShadowModeManager for background shadow runs
         
     Returns:
         PluginRouter singleton instance
@@ -273,12 +403,27 @@ def get_plugin_router(plugin_registry=None) -> PluginRouter:
     if _router_instance is None:
         if plugin_registry is None:
             raise ValueError("plugin_registry required for first initialization")
-        _router_instance = PluginRouter(plugin_registry)
+        budget = 2.0
+        if shadow_manager is not None:
+            budget = shadow_manager.config.get('plugin_time_budget_seconds', budget)
+        _router_instance = PluginRouter(
+            plugin_registry, shadow_manager=shadow_manager, shadow_time_budget=budget
+        )
         logger.info("PluginRouter singleton created")
+    else:
+        if plugin_registry is not None:
+            _router_instance.registry = plugin_registry
+        if shadow_manager is not None:
+            _router_instance.shadow_manager = shadow_manager
     
     return _router_instance
 
 
+def current_plugin_router() -> Optional[PluginRouter]:
+    """The PluginRouter singleton if it has been created, without creating it"""
+    return _router_instance
+
+
 def reset_plugin_router():
     """Reset the singleton instance (for testing)"""
     global _router_instance
@@ -187,6 +187,26 @@ class BaseLogicPlugin(ABC):
         self.enabled = False
         self.logger.info(f"Plugin {self.plugin_id} disabled")
     
+    def export_state(self) -> Dict[str, Any]:
+        """
+        Runtime state handed to the replacement instance on hot reload.
+
+        Override to carry plugin-specific state (counters, caches, open
+        chain references). Called between signals, after in-flight calls
+        on this instance have finished.
+        """
+        return {"enabled": self.enabled}
+
+    def import_state(self, state: Dict[str, Any]):
+        """
+        Adopt state exported by the instance being replaced.
+
+        Called before the new instance receives any signal. Override
+        together with export_state(); ignore keys you do not know so an
+        older instance can hand off to a newer one.
+        """
+        self.enabled = state.get("enabled", self.enabled)
+
     def get_status(self) -> Dict[str, Any]:
         """Get plugin status"""
         return {
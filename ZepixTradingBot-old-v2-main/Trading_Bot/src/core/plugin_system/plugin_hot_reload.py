@@ -0,0 +1,341 @@
+"""
+Plugin Hot Reload - Replace a running plugin without restarting the bot
+
+The plugin package is imported again under a generation alias
+(e.g. src.logic_plugins.v3_combined__r2) next to the running one, so
+plugin.py and its relatively imported helpers are fresh while the old
+instance keeps executing its own code. Handoff:
+
+1. Import and instantiate the new version (any failure leaves the old one live)
+2. Optionally evaluate it in shadow mode first: the candidate is registered
+   as "<plugin_id>@next" with ShadowModeManager, PluginRouter runs it on
+   matching signals, and promote() makes it live later
+3. Wait until the old instance has no in-flight entry-point calls
+4. In one synchronous step (no await, so between two signals):
+   old.export_state() -> new.import_state() -> PluginRegistry.swap_plugin()
+
+In-flight calls are counted by the PluginProfiler wrappers; with profiling
+disabled the drain step cannot see them and the swap happens at once.
+Worker-hosted plugins are reloaded by restarting their worker process.
+
+Config (plugin_system.hot_reload):
+    drain_timeout_seconds:   Max wait for in-flight calls (default 10)
+    min_shadow_comparisons:  Shadow comparisons required to promote (default 1,
+                             never less than 1 without force)
+    min_shadow_match_rate:   Shadow match rate % required to promote (default 0)
+    history_size:            Reload results kept (default 50)
+
+Version: 1.0.0
+Date: 2026-01-14
+"""
+
+import asyncio
+import copy
+import importlib
+import importlib.util
+import logging
+import sys
+import time
+import types
+from collections import deque
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SHADOW_SUFFIX = "@next"
+
+
+@dataclass
+class ReloadResult:
+    """Outcome of one reload, shadow start, promotion or discard"""
+    plugin_id: str
+    action: str  # 'reload', 'shadow', 'promote', 'discard' or 'worker_restart'
+    success: bool
+    generation: int
+    message: str = ""
+    drain_ms: float = 0.0
+    timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class PluginHotReloader:
+    """Loads new plugin versions and hands routing over between signals"""
+
+    def __init__(self, registry, shadow_manager=None, config: Optional[Dict[str, Any]] = None):
+        self.registry = registry
+        self.shadow_manager = shadow_manager
+        self.config = config or {}
+        self.drain_timeout = self.config.get("drain_timeout_seconds", 10.0)
+        # A candidate that never saw a signal has not been evaluated at all
+        self.min_shadow_comparisons = max(1, self.config.get("min_shadow_comparisons", 1))
+        self.min_shadow_match_rate = self.config.get("min_shadow_match_rate", 0.0)
+        self.history: deque = deque(maxlen=self.config.get("history_size", 50))
+
+        self.generations: Dict[str, int] = {}
+        self._live_alias: Dict[str, str] = {}  # plugin_id -> alias package of live version
+        self._candidates: Dict[str, Tuple[int, type, str]] = {}  # plugin_id -> (gen, class, alias)
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    # ------------------------------------------------------------------
+    # Module loading
+    # ------------------------------------------------------------------
+
+    def _import_version(self, module_path: str, class_name: str, generation: int) -> Tuple[type, str]:
+        """Import the plugin package fresh under a generation alias"""
+        package_name, _, leaf = module_path.rpartition(".")
+        importlib.invalidate_caches()
+        spec = importlib.util.find_spec(package_name)
+        if spec is None or not spec.submodule_search_locations:
+            raise ImportError(f"Plugin package not found: {package_name}")
+
+        alias = f"{package_name}__r{generation}"
+        self._purge(alias)
+        package = types.ModuleType(alias)
+        package.__path__ = list(spec.submodule_search_locations)
+        package.__package__ = alias
+        sys.modules[alias] = package
+        try:
+            module = importlib.import_module(f"{alias}.{leaf}")
+            return getattr(module, class_name), alias
+        except BaseException:
+            self._purge(alias)
+            raise
+
+    @staticmethod
+    def _purge(alias: Optional[str]):
+        """Drop an alias package and its submodules from sys.modules"""
+        if not alias:
+            return
+        for name in [n for n in sys.modules if n == alias or n.startswith(alias + ".")]:
+            del sys.modules[name]
+
+    def _instantiate(self, plugin_class: type, plugin_id: str, config: Dict[str, Any]):
+        return plugin_class(plugin_id=plugin_id, config=config,
+                            service_api=self.registry.service_api)
+
+    # ------------------------------------------------------------------
+    # State handoff
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _export(plugin) -> Dict[str, Any]:
+        if hasattr(plugin, "export_state"):
+            return plugin.export_state()
+        if hasattr(plugin, "get_state"):  # PluginRollbackManager contract
+            return plugin.get_state()
+        return {"enabled": getattr(plugin, "enabled", True)}
+
+    @staticmethod
+    def _import(plugin, state: Dict[str, Any]):
+        if hasattr(plugin, "import_state"):
+            plugin.import_state(state)
+        elif hasattr(plugin, "set_state"):
+            plugin.set_state(state)
+        elif "enabled" in state:
+            plugin.enabled = state["enabled"]
+
+    async def _drain(self, plugin, timeout: float) -> Optional[float]:
+        """Wait for the instance's in-flight calls; ms waited, or None on timeout"""
+        profiler = self.registry.profiler
+        started = time.perf_counter()
+        deadline = started + timeout
+        while profiler.in_flight(plugin) > 0:
+            if time.perf_counter() >= deadline:
+                return None
+            await asyncio.sleep(0.005)
+        return (time.perf_counter() - started) * 1000.0
+
+    async def _handoff(self, plugin_id: str, new_plugin, timeout: float) -> float:
+        """Drain the live instance, then transfer state and switch routing"""
+        old_plugin = self.registry.plugins.get(plugin_id)
+        drain_ms = 0.0
+        if old_plugin is not None:
+            drain_ms = await self._drain(old_plugin, timeout)
+            if drain_ms is None:
+                raise TimeoutError(
+                    f"{self.registry.profiler.in_flight(old_plugin)} call(s) still running "
+                    f"after {timeout}s"
+                )
+            # No await from here on: no signal can reach either instance mid-handoff
+            self._import(new_plugin, self._export(old_plugin))
+        self.registry.swap_plugin(plugin_id, new_plugin)
+        return drain_ms
+
+    def _record(self, result: ReloadResult) -> ReloadResult:
+        self.history.append(result)
+        log = logger.info if result.success else logger.error
+        log(f"[HotReload] {result.action} {result.plugin_id} gen {result.generation}: "
+            f"{'ok' if result.success else 'failed'} {result.message}".rstrip())
+        return result
+
+    def _lock(self, plugin_id: str) -> asyncio.Lock:
+        lock = self._locks.get(plugin_id)
+        if lock is None:
+            lock = self._locks[plugin_id] = asyncio.Lock()
+        return lock
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def reload_plugin(
+        self,
+        plugin_id: str,
+        shadow: bool = False,
+        drain_timeout: Optional[float] = None
+    ) -> ReloadResult:
+        """
+        Load the current code of a plugin and make it live.
+
+        Args:
+            plugin_id: Plugin to reload
+            shadow: Run the new version as a shadow candidate instead of
+                switching; call promote() or discard() afterwards
+            drain_timeout: Override drain_timeout_seconds
+
+        Returns:
+            ReloadResult (on failure the old instance stays live)
+        """
+        plugin_id, module_path, class_name, plugin_config = self.registry.resolve_plugin(plugin_id)
+        async with self._lock(plugin_id):
+            generation = self.generations.get(plugin_id, 0) + 1
+
+            if self.registry.is_worker_hosted(plugin_id):
+                success = await self.registry.restart_worker(plugin_id)
+                if success:
+                    self.generations[plugin_id] = generation
+                return self._record(ReloadResult(plugin_id, "worker_restart", success, generation))
+
+            if shadow and self.shadow_manager is None:
+                return self._record(ReloadResult(plugin_id, "shadow", False, generation,
+                                                 "no shadow manager"))
+            if plugin_id not in self.registry.plugins:
+                return self._record(ReloadResult(plugin_id, "shadow" if shadow else "reload",
+                                                 False, generation, "plugin not loaded"))
+
+            try:
+                plugin_class, alias = self._import_version(module_path, class_name, generation)
+            except Exception as e:
+                return self._record(ReloadResult(plugin_id, "shadow" if shadow else "reload",
+                                                 False, generation, f"import failed: {e}"))
+            self.generations[plugin_id] = generation
+
+            if shadow:
+                return self._start_shadow(plugin_id, plugin_class, alias, plugin_config, generation)
+            return await self._make_live(plugin_id, plugin_class, alias, plugin_config,
+                                         generation, "reload", drain_timeout)
+
+    def _start_shadow(self, plugin_id: str, plugin_class: type, alias: str,
+                      plugin_config: Dict[str, Any], generation: int) -> ReloadResult:
+        self._drop_candidate(plugin_id)
+        candidate_id = plugin_id + SHADOW_SUFFIX
+        try:
+            candidate = self._instantiate(plugin_class, candidate_id,
+                                          dict(plugin_config, shadow_mode=True))
+            state = self._export(self.registry.plugins[plugin_id])
+            try:
+                state = copy.deepcopy(state)  # Candidate must not share mutable state
+            except Exception:
+                state = dict(state)
+            self._import(candidate, state)
+        except Exception as e:
+            self._purge(alias)
+            return self._record(ReloadResult(plugin_id, "shadow", False, generation,
+                                             f"candidate init failed: {e}"))
+
+        self.registry.profiler.instrument(candidate_id, candidate)
+        self.registry.shadow_candidates[candidate_id] = candidate
+        self.shadow_manager.register_plugin(candidate_id, candidate)
+        self.shadow_manager.enable_shadow_plugin(candidate_id)
+        self._candidates[plugin_id] = (generation, plugin_class, alias)
+        return self._record(ReloadResult(plugin_id, "shadow", True, generation,
+                                         f"evaluating as {candidate_id}"))
+
+    async def _make_live(self, plugin_id: str, plugin_class: type, alias: str,
+                         plugin_config: Dict[str, Any], generation: int, action: str,
+                         drain_timeout: Optional[float]) -> ReloadResult:
+        timeout = self.drain_timeout if drain_timeout is None else drain_timeout
+        try:
+            new_plugin = self._instantiate(plugin_class, plugin_id, plugin_config)
+            drain_ms = await self._handoff(plugin_id, new_plugin, timeout)
+        except Exception as e:
+            self._purge(alias)
+            return self._record(ReloadResult(plugin_id, action, False, generation, str(e)))
+
+        self._purge(self._live_alias.get(plugin_id))  # Old instance keeps its own references
+        self._live_alias[plugin_id] = alias
+        return self._record(ReloadResult(plugin_id, action, True, generation,
+                                         drain_ms=round(drain_ms, 3)))
+
+    def _drop_candidate(self, plugin_id: str) -> Optional[str]:
+        """Remove the shadow candidate; returns its alias package"""
+        entry = self._candidates.pop(plugin_id, None)
+        candidate_id = plugin_id + SHADOW_SUFFIX
+        candidate = self.registry.shadow_candidates.pop(candidate_id, None)
+        if candidate is not None:
+            self.registry.profiler.release(candidate)
+        if self.shadow_manager is not None:
+            self.shadow_manager.disable_shadow_plugin(candidate_id)
+            self.shadow_manager.unregister_plugin(candidate_id)
+        return entry[2] if entry else None
+
+    def shadow_report(self, plugin_id: str) -> Dict[str, Any]:
+        """Shadow comparison stats for a plugin's candidate"""
+        if self.shadow_manager is None:
+            return {}
+        return self.shadow_manager.get_plugin_stats().get(plugin_id + SHADOW_SUFFIX, {})
+
+    async def promote(self, plugin_id: str, force: bool = False,
+                      drain_timeout: Optional[float] = None) -> ReloadResult:
+        """
+        Make the shadow candidate live.
+
+        Unless force is set, the candidate must have been compared on at
+        least min_shadow_comparisons signals (at least one) and meet
+        min_shadow_match_rate. The live instance is built fresh from the
+        candidate's code with the real plugin config, then handed the state
+        of the instance it replaces.
+        """
+        async with self._lock(plugin_id):
+            entry = self._candidates.get(plugin_id)
+            if entry is None:
+                return self._record(ReloadResult(plugin_id, "promote", False,
+                                                 self.generations.get(plugin_id, 0),
+                                                 "no shadow candidate"))
+            generation, plugin_class, alias = entry
+
+            if not force:
+                report = self.shadow_report(plugin_id)
+                compared = report.get("compared", 0)
+                match_rate = report.get("match_rate", 0.0)
+                if compared < self.min_shadow_comparisons or match_rate < self.min_shadow_match_rate:
+                    return self._record(ReloadResult(
+                        plugin_id, "promote", False, generation,
+                        f"shadow gate not met: {compared} compared, {match_rate:.1f}% match"
+                    ))
+
+            self._drop_candidate(plugin_id)
+            _, _, _, plugin_config = self.registry.resolve_plugin(plugin_id)
+            return await self._make_live(plugin_id, plugin_class, alias, plugin_config,
+                                         generation, "promote", drain_timeout)
+
+    def discard(self, plugin_id: str) -> ReloadResult:
+        """Drop the shadow candidate and keep the live version"""
+        generation = self._candidates.get(plugin_id, (self.generations.get(plugin_id, 0),))[0]
+        alias = self._drop_candidate(plugin_id)
+        if alias is None:
+            return self._record(ReloadResult(plugin_id, "discard", False, generation,
+                                             "no shadow candidate"))
+        self._purge(alias)
+        return self._record(ReloadResult(plugin_id, "discard", True, generation))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "generations": dict(self.generations),
+            "shadow_candidates": sorted(p + SHADOW_SUFFIX for p in self._candidates),
+            "history": [r.to_dict() for r in list(self.history)[-10:]],
+        }
@@ -0,0 +1,336 @@
+"""
+Plugin Profiler - Per-plugin wall, CPU, event-loop and ServiceAPI accounting
+
+PluginRegistry wraps every plugin entry point (process_* signal handlers and
+on_* hooks / service callbacks) at load time, and wraps the shared ServiceAPI
+once. The wrappers attribute cost to the plugin whose code is running:
+
+- wall_ms:     end-to-end time of entry-point calls (includes awaits)
+- loop_ms:     time the plugin actually held the event loop (coroutine steps)
+- cpu_ms:      on-CPU thread time during those steps
+- service_ms:  time spent inside ServiceAPI calls made by the plugin
+- alloc_kb:    net memory allocated during the steps (tracemalloc, opt-in)
+
+Async entry points are driven step by step, so time a coroutine spends
+suspended (waiting on I/O or other tasks) is not charged to it, while a
+plugin that runs long synchronous sections shows up in loop_ms/max_step_ms.
+
+The wrappers also count calls currently running on each plugin instance
+(in_flight), which PluginHotReloader uses to drain an instance before it
+is replaced.
+
+Config (plugin_system.profiling):
+    enabled:            Wrap plugin entry points (default true)
+    track_allocations:  Start tracemalloc and record allocations (default false)
+
+Version: 1.0.0
+Date: 2026-01-14
+"""
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import logging
+import threading
+import time
+import tracemalloc
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+ENTRY_PREFIXES = ("process_", "on_")
+
+# Plugin currently executing on this task/thread
+_current_plugin: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "current_plugin", default=None
+)
+
+
+def current_plugin() -> Optional[str]:
+    """Plugin whose code is running in this context (None for core code)"""
+    return _current_plugin.get()
+
+
+class PluginUsage:
+    """Cumulative usage counters for one plugin"""
+
+    def __init__(self, plugin_id: str):
+        self.plugin_id = plugin_id
+        self.calls = 0
+        self.errors = 0
+        self.wall_ms = 0.0
+        self.loop_ms = 0.0
+        self.cpu_ms = 0.0
+        self.service_ms = 0.0
+        self.service_calls = 0
+        self.alloc_kb = 0.0
+        self.max_step_ms = 0.0
+        self.entry_calls: Dict[str, int] = {}
+        self.call_times: deque = deque(maxlen=1000)
+
+    def percentile(self, pct: float) -> float:
+        if not self.call_times:
+            return 0.0
+        ordered = sorted(self.call_times)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "wall_ms": round(self.wall_ms, 3),
+            "loop_ms": round(self.loop_ms, 3),
+            "cpu_ms": round(self.cpu_ms, 3),
+            "service_ms": round(self.service_ms, 3),
+            "service_calls": self.service_calls,
+            "alloc_kb": round(self.alloc_kb, 1),
+            "max_step_ms": round(self.max_step_ms, 3),
+            "avg_call_ms": round(self.wall_ms / self.calls, 3) if self.calls else 0.0,
+            "p95_call_ms": round(self.percentile(0.95), 3),
+            "p99_call_ms": round(self.percentile(0.99), 3),
+            "entry_calls": dict(self.entry_calls),
+        }
+
+
+class _MeteredCoroutine:
+    """Drives a coroutine, charging each step's loop/CPU time to a plugin"""
+
+    __slots__ = ("coro", "profiler", "plugin_id")
+
+    def __init__(self, coro, profiler: "PluginProfiler", plugin_id: str):
+        self.coro = coro
+        self.profiler = profiler
+        self.plugin_id = plugin_id
+
+    def __await__(self):
+        coro = self.coro
+        send_value = None
+        throw_exc = None
+        while True:
+            token = _current_plugin.set(self.plugin_id)
+            started = self.profiler._step_start()
+            try:
+                if throw_exc is not None:
+                    yielded = coro.throw(throw_exc)
+                else:
+                    yielded = coro.send(send_value)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                self.profiler._step_end(self.plugin_id, started)
+                _current_plugin.reset(token)
+            try:
+                send_value = yield yielded
+                throw_exc = None
+            except GeneratorExit:
+                coro.close()
+                raise
+            except BaseException as e:
+                send_value = None
+                throw_exc = e
+
+
+class PluginProfiler:
+    """Wraps plugin entry points and ServiceAPI calls and keeps per-plugin usage"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.config = config or {}
+        self.enabled = self.config.get("enabled", True)
+        self.track_allocations = self.config.get("track_allocations", False)
+        self.usage: Dict[str, PluginUsage] = {}
+        self._in_flight: Dict[int, int] = {}  # id(plugin instance) -> running entry calls
+        self._lock = threading.Lock()
+        if self.enabled and self.track_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def _usage(self, plugin_id: str) -> PluginUsage:
+        usage = self.usage.get(plugin_id)
+        if usage is None:
+            with self._lock:
+                usage = self.usage.setdefault(plugin_id, PluginUsage(plugin_id))
+        return usage
+
+    # ------------------------------------------------------------------
+    # Measurement
+    # ------------------------------------------------------------------
+
+    def _step_start(self):
+        allocated = tracemalloc.get_traced_memory()[0] if self.track_allocations else 0
+        return time.perf_counter(), time.thread_time(), allocated
+
+    def _step_end(self, plugin_id: str, started):
+        wall0, cpu0, alloc0 = started
+        step_ms = (time.perf_counter() - wall0) * 1000.0
+        usage = self._usage(plugin_id)
+        usage.loop_ms += step_ms
+        usage.cpu_ms += (time.thread_time() - cpu0) * 1000.0
+        if step_ms > usage.max_step_ms:
+            usage.max_step_ms = step_ms
+        if self.track_allocations:
+            usage.alloc_kb += (tracemalloc.get_traced_memory()[0] - alloc0) / 1024.0
+
+    def _call_end(self, plugin_id: str, entry: str, wall0: float, failed: bool):
+        call_ms = (time.perf_counter() - wall0) * 1000.0
+        usage = self._usage(plugin_id)
+        usage.calls += 1
+        usage.wall_ms += call_ms
+        usage.call_times.append(call_ms)
+        usage.entry_calls[entry] = usage.entry_calls.get(entry, 0) + 1
+        if failed:
+            usage.errors += 1
+
+    def _service_end(self, plugin_id: str, wall0: float):
+        usage = self._usage(plugin_id)
+        usage.service_ms += (time.perf_counter() - wall0) * 1000.0
+        usage.service_calls += 1
+
+    # ------------------------------------------------------------------
+    # Wrappers
+    # ------------------------------------------------------------------
+
+    def _enter(self, key: int):
+        with self._lock:
+            self._in_flight[key] = self._in_flight.get(key, 0) + 1
+
+    def _exit(self, key: int):
+        with self._lock:
+            self._in_flight[key] = self._in_flight.get(key, 1) - 1
+
+    def _wrap_entry(self, plugin_id: str, name: str, func: Callable, key: int = 0) -> Callable:
+        profiler = self
+
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_entry(*args, **kwargs):
+                if _current_plugin.get() == plugin_id:
+                    return await func(*args, **kwargs)  # Nested call, already metered
+                profiler._enter(key)
+                wall0 = time.perf_counter()
+                failed = False
+                try:
+                    return await _MeteredCoroutine(func(*args, **kwargs), profiler, plugin_id)
+                except BaseException:
+                    failed = True
+                    raise
+                finally:
+                    profiler._call_end(plugin_id, name, wall0, failed)
+                    profiler._exit(key)
+            wrapper = async_entry
+        else:
+            @functools.wraps(func)
+            def sync_entry(*args, **kwargs):
+                if _current_plugin.get() == plugin_id:
+                    return func(*args, **kwargs)
+                token = _current_plugin.set(plugin_id)
+                profiler._enter(key)
+                wall0 = time.perf_counter()
+                started = profiler._step_start()
+                failed = False
+                try:
+                    return func(*args, **kwargs)
+                except BaseException:
+                    failed = True
+                    raise
+                finally:
+                    profiler._step_end(plugin_id, started)
+                    profiler._call_end(plugin_id, name, wall0, failed)
+                    profiler._exit(key)
+                    _current_plugin.reset(token)
+            wrapper = sync_entry
+
+        wrapper.__plugin_profiled__ = True
+        return wrapper
+
+    def _wrap_service(self, func: Callable) -> Callable:
+        profiler = self
+
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_service(*args, **kwargs):
+                plugin_id = _current_plugin.get()
+                if plugin_id is None:
+                    return await func(*args, **kwargs)
+                wall0 = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    profiler._service_end(plugin_id, wall0)
+            wrapper = async_service
+        else:
+            @functools.wraps(func)
+            def sync_service(*args, **kwargs):
+                plugin_id = _current_plugin.get()
+                if plugin_id is None:
+                    return func(*args, **kwargs)
+                wall0 = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    profiler._service_end(plugin_id, wall0)
+            wrapper = sync_service
+
+        wrapper.__plugin_profiled__ = True
+        return wrapper
+
+    @staticmethod
+    def _public_methods(obj, prefixes=None) -> List[str]:
+        names = []
+        for name in dir(type(obj)):
+            if name.startswith("_"):
+                continue
+            if prefixes and not name.startswith(prefixes):
+                continue
+            if not inspect.isfunction(inspect.getattr_static(type(obj), name, None)):
+                continue
+            names.append(name)
+        return names
+
+    def instrument(self, plugin_id: str, plugin) -> int:
+        """Wrap the plugin's entry points on the instance; returns how many"""
+        if not self.enabled or plugin is None:
+            return 0
+        self._usage(plugin_id)
+        wrapped = 0
+        for name in self._public_methods(plugin, ENTRY_PREFIXES):
+            method = getattr(plugin, name)
+            if getattr(method, "__plugin_profiled__", False):
+                continue
+            setattr(plugin, name, self._wrap_entry(plugin_id, name, method, id(plugin)))
+            wrapped += 1
+        logger.debug(f"[PluginProfiler] Instrumented {wrapped} entry points of {plugin_id}")
+        return wrapped
+
+    def instrument_service_api(self, service_api) -> int:
+        """Wrap the shared ServiceAPI so calls are charged to the calling plugin"""
+        if not self.enabled or service_api is None:
+            return 0
+        wrapped = 0
+        for name in self._public_methods(service_api):
+            method = getattr(service_api, name)
+            if getattr(method, "__plugin_profiled__", False):
+                continue
+            setattr(service_api, name, self._wrap_service(method))
+            wrapped += 1
+        return wrapped
+
+    # ------------------------------------------------------------------
+    # Readers
+    # ------------------------------------------------------------------
+
+    def in_flight(self, plugin) -> int:
+        """Entry-point calls currently running on this plugin instance"""
+        return self._in_flight.get(id(plugin), 0)
+
+    def release(self, plugin):
+        """Forget in-flight tracking for an instance that has been replaced"""
+        with self._lock:
+            self._in_flight.pop(id(plugin), None)
+
+    def get_usage(self, plugin_id: str) -> Dict[str, Any]:
+        usage = self.usage.get(plugin_id)
+        return usage.to_dict() if usage else PluginUsage(plugin_id).to_dict()
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {plugin_id: usage.to_dict() for plugin_id, usage in list(self.usage.items())}
@@ -2,11 +2,15 @@ import importlib
 import importlib.util
 import asyncio
 import os
-from typing import Dict, Optional, List, Any
+from typing import Dict, Optional, List, Any, Tuple
 import logging
 
 from .base_plugin import BaseLogicPlugin
 from .plugin_interface import ISignalProcessor
+from .plugin_worker import PluginWorkerHandle
+from .plugin_profiler import PluginProfiler
+from .service_api import ServiceAPI
+from src.core.event_bus import SLHit, TPHit
 
 logger = logging.getLogger(__name__)
 
@@ -75,6 +79,7 @@ class PluginRegistry:
     - Load and initialize plugins
     - Route alerts to correct plugin
     - Manage plugin lifecycle
+    - Host selected plugins in worker processes (plugin_system.process_workers)
     """
     
     def __init__(self, config: Dict, service_api):
@@ -91,6 +96,22 @@ class PluginRegistry:
         
         self.plugin_dir = config.get("plugin_system", {}).get("plugin_dir", "src/logic_plugins")
         
+        # Out-of-process execution for CPU-heavy plugins
+        self.worker_config = config.get("plugin_system", {}).get("process_workers", {})
+        self.workers: Dict[str, PluginWorkerHandle] = {}
+        
+        # Per-plugin wall/CPU/ServiceAPI accounting (read by PluginHealthMonitor)
+        self.profiler = PluginProfiler(config.get("plugin_system", {}).get("profiling", {}))
+        if isinstance(service_api, ServiceAPI):
+            self.profiler.instrument_service_api(service_api)
+        
+        # SL/TP hooks bound once per plugin: hook -> {plugin_id: (plugin, handler, is_async)}
+        self._hook_handlers: Dict[str, Dict[str, tuple]] = {"on_sl_hit": {}, "on_tp_hit": {}}
+        self.event_bus = None
+        
+        # Hot-reload candidates evaluated in shadow mode; never routed live
+        self.shadow_candidates: Dict[str, Any] = {}
+        
         logger.info("Plugin registry initialized")
     
     def discover_plugins(self) -> List[str]:
@@ -127,31 +148,14 @@ class PluginRegistry:
             bool: True if loaded successfully
         """
         try:
-            # Handle legacy plugin names
-            original_id = plugin_id
-            if plugin_id in LEGACY_PLUGIN_NAMES:
-                plugin_id = LEGACY_PLUGIN_NAMES[plugin_id]
-                logger.warning(f"Using legacy plugin name '{original_id}', please update to: {plugin_id}")
+            plugin_id, module_path, class_name, plugin_config = self.resolve_plugin(plugin_id)
             
-            # Import plugin module
-            # plugin_dir could be relative, e.g. "src/logic_plugins"
-            # We need to turn this into a package path: "src.logic_plugins"
-            package_path = self.plugin_dir.replace('/', '.').replace('\\', '.')
-            module_path = f"{package_path}.{plugin_id}.plugin"
+            if self.runs_in_worker(plugin_id):
+                return self._load_worker_plugin(plugin_id, module_path, class_name, plugin_config)
             
             plugin_module = importlib.import_module(module_path)
-            
-            # Get plugin class from AVAILABLE_PLUGINS if defined, otherwise construct
-            if plugin_id in AVAILABLE_PLUGINS:
-                class_name = AVAILABLE_PLUGINS[plugin_id]['class']
-            else:
-                # Fallback: Construct expected class name: "my_plugin" -> "MyPluginPlugin"
-                class_name = f"{plugin_id.title().replace('_', '')}Plugin"
             plugin_class = getattr(plugin_module, class_name)
             
-            # Load plugin config
-            plugin_config = self.config.get("plugins", {}).get(plugin_id, {})
-            
             # Instantiate plugin
             plugin_instance = plugin_class(
                 plugin_id=plugin_id,
@@ -160,7 +164,9 @@ class PluginRegistry:
             )
             
             # Register
+            self.profiler.instrument(plugin_id, plugin_instance)
             self.plugins[plugin_id] = plugin_instance
+            self._bind_hooks(plugin_id, plugin_instance)
             
             logger.info(f"Loaded plugin: {plugin_id}")
             return True
@@ -175,6 +181,101 @@ class PluginRegistry:
             logger.error(f"Failed to load plugin {plugin_id}: {e}")
             return False
     
+    def resolve_plugin(self, plugin_id: str) -> Tuple[str, str, str, Dict]:
+        """
+        Resolve a plugin ID to (plugin_id, module_path, class_name, config).
+        
+        Handles legacy plugin names; shared by load_plugin() and hot reload.
+        """
+        # Handle legacy plugin names
+        if plugin_id in LEGACY_PLUGIN_NAMES:
+            original_id = plugin_id
+            plugin_id = LEGACY_PLUGIN_NAMES[plugin_id]
+            logger.warning(f"Using legacy plugin name '{original_id}', please update to: {plugin_id}")
+        
+        # Import plugin module
+        # plugin_dir could be relative, e.g. "src/logic_plugins"
+        # We need to turn this into a package path: "src.logic_plugins"
+        package_path = self.plugin_dir.replace('/', '.').replace('\\', '.')
+        module_path = f"{package_path}.{plugin_id}.plugin"
+        
+        # Get plugin class from AVAILABLE_PLUGINS if defined, otherwise construct
+        if plugin_id in AVAILABLE_PLUGINS:
+            class_name = AVAILABLE_PLUGINS[plugin_id]['class']
+        else:
+            # Fallback: Construct expected class name: "my_plugin" -> "MyPluginPlugin"
+            class_name = f"{plugin_id.title().replace('_', '')}Plugin"
+        
+        # Load plugin config
+        plugin_config = self.config.get("plugins", {}).get(plugin_id, {})
+        return plugin_id, module_path, class_name, plugin_config
+    
+    def swap_plugin(self, plugin_id: str, plugin_instance) -> Any:
+        """
+        Replace the routed instance for plugin_id in one step.
+        
+        No awaits: signals routed before the call see the old instance,
+        signals routed after see the new one. Returns the old instance.
+        """
+        self.profiler.instrument(plugin_id, plugin_instance)
+        old_instance = self.plugins.get(plugin_id)
+        self.plugins[plugin_id] = plugin_instance
+        self._bind_hooks(plugin_id, plugin_instance)
+        if old_instance is not None:
+            self.profiler.release(old_instance)
+        return old_instance
+    
+    def runs_in_worker(self, plugin_id: str) -> bool:
+        """True if the plugin is configured to run in its own process"""
+        if not self.worker_config.get("enabled", True):
+            return False
+        return plugin_id in self.worker_config.get("plugins", [])
+    
+    def _load_worker_plugin(self, plugin_id: str, module_path: str,
+                            class_name: str, plugin_config: Dict) -> bool:
+        """Start a worker process for the plugin and register its handle"""
+        handle = PluginWorkerHandle(
+            plugin_id=plugin_id,
+            module_path=module_path,
+            class_name=class_name,
+            config=plugin_config,
+            service_api=self.service_api,
+            call_timeout=plugin_config.get(
+                "worker_call_timeout", self.worker_config.get("call_timeout_seconds", 10.0)
+            ),
+            start_timeout=self.worker_config.get("start_timeout_seconds", 30.0),
+            service_timeout=self.worker_config.get("service_timeout_seconds", 30.0)
+        )
+        if not handle.start():
+            logger.error(f"Failed to start worker for plugin {plugin_id}")
+            return False
+        
+        self.workers[plugin_id] = handle
+        self.plugins[plugin_id] = handle
+        logger.info(f"Loaded plugin: {plugin_id} (worker process)")
+        return True
+    
+    def is_worker_hosted(self, plugin_id: str) -> bool:
+        return plugin_id in self.workers
+    
+    async def restart_worker(self, plugin_id: str) -> bool:
+        """Restart a plugin's worker process without touching the rest of the bot"""
+        handle = self.workers.get(plugin_id)
+        if handle is None:
+            return False
+        loop = asyncio.get_running_loop()
+        success = await loop.run_in_executor(None, handle.restart)
+        logger.info(f"Worker restart for {plugin_id}: {'ok' if success else 'failed'}")
+        return success
+    
+    def shutdown_workers(self):
+        """Stop all plugin worker processes"""
+        for handle in self.workers.values():
+            handle.stop()
+    
+    def get_worker_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {plugin_id: handle.get_worker_stats() for plugin_id, handle in self.workers.items()}
+    
     def load_all_plugins(self):
         """Discover and load all available plugins"""
         plugins = self.discover_plugins()
@@ -264,7 +365,7 @@ class PluginRegistry:
             list: All plugins that can handle this signal
         """
         matching_plugins = []
-        for plugin_id, plugin in self.plugins.items():
+        for plugin_id, plugin in list(self.plugins.items()) + list(self.shadow_candidates.items()):
             if not plugin.enabled:
                 continue
             if hasattr(plugin, 'can_process_signal'):
@@ -409,6 +510,65 @@ class PluginRegistry:
         logger.warning(f"Plugin not found: {plugin_id}")
         return False
     
+    def _bind_hooks(self, plugin_id: str, plugin):
+        """Resolve the plugin's SL/TP hooks once so dispatch needs no reflection"""
+        for hook, handlers in self._hook_handlers.items():
+            handler = getattr(plugin, hook, None)
+            handlers[plugin_id] = (plugin, handler, asyncio.iscoroutinefunction(handler))
+        if self.event_bus is not None and self.event_bus.plugin_hooks:
+            self._subscribe_plugin(plugin_id)
+    
+    def _subscribe_plugin(self, plugin_id: str):
+        self.event_bus.unsubscribe(plugin_id)
+        for event_type, hook in ((SLHit, "on_sl_hit"), (TPHit, "on_tp_hit")):
+            _, handler, is_async = self._hook_handlers[hook].get(plugin_id, (None, None, False))
+            if handler is not None:
+                self.event_bus.subscribe(event_type, self._bus_handler(plugin_id, handler, is_async),
+                                         name=plugin_id)
+    
+    def _bus_handler(self, plugin_id: str, handler, is_async: bool):
+        async def deliver(event):
+            plugin = self.plugins.get(plugin_id)
+            if plugin is None or not plugin.enabled:
+                return
+            result = handler(event.to_dict())
+            if is_async:
+                await result
+        return deliver
+    
+    def attach_event_bus(self, event_bus):
+        """
+        Route SLHit/TPHit bus events to plugin hooks (when the bus enables
+        plugin_hooks). Plugins loaded later are subscribed as they load.
+        """
+        self.event_bus = event_bus
+        if event_bus.plugin_hooks:
+            for plugin_id in list(self.plugins):
+                self._subscribe_plugin(plugin_id)
+    
+    async def _dispatch_hook(self, hook: str, trade_data: Dict[str, Any]) -> Dict[str, Any]:
+        results = {}
+        handlers = self._hook_handlers[hook]
+        for plugin_id, plugin in list(self.plugins.items()):
+            if not plugin.enabled:
+                continue
+            bound = handlers.get(plugin_id)
+            if bound is None or bound[0] is not plugin:
+                self._bind_hooks(plugin_id, plugin)  # Registered without load_plugin()
+                bound = handlers[plugin_id]
+            _, handler, is_async = bound
+            if handler is None:
+                continue
+            try:
+                result = handler(trade_data)
+                if is_async:
+                    result = await result
+                results[plugin_id] = result
+            except Exception as e:
+                logger.error(f"Error in plugin {plugin_id} {hook}: {e}")
+                results[plugin_id] = {"error": str(e)}
+        return results
+    
     async def on_sl_hit(self, trade_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Handle stop loss hit event across all enabled plugins.
@@ -419,24 +579,7 @@ class PluginRegistry:
         Returns:
             Dict with results from all plugins
         """
-        results = {}
-        for plugin_id, plugin in self.plugins.items():
-            if not plugin.enabled:
-                continue
-            
-            if hasattr(plugin, 'on_sl_hit'):
-                try:
-                    handler = getattr(plugin, 'on_sl_hit')
-                    if asyncio.iscoroutinefunction(handler):
-                        result = await handler(trade_data)
-                    else:
-                        result = handler(trade_data)
-                    results[plugin_id] = result
-                except Exception as e:
-                    logger.error(f"Error in plugin {plugin_id} on_sl_hit: {e}")
-                    results[plugin_id] = {"error": str(e)}
-        
-        return results
+        return await self._dispatch_hook("on_sl_hit", trade_data)
     
     async def on_tp_hit(self, trade_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -448,21 +591,4 @@ class PluginRegistry:
         Returns:
             Dict with results from all plugins
         """
-        results = {}
-        for plugin_id, plugin in self.plugins.items():
-            if not plugin.enabled:
-                continue
-            
-            if hasattr(plugin, 'on_tp_hit'):
-                try:
-                    handler = getattr(plugin, 'on_tp_hit')
-                    if asyncio.iscoroutinefunction(handler):
-                        result = await handler(trade_data)
-                    else:
-                        result = handler(trade_data)
-                    results[plugin_id] = result
-                except Exception as e:
-                    logger.error(f"Error in plugin {plugin_id} on_tp_hit: {e}")
-                    results[plugin_id] = {"error": str(e)}
-        
-        return results
+        return await self._dispatch_hook("on_tp_hit", trade_data)
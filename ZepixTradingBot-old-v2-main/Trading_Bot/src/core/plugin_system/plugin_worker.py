@@ -0,0 +1,535 @@
+"""
+Plugin Workers - Host logic plugins in separate processes
+
+Every plugin normally runs on the event loop that also serves webhooks,
+Telegram and monitoring, so one CPU-heavy plugin stalls all of them. A
+worker-hosted plugin lives in its own process instead; the core keeps a
+PluginWorkerHandle in PluginRegistry.plugins that looks like the plugin to
+callers (same method names, sync/async shape preserved) and forwards calls
+over a pipe.
+
+IPC protocol (pickled tuples over a multiprocessing Pipe):
+    core -> worker   ("call", id, (method, args, kwargs))
+                     ("ping", id, None)
+                     ("svc_ok", id, (value, was_coroutine))
+                     ("svc_err", id, message)
+                     ("stop", 0, None)
+    worker -> core   ("ready", 0, manifest)
+                     ("ok", id, value) / ("err", id, (type_name, message))
+                     ("pong", id, stats)
+                     ("svc", id, (path, args, kwargs))
+
+ServiceAPI calls made by the plugin ("svc") are proxied back to the core's
+real ServiceAPI by dotted path (e.g. "reentry_service.start_recovery") and
+run on the core event loop. Pings travel through the worker's event loop, so
+a plugin stuck in CPU work shows up as unresponsive and PluginHealthMonitor
+can restart just that worker.
+
+Config (`plugin_system.process_workers`):
+    plugins:               ["v6_price_action_1m", ...] hosted out of process
+    call_timeout_seconds:  Per-call timeout (override: plugins.<id>.worker_call_timeout)
+    start_timeout_seconds: Time allowed for the worker to import and init the plugin
+    service_timeout_seconds: Worker-side wait for a proxied ServiceAPI call
+
+Version: 1.0.0
+Date: 2026-01-14
+"""
+
+import asyncio
+import concurrent.futures
+import importlib
+import itertools
+import logging
+import multiprocessing
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Plugin getters answered from the manifest instead of a round trip
+CACHED_GETTERS = {
+    "get_supported_strategies": "supported_strategies",
+    "get_supported_timeframes": "supported_timeframes",
+}
+
+
+class PluginWorkerError(RuntimeError):
+    """Worker process is not running or the call failed inside the worker"""
+
+
+class PluginWorkerTimeout(asyncio.TimeoutError):
+    """Worker did not answer within the per-plugin timeout"""
+
+
+def _exposed_methods(plugin) -> Dict[str, str]:
+    """Public plugin methods and whether they are async"""
+    methods = {}
+    for name in dir(plugin):
+        if name.startswith("_"):
+            continue
+        try:
+            attr = getattr(plugin, name)
+        except Exception:
+            continue
+        if callable(attr) and not isinstance(attr, type):
+            methods[name] = "async" if asyncio.iscoroutinefunction(attr) else "sync"
+    return methods
+
+
+def _resolve(root, path: str):
+    target = root
+    for part in path.split("."):
+        target = getattr(target, part)
+    return target
+
+
+# ----------------------------------------------------------------------
+# Worker side
+# ----------------------------------------------------------------------
+
+class _RemoteService:
+    """
+    Worker-side stand-in for ServiceAPI.
+
+    Attribute access builds a dotted path; calling it performs the call in
+    the core. The call blocks the worker until the core answers; if the core
+    method was async, the result is handed back as an awaitable so plugin
+    code written as `await service_api.x()` keeps working.
+    """
+
+    def __init__(self, runtime: "_WorkerRuntime", path: str = ""):
+        self._runtime = runtime
+        self._path = path
+
+    def __getattr__(self, name: str):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return _RemoteService(self._runtime, f"{self._path}.{name}" if self._path else name)
+
+    def __call__(self, *args, **kwargs):
+        value, was_coroutine = self._runtime.service_call(self._path, args, kwargs)
+        if was_coroutine:
+            async def _completed():
+                return value
+            return _completed()
+        return value
+
+    def __bool__(self):
+        return True
+
+
+class _WorkerRuntime:
+    """Runs one plugin inside the worker process"""
+
+    def __init__(self, conn, service_timeout: float):
+        self.conn = conn
+        self.service_timeout = service_timeout
+        self.loop = asyncio.new_event_loop()
+        self.plugin = None
+        self._send_lock = threading.Lock()
+        self._pending: Dict[int, concurrent.futures.Future] = {}
+        self._ids = itertools.count(1)
+
+    def send(self, message: Tuple):
+        with self._send_lock:
+            self.conn.send(message)
+
+    def service_call(self, path: str, args, kwargs):
+        msg_id = next(self._ids)
+        future = concurrent.futures.Future()
+        self._pending[msg_id] = future
+        try:
+            self.send(("svc", msg_id, (path, args, kwargs)))
+            return future.result(timeout=self.service_timeout)
+        except concurrent.futures.TimeoutError:
+            raise PluginWorkerTimeout(f"ServiceAPI call {path} timed out")
+        finally:
+            self._pending.pop(msg_id, None)
+
+    async def _invoke(self, msg_id: int, method: str, args, kwargs):
+        try:
+            result = getattr(self.plugin, method)(*args, **kwargs)
+            if asyncio.iscoroutine(result):
+                result = await result
+            self._reply(("ok", msg_id, result))
+        except Exception as e:
+            self._reply(("err", msg_id, (type(e).__name__, str(e))))
+
+    def _reply(self, message: Tuple):
+        try:
+            self.send(message)
+        except Exception as e:  # unpicklable result
+            self.send(("err", message[1], (type(e).__name__, f"Result not transferable: {e}")))
+
+    async def _pong(self, msg_id: int):
+        self.send(("pong", msg_id, {
+            "cpu_seconds": time.process_time(),
+            "rss_mb": _rss_mb(),
+            "enabled": getattr(self.plugin, "enabled", True),
+        }))
+
+    def _read_loop(self):
+        while True:
+            try:
+                kind, msg_id, payload = self.conn.recv()
+            except (EOFError, OSError):
+                kind, msg_id, payload = "stop", 0, None
+
+            if kind == "call":
+                method, args, kwargs = payload
+                asyncio.run_coroutine_threadsafe(self._invoke(msg_id, method, args, kwargs), self.loop)
+            elif kind == "ping":
+                asyncio.run_coroutine_threadsafe(self._pong(msg_id), self.loop)
+            elif kind in ("svc_ok", "svc_err"):
+                future = self._pending.get(msg_id)
+                if future is not None and not future.done():
+                    if kind == "svc_ok":
+                        future.set_result(payload)
+                    else:
+                        future.set_exception(PluginWorkerError(payload))
+            elif kind == "stop":
+                self.loop.call_soon_threadsafe(self.loop.stop)
+                return
+
+    def run(self, plugin_id: str, module_path: str, class_name: str, config: Dict[str, Any]):
+        asyncio.set_event_loop(self.loop)
+        try:
+            plugin_class = getattr(importlib.import_module(module_path), class_name)
+            self.plugin = plugin_class(plugin_id=plugin_id, config=config,
+                                       service_api=_RemoteService(self))
+        except Exception as e:
+            self.send(("err", 0, (type(e).__name__, str(e))))
+            return
+
+        threading.Thread(target=self._read_loop, name=f"plugin-worker-{plugin_id}", daemon=True).start()
+        self.send(("ready", 0, self._manifest()))
+        self.loop.run_forever()
+
+    def _manifest(self) -> Dict[str, Any]:
+        manifest = {
+            "methods": _exposed_methods(self.plugin),
+            "enabled": getattr(self.plugin, "enabled", True),
+            "priority": getattr(self.plugin, "priority", 0),
+            "metadata": getattr(self.plugin, "metadata", {}),
+            "status": None,
+        }
+        for getter, key in CACHED_GETTERS.items():
+            if getter in manifest["methods"]:
+                try:
+                    manifest[key] = list(getattr(self.plugin, getter)())
+                except Exception:
+                    manifest["methods"].pop(getter)
+        if hasattr(self.plugin, "get_status"):
+            try:
+                manifest["status"] = self.plugin.get_status()
+            except Exception:
+                pass
+        return manifest
+
+
+def _rss_mb() -> float:
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+    except Exception:  # resource is unavailable on Windows
+        return 0.0
+
+
+def _worker_main(conn, plugin_id: str, module_path: str, class_name: str,
+                 config: Dict[str, Any], service_timeout: float):
+    """Process entry point"""
+    logging.basicConfig(level=logging.INFO)
+    _WorkerRuntime(conn, service_timeout).run(plugin_id, module_path, class_name, config)
+
+
+# ----------------------------------------------------------------------
+# Core side
+# ----------------------------------------------------------------------
+
+class PluginWorkerHandle:
+    """
+    Core-side proxy for a plugin running in a worker process.
+
+    Registered in PluginRegistry.plugins in place of the plugin instance.
+    Plugin methods listed in the worker's manifest are exposed with the same
+    shape: async methods become awaitable proxies with the per-plugin
+    timeout, sync methods block for the answer (avoid these on the hot path).
+    """
+
+    def __init__(self, plugin_id: str, module_path: str, class_name: str,
+                 config: Dict[str, Any], service_api,
+                 call_timeout: float = 10.0, start_timeout: float = 30.0,
+                 service_timeout: float = 30.0):
+        self.plugin_id = plugin_id
+        self.module_path = module_path
+        self.class_name = class_name
+        self.config = config
+        self.service_api = service_api
+        self.call_timeout = call_timeout
+        self.start_timeout = start_timeout
+        self.service_timeout = service_timeout
+
+        self.process = None
+        self.conn = None
+        self.manifest: Dict[str, Any] = {}
+        self.enabled = config.get("enabled", True)
+        self.start_time: Optional[datetime] = None
+        self.restarts = 0
+        self.stats = {"calls": 0, "timeouts": 0, "errors": 0, "service_calls": 0}
+        self.last_ping: Dict[str, Any] = {}
+        self.cpu_pct = 0.0
+        self._last_ping_at: Optional[float] = None
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._send_lock = threading.Lock()
+        self._pending: Dict[int, concurrent.futures.Future] = {}
+        self._ids = itertools.count(1)
+        self._reader: Optional[threading.Thread] = None
+        self._sync_waiting = 0
+        self._ready = threading.Event()
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    @property
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    def start(self) -> bool:
+        """Spawn the worker and wait for the plugin manifest"""
+        context = multiprocessing.get_context("spawn")
+        parent_conn, child_conn = context.Pipe()
+        self.conn = parent_conn
+        self._ready.clear()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child_conn, self.plugin_id, self.module_path, self.class_name,
+                  self.config, self.service_timeout),
+            name=f"plugin-{self.plugin_id}",
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+
+        try:
+            if not parent_conn.poll(self.start_timeout):
+                raise PluginWorkerError("worker did not report ready")
+            kind, _, payload = parent_conn.recv()
+            if kind != "ready":
+                raise PluginWorkerError(f"plugin init failed: {payload[0]}: {payload[1]}")
+        except (PluginWorkerError, EOFError, OSError) as e:
+            logger.error(f"[PluginWorker:{self.plugin_id}] Start failed: {e}")
+            self.stop()
+            return False
+
+        self.manifest = payload
+        self.enabled = self.enabled and payload.get("enabled", True)
+        self.start_time = datetime.now()
+        self._reader = threading.Thread(target=self._read_loop, name=f"plugin-handle-{self.plugin_id}",
+                                        daemon=True)
+        self._reader.start()
+        logger.info(f"[PluginWorker:{self.plugin_id}] Started in process {self.process.pid}")
+        return True
+
+    def stop(self, timeout: float = 5.0):
+        """Ask the worker to exit, then terminate it if needed"""
+        if self.conn is not None:
+            try:
+                with self._send_lock:
+                    self.conn.send(("stop", 0, None))
+            except Exception:
+                pass
+        if self.process is not None:
+            self.process.join(timeout)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join(timeout)
+        if self.conn is not None:
+            self.conn.close()
+        self._fail_pending(PluginWorkerError(f"worker {self.plugin_id} stopped"))
+        self.process = None
+        self.conn = None
+
+    def restart(self) -> bool:
+        self.stop()
+        self.restarts += 1
+        return self.start()
+
+    # ------------------------------------------------------------------
+    # Calls
+    # ------------------------------------------------------------------
+
+    def _send_call(self, kind: str, payload) -> Tuple[int, concurrent.futures.Future]:
+        if not self.is_alive or self.conn is None:
+            raise PluginWorkerError(f"worker {self.plugin_id} is not running")
+        msg_id = next(self._ids)
+        future = concurrent.futures.Future()
+        self._pending[msg_id] = future
+        with self._send_lock:
+            self.conn.send((kind, msg_id, payload))
+        return msg_id, future
+
+    async def call(self, method: str, *args, timeout: float = None, **kwargs) -> Any:
+        """Invoke a plugin method in the worker"""
+        self._loop = asyncio.get_running_loop()
+        self.stats["calls"] += 1
+        msg_id, future = self._send_call("call", (method, args, kwargs))
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout or self.call_timeout)
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            raise PluginWorkerTimeout(f"{self.plugin_id}.{method} timed out")
+        finally:
+            self._pending.pop(msg_id, None)
+
+    def call_sync(self, method: str, *args, timeout: float = None, **kwargs) -> Any:
+        """Blocking variant for sync plugin methods"""
+        self.stats["calls"] += 1
+        self._sync_waiting += 1
+        msg_id, future = self._send_call("call", (method, args, kwargs))
+        try:
+            return future.result(timeout=timeout or self.call_timeout)
+        except concurrent.futures.TimeoutError:
+            self.stats["timeouts"] += 1
+            raise PluginWorkerTimeout(f"{self.plugin_id}.{method} timed out")
+        finally:
+            self._sync_waiting -= 1
+            self._pending.pop(msg_id, None)
+
+    async def ping(self, timeout: float = 2.0) -> bool:
+        """True if the worker's event loop answered in time (a CPU-bound plugin will not)"""
+        try:
+            msg_id, future = self._send_call("ping", None)
+        except PluginWorkerError:
+            return False
+        try:
+            stats = await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except (asyncio.TimeoutError, PluginWorkerError):
+            return False
+        finally:
+            self._pending.pop(msg_id, None)
+        
+        # CPU share of the worker since the previous ping
+        now = time.monotonic()
+        if self._last_ping_at is not None and self.last_ping and now > self._last_ping_at:
+            cpu_delta = stats["cpu_seconds"] - self.last_ping.get("cpu_seconds", 0.0)
+            self.cpu_pct = max(0.0, 100.0 * cpu_delta / (now - self._last_ping_at))
+        self._last_ping_at = now
+        self.last_ping = stats
+        return True
+
+    def __getattr__(self, name: str):
+        # Only reached for names not defined on the handle
+        manifest = self.__dict__.get("manifest") or {}
+        kind = manifest.get("methods", {}).get(name)
+        if kind is None:
+            raise AttributeError(f"{self.__dict__.get('plugin_id')} has no attribute {name}")
+
+        if name in CACHED_GETTERS:
+            value = manifest.get(CACHED_GETTERS[name], [])
+            return lambda: list(value)
+
+        if kind == "async":
+            async def remote(*args, **kwargs):
+                return await self.call(name, *args, **kwargs)
+        else:
+            def remote(*args, **kwargs):
+                return self.call_sync(name, *args, **kwargs)
+        remote.__name__ = name
+        return remote
+
+    # ------------------------------------------------------------------
+    # Reader / ServiceAPI proxy
+    # ------------------------------------------------------------------
+
+    def _fail_pending(self, error: Exception):
+        for future in list(self._pending.values()):
+            if not future.done():
+                future.set_exception(error)
+        self._pending.clear()
+
+    def _read_loop(self):
+        conn = self.conn
+        while True:
+            try:
+                kind, msg_id, payload = conn.recv()
+            except (EOFError, OSError):
+                if self.conn is conn:
+                    logger.error(f"[PluginWorker:{self.plugin_id}] Worker process exited")
+                    self._fail_pending(PluginWorkerError(f"worker {self.plugin_id} exited"))
+                return
+
+            if kind == "svc":
+                self._dispatch_service_call(msg_id, *payload)
+                continue
+
+            future = self._pending.get(msg_id)
+            if future is None or future.done():
+                continue
+            if kind in ("ok", "pong"):
+                future.set_result(payload)
+            elif kind == "err":
+                self.stats["errors"] += 1
+                future.set_exception(PluginWorkerError(f"{payload[0]}: {payload[1]}"))
+
+    def _dispatch_service_call(self, msg_id: int, path: str, args, kwargs):
+        self.stats["service_calls"] += 1
+        loop = self._loop
+        if loop is not None and loop.is_running() and not self._sync_waiting:
+            asyncio.run_coroutine_threadsafe(self._serve_service_call(msg_id, path, args, kwargs), loop)
+        else:
+            # No core loop yet (plugin init) or the loop is blocked in call_sync
+            asyncio.run(self._serve_service_call(msg_id, path, args, kwargs))
+
+    async def _serve_service_call(self, msg_id: int, path: str, args, kwargs):
+        try:
+            result = _resolve(self.service_api, path)(*args, **kwargs)
+            was_coroutine = asyncio.iscoroutine(result)
+            if was_coroutine:
+                result = await result
+            message = ("svc_ok", msg_id, (result, was_coroutine))
+        except Exception as e:
+            message = ("svc_err", msg_id, f"{path}: {type(e).__name__}: {e}")
+        try:
+            with self._send_lock:
+                self.conn.send(message)
+        except Exception as e:
+            with self._send_lock:
+                self.conn.send(("svc_err", msg_id, f"{path}: result not transferable: {e}"))
+
+    # ------------------------------------------------------------------
+    # Status
+    # ------------------------------------------------------------------
+
+    def get_status(self) -> Dict[str, Any]:
+        status = dict(self.manifest.get("status") or {"plugin_id": self.plugin_id})
+        status.update({
+            "enabled": self.enabled,
+            "execution_mode": "process",
+            "worker": self.get_worker_stats(),
+        })
+        return status
+
+    def get_resource_stats(self) -> Dict[str, Any]:
+        """Picked up by PluginHealthMonitor resource metrics"""
+        return {"memory_mb": self.last_ping.get("rss_mb", 0.0), "cpu_pct": self.cpu_pct}
+
+    def get_worker_stats(self) -> Dict[str, Any]:
+        return {
+            "pid": self.process.pid if self.process else None,
+            "alive": self.is_alive,
+            "restarts": self.restarts,
+            "pending": len(self._pending),
+            **self.stats,
+        }
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        return self.manifest.get("metadata", {})
+
+    @property
+    def priority(self) -> int:
+        return self.manifest.get("priority", 0)
@@ -35,6 +35,8 @@ import asyncio
 from datetime import datetime
 from dataclasses import dataclass, field
 
+from src.core.order_templates import OrderTemplate, OrderTemplateService
+
 logger = logging.getLogger(__name__)
 
 
@@ -1040,6 +1042,62 @@ class ServiceAPI:
         
         return {"lot_size": lot_size, "balance": balance}
     
+    @property
+    def order_templates(self) -> Optional[OrderTemplateService]:
+        """Engine-wide OrderTemplateService (None for engines without one)"""
+        templates = getattr(self._engine, 'order_templates', None)
+        return templates if isinstance(templates, OrderTemplateService) else None
+    
+    def get_order_template(
+        self,
+        symbol: str,
+        logic: str = "default",
+        direction: str = "BUY",
+        plugin_id: str = None
+    ) -> Optional[OrderTemplate]:
+        """
+        Get the pre-armed order template for a plugin entry.
+        
+        The template carries the tier lot, plugin sizing parameters and symbol
+        stop constraints; the caller only applies the live price.
+        
+        Args:
+            symbol: Trading symbol
+            logic: Logic route of the entry
+            direction: "BUY" or "SELL"
+            plugin_id: Plugin ID (defaults to this API's plugin_id)
+        
+        Returns:
+            OrderTemplate, or None if no template service is available
+        """
+        templates = self.order_templates
+        if templates is None:
+            return None
+        return templates.get(plugin_id or self._plugin_id, symbol, logic, direction)
+    
+    def register_order_templates(
+        self,
+        params: Callable[[str, str], Dict[str, Any]] = None,
+        logics: List[str] = None,
+        plugin_id: str = None
+    ) -> bool:
+        """
+        Register a plugin's sizing parameters so its templates are kept warm.
+        
+        Args:
+            params: Callable(logic, direction) -> dict of template parameters
+            logics: Logic routes to pre-arm
+            plugin_id: Plugin ID (defaults to this API's plugin_id)
+        
+        Returns:
+            True if registered
+        """
+        templates = self.order_templates
+        if templates is None:
+            return False
+        templates.register_plugin(plugin_id or self._plugin_id, params, logics or ["default"])
+        return True
+    
     async def calculate_sl_price(
         self,
         price: float,
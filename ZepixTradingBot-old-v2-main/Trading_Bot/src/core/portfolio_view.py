@@ -0,0 +1,468 @@
+"""
+Portfolio View - Materialized live portfolio shared by all Telegram surfaces
+
+The dashboard, sticky headers, RiskManager.get_live_open_trades_pnl and the
+analytics bot each rebuilt the live picture on demand (open trades, per-trade
+PnL, chain levels, daily loss, session status), hitting MT5 once per trade on
+every render. This view is kept up to date incrementally instead:
+
+- Ticks re-price only the positions on that symbol (pip value cached per position)
+- Fills, closes and SL/TP changes arrive as MT5Client execution events
+- sync() reconciles with the engine's open trades (covers every code path
+  that appends trades) and refreshes risk counters, balance and status
+
+Every change bumps `version`. snapshot() returns an immutable
+PortfolioSnapshot rebuilt at most once per version, so readers get a
+consistent picture in O(1); render() memoizes formatted text per version so
+surfaces only re-render when something actually changed.
+
+Usage:
+    snapshot = engine.portfolio.snapshot()
+    text = engine.portfolio.render("dashboard", format_dashboard)
+    header = StickyHeader(..., version_source=lambda: engine.portfolio.version)
+
+Version: 1.0.0
+Date: 2026-01-14
+"""
+
+import logging
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple
+
+from src.utils.clock import Clock, get_clock
+
+logger = logging.getLogger(__name__)
+
+# Seconds a fill may take to appear in the engine's open trades before
+# snapshot() stops re-syncing for it
+PENDING_FILL_WINDOW = 10.0
+
+
+@dataclass(frozen=True)
+class PortfolioPosition:
+    """One open trade, priced at the last tick for its symbol"""
+    trade_id: Any
+    symbol: str
+    direction: str
+    lot_size: float
+    entry: float
+    sl: float
+    tp: float
+    current_price: float
+    pips: float
+    pnl: float
+    strategy: str = ""
+    chain_id: Optional[str] = None
+    chain_level: int = 1
+    profit_chain_id: Optional[str] = None
+    profit_level: int = 0
+
+    def to_detail(self) -> Dict[str, Any]:
+        """Same shape as RiskManager.get_live_open_trades_pnl trade_details"""
+        return {
+            'symbol': self.symbol,
+            'direction': self.direction.upper(),
+            'live_pnl': self.pnl,
+            'entry_price': self.entry,
+            'current_price': self.current_price,
+            'sl_price': self.sl,
+            'tp_price': self.tp,
+            'lot_size': self.lot_size,
+            'trade_id': self.trade_id,
+            'chain_level': self.chain_level,
+            'profit_level': self.profit_level,
+        }
+
+
+@dataclass(frozen=True)
+class PortfolioSnapshot:
+    """Immutable portfolio state at one version"""
+    version: int
+    built_at: datetime
+    positions: Tuple[PortfolioPosition, ...] = ()
+    total_pnl: float = 0.0
+    balance: float = 0.0
+    equity: float = 0.0
+    today: Dict[str, Any] = field(default_factory=lambda: {
+        'profit': 0.0, 'loss': 0.0, 'net': 0.0, 'trade_count': 0})
+    daily_loss: float = 0.0
+    lifetime_loss: float = 0.0
+    total_trades: int = 0
+    winning_trades: int = 0
+    trading_enabled: bool = True
+    session: str = "Unknown"
+
+    @property
+    def open_count(self) -> int:
+        return len(self.positions)
+
+    @property
+    def win_rate(self) -> float:
+        return (self.winning_trades / self.total_trades * 100.0) if self.total_trades else 0.0
+
+    @property
+    def chains(self) -> Dict[str, int]:
+        """Re-entry chain id -> highest open level"""
+        levels: Dict[str, int] = {}
+        for position in self.positions:
+            if position.chain_id:
+                levels[position.chain_id] = max(levels.get(position.chain_id, 0), position.chain_level)
+        return levels
+
+    def live_pnl(self) -> Dict[str, Any]:
+        """Same shape as RiskManager.get_live_open_trades_pnl"""
+        return {
+            'total_live_pnl': self.total_pnl,
+            'trade_details': [p.to_detail() for p in self.positions],
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "built_at": self.built_at.isoformat(),
+            "open_trades": self.open_count,
+            "total_pnl": round(self.total_pnl, 2),
+            "balance": self.balance,
+            "equity": self.equity,
+            "today": dict(self.today),
+            "daily_loss": self.daily_loss,
+            "trading_enabled": self.trading_enabled,
+            "session": self.session,
+            "chains": self.chains,
+            "positions": [p.to_detail() for p in self.positions],
+        }
+
+
+class PortfolioView:
+    """
+    Incrementally maintained portfolio with a version number.
+
+    Sources are callables so the view has no hard dependency on the engine:
+        trade_source:   -> iterable of open Trade objects
+        risk_source:    -> RiskCounters-like object (daily_loss, today_profit, ...)
+        account_source: -> object/dict with balance and equity (cached snapshot)
+        status_source:  -> {"trading_enabled": bool, "session": str}
+    """
+
+    def __init__(self, pip_calculator=None,
+                 trade_source: Optional[Callable[[], Iterable]] = None,
+                 risk_source: Optional[Callable[[], Any]] = None,
+                 account_source: Optional[Callable[[], Any]] = None,
+                 status_source: Optional[Callable[[], Dict[str, Any]]] = None,
+                 clock: Optional[Clock] = None):
+        self.pip_calculator = pip_calculator
+        self.trade_source = trade_source
+        self.risk_source = risk_source
+        self.account_source = account_source
+        self.status_source = status_source
+        self.clock = clock or get_clock()
+
+        self._lock = threading.RLock()
+        self._version = 0
+        self._positions: Dict[Any, Dict[str, Any]] = {}
+        self._by_symbol: Dict[str, Set[Any]] = {}
+        self._prices: Dict[str, float] = {}
+        self._total_pnl = 0.0
+        self._summary: Dict[str, Any] = {
+            "balance": 0.0, "equity": 0.0, "daily_loss": 0.0, "lifetime_loss": 0.0,
+            "today": {'profit': 0.0, 'loss': 0.0, 'net': 0.0, 'trade_count': 0},
+            "total_trades": 0, "winning_trades": 0, "trading_enabled": True, "session": "Unknown",
+        }
+        self._pending_fills: Dict[Any, float] = {}
+        self._snapshot: Optional[PortfolioSnapshot] = None
+        self._renders: Dict[str, Tuple[int, Any]] = {}
+        self.stats = {"ticks": 0, "fills": 0, "closes": 0, "modifies": 0, "syncs": 0,
+                      "snapshot_builds": 0, "render_hits": 0, "render_misses": 0}
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def _bump(self):
+        self._version += 1
+
+    # ------------------------------------------------------------------
+    # Positions
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _key(trade) -> Any:
+        trade_id = getattr(trade, 'trade_id', None)
+        return trade_id if trade_id is not None else id(trade)
+
+    def _pip_terms(self, symbol: str, lot_size: float) -> Tuple[float, float]:
+        if self.pip_calculator is None:
+            return 0.0001, 10.0 * lot_size
+        try:
+            return (self.pip_calculator.get_pip_size(symbol),
+                    self.pip_calculator.get_pip_value(symbol, lot_size))
+        except Exception as e:
+            logger.debug(f"[PortfolioView] Pip terms unavailable for {symbol}: {e}")
+            return 0.0001, 10.0 * lot_size
+
+    def _price(self, position: Dict[str, Any], price: float):
+        """Set a position's price and PnL; returns the PnL change"""
+        sign = 1 if position["direction"].lower() == "buy" else -1
+        pips = sign * (price - position["entry"]) / position["pip_size"] if position["pip_size"] else 0.0
+        pnl = pips * position["pip_value"]
+        delta = pnl - position["pnl"]
+        position.update(current_price=price, pips=pips, pnl=pnl)
+        return delta
+
+    def _fields(self, trade) -> Dict[str, Any]:
+        return {
+            "symbol": trade.symbol,
+            "direction": str(trade.direction),
+            "lot_size": trade.lot_size,
+            "entry": trade.entry,
+            "sl": getattr(trade, 'sl', 0.0) or 0.0,
+            "tp": getattr(trade, 'tp', 0.0) or 0.0,
+            "strategy": getattr(trade, 'strategy', "") or "",
+            "chain_id": getattr(trade, 'chain_id', None),
+            "chain_level": getattr(trade, 'chain_level', 1),
+            "profit_chain_id": getattr(trade, 'profit_chain_id', None),
+            "profit_level": getattr(trade, 'profit_level', 0),
+        }
+
+    def _add(self, key, fields: Dict[str, Any]):
+        pip_size, pip_value = self._pip_terms(fields["symbol"], fields["lot_size"])
+        position = {**fields, "trade_id": key, "pip_size": pip_size, "pip_value": pip_value,
+                    "current_price": fields["entry"], "pips": 0.0, "pnl": 0.0}
+        price = self._prices.get(fields["symbol"])
+        if price:
+            self._total_pnl += self._price(position, price)
+        self._positions[key] = position
+        self._by_symbol.setdefault(fields["symbol"], set()).add(key)
+        self._pending_fills.pop(key, None)
+
+    def _remove(self, key) -> bool:
+        position = self._positions.pop(key, None)
+        if position is None:
+            return False
+        self._total_pnl -= position["pnl"]
+        keys = self._by_symbol.get(position["symbol"])
+        if keys:
+            keys.discard(key)
+        return True
+
+    def on_fill(self, trade):
+        """A trade opened (Trade object)"""
+        with self._lock:
+            key = self._key(trade)
+            if key in self._positions:
+                self._remove(key)
+            self._add(key, self._fields(trade))
+            self.stats["fills"] += 1
+            self._bump()
+
+    def on_close(self, trade_id) -> bool:
+        """A trade closed; returns False if it was not tracked"""
+        with self._lock:
+            self._pending_fills.pop(trade_id, None)
+            if not self._remove(trade_id):
+                return False
+            self.stats["closes"] += 1
+            self._bump()
+            return True
+
+    def on_modify(self, trade_id, sl: float = None, tp: float = None) -> bool:
+        with self._lock:
+            position = self._positions.get(trade_id)
+            if position is None:
+                return False
+            changed = False
+            for name, value in (("sl", sl), ("tp", tp)):
+                if value is not None and position[name] != value:
+                    position[name] = value
+                    changed = True
+            if changed:
+                self.stats["modifies"] += 1
+                self._bump()
+            return changed
+
+    def on_tick(self, symbol: str, price: float) -> bool:
+        """Re-price the positions on symbol; returns True if anything changed"""
+        if not price:
+            return False
+        with self._lock:
+            self.stats["ticks"] += 1
+            if self._prices.get(symbol) == price:
+                return False
+            self._prices[symbol] = price
+            keys = self._by_symbol.get(symbol)
+            if not keys:
+                return False
+            for key in keys:
+                self._total_pnl += self._price(self._positions[key], price)
+            self._bump()
+            return True
+
+    def on_execution(self, event: str, payload: Dict[str, Any]):
+        """MT5Client execution listener"""
+        ticket = payload.get("ticket")
+        if event == "place":
+            # The Trade object is appended by the caller after the order returns
+            with self._lock:
+                self._pending_fills[ticket] = self.clock.monotonic()
+        elif event == "close" and payload.get("percentage", 100) >= 100:
+            self.on_close(ticket)
+        elif event == "modify":
+            self.on_modify(ticket, sl=payload.get("sl"), tp=payload.get("tp"))
+
+    # ------------------------------------------------------------------
+    # Reconciliation
+    # ------------------------------------------------------------------
+
+    def _read_summary(self) -> Dict[str, Any]:
+        summary = dict(self._summary)
+        if self.risk_source:
+            try:
+                counters = self.risk_source()
+                summary.update(
+                    daily_loss=counters.daily_loss,
+                    lifetime_loss=counters.lifetime_loss,
+                    total_trades=counters.total_trades,
+                    winning_trades=counters.winning_trades,
+                    today={
+                        'profit': counters.today_profit,
+                        'loss': counters.today_loss,
+                        'net': counters.today_profit + counters.today_loss,
+                        'trade_count': counters.today_trade_count,
+                    },
+                )
+            except Exception as e:
+                logger.debug(f"[PortfolioView] Risk source failed: {e}")
+        if self.account_source:
+            try:
+                account = self.account_source()
+                if account is not None:
+                    get = account.get if isinstance(account, dict) else lambda k, d=0.0: getattr(account, k, d)
+                    summary.update(balance=get("balance", 0.0), equity=get("equity", 0.0))
+            except Exception as e:
+                logger.debug(f"[PortfolioView] Account source failed: {e}")
+        if self.status_source:
+            try:
+                summary.update(self.status_source())
+            except Exception as e:
+                logger.debug(f"[PortfolioView] Status source failed: {e}")
+        return summary
+
+    def sync(self, trades: Optional[Iterable] = None) -> bool:
+        """
+        Reconcile positions with the engine's open trades and refresh the
+        risk/account/status summary. O(open trades), no broker calls.
+        Returns True if the version changed.
+        """
+        if trades is None:
+            trades = self.trade_source() if self.trade_source else []
+        summary = self._read_summary()
+        with self._lock:
+            self.stats["syncs"] += 1
+            changed = False
+            seen = set()
+            for trade in trades:
+                if getattr(trade, 'status', 'open') == 'closed':
+                    continue
+                key = self._key(trade)
+                seen.add(key)
+                fields = self._fields(trade)
+                position = self._positions.get(key)
+                if position is None:
+                    self._add(key, fields)
+                    self.stats["fills"] += 1
+                    changed = True
+                elif any(position[name] != value for name, value in fields.items()):
+                    self._remove(key)
+                    self._add(key, fields)
+                    changed = True
+            for key in [k for k in self._positions if k not in seen]:
+                self._remove(key)
+                self.stats["closes"] += 1
+                changed = True
+
+            if summary != self._summary:
+                self._summary = summary
+                changed = True
+            if changed:
+                self._bump()
+            return changed
+
+    def _expire_pending(self):
+        now = self.clock.monotonic()
+        for ticket, since in list(self._pending_fills.items()):
+            if now - since > PENDING_FILL_WINDOW:
+                del self._pending_fills[ticket]
+
+    # ------------------------------------------------------------------
+    # Readers
+    # ------------------------------------------------------------------
+
+    def snapshot(self) -> PortfolioSnapshot:
+        """Consistent immutable view; rebuilt at most once per version"""
+        if self._pending_fills:
+            # A fill is waiting for its Trade object; pick it up as soon as it lands
+            self.sync()
+            with self._lock:
+                self._expire_pending()
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot.version == self._version:
+                return snapshot
+            summary = self._summary
+            snapshot = PortfolioSnapshot(
+                version=self._version,
+                built_at=self.clock.now(),
+                positions=tuple(
+                    PortfolioPosition(**{k: v for k, v in p.items() if k not in ("pip_size", "pip_value")})
+                    for p in self._positions.values()
+                ),
+                total_pnl=self._total_pnl,
+                balance=summary["balance"],
+                equity=summary["equity"],
+                today=dict(summary["today"]),
+                daily_loss=summary["daily_loss"],
+                lifetime_loss=summary["lifetime_loss"],
+                total_trades=summary["total_trades"],
+                winning_trades=summary["winning_trades"],
+                trading_enabled=summary["trading_enabled"],
+                session=summary["session"],
+            )
+            self._snapshot = snapshot
+            self.stats["snapshot_builds"] += 1
+            return snapshot
+
+    def render(self, key: str, renderer: Callable[[PortfolioSnapshot], Any]) -> Any:
+        """renderer(snapshot), memoized until the version changes"""
+        snapshot = self.snapshot()
+        cached = self._renders.get(key)
+        if cached is not None and cached[0] == snapshot.version:
+            self.stats["render_hits"] += 1
+            return cached[1]
+        self.stats["render_misses"] += 1
+        result = renderer(snapshot)
+        self._renders[key] = (snapshot.version, result)
+        return result
+
+    def data_providers(self) -> Dict[str, Callable]:
+        """Providers for the sticky header content generators"""
+        return {
+            "open_trades": lambda: self.snapshot().open_count,
+            "daily_pnl": lambda: self.snapshot().today['net'],
+            "live_pnl": lambda: self.snapshot().total_pnl,
+            "daily_loss": lambda: self.snapshot().daily_loss,
+            "bot_status": lambda: "RUNNING" if self.snapshot().trading_enabled else "PAUSED",
+            "current_session": lambda: self.snapshot().session,
+            "win_rate": lambda: self.snapshot().win_rate,
+            "total_trades": lambda: self.snapshot().total_trades,
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "version": self._version,
+            "positions": len(self._positions),
+            "symbols": len([s for s, keys in self._by_symbol.items() if keys]),
+            "pending_fills": len(self._pending_fills),
+            **self.stats,
+        }
@@ -6,7 +6,8 @@ Each plugin has its own SQLite database to prevent data conflicts.
 
 Features:
 - Isolated databases per plugin
-- Async database operations
+- Async database operations on the shared database access layer
+  (pooled connections per file, executor-backed)
 - Cross-plugin aggregation
 - Health checks
 
@@ -21,6 +22,8 @@ from pathlib import Path
 from datetime import datetime
 from contextlib import asynccontextmanager
 
+from src.core.database_access import DatabasePool, get_db_pool, close_db_pool
+
 logger = logging.getLogger(__name__)
 
 
@@ -63,6 +66,7 @@ class DatabaseService:
         """
         self.base_path = Path(base_path)
         self._connections: Dict[str, sqlite3.Connection] = {}
+        self._pools: Dict[str, DatabasePool] = {}
         self._initialized_dbs: set = set()
         self._lock = asyncio.Lock()
     
@@ -91,35 +95,52 @@ class DatabaseService:
         data_dir = self.base_path / 'data'
         data_dir.mkdir(parents=True, exist_ok=True)
     
-    async def get_connection(self, plugin_id: str) -> sqlite3.Connection:
+    async def get_pool(self, plugin_id: str) -> DatabasePool:
         """
-        Get database connection for a plugin.
+        Get the shared connection pool for a plugin's database file.
         
-        Creates connection if it doesn't exist.
-        Uses synchronous sqlite3 wrapped in async for compatibility.
+        Plugins that share a file (the V6 timeframes) share one pool.
         
         Args:
             plugin_id: Plugin identifier
             
         Returns:
-            SQLite connection
+            DatabasePool for the plugin's database
         """
         async with self._lock:
-            if plugin_id not in self._connections:
+            pool = self._pools.get(plugin_id)
+            if pool is None or pool.closed:
                 self._ensure_data_dir()
                 db_path = self._get_db_path(plugin_id)
                 
-                # Create connection in thread pool
+                # Opening runs PRAGMAs on disk, keep it off the event loop
                 loop = asyncio.get_event_loop()
-                conn = await loop.run_in_executor(
+                pool = await loop.run_in_executor(
                     None,
-                    lambda: sqlite3.connect(str(db_path), check_same_thread=False)
+                    lambda: get_db_pool(str(db_path), row_factory=sqlite3.Row)
                 )
-                conn.row_factory = sqlite3.Row
-                self._connections[plugin_id] = conn
+                self._pools[plugin_id] = pool
+                self._connections[plugin_id] = pool.writer_connection
                 logger.info(f"[DatabaseService] Connection created for {plugin_id}: {db_path}")
             
-            return self._connections[plugin_id]
+            return pool
+    
+    async def get_connection(self, plugin_id: str) -> sqlite3.Connection:
+        """
+        Get database connection for a plugin.
+        
+        Returns the writer connection of the plugin's pool; prefer
+        execute_query / insert_record etc., which use pooled readers and
+        serialise writes.
+        
+        Args:
+            plugin_id: Plugin identifier
+            
+        Returns:
+            SQLite connection
+        """
+        await self.get_pool(plugin_id)
+        return self._connections[plugin_id]
     
     async def initialize_database(self, plugin_id: str, schema: str = None) -> bool:
         """
@@ -136,7 +157,7 @@ class DatabaseService:
             return True
         
         try:
-            conn = await self.get_connection(plugin_id)
+            pool = await self.get_pool(plugin_id)
             
             # Load schema from file if not provided
             if not schema:
@@ -147,13 +168,7 @@ class DatabaseService:
                     logger.warning(f"[DatabaseService] No schema found for {plugin_id}")
                     return False
             
-            # Execute schema in thread pool
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                None,
-                lambda: conn.executescript(schema)
-            )
-            await loop.run_in_executor(None, conn.commit)
+            await pool.aexecutescript(schema)
             
             self._initialized_dbs.add(plugin_id)
             logger.info(f"[DatabaseService] Database initialized for {plugin_id}")
@@ -180,17 +195,11 @@ class DatabaseService:
         Returns:
             List of result rows as dictionaries
         """
-        conn = await self.get_connection(plugin_id)
+        pool = await self.get_pool(plugin_id)
         
         try:
-            loop = asyncio.get_event_loop()
-            
-            def _execute():
-                cursor = conn.execute(query, params)
-                rows = cursor.fetchall()
-                return [dict(row) for row in rows]
-            
-            return await loop.run_in_executor(None, _execute)
+            rows = await pool.aquery(query, params)
+            return [dict(row) for row in rows]
             
         except Exception as e:
             logger.error(f"[DatabaseService] Query failed for {plugin_id}: {e}")
@@ -213,21 +222,15 @@ class DatabaseService:
         Returns:
             ID of inserted record
         """
-        conn = await self.get_connection(plugin_id)
+        pool = await self.get_pool(plugin_id)
         
         columns = ', '.join(data.keys())
         placeholders = ', '.join(['?' for _ in data])
         query = f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"
         
         try:
-            loop = asyncio.get_event_loop()
-            
-            def _insert():
-                cursor = conn.execute(query, tuple(data.values()))
-                conn.commit()
-                return cursor.lastrowid
-            
-            return await loop.run_in_executor(None, _insert)
+            cursor = await pool.aexecute(query, tuple(data.values()))
+            return cursor.lastrowid
             
         except Exception as e:
             logger.error(f"[DatabaseService] Insert failed for {plugin_id}.{table}: {e}")
@@ -252,21 +255,15 @@ class DatabaseService:
         Returns:
             Number of records updated
         """
-        conn = await self.get_connection(plugin_id)
+        pool = await self.get_pool(plugin_id)
         
         set_clause = ', '.join([f"{k} = ?" for k in data.keys()])
         where_clause = ' AND '.join([f"{k} = ?" for k in where.keys()])
         query = f"UPDATE {table} SET {set_clause} WHERE {where_clause}"
         
         try:
-            loop = asyncio.get_event_loop()
-            
-            def _update():
-                cursor = conn.execute(query, tuple(data.values()) + tuple(where.values()))
-                conn.commit()
-                return cursor.rowcount
-            
-            return await loop.run_in_executor(None, _update)
+            cursor = await pool.aexecute(query, tuple(data.values()) + tuple(where.values()))
+            return cursor.rowcount
             
         except Exception as e:
             logger.error(f"[DatabaseService] Update failed for {plugin_id}.{table}: {e}")
@@ -289,20 +286,14 @@ class DatabaseService:
         Returns:
             Number of records deleted
         """
-        conn = await self.get_connection(plugin_id)
+        pool = await self.get_pool(plugin_id)
         
         where_clause = ' AND '.join([f"{k} = ?" for k in where.keys()])
         query = f"DELETE FROM {table} WHERE {where_clause}"
         
         try:
-            loop = asyncio.get_event_loop()
-            
-            def _delete():
-                cursor = conn.execute(query, tuple(where.values()))
-                conn.commit()
-                return cursor.rowcount
-            
-            return await loop.run_in_executor(None, _delete)
+            cursor = await pool.aexecute(query, tuple(where.values()))
+            return cursor.rowcount
             
         except Exception as e:
             logger.error(f"[DatabaseService] Delete failed for {plugin_id}.{table}: {e}")
@@ -335,19 +326,24 @@ class DatabaseService:
         """Close database connection for a plugin"""
         async with self._lock:
             if plugin_id in self._connections:
-                conn = self._connections.pop(plugin_id)
-                loop = asyncio.get_event_loop()
-                await loop.run_in_executor(None, conn.close)
+                self._connections.pop(plugin_id)
+                pool = self._pools.pop(plugin_id)
+                # The file's pool stays open while another plugin still uses it
+                if all(other is not pool for other in self._pools.values()):
+                    loop = asyncio.get_event_loop()
+                    await loop.run_in_executor(None, close_db_pool, pool.db_path)
                 logger.info(f"[DatabaseService] Connection closed for {plugin_id}")
     
     async def close_all(self):
         """Close all database connections"""
         async with self._lock:
-            for plugin_id, conn in list(self._connections.items()):
-                loop = asyncio.get_event_loop()
-                await loop.run_in_executor(None, conn.close)
+            loop = asyncio.get_event_loop()
+            for db_path in {pool.db_path for pool in self._pools.values()}:
+                await loop.run_in_executor(None, close_db_pool, db_path)
+            for plugin_id in list(self._connections):
                 logger.info(f"[DatabaseService] Connection closed for {plugin_id}")
             self._connections.clear()
+            self._pools.clear()
     
     # ==================== Cross-Plugin Aggregation ====================
     
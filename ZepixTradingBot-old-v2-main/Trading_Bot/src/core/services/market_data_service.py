@@ -14,6 +14,8 @@ from typing import Dict, Any, Optional, List
 import logging
 from datetime import datetime
 
+from src.clients.symbol_registry import price_to_pips
+
 logger = logging.getLogger(__name__)
 
 
@@ -51,10 +53,7 @@ class MarketDataService:
             spread_points = symbol_info.get('spread', 0)
             point_value = symbol_info.get('point', 0.01)
             
-            if symbol in ['XAUUSD', 'XAGUSD']:
-                spread_pips = (spread_points * point_value) * 10
-            else:
-                spread_pips = spread_points / 10.0
+            spread_pips = price_to_pips(symbol, spread_points * point_value)
             
             return round(spread_pips, 1)
             
@@ -144,17 +143,11 @@ class MarketDataService:
             high = max(r.get('high', 0) for r in rates)
             low = min(r.get('low', 0) for r in rates)
             
-            if symbol in ['XAUUSD', 'XAGUSD']:
-                range_pips = (high - low) * 10
-            else:
-                range_pips = (high - low) * 10000
+            range_pips = price_to_pips(symbol, high - low)
             
             ranges = [(r.get('high', 0) - r.get('low', 0)) for r in rates]
             atr = sum(ranges) / len(ranges) if ranges else 0
-            if symbol in ['XAUUSD', 'XAGUSD']:
-                atr_pips = atr * 10
-            else:
-                atr_pips = atr * 10000
+            atr_pips = price_to_pips(symbol, atr)
             
             return {
                 "high": high,
@@ -270,10 +263,16 @@ class MarketDataService:
                 logger.warning(f"[SYMBOL_INFO] Symbol {symbol} not found")
                 return None
             
+            pip_value = 1.0
+            try:
+                pip_value = self._pip_calculator.get_pip_value(symbol, 1.0) or 1.0
+            except Exception:
+                pass
+            
             return {
                 "digits": info.get('digits', 2),
                 "point": info.get('point', 0.01),
-                "pip_value_per_std_lot": 1.0,
+                "pip_value_per_std_lot": pip_value,
                 "min_lot": info.get('volume_min', 0.01),
                 "max_lot": info.get('volume_max', 100.0),
                 "lot_step": info.get('volume_step', 0.01),
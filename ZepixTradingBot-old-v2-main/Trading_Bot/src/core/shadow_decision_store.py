@@ -0,0 +1,208 @@
+"""
+Shadow Decision Store
+Bounded in-memory storage for shadow mode records with SQLite spill-over
+
+Shadow mode records a decision, comparison and execution entry for every
+signal. Keeping them in plain lists grows memory for the life of the
+process, so each collection is a fixed-size ring buffer: when it is full the
+oldest record is handed to ShadowSpillStore, which batches them into SQLite.
+Recent records stay in memory for reports; older ones remain queryable.
+
+Part of Plan 11: Shadow Mode Testing
+Version: 1.0.0
+Date: 2026-01-14
+"""
+from collections import OrderedDict, deque
+from dataclasses import asdict, is_dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, Dict, Iterator, List, Optional
+import json
+import logging
+import os
+import sqlite3
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+def to_record(item: Any) -> Dict[str, Any]:
+    """Convert a dataclass / dict record into JSON-serializable form"""
+    if is_dataclass(item) and not isinstance(item, type):
+        item = asdict(item)
+    return json.loads(json.dumps(item, default=_json_default))
+
+
+def _json_default(value: Any):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
+
+
+class ShadowSpillStore:
+    """
+    SQLite archive for records evicted from memory.
+
+    The database is opened lazily on the first spill, so short-lived managers
+    (tests, shadow mode never enabled) never touch the disk. Rows are written
+    in batches of batch_size.
+    """
+
+    def __init__(self, db_path: str = "data/shadow_mode.db", batch_size: int = 50):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pending: List[tuple] = []
+        self._lock = threading.Lock()
+        self.spilled = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS shadow_records (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    kind TEXT NOT NULL,
+                    signal_id TEXT,
+                    ts TEXT NOT NULL,
+                    payload TEXT NOT NULL
+                )
+            ''')
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_shadow_kind_signal ON shadow_records(kind, signal_id)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def spill(self, kind: str, item: Any):
+        """Queue one evicted record; writes when the batch is full"""
+        record = to_record(item)
+        with self._lock:
+            self._pending.append((
+                kind,
+                record.get('signal_id'),
+                record.get('timestamp') or datetime.now().isoformat(),
+                json.dumps(record)
+            ))
+            if len(self._pending) < self.batch_size:
+                return
+        self.flush()
+
+    def flush(self) -> int:
+        """Write queued records. Returns number written."""
+        with self._lock:
+            if not self._pending:
+                return 0
+            rows, self._pending = self._pending, []
+            try:
+                conn = self._connect()
+                conn.executemany(
+                    "INSERT INTO shadow_records (kind, signal_id, ts, payload) VALUES (?, ?, ?, ?)",
+                    rows
+                )
+                conn.commit()
+            except Exception as e:
+                logger.error(f"[SHADOW_STORE] Spill of {len(rows)} records failed: {e}")
+                return 0
+            self.spilled += len(rows)
+            return len(rows)
+
+    def load(self, kind: str, limit: int = 100, signal_id: str = None) -> List[Dict[str, Any]]:
+        """Most recent spilled records of a kind (oldest first)"""
+        self.flush()
+        if self._conn is None and not os.path.exists(self.db_path):
+            return []
+        query = "SELECT payload FROM shadow_records WHERE kind = ?"
+        params: list = [kind]
+        if signal_id is not None:
+            query += " AND signal_id = ?"
+            params.append(signal_id)
+        query += " ORDER BY id DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._connect().execute(query, params).fetchall()
+        return [json.loads(r[0]) for r in reversed(rows)]
+
+    def clear(self):
+        with self._lock:
+            self._pending.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM shadow_records")
+                self._conn.commit()
+            self.spilled = 0
+
+    def close(self):
+        self.flush()
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class SpillingRingBuffer:
+    """
+    List-like fixed-size buffer. Appending to a full buffer evicts the
+    oldest record to the spill store. Supports len(), iteration, indexing
+    and slicing (e.g. buffer[-limit:]) like the lists it replaces.
+    """
+
+    def __init__(self, kind: str, maxlen: int = 1000, spill: Optional[ShadowSpillStore] = None):
+        self.kind = kind
+        self.maxlen = maxlen
+        self.spill_store = spill
+        self._items: deque = deque()
+        self.evicted = 0
+
+    def append(self, item: Any):
+        if len(self._items) >= self.maxlen:
+            oldest = self._items.popleft()
+            self.evicted += 1
+            if self.spill_store is not None:
+                self.spill_store.spill(self.kind, oldest)
+        self._items.append(item)
+
+    def clear(self):
+        self._items.clear()
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._items)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self._items)[index]
+        return self._items[index]
+
+    def __bool__(self) -> bool:
+        return bool(self._items)
+
+
+class BoundedDecisionMap(OrderedDict):
+    """
+    signal_id -> [Decision] map holding at most max_signals signals.
+    The least recently touched signal is evicted (and spilled) first.
+    """
+
+    def __init__(self, max_signals: int = 1000,
+                 on_evict: Optional[Callable[[str, List[Any]], None]] = None):
+        super().__init__()
+        self.max_signals = max_signals
+        self.on_evict = on_evict
+        self.evicted = 0
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.max_signals:
+            old_key, old_value = self.popitem(last=False)
+            self.evicted += 1
+            if self.on_evict is not None:
+                self.on_evict(old_key, old_value)
@@ -13,6 +13,10 @@ from enum import Enum
 import logging
 import json
 
+from src.core.shadow_decision_store import (
+    ShadowSpillStore, SpillingRingBuffer, BoundedDecisionMap
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -57,6 +61,10 @@ class ShadowModeManager:
     - Safe testing of new plugins
     - Comparison of plugin decisions vs legacy
     - Gradual rollout with confidence
+    
+    Storage is bounded: each collection keeps the most recent
+    `max_records` entries (`max_signals` for decisions) in memory and spills
+    older ones to SQLite. Comparison statistics are kept as running counters.
     """
     
     def __init__(self, config: Dict[str, Any] = None):
@@ -64,9 +72,17 @@ class ShadowModeManager:
         self.mode = ExecutionMode.LEGACY_ONLY
         self.execution_mode = ExecutionMode.LEGACY_ONLY  # Alias for compatibility
         
-        # Decision storage
-        self._decisions: Dict[str, List[Decision]] = {}  # signal_id -> decisions
-        self._comparisons: List[ComparisonResult] = []
+        max_records = self.config.get('max_records', 1000)
+        self._spill = ShadowSpillStore(
+            self.config.get('spill_db_path', 'data/shadow_mode.db')
+        ) if self.config.get('spill_enabled', True) else None
+        
+        # Decision storage (bounded, evicted entries spill to SQLite)
+        self._decisions: Dict[str, List[Decision]] = BoundedDecisionMap(
+            self.config.get('max_signals', 1000), on_evict=self._spill_decisions
+        )  # signal_id -> decisions
+        self._comparisons = SpillingRingBuffer('comparison', max_records, self._spill)
+        self._discrepancies = SpillingRingBuffer('discrepancy', max_records, None)
         
         # Statistics
         self._stats = {
@@ -79,16 +95,20 @@ class ShadowModeManager:
         }
         self.stats = self._stats  # Alias for compatibility
         
+        # Incremental comparison stats (no rescans of stored comparisons)
+        self._discrepancy_types: Dict[str, int] = {}
+        self._plugin_stats: Dict[str, Dict[str, Any]] = {}
+        
         # Enabled plugins for shadow mode
         self._shadow_plugins: set = set()
         self.registered_plugins: Dict[str, Any] = {}  # Plugin registry
         
         # Virtual orders (shadow trades)
-        self._virtual_orders: List[Dict[str, Any]] = []
+        self._virtual_orders = SpillingRingBuffer('virtual_order', max_records, self._spill)
         
         # Execution history and mismatches
-        self.execution_history: List[Dict[str, Any]] = []
-        self.mismatches: List[Dict[str, Any]] = []
+        self.execution_history = SpillingRingBuffer('execution', max_records, self._spill)
+        self.mismatches = SpillingRingBuffer('mismatch', max_records, self._spill)
         
         logger.info("ShadowModeManager initialized")
     
@@ -146,12 +166,17 @@ class ShadowModeManager:
     
     def record_decision(self, decision: Decision):
         """Record a trading decision"""
-        if decision.signal_id not in self._decisions:
-            self._decisions[decision.signal_id] = []
-        
-        self._decisions[decision.signal_id].append(decision)
+        decisions = self._decisions.get(decision.signal_id, [])
+        decisions.append(decision)
+        self._decisions[decision.signal_id] = decisions  # marks signal as most recent
         logger.debug(f"Decision recorded: {decision.source} -> {decision.action}")
     
+    def _spill_decisions(self, signal_id: str, decisions: List[Decision]):
+        """Eviction hook for the bounded decision map"""
+        if self._spill is not None:
+            for decision in decisions:
+                self._spill.spill('decision', decision)
+    
     def record_legacy_decision(
         self,
         signal_id: str,
@@ -259,14 +284,40 @@ class ShadowModeManager:
             result.discrepancy_type, result.discrepancy_details = \
                 self._analyze_discrepancy(legacy_decision, plugin_decision)
             self._stats['discrepancies'] += 1
+            self._discrepancies.append(result)
         else:
             self._stats['matches'] += 1
         
         self._comparisons.append(result)
         self._stats['signals_processed'] += 1
+        self._update_plugin_stats(plugin_decision.source, match, result.discrepancy_type)
         
         return result
     
+    def _update_plugin_stats(self, plugin_id: str, match: Optional[bool] = None,
+                             discrepancy_type: Optional[str] = None,
+                             status: Optional[str] = None, elapsed_ms: float = None):
+        """Fold one comparison / evaluation into the running per-plugin stats"""
+        stats = self._plugin_stats.setdefault(plugin_id, {
+            'evaluations': 0, 'compared': 0, 'matches': 0, 'discrepancies': 0,
+            'timeouts': 0, 'errors': 0, 'total_ms': 0.0, 'max_ms': 0.0
+        })
+        if match is not None:
+            stats['compared'] += 1
+            stats['matches' if match else 'discrepancies'] += 1
+            if discrepancy_type:
+                self._discrepancy_types[discrepancy_type] = \
+                    self._discrepancy_types.get(discrepancy_type, 0) + 1
+        if status is not None:
+            stats['evaluations'] += 1
+            if status == 'timeout':
+                stats['timeouts'] += 1
+            elif status == 'error':
+                stats['errors'] += 1
+        if elapsed_ms is not None:
+            stats['total_ms'] += elapsed_ms
+            stats['max_ms'] = max(stats['max_ms'], elapsed_ms)
+    
     def _decisions_match(self, legacy: Decision, plugin: Decision) -> bool:
         """Check if two decisions match"""
         # Same action?
@@ -338,17 +389,126 @@ class ShadowModeManager:
             **self._stats,
             'mode': self.mode.value,
             'shadow_plugins': list(self._shadow_plugins),
-            'virtual_orders_count': len(self._virtual_orders),
+            'virtual_orders_count': len(self._virtual_orders) + self._virtual_orders.evicted,
             'match_rate': (
                 self._stats['matches'] / self._stats['signals_processed'] * 100
                 if self._stats['signals_processed'] > 0 else 0
-            )
+            ),
+            'discrepancy_types': dict(self._discrepancy_types),
+            'by_plugin': self.get_plugin_stats(),
+            'storage': self.get_storage_stats()
+        }
+    
+    def get_plugin_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-plugin shadow stats with derived match rate and average latency"""
+        result = {}
+        for plugin_id, stats in self._plugin_stats.items():
+            result[plugin_id] = {
+                **stats,
+                'match_rate': stats['matches'] / stats['compared'] * 100 if stats['compared'] else 0,
+                'avg_ms': stats['total_ms'] / stats['evaluations'] if stats['evaluations'] else 0
+            }
+        return result
+    
+    def get_storage_stats(self) -> Dict[str, Any]:
+        """In-memory sizes and spill counts of the bounded stores"""
+        return {
+            'signals_in_memory': len(self._decisions),
+            'comparisons_in_memory': len(self._comparisons),
+            'virtual_orders_in_memory': len(self._virtual_orders),
+            'history_in_memory': len(self.execution_history),
+            'evicted': (self._decisions.evicted + self._comparisons.evicted +
+                        self._virtual_orders.evicted + self.execution_history.evicted +
+                        self.mismatches.evicted),
+            'spilled': self._spill.spilled if self._spill else 0
         }
     
     def get_discrepancies(self, limit: int = 100) -> List[ComparisonResult]:
         """Get recent discrepancies"""
-        discrepancies = [c for c in self._comparisons if not c.match]
-        return discrepancies[-limit:]
+        return self._discrepancies[-limit:]
+    
+    def get_spilled_records(self, kind: str, limit: int = 100,
+                            signal_id: str = None) -> List[Dict[str, Any]]:
+        """
+        Records already evicted from memory.
+        
+        Args:
+            kind: 'decision', 'comparison', 'virtual_order', 'execution' or 'mismatch'
+            limit: Maximum records to return
+            signal_id: Optional signal filter
+        """
+        if self._spill is None:
+            return []
+        return self._spill.load(kind, limit, signal_id)
+    
+    def record_shadow_result(
+        self,
+        plugin_id: str,
+        signal_id: str,
+        outcome: Dict[str, Any],
+        live_result: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Record a shadow plugin evaluation produced off the live path.
+        
+        Args:
+            plugin_id: Shadow plugin that ran
+            signal_id: Signal identifier
+            outcome: {'status': 'success'|'error'|'timeout', 'result': ..., 'elapsed_ms': ...}
+            live_result: Result of the live decision for the same signal, if any
+            
+        Returns:
+            Comparison dict when a live result was given, else None
+        """
+        status = outcome.get('status', 'success')
+        result = outcome.get('result') or {}
+        if not isinstance(result, dict):
+            result = {'value': result}
+        
+        action = status if status != 'success' else result.get('action', result.get('status', 'unknown'))
+        order_params = result.get('order_params')
+        
+        self._update_plugin_stats(plugin_id, status=status, elapsed_ms=outcome.get('elapsed_ms'))
+        self.record_plugin_decision(
+            plugin_id=plugin_id,
+            signal_id=signal_id,
+            action=action,
+            reason=outcome.get('error') or result.get('reason', ''),
+            order_params=order_params
+        )
+        self.record_plugin_execution(plugin_id, signal_id, {'action': action, **result})
+        
+        if action == 'execute' and self.is_plugin_in_shadow(plugin_id):
+            self.record_virtual_order(plugin_id, signal_id, order_params or {})
+        
+        if live_result is None:
+            return None
+        
+        live_action = live_result.get('action', live_result.get('status', 'unknown')) \
+            if isinstance(live_result, dict) else 'unknown'
+        comparison = self.compare_results({'action': live_action}, {'action': action}, signal_id)
+        self._update_plugin_stats(plugin_id, comparison['match'], comparison.get('discrepancy_type'))
+
+        # Same bookkeeping as compare_decisions so get_stats() covers live shadow runs
+        now = datetime.now()
+        stored = ComparisonResult(
+            signal_id=signal_id,
+            timestamp=now,
+            legacy_decision=Decision('live', signal_id, now, live_action, 'live decision'),
+            plugin_decision=Decision(plugin_id, signal_id, now, action,
+                                     outcome.get('error') or result.get('reason', ''), order_params),
+            match=comparison['match'],
+            discrepancy_type=comparison.get('discrepancy_type'),
+            discrepancy_details=comparison.get('discrepancy_details')
+        )
+        if stored.match:
+            self._stats['matches'] += 1
+        else:
+            self._stats['discrepancies'] += 1
+            self._discrepancies.append(stored)
+        self._comparisons.append(stored)
+        self._stats['signals_processed'] += 1
+        return comparison
     
     def compare_results(self, legacy_result: Dict[str, Any], plugin_result: Dict[str, Any], signal_id: str) -> Dict[str, Any]:
         """Compare legacy and plugin results for a signal"""
@@ -456,21 +616,23 @@ Plugin: {d.plugin_decision.action} - {d.plugin_decision.reason}
     def export_virtual_orders(self, filepath: str):
         """Export virtual orders to JSON file"""
         with open(filepath, 'w') as f:
-            json.dump(self._virtual_orders, f, indent=2)
+            json.dump(list(self._virtual_orders), f, indent=2)
         
         logger.info(f"Exported {len(self._virtual_orders)} virtual orders to {filepath}")
     
     def reset_stats(self):
         """Reset statistics (for testing)"""
-        self._stats = {
-            'signals_processed': 0,
-            'matches': 0,
-            'discrepancies': 0,
-            'legacy_executes': 0,
-            'plugin_executes': 0,
-            'shadow_signals': 0
-        }
+        for key in self._stats:
+            self._stats[key] = 0
         self._decisions.clear()
         self._comparisons.clear()
+        self._discrepancies.clear()
         self._virtual_orders.clear()
+        self._discrepancy_types.clear()
+        self._plugin_stats.clear()
         logger.info("Shadow mode stats reset")
+    
+    def flush(self):
+        """Write pending spilled records to SQLite"""
+        if self._spill is not None:
+            self._spill.flush()
@@ -198,17 +198,24 @@ class StartupIntegration:
     def _init_sticky_headers(self):
         """Initialize Sticky Header Manager"""
         try:
-            from src.telegram.sticky_headers import StickyHeaderManager, create_controller_content_generator
+            from src.telegram.sticky_headers import (
+                StickyHeaderManager, clock_change_key, create_controller_content_generator
+            )
             self._sticky_header_manager = StickyHeaderManager()
             
             # Create headers for each bot if available
             if self._controller_bot:
                 chat_id = getattr(self._controller_bot, 'chat_id', None)
                 if chat_id:
-                    # Create content generator
-                    content_gen = create_controller_content_generator(
-                        trading_engine=self._trading_engine
-                    )
+                    # Create content generator backed by the live portfolio view
+                    portfolio = getattr(self._trading_engine, 'portfolio', None)
+                    providers = portfolio.data_providers() if portfolio else {}
+                    content_gen = create_controller_content_generator(providers)
+                    
+                    # The header shows time and session, so those are part of its change key
+                    version_source = clock_change_key(
+                        lambda: portfolio.version, providers.get("current_session")
+                    ) if portfolio else None
                     
                     # Create header
                     header = self._sticky_header_manager.create_header(
@@ -219,7 +226,8 @@ class StartupIntegration:
                         send_callback=getattr(self._controller_bot, 'send_message', None),
                         edit_callback=getattr(self._controller_bot, 'edit_message', None),
                         pin_callback=getattr(self._controller_bot, 'pin_message', None),
-                        content_generator=content_gen
+                        content_generator=content_gen,
+                        version_source=version_source
                     )
                     
                     # Start header
@@ -0,0 +1,299 @@
+"""
+Symbol Shards - Per-symbol execution workers for the trading engine
+
+Open trades, pending re-entries and profit chains are partitioned by symbol.
+Each symbol gets its own asyncio task with its own work queue, so a slow
+broker call on one symbol (e.g. a retried XAUUSD close) no longer delays SL
+checks on the others. Limits that span symbols are enforced through a
+shared RiskBudget whose check-and-reserve step is atomic.
+
+Features:
+- SymbolShard: one task + one queue per symbol, periodic cycle plus ad-hoc jobs
+- SymbolShardManager: creates shards on demand, retires idle ones, stats
+- RiskBudget: global open-trade / lot / loss headroom with atomic reservations
+
+The shard cycle and jobs are plain callables, so the same partitioning can
+later be moved onto processes without touching the engine logic.
+
+Version: 1.0.0
+Date: 2026-01-14
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ShardJob = Callable[[], Awaitable[Any]]
+
+
+@dataclass
+class BudgetReservation:
+    """Slot taken from the RiskBudget while an order is being placed"""
+    symbol: str
+    lots: float
+    created_at: float = field(default_factory=time.time)
+
+
+class RiskBudget:
+    """
+    Global risk headroom shared by every shard.
+
+    try_reserve() checks the limits and takes a slot under one lock, so two
+    shards can never both claim the last open-trade slot. Reservations cover
+    the in-flight window between the check and the order appearing in the
+    engine's open trades; release them once placement succeeds or fails.
+
+    With a `limits` source the caps are re-read on every check, so edits
+    made at runtime (e.g. from the Telegram risk menu) apply immediately.
+    """
+
+    def __init__(self, max_open_trades: Optional[int] = None,
+                 max_total_lots: Optional[float] = None,
+                 open_exposure: Optional[Callable[[], Tuple[int, float]]] = None,
+                 loss_guard: Optional[Callable[[], bool]] = None,
+                 limits: Optional[Callable[[], Dict[str, Any]]] = None):
+        """
+        Args:
+            max_open_trades: Cap on open + in-flight trades (None = unlimited)
+            max_total_lots: Cap on open + in-flight volume (None = unlimited)
+            open_exposure: Returns (open_trade_count, open_lots) right now
+            loss_guard: Returns False when loss limits block new trades
+            limits: Returns the current risk_management section; its
+                    max_open_trades / max_total_lots override the fixed caps
+        """
+        self.max_open_trades = max_open_trades
+        self.max_total_lots = max_total_lots
+        self.open_exposure = open_exposure or (lambda: (0, 0.0))
+        self.loss_guard = loss_guard
+        self.limits = limits
+        self._lock = threading.Lock()
+        self._reserved_trades = 0
+        self._reserved_lots = 0.0
+        self.granted = 0
+        self.denied = 0
+
+    def try_reserve(self, symbol: str, lots: float) -> Optional[BudgetReservation]:
+        """Atomically check limits and reserve headroom. Returns None if denied."""
+        with self._lock:
+            reason = self._check(lots)
+            if reason:
+                self.denied += 1
+                logger.warning(f"[RISK_BUDGET] {symbol} {lots:.2f} lots denied: {reason}")
+                return None
+            self._reserved_trades += 1
+            self._reserved_lots += lots
+            self.granted += 1
+            return BudgetReservation(symbol=symbol, lots=lots)
+
+    def release(self, reservation: Optional[BudgetReservation]):
+        """Return a reservation's headroom (idempotent for None)"""
+        if reservation is None:
+            return
+        with self._lock:
+            self._reserved_trades = max(0, self._reserved_trades - 1)
+            self._reserved_lots = max(0.0, self._reserved_lots - reservation.lots)
+
+    @contextmanager
+    def reserve(self, symbol: str, lots: float):
+        """Context manager form: yields the reservation (or None) and always releases"""
+        reservation = self.try_reserve(symbol, lots)
+        try:
+            yield reservation
+        finally:
+            self.release(reservation)
+
+    def _current_limits(self) -> Tuple[Optional[int], Optional[float]]:
+        if self.limits is None:
+            return self.max_open_trades, self.max_total_lots
+        limits = self.limits() or {}
+        return (limits.get("max_open_trades", self.max_open_trades),
+                limits.get("max_total_lots", self.max_total_lots))
+
+    def _check(self, lots: float) -> Optional[str]:
+        if self.loss_guard is not None and not self.loss_guard():
+            return "loss limit reached"
+        max_open_trades, max_total_lots = self._current_limits()
+        open_count, open_lots = self.open_exposure()
+        if max_open_trades is not None and \
+                open_count + self._reserved_trades + 1 > max_open_trades:
+            return f"max open trades ({max_open_trades}) reached"
+        if max_total_lots is not None and \
+                open_lots + self._reserved_lots + lots > max_total_lots + 1e-9:
+            return f"max total lots ({max_total_lots}) reached"
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        open_count, open_lots = self.open_exposure()
+        max_open_trades, max_total_lots = self._current_limits()
+        return {
+            "open_trades": open_count,
+            "open_lots": round(open_lots, 2),
+            "reserved_trades": self._reserved_trades,
+            "reserved_lots": round(self._reserved_lots, 2),
+            "max_open_trades": max_open_trades,
+            "max_total_lots": max_total_lots,
+            "granted": self.granted,
+            "denied": self.denied,
+        }
+
+
+class SymbolShard:
+    """
+    Worker for a single symbol.
+
+    Runs `cycle(symbol)` every `interval` seconds and, in between, drains
+    jobs submitted to its own queue. Nothing here is shared with other
+    shards, so a blocked job only delays this symbol.
+    """
+
+    def __init__(self, symbol: str, cycle: Callable[[str], Awaitable[Any]],
+                 interval: float = 5.0, max_queue_size: int = 1000):
+        self.symbol = symbol
+        self.cycle = cycle
+        self.interval = interval
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self.task: Optional[asyncio.Task] = None
+        self.last_active = time.monotonic()
+        self.cycles = 0
+        self.jobs = 0
+        self.errors = 0
+        self.last_cycle_ms = 0.0
+        self.max_cycle_ms = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    def start(self):
+        if not self.running:
+            self.task = asyncio.create_task(self._run(), name=f"shard-{self.symbol}")
+
+    async def stop(self):
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    def submit(self, job: ShardJob) -> bool:
+        """Queue a job on this shard. Returns False if the queue is full."""
+        try:
+            self.queue.put_nowait(job)
+            return True
+        except asyncio.QueueFull:
+            logger.error(f"[SHARD:{self.symbol}] Work queue full, job dropped")
+            return False
+
+    async def _run(self):
+        next_cycle = time.monotonic()
+        while True:
+            timeout = max(0.0, next_cycle - time.monotonic())
+            try:
+                job = await asyncio.wait_for(self.queue.get(), timeout=timeout)
+            except asyncio.TimeoutError:
+                job = None
+
+            if job is not None:
+                await self._execute(job, is_cycle=False)
+                continue
+
+            await self._execute(lambda: self.cycle(self.symbol), is_cycle=True)
+            next_cycle = time.monotonic() + self.interval
+
+    async def _execute(self, job: ShardJob, is_cycle: bool):
+        started = time.perf_counter()
+        try:
+            await job()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"[SHARD:{self.symbol}] {'Cycle' if is_cycle else 'Job'} failed: {e}")
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if is_cycle:
+            self.cycles += 1
+            self.last_cycle_ms = elapsed_ms
+            self.max_cycle_ms = max(self.max_cycle_ms, elapsed_ms)
+        else:
+            self.jobs += 1
+            self.last_active = time.monotonic()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "queue_depth": self.queue.qsize(),
+            "cycles": self.cycles,
+            "jobs": self.jobs,
+            "errors": self.errors,
+            "last_cycle_ms": round(self.last_cycle_ms, 2),
+            "max_cycle_ms": round(self.max_cycle_ms, 2),
+        }
+
+
+class SymbolShardManager:
+    """
+    Owns the set of SymbolShards.
+
+    The engine's coordinator loop calls sync() with the symbols that currently
+    have work; shards are started for new symbols and retired after being
+    idle for idle_timeout seconds.
+    """
+
+    def __init__(self, cycle: Callable[[str], Awaitable[Any]], interval: float = 5.0,
+                 idle_timeout: float = 300.0, max_queue_size: int = 1000):
+        self.cycle = cycle
+        self.interval = interval
+        self.idle_timeout = idle_timeout
+        self.max_queue_size = max_queue_size
+        self.shards: Dict[str, SymbolShard] = {}
+
+    @property
+    def active(self) -> bool:
+        return any(shard.running for shard in self.shards.values())
+
+    def ensure(self, symbol: str) -> SymbolShard:
+        """Get (and start if needed) the shard for symbol. Needs a running loop."""
+        shard = self.shards.get(symbol)
+        if shard is None:
+            shard = SymbolShard(symbol, self.cycle, self.interval, self.max_queue_size)
+            self.shards[symbol] = shard
+            logger.info(f"[SHARD:{symbol}] Worker started")
+        shard.start()
+        return shard
+
+    def submit(self, symbol: str, job: ShardJob) -> bool:
+        """Run job on the symbol's shard, serialized with its SL/TP checks"""
+        return self.ensure(symbol).submit(job)
+
+    def sync(self, symbols: Iterable[str]):
+        """Start shards for symbols with work; retire shards idle too long"""
+        wanted = set(s for s in symbols if s)
+        now = time.monotonic()
+        for symbol in wanted:
+            self.ensure(symbol).last_active = now
+
+        for symbol, shard in list(self.shards.items()):
+            if symbol in wanted or not shard.queue.empty():
+                continue
+            if now - shard.last_active >= self.idle_timeout:
+                if shard.task:
+                    shard.task.cancel()
+                del self.shards[symbol]
+                logger.info(f"[SHARD:{symbol}] Worker retired (idle)")
+
+    async def stop(self):
+        """Cancel every shard task"""
+        for shard in list(self.shards.values()):
+            await shard.stop()
+        self.shards.clear()
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {symbol: shard.get_stats() for symbol, shard in self.shards.items()}
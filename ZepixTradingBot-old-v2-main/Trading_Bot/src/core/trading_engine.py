@@ -5,6 +5,8 @@ import time
 from src.models import Alert, Trade, ReEntryChain, ProfitBookingChain
 from src.v3_alert_models import ZepixV3Alert, V3AlertResponse
 from src.config import Config
+from src.core.config_snapshot import ConfigSnapshot, ConfigSnapshotStore
+from src.core.symbol_shards import RiskBudget, SymbolShardManager
 from src.managers.risk_manager import RiskManager
 from src.clients.mt5_client import MT5Client
 from src.processors.alert_processor import AlertProcessor
@@ -21,12 +23,26 @@ from src.managers.profit_booking_reentry_manager import ProfitBookingReEntryMana
 from src.managers.autonomous_system_manager import AutonomousSystemManager
 from src.utils.optimized_logger import logger
 from src.core.plugin_system.plugin_registry import PluginRegistry
+from src.core.plugin_system.plugin_hot_reload import PluginHotReloader
 from src.core.plugin_system.service_api import ServiceAPI
 # from src.telegram.multi_telegram_manager import MultiTelegramManager # REMOVED LEAGCY
 from src.telegram.core.multi_bot_manager import MultiBotManager
 from src.core.shadow_mode_manager import ShadowModeManager, ExecutionMode
+from src.core.plugin_router import get_plugin_router
 from src.modules.voice_alert_system import VoiceAlertSystem, AlertPriority
 from src.modules.fixed_clock_system import get_clock_system
+from src.monitoring.memory_telemetry import MemoryTelemetry, EvictionPolicy
+from src.core.data_lifecycle import DataLifecycleManager
+from src.core.order_templates import OrderTemplateService
+from src.core.multi_account import AccountCoordinator
+from src.core.portfolio_view import PortfolioView
+from src.core.engine_snapshot import EngineSnapshotStore
+from src.core.market_recorder import MarketRecorder
+from src.core.event_bus import (
+    OrderEventBus, OrderOpened, OrderModified, OrderClosed, SLHit, TPHit, TickBatch
+)
+from src.telegram.sticky_header_builder import get_current_session
+from src.utils.clock import get_clock
 import json
 import uuid
 
@@ -39,6 +55,11 @@ class TradingEngine:
         self.mt5_client = mt5_client
         self.telegram_bot = telegram_bot # Injected MultiBotManager
         self.alert_processor = alert_processor
+        # Time source for trade timestamps, grace periods and the monitor loop
+        self.clock = get_clock()
+        
+        # Hot-path config flags, refreshed from config snapshots on change
+        self._bind_config_snapshot()
         
         # Track bot uptime
         self.start_time = time.time()
@@ -60,7 +81,9 @@ class TradingEngine:
         self.session_manager = None 
         
         # Core managers
-        self.pip_calculator = PipCalculator(config)
+        self.pip_calculator = PipCalculator(
+            config, symbol_registry=getattr(mt5_client, 'symbol_registry', None)
+        )
         self.trend_manager = TimeframeTrendManager()
         self.alert_processor.trend_manager = self.trend_manager
         self.reentry_manager = ReEntryManager(config, mt5_client)
@@ -96,12 +119,30 @@ class TradingEngine:
         # NEW: Advanced re-entry and exit handlers
         self.price_monitor = PriceMonitorService(
             config, mt5_client, self.reentry_manager, 
-            self.trend_manager, self.pip_calculator, self
+            self.trend_manager, self.pip_calculator, self, clock=self.clock
         )
         self.reversal_handler = ReversalExitHandler(
             config, mt5_client, telegram_bot, self.db, price_monitor=self.price_monitor
         )
         
+        # Per-symbol execution shards; limits spanning symbols go through one shared budget
+        self.risk_budget = RiskBudget(
+            open_exposure=self._open_exposure,
+            loss_guard=self.risk_manager.check_daily_limit,
+            limits=lambda: self.config.get("risk_management", {})
+        )
+        sharding_config = self.config.get("symbol_sharding", {}) or {}
+        self.shard_manager: Optional[SymbolShardManager] = None
+        if sharding_config.get("enabled", True):
+            # Shards take over the price monitor's re-entry scans, so they keep its cadence
+            monitor_interval = (self.config.get("re_entry_config", {}) or {}).get(
+                "price_monitor_interval_seconds", 5)
+            self.shard_manager = SymbolShardManager(
+                self._run_symbol_shard,
+                interval=sharding_config.get("check_interval_seconds", monitor_interval),
+                idle_timeout=sharding_config.get("idle_timeout_seconds", 300)
+            )
+        
         # Current signals per symbol
         self.current_signals = {}
         
@@ -117,6 +158,12 @@ class TradingEngine:
         self.combinedlogic_2_enabled = True
         self.combinedlogic_3_enabled = True
 
+        # Pre-armed lot/SL/TP parameters so entries only apply the live price
+        self.order_templates = OrderTemplateService(
+            self.config, mt5_client=mt5_client, risk_manager=risk_manager,
+            refresh_interval=self.config.get("order_templates", {}).get("refresh_seconds", 5)
+        )
+
         # Initialize Plugin System
         self.service_api = ServiceAPI(self)
         self.plugin_registry = PluginRegistry(
@@ -127,6 +174,64 @@ class TradingEngine:
         # Plan 11: Initialize Shadow Mode Manager
         shadow_config = self.config.get("shadow_mode", {})
         self.shadow_manager = ShadowModeManager(shadow_config)
+        # Live signals are delegated below; the router runs shadow plugins after them
+        self.plugin_router = get_plugin_router(self.plugin_registry, shadow_manager=self.shadow_manager)
+        
+        # Zero-downtime plugin replacement (optionally shadow-evaluated first)
+        self.plugin_reloader = PluginHotReloader(
+            self.plugin_registry, shadow_manager=self.shadow_manager,
+            config=self.config.get("plugin_system", {}).get("hot_reload", {})
+        )
+        
+        # Memory telemetry: size caps and budget alerts for long-lived state
+        self.memory_telemetry = MemoryTelemetry(
+            self.config.get("memory_telemetry", {}), telegram_bot=telegram_bot
+        )
+        self._register_memory_components()
+        
+        # Hot/archive tiers and quiet-hour ANALYZE / incremental vacuum
+        self.data_lifecycle = DataLifecycleManager(self.config.get("data_lifecycle", {}))
+        
+        # Mirrors primary executions to extra accounts, one worker process per account
+        self.account_coordinator = AccountCoordinator.from_config(
+            self.config, primary_client=mt5_client,
+            notifier=lambda message: self.telegram_bot.send_message(message)
+        )
+        
+        # Live portfolio shared by the dashboard, sticky headers and analytics
+        self.portfolio = PortfolioView(
+            pip_calculator=self.pip_calculator,
+            trade_source=lambda: self.open_trades,
+            risk_source=lambda: self.risk_manager.ledger.counters,
+            account_source=self.mt5_client.get_account_snapshot,
+            status_source=lambda: {
+                "trading_enabled": self.trading_enabled,
+                "session": get_current_session()[0],
+            },
+            clock=self.clock,
+        )
+        self.mt5_client.add_execution_listener(self.portfolio.on_execution)
+        
+        # Order lifecycle events: close handling publishes, follow-up work subscribes
+        self.event_bus = OrderEventBus(self.config.get("event_bus", {}))
+        self.event_bus.subscribe(OrderClosed, self._on_order_closed, name="engine", lossless=True)
+        self.mt5_client.add_execution_listener(self._publish_execution)
+        self.plugin_registry.attach_event_bus(self.event_bus)
+        if self.reentry_manager.trend_analyzer:
+            self.reentry_manager.trend_analyzer.event_bus = self.event_bus
+            if not self.config.get("simulate_orders", True):
+                # Scored once per bar by the trade monitor so TrendChanged fires for every
+                # traded symbol, not only when a re-entry check happens to ask
+                self.reentry_manager.trend_analyzer.watch(self.config.get("symbol_mapping", {}).keys())
+        self._tick_batch: Dict[str, float] = {}
+        
+        # Warm-restart snapshot of trades, chains, pending re-entries and windows
+        self.snapshot_store = EngineSnapshotStore(self.config.get("engine_snapshot", {}), clock=self.clock)
+        
+        # Polled ticks and raw alert payloads, recorded off-thread for post-mortems
+        self.market_recorder = MarketRecorder(self.config.get("market_recorder", {}), clock=self.clock)
+        if self.market_recorder.enabled:
+            self.mt5_client.add_tick_listener(self.market_recorder.record_tick)
         
         # Plan 07: Initialize Multi-Telegram Manager (3-Bot System)
         # self.telegram_manager: Optional[MultiTelegramManager] = None
@@ -139,6 +244,64 @@ class TradingEngine:
         # Phase 9: Initialize Clock System (Legacy Restoration)
         self.clock_system = get_clock_system()
     
+    def _bind_config_snapshot(self):
+        """
+        Cache flags read on every monitor cycle as plain attributes.
+        
+        Config objects that publish snapshots push changed sections to
+        _on_config_sections_changed; plain dict configs are read once.
+        """
+        self._simulate_orders = bool(self.config.get("simulate_orders", False))
+        re_entry = self.config.get("re_entry_config", {}) or {}
+        self._sl_hunt_reentry_enabled = bool(re_entry.get("sl_hunt_reentry_enabled", True))
+        self._tp_reentry_enabled = bool(re_entry.get("tp_reentry_enabled", False))
+        
+        if isinstance(getattr(self.config, "snapshots", None), ConfigSnapshotStore):
+            self.config.snapshots.subscribe(
+                self._on_config_sections_changed,
+                sections=("simulate_orders", "re_entry_config")
+            )
+    
+    def _on_config_sections_changed(self, changed: Dict[str, Any], snapshot: ConfigSnapshot):
+        """Snapshot subscriber - refresh hot-path flags for changed sections only"""
+        if "simulate_orders" in changed:
+            self._simulate_orders = bool(snapshot.get("simulate_orders", False))
+        if "re_entry_config" in changed:
+            re_entry = snapshot.section("re_entry_config")
+            self._sl_hunt_reentry_enabled = bool(re_entry.get("sl_hunt_reentry_enabled", True))
+            self._tp_reentry_enabled = bool(re_entry.get("tp_reentry_enabled", False))
+    
+    def _register_memory_components(self):
+        """Register long-lived containers owned by the engine and its managers"""
+        telemetry = self.memory_telemetry
+        alert_processor = self.alert_processor
+        recovery_monitor = getattr(self.autonomous_manager, 'recovery_monitor', None)
+        
+        def evict_alerts(container, excess):
+            before = len(alert_processor.recent_alerts)
+            alert_processor.clean_old_alerts()
+            return before - len(alert_processor.recent_alerts)
+        
+        try:
+            telemetry.register_attributes(
+                alert_processor, "alert_processor",
+                {"recent_alerts": alert_processor.MAX_RECENT_ALERTS},
+                policy=EvictionPolicy.CALLBACK, evict=evict_alerts
+            )
+            # Evicting here would only prune monitors whose task already ended
+            telemetry.register_attributes(
+                recovery_monitor, "recovery_window_monitor", {"active_monitors": 200},
+                policy=EvictionPolicy.CALLBACK,
+                evict=lambda container, excess: recovery_monitor.prune_finished_monitors()
+            )
+            # Bounded by construction (evict/spill on their own): reported and alerted on only
+            telemetry.register_attributes(self.shadow_manager, "shadow_mode", dict.fromkeys(
+                ("_decisions", "_comparisons", "_discrepancies", "_virtual_orders",
+                 "execution_history", "mismatches")))
+            telemetry.register_attributes(self.service_api, "service_api", {"_service_metrics": 100})
+        except Exception as e:
+            logger.warning(f"[MEMORY] Could not register components: {e}")
+    
     def _init_voice_alerts(self):
         """Initialize Voice Alert System (Phase 9: Legacy Restoration)"""
         try:
@@ -279,6 +442,16 @@ class TradingEngine:
         """Disable a plugin from shadow mode testing"""
         self.shadow_manager.disable_shadow_plugin(plugin_id)
     
+    async def reload_plugin(self, plugin_id: str, shadow: bool = False) -> Dict[str, Any]:
+        """Hot-reload a plugin's code; with shadow=True it is evaluated before promotion"""
+        result = await self.plugin_reloader.reload_plugin(plugin_id, shadow=shadow)
+        return result.to_dict()
+    
+    async def promote_plugin(self, plugin_id: str, force: bool = False) -> Dict[str, Any]:
+        """Make a shadow-evaluated plugin version live"""
+        result = await self.plugin_reloader.promote(plugin_id, force=force)
+        return result.to_dict()
+    
     async def _notify_discrepancy(self, comparison):
         """Notify about decision discrepancy via Telegram"""
         message = f"Shadow Mode Discrepancy: {comparison.discrepancy_type}\n"
@@ -352,6 +525,11 @@ class TradingEngine:
                 f"  SL Reduction Per Level: {re_entry_config.get('sl_reduction_per_level', 0.5)}"
             )
             
+            # Warm restart: reload engine state, then only the delta is reconciled with MT5
+            restored = self.snapshot_store.load_and_restore(self)
+            if restored:
+                logger.info(f"✅ Engine state restored from snapshot: {restored}")
+            
             # Start background price monitor
             await self.price_monitor.start()
             
@@ -361,9 +539,10 @@ class TradingEngine:
             else:
                 logger.error("❌ Price Monitor Service NOT running after initialization")
             
-            # Recover profit booking chains from database
+            # Recover profit booking chains from database (already restored on warm restart)
             if self.profit_booking_manager.is_enabled():
-                self.profit_booking_manager.recover_chains_from_database(self.open_trades)
+                if not restored:
+                    self.profit_booking_manager.recover_chains_from_database(self.open_trades)
                 # Handle orphaned orders
                 self.profit_booking_manager.handle_orphaned_orders(self.open_trades)
                 # Clean up stale chains (fixes infinite loop spam)
@@ -373,6 +552,20 @@ class TradingEngine:
             print("SUCCESS: Price monitor service started")
             if self.profit_booking_manager.is_enabled():
                 print("SUCCESS: Profit booking manager initialized")
+        
+        self.market_recorder.start()
+        if self.config.get("memory_telemetry", {}).get("enabled", True):
+            await self.memory_telemetry.start()
+        if self.config.get("data_lifecycle", {}).get("enabled", False):
+            await self.data_lifecycle.start()
+        if self.config.get("order_templates", {}).get("enabled", True):
+            await self.order_templates.start()
+        if success and self.account_coordinator.enabled:
+            await self.account_coordinator.start()
+            self.mt5_client.add_execution_listener(self.account_coordinator.on_primary_execution)
+            # Closes the broker made itself (SL/TP, reconcile_with_mt5) reach the mirrors too
+            self.event_bus.subscribe(OrderClosed, self.account_coordinator.on_primary_closed,
+                                     name="multi_account", lossless=True)
         return success
 
     def initialize_symbol_signals(self, symbol: str):
@@ -401,6 +594,8 @@ class TradingEngine:
         
         if not plugin:
             logger.warning(f"No plugin found for signal: {signal_data.get('strategy', 'unknown')}")
+            self.plugin_router.record_route(signal_data)
+            self.plugin_router.dispatch_shadow(signal_data)
             return {"status": "error", "message": "no_plugin_found"}
         
         # Log delegation
@@ -426,6 +621,11 @@ class TradingEngine:
             
             # Track metrics
             self._track_plugin_execution(plugin.plugin_id, signal_data, result)
+            self.plugin_router.record_route(signal_data, plugin.plugin_id)
+            
+            # Shadow plugins see the same signal off the live path
+            self.plugin_router.dispatch_shadow(signal_data, live_plugin_id=plugin.plugin_id,
+                                               live_result=result)
             
             return result if result else {"status": "error", "message": "plugin_returned_none"}
             
@@ -433,6 +633,7 @@ class TradingEngine:
             logger.error(f"Plugin {plugin.plugin_id} failed to process signal: {e}")
             import traceback
             traceback.print_exc()
+            self.plugin_router.record_route(signal_data, plugin.plugin_id, success=False)
             self._handle_plugin_failure(plugin.plugin_id, e)
             return {"status": "error", "message": str(e)}
 
@@ -484,6 +685,9 @@ class TradingEngine:
     async def process_alert(self, data: Dict[str, Any]) -> bool:
         """Enhanced alert router with v3 support"""
         
+        # Record the payload exactly as received, before plugins modify it
+        self.market_recorder.record_alert(data)
+        
         # PLUGIN HOOK: on_signal_received
         # Allow plugins to modify or reject the signal
         if self.config.get("plugin_system", {}).get("enabled", True):
@@ -905,7 +1109,7 @@ class TradingEngine:
                 lot_size=order_a_lot,
                 direction="BUY" if alert.direction == "buy" else "SELL",
                 strategy=logic_type,
-                open_time=datetime.now().isoformat(),
+                open_time=self.clock.now().isoformat(),
                 original_entry=alert.price,
                 original_sl_distance=abs(alert.price - sl_price_a),
                 order_type="TP_TRAIL",
@@ -952,7 +1156,7 @@ class TradingEngine:
                 lot_size=order_b_lot,
                 direction="BUY" if alert.direction == "buy" else "SELL",
                 strategy=logic_type,
-                open_time=datetime.now().isoformat(),
+                open_time=self.clock.now().isoformat(),
                 original_entry=alert.price,
                 original_sl_distance=sl_dist_b,
                 order_type="PROFIT_TRAIL",
@@ -1526,7 +1730,7 @@ class TradingEngine:
                         # Update chain with Order A's trade_id
                         if order_a.trade_id and order_a.trade_id not in chain.trades:
                             chain.trades.append(order_a.trade_id)
-                            chain.last_update = datetime.now().isoformat()
+                            chain.last_update = self.clock.now().isoformat()
                     
                     # Register for SL hunt monitoring
                     if self.config.get("re_entry_config", {}).get("sl_hunt_reentry_enabled", True):
@@ -1544,7 +1748,7 @@ class TradingEngine:
                     if shared_chain is not None:
                         if order_b.trade_id and order_b.trade_id not in shared_chain.trades:
                             shared_chain.trades.append(order_b.trade_id)
-                            shared_chain.last_update = datetime.now().isoformat()
+                            shared_chain.last_update = self.clock.now().isoformat()
                         
                         self.logger.info(
                             f"[DUAL_ORDER_CHAIN] ✅ Order B #{order_b.trade_id} added to shared chain {shared_chain_id}"
@@ -1729,7 +1933,7 @@ class TradingEngine:
                 lot_size=lot_size,
                 direction=alert.signal,
                 strategy=strategy,
-                open_time=datetime.now().isoformat(),
+                open_time=self.clock.now().isoformat(),
                 original_entry=alert.price,
                 original_sl_distance=sl_distance,
                 session_id=session_id
@@ -1851,7 +2055,7 @@ class TradingEngine:
                     lot_size=lot_size,
                     direction=alert.signal,
                     strategy=strategy,
-                    open_time=datetime.now().isoformat(),
+                    open_time=self.clock.now().isoformat(),
                     chain_id=reentry_info["chain_id"],
                     chain_level=reentry_info["level"],
                     is_re_entry=True,
@@ -1890,7 +2094,7 @@ class TradingEngine:
                     lot_size=lot_size,
                     direction=alert.signal,
                     strategy=strategy,
-                    open_time=datetime.now().isoformat(),
+                    open_time=self.clock.now().isoformat(),
                     chain_id=reentry_info["chain_id"],
                     chain_level=reentry_info["level"],
                     is_re_entry=True,
@@ -2006,7 +2210,7 @@ class TradingEngine:
                 lot_size=lot_size,
                 direction=alert.signal,
                 strategy=strategy,
-                open_time=datetime.now().isoformat(),
+                open_time=self.clock.now().isoformat(),
                 chain_id=reentry_info["chain_id"],
                 chain_level=reentry_info["level"],
                 is_re_entry=True,
@@ -2083,15 +2287,21 @@ class TradingEngine:
                     
                 if trade.trade_id and trade.trade_id not in mt5_ticket_ids:
                     # Position doesn't exist in MT5 - was auto-closed by TP/SL
+                    self.mt5_client.account_state.invalidate("external_close")
                     current_price = self.mt5_client.get_current_price(trade.symbol)
                     
+                    # Use the broker's exit deal: the close may be old (e.g. it happened while the bot was down)
+                    exit_deal = self.mt5_client.get_closed_trade_exit(trade.trade_id)
+                    close_price = exit_deal["price"] if exit_deal else current_price
+                    closed_at = exit_deal["time"] if exit_deal else None
+                    
                     # FIX #8: Determine close reason from PnL (positive = TP, negative = SL)
                     # Use actual profit from MT5 history if available
                     pnl = self.mt5_client.get_closed_trade_profit(trade.trade_id)
                     
                     if pnl is None:
                         # Fallback: Manual calculation (only if history fetch fails)
-                        pnl = (current_price - trade.entry) * trade.lot_size * 100 if trade.direction == "buy" else (trade.entry - current_price) * trade.lot_size * 100
+                        pnl = (close_price - trade.entry) * trade.lot_size * 100 if trade.direction == "buy" else (trade.entry - close_price) * trade.lot_size * 100
                     
                     if pnl > 0:
                         close_reason = "TP_HIT_AUTO_CLOSED"
@@ -2100,10 +2310,11 @@ class TradingEngine:
                         close_reason = "SL_HIT_AUTO_CLOSED"
                         print(f"Auto-reconciliation: Position {trade.trade_id} closed by Stop Loss (PnL: ${pnl:.2f})")
                     
-                    await self.close_trade(trade, close_reason, current_price)
+                    await self.close_trade(trade, close_reason, close_price, closed_at=closed_at)
                     
                     # NEW: Check for Profit Order SL Hit
-                    if close_reason == "SL_HIT_AUTO_CLOSED" and trade.profit_chain_id:
+                    if (close_reason == "SL_HIT_AUTO_CLOSED" and trade.profit_chain_id
+                            and self._within_reentry_window(trade)):
                         # Register for recovery re-entry
                         self.profit_booking_reentry_manager.register_sl_hit(
                             trade.profit_chain_id,
@@ -2130,8 +2341,12 @@ class TradingEngine:
         while True:
             try:
                 # MT5 Reconciliation - Check if positions still exist in MT5
-                if not self.config["simulate_orders"]:
+                if not self._simulate_orders:
                     await self.reconcile_with_mt5()
+                    # Scheduled reload of broker symbol metadata (no-op until entries go stale)
+                    symbol_registry = getattr(self.mt5_client, 'symbol_registry', None)
+                    if symbol_registry:
+                        symbol_registry.refresh_stale()
                 
                 # 🔄 RUN AUTONOMOUS CHECKS (TP Continuation, Profit Checks)
                 if hasattr(self, 'autonomous_manager') and self.autonomous_manager:
@@ -2163,53 +2378,22 @@ class TradingEngine:
                     self.price_monitor.clear_all_monitoring()
                     logger.info("✅ Session Closed -> Monitoring Cleared (Clean Slate)")
                 
-                for trade in self.open_trades:
-                    if trade.status == "closed":
-                        continue
-                    
-                    # Get current price
-                    current_price = self.mt5_client.get_current_price(trade.symbol)
-                    if current_price == 0:
-                        continue
-                    
-                    # Check SL hit
-                    if ((trade.direction == "buy" and current_price <= trade.sl) or
-                        (trade.direction == "sell" and current_price >= trade.sl)):
-                        await self.close_trade(trade, "SL_HIT", current_price)
-                        self.reentry_manager.record_sl_hit(trade)
-                        
-                        # NEW: Register for SL hunt re-entry monitoring via AUTONOMOUS SYSTEM
-                        # REROUTED: Uses 1s precision monitor & symbol-specific windows
-                        # NEW: Register for SL hunt re-entry monitoring via AUTONOMOUS SYSTEM
-                        # REROUTED: Uses 1s precision monitor & symbol-specific windows
-                        if hasattr(self, 'autonomous_manager') and self.autonomous_manager:
-                            self.autonomous_manager.register_sl_recovery(trade, trade.strategy)
-                        # Fallback for legacy support
-                        elif self.config["re_entry_config"]["sl_hunt_reentry_enabled"]:
-                            self.price_monitor.register_sl_hunt(trade, trade.strategy)
-                        continue
-                    
-                    # Check TP hit
-                    if ((trade.direction == "buy" and current_price >= trade.tp) or
-                        (trade.direction == "sell" and current_price <= trade.tp)):
-                        # BACKGROUND LOOP - Silenced for clean logs (only Telegram notification sent)
-                        # TP hit detected, closing trade and processing re-entry if enabled
-                        
-                        await self.close_trade(trade, "TP_HIT", current_price)
-                        self.reentry_manager.record_tp_hit(trade, current_price)
-                        
-                        # Register for TP continuation re-entry monitoring if enabled
-                        tp_reentry_enabled = self.config["re_entry_config"].get("tp_reentry_enabled", False)
-                        if tp_reentry_enabled:
-                            self.price_monitor.register_tp_continuation(trade, current_price, trade.strategy)
-                        continue
-                    
-                    # Check trend reversal exit
-                    if self.should_exit_by_trend_reversal(trade):
-                        await self.close_trade(trade, "TREND_REVERSAL", current_price)
-                        continue
+                if self.shard_manager:
+                    # Per-symbol workers run the SL/TP/reversal checks and re-entry scans
+                    self.price_monitor.symbol_sharding = True
+                    self.shard_manager.sync(self._active_symbols())
+                else:
+                    for trade in list(self.open_trades):
+                        await self._check_trade_exit(trade)
                 
-                await asyncio.sleep(5)
+                if self._tick_batch:
+                    self.event_bus.publish(TickBatch(prices=self._tick_batch))
+                    self._tick_batch = {}
+                if self.reentry_manager.trend_analyzer:
+                    self.reentry_manager.trend_analyzer.score_all()  # Cached until the next bar
+                self.portfolio.sync()
+                self.snapshot_store.maybe_save(self)
+                await self.clock.sleep(5)
                 self.monitor_error_count = 0  # Reset on success
                 
             except asyncio.CancelledError:
@@ -2223,16 +2407,90 @@ class TradingEngine:
                     logger.critical("🚨 Too many monitor errors - stopping trade monitoring")
                     self.telegram_bot.send_message("🚨 CRITICAL: Trade monitor stopped due to repeated errors")
                     break
-                await asyncio.sleep(30)
-
+                await self.clock.sleep(30)
+        
+        if self.shard_manager:
+            await self.shard_manager.stop()
+            self.price_monitor.symbol_sharding = False
+    
+    def _active_symbols(self) -> set:
+        """Symbols with open trades, pending re-entries or active profit chains"""
+        symbols = {t.symbol for t in self.open_trades if t.status != "closed"}
+        symbols.update(self.price_monitor.sl_hunt_pending.keys())
+        symbols.update(self.price_monitor.tp_continuation_pending.keys())
+        symbols.update(self.price_monitor.exit_continuation_pending.keys())
+        if self.profit_booking_manager:
+            symbols.update(
+                chain.symbol for chain in self.profit_booking_manager.active_chains.values()
+                if chain.status == "ACTIVE"
+            )
+        return symbols
+    
+    def _open_exposure(self) -> tuple:
+        """(open trade count, open lots) for the shared risk budget"""
+        open_trades = [t for t in self.open_trades if t.status != "closed"]
+        return len(open_trades), sum(t.lot_size for t in open_trades)
+    
+    async def _run_symbol_shard(self, symbol: str):
+        """One shard cycle: exit checks for this symbol's trades, then its re-entries"""
+        for trade in [t for t in self.open_trades if t.symbol == symbol]:
+            await self._check_trade_exit(trade)
+        await self.price_monitor.check_symbol_opportunities(symbol)
+    
+    async def _check_trade_exit(self, trade: Trade):
+        """Close trade on SL / TP / trend reversal and register follow-up re-entries"""
+        if trade.status == "closed":
+            return
+        
+        # Get current price
+        current_price = self.mt5_client.get_current_price(trade.symbol)
+        if current_price == 0:
+            return
+        self.portfolio.on_tick(trade.symbol, current_price)
+        self._tick_batch[trade.symbol] = current_price
+        
+        # Check SL hit
+        if ((trade.direction == "buy" and current_price <= trade.sl) or
+            (trade.direction == "sell" and current_price >= trade.sl)):
+            await self.close_trade(trade, "SL_HIT", current_price)
+            self.reentry_manager.record_sl_hit(trade)
+            
+            # NEW: Register for SL hunt re-entry monitoring via AUTONOMOUS SYSTEM
+            # REROUTED: Uses 1s precision monitor & symbol-specific windows
+            # NEW: Register for SL hunt re-entry monitoring via AUTONOMOUS SYSTEM
+            # REROUTED: Uses 1s precision monitor & symbol-specific windows
+            if hasattr(self, 'autonomous_manager') and self.autonomous_manager:
+                self.autonomous_manager.register_sl_recovery(trade, trade.strategy)
+            # Fallback for legacy support
+            elif self._sl_hunt_reentry_enabled:
+                self.price_monitor.register_sl_hunt(trade, trade.strategy)
+            return
+        
+        # Check TP hit
+        if ((trade.direction == "buy" and current_price >= trade.tp) or
+            (trade.direction == "sell" and current_price <= trade.tp)):
+            # BACKGROUND LOOP - Silenced for clean logs (only Telegram notification sent)
+            # TP hit detected, closing trade and processing re-entry if enabled
+            
+            await self.close_trade(trade, "TP_HIT", current_price)
+            self.reentry_manager.record_tp_hit(trade, current_price)
+            
+            # Register for TP continuation re-entry monitoring if enabled
+            if self._tp_reentry_enabled:
+                self.price_monitor.register_tp_continuation(trade, current_price, trade.strategy)
+            return
+        
+        # Check trend reversal exit
+        if self.should_exit_by_trend_reversal(trade):
+            await self.close_trade(trade, "TREND_REVERSAL", current_price)
+    
     def should_exit_by_trend_reversal(self, trade: Trade) -> bool:
         """Check if we should exit due to trend reversal"""
         # Grace period: Don't exit trades within first 5 minutes of entry
         # This prevents premature exits when signals are still arriving
         try:
-            from datetime import datetime, timedelta
             trade_open_time = datetime.fromisoformat(trade.open_time)
-            time_since_open = datetime.now() - trade_open_time
+            time_since_open = self.clock.now() - trade_open_time
             
             if time_since_open < timedelta(minutes=5):
                 return False  # Grace period - don't check trend reversal yet
@@ -2251,12 +2509,13 @@ class TradingEngine:
         
         return False
 
-    async def close_trade(self, trade: Trade, reason: str, current_price: float):
-        """Close a trade"""
+    async def close_trade(self, trade: Trade, reason: str, current_price: float,
+                          closed_at: Optional[datetime] = None):
+        """Close a trade (closed_at: broker close time when the position is already gone)"""
         notification_sent = False
         try:
             # FIX #5: Add retry logic with exponential backoff for MT5 close
-            if not self.config["simulate_orders"] and trade.trade_id:
+            if not self._simulate_orders and trade.trade_id:
                 import MetaTrader5 as mt5
                 import asyncio
                 
@@ -2312,7 +2571,7 @@ class TradingEngine:
             
             # Only mark as closed if MT5 close succeeded or we're in simulation
             trade.status = "closed"
-            trade.close_time = datetime.now().isoformat()
+            trade.close_time = (closed_at or self.clock.now()).isoformat()
             self.risk_manager.remove_open_trade(trade)
             
             # 🆕 REVERSE SHIELD HOOK: Detect if shield trade closed
@@ -2327,7 +2586,7 @@ class TradingEngine:
             
             # Calculate PnL: Use ACTUAL profit from MT5 history
             # This ensures we account for commission, swap, and broker-specific contract sizes
-            if trade.trade_id and not self.config["simulate_orders"]:
+            if trade.trade_id and not self._simulate_orders:
                 # Fetch real profit from MT5 history
                 pnl = self.mt5_client.get_closed_trade_profit(trade.trade_id)
                 
@@ -2355,7 +2614,7 @@ class TradingEngine:
             print(f"   Reason: {reason}")
             
             # Update risk manager
-            self.risk_manager.update_pnl(pnl)
+            self.risk_manager.update_pnl(pnl, symbol=trade.symbol)
             
             # Update trade in database
             self.db.save_trade(trade)
@@ -2390,8 +2649,57 @@ class TradingEngine:
                 )
                 self.telegram_bot.send_message(message)
             
-            # 🔗 AUTONOMOUS SYSTEM HOOKS (NEW)
+            # Follow-up work (autonomous hooks, plugins) runs off the bus
+            self._publish_close(trade, reason, current_price, pnl)
             
+        except Exception as e:
+            error_msg = f"Trade close error: {str(e)}"
+            self.telegram_bot.send_message(f"❌ {error_msg}")
+
+    def _within_reentry_window(self, trade: Trade) -> bool:
+        """False when the trade closed longer ago than the re-entry window (e.g. while the bot was down)"""
+        if not trade.close_time:
+            return True
+        window_minutes = self.config.get("re_entry_config", {}).get("recovery_window_minutes", 30)
+        age = self.clock.now() - datetime.fromisoformat(trade.close_time)
+        return age.total_seconds() <= window_minutes * 60
+    
+    def save_state_snapshot(self) -> bool:
+        """Write the warm-restart snapshot now (e.g. on shutdown)"""
+        try:
+            return self.snapshot_store.save(self)
+        except Exception as e:
+            logger.error(f"Engine snapshot write failed: {e}")
+            return False
+    
+    def _publish_close(self, trade: Trade, reason: str, close_price: float, pnl: float):
+        """Publish OrderClosed, plus SLHit/TPHit when the close was a stop or target"""
+        common = dict(trade_id=trade.trade_id, symbol=trade.symbol, direction=trade.direction,
+                      close_price=close_price, pnl=pnl, strategy=trade.strategy or "", trade=trade)
+        self.event_bus.publish(OrderClosed(reason=reason, **common))
+        if reason == "SL_HIT":
+            self.event_bus.publish(SLHit(sl_price=trade.sl, **common))
+        elif reason == "TP_HIT":
+            self.event_bus.publish(TPHit(tp_price=trade.tp, **common))
+    
+    def _publish_execution(self, event: str, payload: Dict[str, Any]):
+        """MT5 execution listener: placed and modified orders onto the bus"""
+        if event == "place":
+            self.event_bus.publish(OrderOpened(
+                ticket=payload["ticket"], symbol=payload.get("symbol", ""),
+                order_type=payload.get("order_type", ""), lot_size=payload.get("lot_size", 0.0),
+                price=payload.get("price") or 0.0, sl=payload.get("sl") or 0.0,
+                tp=payload.get("tp") or 0.0, comment=payload.get("comment") or ""
+            ))
+        elif event == "modify":
+            self.event_bus.publish(OrderModified(
+                ticket=payload["ticket"], sl=payload.get("sl"), tp=payload.get("tp")
+            ))
+    
+    async def _on_order_closed(self, event: OrderClosed):
+        """Autonomous system hooks for a closed trade (OrderClosed subscriber)"""
+        trade, reason, pnl = event.trade, event.reason, event.pnl
+        try:
             # 1. Handle SL Hunt Recovery Outcome
             if hasattr(trade, 'order_type') and trade.order_type == "SL_RECOVERY":
                 if pnl >= 0:
@@ -2414,11 +2722,11 @@ class TradingEngine:
                         )
             
             # 3. Handle Exit Continuation Monitoring
-            if reason in ["TREND_REVERSAL", "MANUAL_EXIT", "Exit Appeared"] or "MANUAL" in reason.upper():
+            if ((reason in ["TREND_REVERSAL", "MANUAL_EXIT", "Exit Appeared"] or "MANUAL" in reason.upper())
+                    and self._within_reentry_window(trade)):
                 self.autonomous_manager.register_exit_continuation(trade, reason)
-            
         except Exception as e:
-            error_msg = f"Trade close error: {str(e)}"
+            error_msg = f"Trade close follow-up error: {str(e)}"
             self.telegram_bot.send_message(f"❌ {error_msg}")
 
     # Logic control methods
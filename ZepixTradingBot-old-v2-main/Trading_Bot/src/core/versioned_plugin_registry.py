@@ -17,11 +17,12 @@ Date: 2026-01-14
 
 import json
 import logging
-import sqlite3
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple, Any
 
+from src.core.database_access import get_db_pool
+
 logger = logging.getLogger(__name__)
 
 
@@ -174,6 +175,7 @@ class VersionedPluginRegistry:
             db_path: Path to version database
         """
         self.db_path = db_path
+        self._db = get_db_pool(db_path)
         
         # Active plugins: plugin_id -> PluginVersion
         self.active_plugins: Dict[str, PluginVersion] = {}
@@ -195,54 +197,51 @@ class VersionedPluginRegistry:
     def _init_database(self):
         """Initialize version database schema"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Plugin versions table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS plugin_versions (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    plugin_id TEXT NOT NULL,
-                    major INTEGER NOT NULL,
-                    minor INTEGER NOT NULL,
-                    patch INTEGER NOT NULL,
-                    build_date DATETIME NOT NULL,
-                    commit_hash TEXT NOT NULL,
-                    author TEXT NOT NULL,
-                    requires_api_version TEXT NOT NULL,
-                    requires_db_schema TEXT NOT NULL,
-                    features TEXT NOT NULL,
-                    deprecated BOOLEAN DEFAULT FALSE,
-                    release_notes TEXT,
-                    UNIQUE(plugin_id, major, minor, patch)
-                )
-            """)
-            
-            # Plugin version history table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS plugin_version_history (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    plugin_id TEXT NOT NULL,
-                    version_string TEXT NOT NULL,
-                    activated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    deactivated_at DATETIME,
-                    reason TEXT
-                )
-            """)
-            
-            # Create indexes
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_versions_plugin 
-                ON plugin_versions (plugin_id)
-            """)
-            
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_history_plugin 
-                ON plugin_version_history (plugin_id, activated_at)
-            """)
-            
-            conn.commit()
-            conn.close()
+            with self._db.transaction() as conn:
+                cursor = conn.cursor()
+            
+                # Plugin versions table
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS plugin_versions (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        plugin_id TEXT NOT NULL,
+                        major INTEGER NOT NULL,
+                        minor INTEGER NOT NULL,
+                        patch INTEGER NOT NULL,
+                        build_date DATETIME NOT NULL,
+                        commit_hash TEXT NOT NULL,
+                        author TEXT NOT NULL,
+                        requires_api_version TEXT NOT NULL,
+                        requires_db_schema TEXT NOT NULL,
+                        features TEXT NOT NULL,
+                        deprecated BOOLEAN DEFAULT FALSE,
+                        release_notes TEXT,
+                        UNIQUE(plugin_id, major, minor, patch)
+                    )
+                """)
+            
+                # Plugin version history table
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS plugin_version_history (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        plugin_id TEXT NOT NULL,
+                        version_string TEXT NOT NULL,
+                        activated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                        deactivated_at DATETIME,
+                        reason TEXT
+                    )
+                """)
+            
+                # Create indexes
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_versions_plugin 
+                    ON plugin_versions (plugin_id)
+                """)
+            
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_history_plugin 
+                    ON plugin_version_history (plugin_id, activated_at)
+                """)
             
             logger.info("[VersionedPluginRegistry] Database initialized")
             
@@ -252,51 +251,49 @@ class VersionedPluginRegistry:
     def _load_plugin_versions(self):
         """Load all available plugin versions from database"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                SELECT plugin_id, major, minor, patch, build_date, 
-                       commit_hash, author, requires_api_version, 
-                       requires_db_schema, features, deprecated, release_notes
-                FROM plugin_versions
-                ORDER BY plugin_id, major DESC, minor DESC, patch DESC
-            """)
-            
-            for row in cursor.fetchall():
-                plugin_id = row[0]
+            with self._db.reader() as conn:
+                cursor = conn.cursor()
+            
+                cursor.execute("""
+                    SELECT plugin_id, major, minor, patch, build_date, 
+                           commit_hash, author, requires_api_version, 
+                           requires_db_schema, features, deprecated, release_notes
+                    FROM plugin_versions
+                    ORDER BY plugin_id, major DESC, minor DESC, patch DESC
+                """)
+            
+                for row in cursor.fetchall():
+                    plugin_id = row[0]
                 
-                try:
-                    build_date = datetime.fromisoformat(row[4]) if row[4] else datetime.now()
-                except (ValueError, TypeError):
-                    build_date = datetime.now()
+                    try:
+                        build_date = datetime.fromisoformat(row[4]) if row[4] else datetime.now()
+                    except (ValueError, TypeError):
+                        build_date = datetime.now()
                 
-                try:
-                    features = json.loads(row[9]) if row[9] else []
-                except (json.JSONDecodeError, TypeError):
-                    features = []
+                    try:
+                        features = json.loads(row[9]) if row[9] else []
+                    except (json.JSONDecodeError, TypeError):
+                        features = []
                 
-                version = PluginVersion(
-                    plugin_id=plugin_id,
-                    major=row[1],
-                    minor=row[2],
-                    patch=row[3],
-                    build_date=build_date,
-                    commit_hash=row[5] or "",
-                    author=row[6] or "Zepix Team",
-                    requires_api_version=row[7] or "1.0.0",
-                    requires_db_schema=row[8] or "1.0.0",
-                    features=features,
-                    deprecated=bool(row[10]),
-                    release_notes=row[11] or ""
-                )
+                    version = PluginVersion(
+                        plugin_id=plugin_id,
+                        major=row[1],
+                        minor=row[2],
+                        patch=row[3],
+                        build_date=build_date,
+                        commit_hash=row[5] or "",
+                        author=row[6] or "Zepix Team",
+                        requires_api_version=row[7] or "1.0.0",
+                        requires_db_schema=row[8] or "1.0.0",
+                        features=features,
+                        deprecated=bool(row[10]),
+                        release_notes=row[11] or ""
+                    )
                 
-                if plugin_id not in self.available_versions:
-                    self.available_versions[plugin_id] = []
+                    if plugin_id not in self.available_versions:
+                        self.available_versions[plugin_id] = []
                 
-                self.available_versions[plugin_id].append(version)
-            
-            conn.close()
+                    self.available_versions[plugin_id].append(version)
             
             logger.info(f"[VersionedPluginRegistry] Loaded {sum(len(v) for v in self.available_versions.values())} versions for {len(self.available_versions)} plugins")
             
@@ -314,32 +311,29 @@ class VersionedPluginRegistry:
             True if registered successfully
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                INSERT OR REPLACE INTO plugin_versions (
-                    plugin_id, major, minor, patch, build_date,
-                    commit_hash, author, requires_api_version,
-                    requires_db_schema, features, deprecated, release_notes
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                version.plugin_id,
-                version.major,
-                version.minor,
-                version.patch,
-                version.build_date.isoformat(),
-                version.commit_hash,
-                version.author,
-                version.requires_api_version,
-                version.requires_db_schema,
-                json.dumps(version.features),
-                version.deprecated,
-                version.release_notes
-            ))
-            
-            conn.commit()
-            conn.close()
+            with self._db.transaction() as conn:
+                cursor = conn.cursor()
+            
+                cursor.execute("""
+                    INSERT OR REPLACE INTO plugin_versions (
+                        plugin_id, major, minor, patch, build_date,
+                        commit_hash, author, requires_api_version,
+                        requires_db_schema, features, deprecated, release_notes
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (
+                    version.plugin_id,
+                    version.major,
+                    version.minor,
+                    version.patch,
+                    version.build_date.isoformat(),
+                    version.commit_hash,
+                    version.author,
+                    version.requires_api_version,
+                    version.requires_db_schema,
+                    json.dumps(version.features),
+                    version.deprecated,
+                    version.release_notes
+                ))
             
             # Update in-memory cache
             if version.plugin_id not in self.available_versions:
@@ -514,17 +508,14 @@ class VersionedPluginRegistry:
         
         # Update in database
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                UPDATE plugin_versions 
-                SET deprecated = TRUE
-                WHERE plugin_id = ? AND major = ? AND minor = ? AND patch = ?
-            """, (plugin_id, version.major, version.minor, version.patch))
+            with self._db.transaction() as conn:
+                cursor = conn.cursor()
             
-            conn.commit()
-            conn.close()
+                cursor.execute("""
+                    UPDATE plugin_versions 
+                    SET deprecated = TRUE
+                    WHERE plugin_id = ? AND major = ? AND minor = ? AND patch = ?
+                """, (plugin_id, version.major, version.minor, version.patch))
             
             logger.info(f"[VersionedPluginRegistry] Deprecated {version}")
             return True
@@ -563,39 +554,37 @@ class VersionedPluginRegistry:
     def get_version_history(self, plugin_id: str, limit: int = 10) -> List[VersionHistoryEntry]:
         """Get version activation history for plugin"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                SELECT id, plugin_id, version_string, activated_at, deactivated_at, reason
-                FROM plugin_version_history
-                WHERE plugin_id = ?
-                ORDER BY activated_at DESC
-                LIMIT ?
-            """, (plugin_id, limit))
-            
-            history = []
-            for row in cursor.fetchall():
-                try:
-                    activated_at = datetime.fromisoformat(row[3]) if row[3] else datetime.now()
-                except (ValueError, TypeError):
-                    activated_at = datetime.now()
+            with self._db.reader() as conn:
+                cursor = conn.cursor()
+            
+                cursor.execute("""
+                    SELECT id, plugin_id, version_string, activated_at, deactivated_at, reason
+                    FROM plugin_version_history
+                    WHERE plugin_id = ?
+                    ORDER BY activated_at DESC
+                    LIMIT ?
+                """, (plugin_id, limit))
+            
+                history = []
+                for row in cursor.fetchall():
+                    try:
+                        activated_at = datetime.fromisoformat(row[3]) if row[3] else datetime.now()
+                    except (ValueError, TypeError):
+                        activated_at = datetime.now()
                 
-                try:
-                    deactivated_at = datetime.fromisoformat(row[4]) if row[4] else None
-                except (ValueError, TypeError):
-                    deactivated_at = None
+                    try:
+                        deactivated_at = datetime.fromisoformat(row[4]) if row[4] else None
+                    except (ValueError, TypeError):
+                        deactivated_at = None
                 
-                history.append(VersionHistoryEntry(
-                    id=row[0],
-                    plugin_id=row[1],
-                    version_string=row[2],
-                    activated_at=activated_at,
-                    deactivated_at=deactivated_at,
-                    reason=row[5] or ""
-                ))
-            
-            conn.close()
+                    history.append(VersionHistoryEntry(
+                        id=row[0],
+                        plugin_id=row[1],
+                        version_string=row[2],
+                        activated_at=activated_at,
+                        deactivated_at=deactivated_at,
+                        reason=row[5] or ""
+                    ))
             return history
             
         except Exception as e:
@@ -652,16 +641,13 @@ class VersionedPluginRegistry:
     def _record_activation(self, plugin_id: str, version: PluginVersion, reason: str):
         """Record version activation in history"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                INSERT INTO plugin_version_history (plugin_id, version_string, activated_at, reason)
-                VALUES (?, ?, ?, ?)
-            """, (plugin_id, version.version_string, datetime.now().isoformat(), reason))
+            with self._db.transaction() as conn:
+                cursor = conn.cursor()
             
-            conn.commit()
-            conn.close()
+                cursor.execute("""
+                    INSERT INTO plugin_version_history (plugin_id, version_string, activated_at, reason)
+                    VALUES (?, ?, ?, ?)
+                """, (plugin_id, version.version_string, datetime.now().isoformat(), reason))
             
         except Exception as e:
             logger.error(f"[VersionedPluginRegistry] Failed to record activation: {e}")
@@ -669,20 +655,17 @@ class VersionedPluginRegistry:
     def _record_deactivation(self, plugin_id: str, reason: str):
         """Record version deactivation in history"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Update the most recent activation record
-            cursor.execute("""
-                UPDATE plugin_version_history 
-                SET deactivated_at = ?
-                WHERE plugin_id = ? AND deactivated_at IS NULL
-                ORDER BY activated_at DESC
-                LIMIT 1
-            """, (datetime.now().isoformat(), plugin_id))
-            
-            conn.commit()
-            conn.close()
+            with self._db.transaction() as conn:
+                cursor = conn.cursor()
+            
+                # Update the most recent activation record
+                cursor.execute("""
+                    UPDATE plugin_version_history 
+                    SET deactivated_at = ?
+                    WHERE plugin_id = ? AND deactivated_at IS NULL
+                    ORDER BY activated_at DESC
+                    LIMIT 1
+                """, (datetime.now().isoformat(), plugin_id))
             
         except Exception as e:
             logger.error(f"[VersionedPluginRegistry] Failed to record deactivation: {e}")
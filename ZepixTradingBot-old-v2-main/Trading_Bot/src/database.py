@@ -1,15 +1,18 @@
 import sqlite3
-from datetime import datetime, date
+from datetime import datetime, date, timedelta, timezone
 from src.models import Trade, ReEntryChain
 from typing import List, Dict, Any
+from src.clients.symbol_registry import price_to_pips
+from src.core.database_access import get_db_pool
+from src.core.data_lifecycle import query_with_archives
 
 class TradeDatabase:
     def __init__(self):
-        self.conn = sqlite3.connect('data/trading_bot.db', check_same_thread=False, timeout=30.0)
-        # Enable WAL mode for better concurrency (as per 10_DATABASE_SCHEMA.md)
-        self.conn.execute("PRAGMA journal_mode=WAL")
-        # Enable foreign key constraints
-        self.conn.execute("PRAGMA foreign_keys=ON")
+        # Shared pool: WAL, synchronous=NORMAL and foreign keys are set per connection
+        # (as per 10_DATABASE_SCHEMA.md). Writes use the pool's writer connection,
+        # reads take a pooled reader so they do not queue behind writes.
+        self.pool = get_db_pool('data/trading_bot.db')
+        self.conn = self.pool.writer_connection
         self.create_tables()
         self.create_indexes()  # Create indexes for query performance
 
@@ -245,12 +248,8 @@ class TradeDatabase:
             base_sl_pips = getattr(trade, 'base_sl_pips', 0.0)
             final_sl_pips = 0.0
             if trade.entry and trade.sl:
-                final_sl_pips = abs(trade.entry - trade.sl)
-                # Normalize if we have pip size info, otherwise store raw price diff
-                if hasattr(trade, 'symbol') and "JPY" in trade.symbol:
-                     final_sl_pips *= 100
-                else:
-                     final_sl_pips *= 10000
+                # Shared symbol rule (metals / JPY / forex)
+                final_sl_pips = price_to_pips(getattr(trade, 'symbol', ''), trade.entry - trade.sl)
             
             lot_mult = getattr(trade, 'lot_multiplier', 1.0)
             sl_mult = getattr(trade, 'sl_multiplier', 1.0)
@@ -302,51 +301,48 @@ class TradeDatabase:
         self.conn.commit()
 
     def get_trade_history(self, days=30) -> List[Dict[str, Any]]:
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            SELECT * FROM trades 
-            WHERE close_time >= datetime('now', ?)
-            ORDER BY close_time DESC
-        ''', (f'-{days} days',))
-        
-        columns = [description[0] for description in cursor.description]
-        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        # Same cutoff as SQLite datetime('now', '-N days'); spans monthly archives
+        since = (datetime.now(timezone.utc) - timedelta(days=days)).strftime('%Y-%m-%d %H:%M:%S')
+        return query_with_archives(self.pool, 'trades', 'close_time', since,
+                                   descending=True, as_dicts=True)
 
     def get_chain_statistics(self) -> Dict[str, Any]:
-        cursor = self.conn.cursor()
+        with self.pool.reader() as conn:
+            cursor = conn.cursor()
         
-        # Get chain performance
-        cursor.execute('''
-            SELECT 
-                COUNT(*) as total_chains,
-                AVG(max_level_reached) as avg_max_level,
-                SUM(total_profit) as total_chain_profit,
-                COUNT(CASE WHEN status = 'completed' THEN 1 END) as completed_chains,
-                COUNT(CASE WHEN total_profit > 0 THEN 1 END) as profitable_chains
-            FROM reentry_chains
-        ''')
+            # Get chain performance
+            cursor.execute('''
+                SELECT 
+                    COUNT(*) as total_chains,
+                    AVG(max_level_reached) as avg_max_level,
+                    SUM(total_profit) as total_chain_profit,
+                    COUNT(CASE WHEN status = 'completed' THEN 1 END) as completed_chains,
+                    COUNT(CASE WHEN total_profit > 0 THEN 1 END) as profitable_chains
+                FROM reentry_chains
+            ''')
         
-        result = cursor.fetchone()
-        columns = [description[0] for description in cursor.description]
+            result = cursor.fetchone()
+            columns = [description[0] for description in cursor.description]
         
-        return dict(zip(columns, result))
+            return dict(zip(columns, result))
 
     def get_sl_recovery_stats(self) -> Dict[str, Any]:
-        cursor = self.conn.cursor()
+        with self.pool.reader() as conn:
+            cursor = conn.cursor()
         
-        cursor.execute('''
-            SELECT 
-                COUNT(*) as total_sl_hits,
-                COUNT(CASE WHEN recovery_attempted THEN 1 END) as recovery_attempts,
-                COUNT(CASE WHEN recovery_successful THEN 1 END) as successful_recoveries
-            FROM sl_events
-            WHERE hit_time >= datetime('now', '-30 days')
-        ''')
+            cursor.execute('''
+                SELECT 
+                    COUNT(*) as total_sl_hits,
+                    COUNT(CASE WHEN recovery_attempted THEN 1 END) as recovery_attempts,
+                    COUNT(CASE WHEN recovery_successful THEN 1 END) as successful_recoveries
+                FROM sl_events
+                WHERE hit_time >= datetime('now', '-30 days')
+            ''')
         
-        result = cursor.fetchone()
-        columns = [description[0] for description in cursor.description]
+            result = cursor.fetchone()
+            columns = [description[0] for description in cursor.description]
         
-        return dict(zip(columns, result))
+            return dict(zip(columns, result))
     
     def clear_lifetime_losses(self):
         """Reset lifetime loss counter (database side)"""
@@ -358,33 +354,35 @@ class TradeDatabase:
         
     def get_tp_reentry_stats(self) -> Dict[str, Any]:
         """Get TP re-entry statistics"""
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            SELECT 
-                COUNT(*) as total_tp_reentries,
-                SUM(pnl) as total_tp_reentry_pnl,
-                AVG(pnl) as avg_tp_reentry_pnl,
-                COUNT(CASE WHEN pnl > 0 THEN 1 END) as profitable_tp_reentries
-            FROM tp_reentry_events
-            WHERE timestamp >= datetime('now', '-30 days')
-        ''')
-        result = cursor.fetchone()
-        columns = [desc[0] for desc in cursor.description]
-        return dict(zip(columns, result)) if result else {}
+        with self.pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT 
+                    COUNT(*) as total_tp_reentries,
+                    SUM(pnl) as total_tp_reentry_pnl,
+                    AVG(pnl) as avg_tp_reentry_pnl,
+                    COUNT(CASE WHEN pnl > 0 THEN 1 END) as profitable_tp_reentries
+                FROM tp_reentry_events
+                WHERE timestamp >= datetime('now', '-30 days')
+            ''')
+            result = cursor.fetchone()
+            columns = [desc[0] for desc in cursor.description]
+            return dict(zip(columns, result)) if result else {}
     
     def get_sl_hunt_reentry_stats(self) -> Dict[str, Any]:
         """Get SL hunt re-entry statistics (from sl_events where recovery_successful=1)"""
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            SELECT 
-                COUNT(CASE WHEN recovery_successful THEN 1 END) as total_sl_hunt_reentries,
-                COUNT(CASE WHEN recovery_attempted THEN 1 END) as sl_hunt_attempts
-            FROM sl_events
-            WHERE hit_time >= datetime('now', '-30 days')
-        ''')
-        result = cursor.fetchone()
-        columns = [desc[0] for desc in cursor.description]
-        return dict(zip(columns, result)) if result else {}
+        with self.pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT 
+                    COUNT(CASE WHEN recovery_successful THEN 1 END) as total_sl_hunt_reentries,
+                    COUNT(CASE WHEN recovery_attempted THEN 1 END) as sl_hunt_attempts
+                FROM sl_events
+                WHERE hit_time >= datetime('now', '-30 days')
+            ''')
+            result = cursor.fetchone()
+            columns = [desc[0] for desc in cursor.description]
+            return dict(zip(columns, result)) if result else {}
     
     def get_trades_by_date(self, target_date: date) -> List[Dict[str, Any]]:
         """
@@ -392,15 +390,10 @@ class TradeDatabase:
         Returns: List of trade dictionaries with PnL
         """
         try:
-            cursor = self.conn.cursor()
-            cursor.execute('''
-                SELECT * FROM trades 
-                WHERE DATE(close_time) = DATE(?) AND status = 'closed'
-                ORDER BY close_time DESC
-            ''', (target_date.isoformat(),))
-            
-            columns = [description[0] for description in cursor.description]
-            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+            next_date = target_date + timedelta(days=1)
+            return query_with_archives(self.pool, 'trades', 'close_time',
+                                       target_date.isoformat(), next_date.isoformat(),
+                                       where="status = 'closed'", descending=True, as_dicts=True)
         except Exception as e:
             print(f"Error getting trades by date: {e}")
             return []
@@ -411,10 +404,11 @@ class TradeDatabase:
         Returns: True if connection is working, False otherwise
         """
         try:
-            cursor = self.conn.cursor()
-            cursor.execute('SELECT 1')
-            cursor.fetchone()
-            return True
+            with self.pool.reader() as conn:
+                cursor = conn.cursor()
+                cursor.execute('SELECT 1')
+                cursor.fetchone()
+                return True
         except Exception:
             return False
     
@@ -440,13 +434,14 @@ class TradeDatabase:
     
     def get_active_profit_chains(self) -> List[Dict[str, Any]]:
         """Get all active profit booking chains from database"""
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            SELECT * FROM profit_booking_chains
-            WHERE status = 'ACTIVE'
-        ''')
-        columns = [description[0] for description in cursor.description]
-        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        with self.pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT * FROM profit_booking_chains
+                WHERE status = 'ACTIVE'
+            ''')
+            columns = [description[0] for description in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
     
     def save_profit_booking_order(self, order_id: str, chain_id: str, level: int, 
                                   profit_target: float, sl_reduction: int, status: str):
@@ -529,71 +524,74 @@ class TradeDatabase:
     
     def get_active_session(self, symbol: str = None) -> Dict[str, Any]:
         """Get active session for symbol (or any active session if symbol is None)"""
-        cursor = self.conn.cursor()
-        if symbol:
-            cursor.execute('''
-                SELECT * FROM trading_sessions
-                WHERE symbol = ? AND status = 'ACTIVE'
-                ORDER BY start_time DESC LIMIT 1
-            ''', (symbol,))
-        else:
-            cursor.execute('''
-                SELECT * FROM trading_sessions
-                WHERE status = 'ACTIVE'
-                ORDER BY start_time DESC LIMIT 1
-            ''')
-        
-        row = cursor.fetchone()
-        if row:
-            columns = [desc[0] for desc in cursor.description]
-            return dict(zip(columns, row))
-        return {}
+        with self.pool.reader() as conn:
+            cursor = conn.cursor()
+            if symbol:
+                cursor.execute('''
+                    SELECT * FROM trading_sessions
+                    WHERE symbol = ? AND status = 'ACTIVE'
+                    ORDER BY start_time DESC LIMIT 1
+                ''', (symbol,))
+            else:
+                cursor.execute('''
+                    SELECT * FROM trading_sessions
+                    WHERE status = 'ACTIVE'
+                    ORDER BY start_time DESC LIMIT 1
+                ''')
+        
+            row = cursor.fetchone()
+            if row:
+                columns = [desc[0] for desc in cursor.description]
+                return dict(zip(columns, row))
+            return {}
     
     def get_sessions_by_date(self, target_date: date) -> List[Dict[str, Any]]:
         """Get all sessions for a specific date"""
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            SELECT * FROM trading_sessions
-            WHERE DATE(start_time) = DATE(?)
-            ORDER BY start_time DESC
-        ''', (target_date.isoformat(),))
+        with self.pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT * FROM trading_sessions
+                WHERE DATE(start_time) = DATE(?)
+                ORDER BY start_time DESC
+            ''', (target_date.isoformat(),))
         
-        columns = [desc[0] for desc in cursor.description]
-        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+            columns = [desc[0] for desc in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
     
     def get_session_details(self, session_id: str) -> Dict[str, Any]:
         """Get detailed session report including breakdown"""
-        cursor = self.conn.cursor()
+        with self.pool.reader() as conn:
+            cursor = conn.cursor()
         
-        # Get session info
-        cursor.execute('SELECT * FROM trading_sessions WHERE session_id = ?', (session_id,))
-        row = cursor.fetchone()
-        if not row:
-            return {}
+            # Get session info
+            cursor.execute('SELECT * FROM trading_sessions WHERE session_id = ?', (session_id,))
+            row = cursor.fetchone()
+            if not row:
+                return {}
         
-        columns = [desc[0] for desc in cursor.description]
-        session = dict(zip(columns, row))
-        
-        # Get win/loss breakdown
-        cursor.execute('''
-            SELECT 
-                COUNT(CASE WHEN pnl > 0 THEN 1 END) as wins,
-                COUNT(CASE WHEN pnl < 0 THEN 1 END) as losses,
-                COALESCE(SUM(CASE WHEN pnl > 0 THEN pnl END), 0) as total_profit,
-                COALESCE(SUM(CASE WHEN pnl < 0 THEN pnl END), 0) as total_loss,
-                COUNT(DISTINCT CASE WHEN order_type = 'DUAL_A' OR order_type = 'DUAL_B' THEN 1 END) as dual_orders,
-                COUNT(DISTINCT profit_chain_id) as profit_chains,
-                COUNT(CASE WHEN is_re_entry THEN 1 END) as reentries
-            FROM trades
-            WHERE session_id = ? AND status = 'closed'
-        ''', (session_id,))
-        
-        breakdown = cursor.fetchone()
-        if breakdown:
-            cols = [desc[0] for desc in cursor.description]
-            session['breakdown'] = dict(zip(cols, breakdown))
+            columns = [desc[0] for desc in cursor.description]
+            session = dict(zip(columns, row))
         
-        return session
+            # Get win/loss breakdown
+            cursor.execute('''
+                SELECT 
+                    COUNT(CASE WHEN pnl > 0 THEN 1 END) as wins,
+                    COUNT(CASE WHEN pnl < 0 THEN 1 END) as losses,
+                    COALESCE(SUM(CASE WHEN pnl > 0 THEN pnl END), 0) as total_profit,
+                    COALESCE(SUM(CASE WHEN pnl < 0 THEN pnl END), 0) as total_loss,
+                    COUNT(DISTINCT CASE WHEN order_type = 'DUAL_A' OR order_type = 'DUAL_B' THEN 1 END) as dual_orders,
+                    COUNT(DISTINCT profit_chain_id) as profit_chains,
+                    COUNT(CASE WHEN is_re_entry THEN 1 END) as reentries
+                FROM trades
+                WHERE session_id = ? AND status = 'closed'
+            ''', (session_id,))
+        
+            breakdown = cursor.fetchone()
+            if breakdown:
+                cols = [desc[0] for desc in cursor.description]
+                session['breakdown'] = dict(zip(cols, breakdown))
+        
+            return session
     
     def create_indexes(self):
         """
@@ -8,6 +8,10 @@ Implements the V3 dual order system:
 
 CRITICAL RULE: Order B MUST use pyramid fixed $10 SL, NOT smart SL
 
+Sizing inputs (tier lot, split ratio, fixed SL dollars, RR, fallback SL pips)
+come from pre-armed OrderTemplates when the ServiceAPI provides them, so an
+entry only applies the live price before sending.
+
 Version: 1.0.0
 Date: 2026-01-14
 """
@@ -18,6 +22,7 @@ import uuid
 from datetime import datetime
 
 from src.core.plugin_system.reentry_interface import ReentryEvent, ReentryType
+from src.core.order_templates import OrderTemplate
 
 if TYPE_CHECKING:
     from .plugin import CombinedV3Plugin
@@ -55,6 +60,42 @@ class V3OrderManager:
         self.dual_config = plugin.plugin_config.get("dual_orders", {})
         self.split_ratio = self.dual_config.get("split_ratio", 0.5)
         self.fixed_sl_dollars = self.dual_config.get("order_b_fixed_sl_dollars", 10.0)
+        
+        register = getattr(service_api, "register_order_templates", None)
+        if callable(register):
+            try:
+                register(
+                    params=self._template_params,
+                    logics=list(plugin.plugin_config.get("logic_multipliers", {}).keys()) or ["default"],
+                    plugin_id=plugin.plugin_id
+                )
+            except Exception as e:
+                self.logger.warning(f"Order template registration failed: {e}")
+    
+    def _template_params(self, logic_route: str, direction: str) -> Dict[str, Any]:
+        """Sizing parameters baked into this plugin's order templates"""
+        return {
+            "split_ratio": self.split_ratio,
+            "fixed_sl_dollars": self.fixed_sl_dollars,
+            "rr_ratio": self.plugin.plugin_config.get("rr_ratio", 1.5),
+        }
+    
+    def _get_template(self, symbol: str, logic_route: str, direction: str) -> Optional[OrderTemplate]:
+        """Pre-armed template for this entry, or None to compute inputs directly"""
+        getter = getattr(self.service_api, "get_order_template", None)
+        if not callable(getter):
+            return None
+        try:
+            template = getter(
+                symbol=symbol,
+                logic=logic_route,
+                direction=direction.upper(),
+                plugin_id=self.plugin.plugin_id
+            )
+        except Exception as e:
+            self.logger.warning(f"Order template lookup failed: {e}")
+            return None
+        return template if isinstance(template, OrderTemplate) else None
     
     async def place_v3_dual_orders(
         self,
@@ -88,7 +129,15 @@ class V3OrderManager:
             
             chain_id = f"{symbol}_{uuid.uuid4().hex[:8]}"
             
-            base_lot = await self._get_base_lot(symbol)
+            template = self._get_template(symbol, logic_route, direction)
+            if template is not None and not template.valid:
+                self.logger.error(f"V3 entry blocked by order template: {template.reason}")
+                return {"status": "error", "message": template.reason}
+            
+            if template is not None:
+                base_lot = template.base_lot
+            else:
+                base_lot = await self._get_base_lot(symbol)
             
             v3_multiplier = self._map_consensus_to_multiplier(consensus_score)
             
@@ -107,11 +156,11 @@ class V3OrderManager:
             )
             
             order_a_params = await self._calculate_order_a_params(
-                alert, price, direction, order_a_lot, logic_route
+                alert, price, direction, order_a_lot, logic_route, template
             )
             
             order_b_params = await self._calculate_order_b_params(
-                alert, price, direction, order_b_lot, logic_route
+                alert, price, direction, order_b_lot, logic_route, template
             )
             
             order_a_result = await self._place_order_a(
@@ -195,7 +244,8 @@ class V3OrderManager:
         price: float,
         direction: str,
         lot_size: float,
-        logic_route: str
+        logic_route: str,
+        template: Optional[OrderTemplate] = None
     ) -> Dict[str, Any]:
         """
         Calculate Order A parameters (TP Trail - Smart SL).
@@ -210,6 +260,7 @@ class V3OrderManager:
             direction: Trade direction
             lot_size: Lot size for Order A
             logic_route: Logic route
+            template: Pre-armed order template (optional)
             
         Returns:
             dict: Order A parameters
@@ -219,6 +270,9 @@ class V3OrderManager:
         
         if sl_price:
             self.logger.info(f"Order A: Using V3 Smart SL = {sl_price:.5f}")
+        elif template is not None:
+            sl_price = template.fallback_sl(price)
+            self.logger.warning(f"Order A: V3 SL missing, using bot SL = {sl_price:.5f}")
         else:
             sl_price = await self._calculate_fallback_sl(price, direction, lot_size, logic_route)
             self.logger.warning(f"Order A: V3 SL missing, using bot SL = {sl_price:.5f}")
@@ -226,7 +280,10 @@ class V3OrderManager:
         if tp2_price:
             self.logger.info(f"Order A: Using V3 Extended TP = {tp2_price:.5f}")
         else:
-            rr_ratio = self.plugin.plugin_config.get("rr_ratio", 1.5)
+            if template is not None:
+                rr_ratio = template.rr_ratio
+            else:
+                rr_ratio = self.plugin.plugin_config.get("rr_ratio", 1.5)
             sl_distance = abs(price - sl_price)
             if direction.lower() == "buy":
                 tp2_price = price + (sl_distance * rr_ratio)
@@ -249,7 +306,8 @@ class V3OrderManager:
         price: float,
         direction: str,
         lot_size: float,
-        logic_route: str
+        logic_route: str,
+        template: Optional[OrderTemplate] = None
     ) -> Dict[str, Any]:
         """
         Calculate Order B parameters (Profit Trail - Fixed $10 SL).
@@ -267,6 +325,7 @@ class V3OrderManager:
             direction: Trade direction
             lot_size: Lot size for Order B
             logic_route: Logic route
+            template: Pre-armed order template (optional)
             
         Returns:
             dict: Order B parameters
@@ -274,7 +333,10 @@ class V3OrderManager:
         v3_sl = self._get_sl_price(alert)
         tp1_price = self._get_tp1_price(alert)
         
-        sl_price = await self._calculate_fixed_dollar_sl(price, direction, lot_size)
+        if template is not None:
+            sl_price = template.fixed_dollar_sl(price, lot_size)
+        else:
+            sl_price = await self._calculate_fixed_dollar_sl(price, direction, lot_size)
         
         if v3_sl:
             self.logger.info(
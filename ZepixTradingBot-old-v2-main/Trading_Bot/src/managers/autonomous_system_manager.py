@@ -295,6 +295,24 @@ class AutonomousSystemManager:
             
         checks_run = 0
         
+        # Event-driven path: only symbols whose price moved are re-evaluated
+        if hasattr(self.profit_booking_manager, 'collect_ready_orders'):
+            for chain, trade in self.profit_booking_manager.collect_ready_orders(open_trades):
+                if chain.status != "ACTIVE" or trade.status != "open":
+                    continue
+                print(f"💰 PROFIT TARGET REACHED: Order #{trade.trade_id} (Chain {chain.chain_id})")
+                
+                success = await self.profit_booking_manager.book_individual_order(
+                    trade, chain, open_trades, trading_engine
+                )
+                
+                if success:
+                    await self.profit_booking_manager.check_and_progress_chain(
+                        chain, open_trades, trading_engine
+                    )
+                checks_run += 1
+            return checks_run
+        
         # Access chains safely
         if hasattr(self.profit_booking_manager, 'get_all_chains'):
             active_chains = self.profit_booking_manager.get_all_chains()
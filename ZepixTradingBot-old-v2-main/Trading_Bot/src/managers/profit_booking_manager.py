@@ -6,6 +6,7 @@ from src.database import TradeDatabase
 from src.clients.mt5_client import MT5Client
 from src.utils.pip_calculator import PipCalculator
 from src.managers.risk_manager import RiskManager
+from src.managers.profit_chain_engine import ProfitChainEngine
 from src.utils.optimized_logger import logger
 import uuid
 import logging
@@ -61,6 +62,9 @@ class ProfitBookingManager:
         self.checked_missing_orders: Dict[str, int] = {}  # order_id -> check_count
         self.last_error_log_time: Dict[str, float] = {}  # order_id -> last_log_timestamp
         self.stale_chains: set = set()  # Chains marked as stale
+        
+        # Event-driven level membership / PnL index (replaces per-cycle open_trades scans)
+        self.chain_engine = ProfitChainEngine(config, mt5_client, self.min_profit)
     
     def is_enabled(self) -> bool:
         """Check if profit booking system is enabled"""
@@ -106,6 +110,8 @@ class ProfitBookingManager:
             self.active_chains[chain_id] = chain
             trade.profit_chain_id = chain_id
             trade.profit_level = 0
+            self.chain_engine.add_chain(chain)
+            self.chain_engine.on_fill(trade)
             
             # Save to database
             self.db.save_profit_chain(chain)
@@ -254,12 +260,7 @@ class ProfitBookingManager:
         """
         try:
             # Get all trades for this chain at current level
-            chain_trades = [
-                t for t in open_trades
-                if t.profit_chain_id == chain.chain_id 
-                and t.profit_level == chain.current_level
-                and t.status == "open"
-            ]
+            chain_trades = self._level_trades(chain, open_trades)
             
             if not chain_trades:
                 return 0.0
@@ -269,6 +270,10 @@ class ProfitBookingManager:
             if current_price == 0:
                 return 0.0
             
+            # Indexed chains keep aggregate PnL terms per level
+            if self.chain_engine.is_tracking(chain.chain_id):
+                return self.chain_engine.level_pnl(chain, current_price)
+            
             # Calculate PnL for each trade and sum
             total_pnl = 0.0
             
@@ -362,31 +367,16 @@ class ProfitBookingManager:
             return orders_to_book
         
         # Get all trades for this chain at current level
-        chain_trades = [
-            t for t in open_trades
-            if t.profit_chain_id == chain.chain_id 
-            and t.profit_level == chain.current_level
-            and t.status == "open"
-        ]
+        chain_trades = self._level_trades(chain, open_trades)
         
         # If no trades found in open_trades, check if orders exist in MT5
         # This handles cases where orders were auto-closed or not tracked
         if not chain_trades:
             # Check if chain has active_orders (trade_ids) that might be in MT5
+            # (lookups are rate-limited per chain by the engine)
             if chain.active_orders:
-                # Try to recover chain from MT5
-                recovered = self.recover_chain_from_mt5(chain.chain_id)
-                if recovered:
-                    # After recovery, re-check for trades
-                    chain_trades = [
-                        t for t in open_trades
-                        if t.profit_chain_id == chain.chain_id 
-                        and t.profit_level == chain.current_level
-                        and t.status == "open"
-                    ]
-            
-            if not chain_trades:
-                return orders_to_book
+                self.recover_chains_from_mt5([chain])
+            return orders_to_book
         
         # Get current price once
         current_price = self.mt5_client.get_current_price(chain.symbol)
@@ -630,6 +620,7 @@ class ProfitBookingManager:
                 # Add to open trades
                 trading_engine.open_trades.append(new_trade)
                 trading_engine.risk_manager.add_open_trade(new_trade)
+                self.chain_engine.on_fill(new_trade)
                 
                 # Save to database
                 if new_trade.trade_id:
@@ -804,6 +795,7 @@ class ProfitBookingManager:
                 # Add to open trades
                 trading_engine.open_trades.append(new_trade)
                 trading_engine.risk_manager.add_open_trade(new_trade)
+                self.chain_engine.on_fill(new_trade)
                 
                 # Save to database
                 if new_trade.trade_id:
@@ -866,6 +858,7 @@ class ProfitBookingManager:
             chain.status = "STOPPED"
             chain.updated_at = datetime.now().isoformat()
             self.db.save_profit_chain(chain)
+            self.chain_engine.remove_chain(chain_id)
             self.logger.info(f"STOPPED: Chain {chain_id} stopped: {reason}")
     
     def stop_all_chains(self, reason: str = "Manual stop all"):
@@ -909,11 +902,13 @@ class ProfitBookingManager:
                     chain.active_orders = chain_orders
                     
                     self.active_chains[chain.chain_id] = chain
+                    self.chain_engine.add_chain(chain)
                     self.logger.info(f"SUCCESS: Recovered chain: {chain.chain_id} with {len(chain_orders)} orders")
                     
                 except Exception as e:
                     self.logger.error(f"Error recovering chain {chain_data.get('chain_id', 'unknown')}: {str(e)}")
             
+            self.chain_engine.sync(open_trades, force=True)
             self.logger.info(f"SUCCESS: Recovered {len(self.active_chains)} profit booking chains from database")
             
         except Exception as e:
@@ -923,6 +918,22 @@ class ProfitBookingManager:
         """Get profit booking chain by ID"""
         return self.active_chains.get(chain_id)
     
+    def restore_chains(self, chains: Dict[str, ProfitBookingChain], open_trades: List[Trade]) -> int:
+        """
+        Restore active chains from an engine snapshot (instead of rebuilding
+        them from the database) and sync the chain engine with open trades
+        """
+        restored = 0
+        for chain_id, chain in chains.items():
+            if chain_id in self.active_chains or chain.status != "ACTIVE":
+                continue
+            self.active_chains[chain_id] = chain
+            self.chain_engine.add_chain(chain)
+            restored += 1
+        self.chain_engine.sync(open_trades, force=True)
+        self.logger.info(f"SUCCESS: Restored {restored} profit booking chains from snapshot")
+        return restored
+    
     def get_all_chains(self) -> Dict[str, ProfitBookingChain]:
         """Get all active profit booking chains"""
         return self.active_chains.copy()
@@ -932,32 +943,24 @@ class ProfitBookingManager:
         Attempt to recover chain state from MT5 positions
         Returns True if recovered, False otherwise
         """
+        chain = self.get_chain(chain_id)
+        if not chain:
+            self.logger.warning(f"Chain {chain_id} not found for recovery")
+            return False
+        return chain_id in self.recover_chains_from_mt5([chain], force=True)
+    
+    def recover_chains_from_mt5(self, chains: List[ProfitBookingChain],
+                                force: bool = False) -> set:
+        """
+        Batched MT5 recovery: one positions lookup per symbol for all chains.
+        Returns the set of chain IDs that still have positions in MT5.
+        """
         try:
-            chain = self.get_chain(chain_id)
-            if not chain:
-                self.logger.warning(f"Chain {chain_id} not found for recovery")
-                return False
-            
-            # Get all positions from MT5 for this symbol
-            positions = self.mt5_client.get_positions(symbol=chain.symbol)
-            
-            chain_orders = []
-            for position in positions:
-                # Check if position comment contains chain_id
-                if position.get('comment') and chain_id in position.get('comment', ''):
-                    # This position belongs to our chain
-                    chain_orders.append({
-                        'ticket': position['ticket'],
-                        'volume': position['volume'],
-                        'price_open': position['price_open'],
-                        'sl_price': position['sl'],
-                        'tp_price': position['tp'],
-                        'profit': position['profit'],
-                        'comment': position['comment']
-                    })
-            
-            if chain_orders:
-                # Update chain with found orders
+            found = self.chain_engine.recover_from_mt5(chains, force=force)
+            for chain_id, chain_orders in found.items():
+                chain = self.get_chain(chain_id)
+                if not chain:
+                    continue
                 # Note: active_orders in chain stores trade_ids, not position dicts
                 # We'll update the chain status to indicate recovery
                 chain.status = 'ACTIVE'
@@ -966,13 +969,52 @@ class ProfitBookingManager:
                 self.logger.info(
                     f"Recovered chain {chain_id} with {len(chain_orders)} orders from MT5"
                 )
-                return True
-            
-            return False
+            return set(found)
             
         except Exception as e:
-            self.logger.error(f"Chain recovery failed for {chain_id}: {str(e)}")
-            return False
+            self.logger.error(f"Chain recovery failed: {str(e)}")
+            return set()
+    
+    def _level_trades(self, chain: ProfitBookingChain, open_trades: List[Trade]) -> List[Trade]:
+        """Open trades of the chain's current level (index lookup when tracked)"""
+        if self.chain_engine.is_tracking(chain.chain_id):
+            self.chain_engine.sync(open_trades)
+            return self.chain_engine.level_trades(chain)
+        return [
+            t for t in open_trades
+            if t.profit_chain_id == chain.chain_id 
+            and t.profit_level == chain.current_level
+            and t.status == "open"
+        ]
+    
+    def collect_ready_orders(self, open_trades: List[Trade]) -> List[tuple]:
+        """
+        Event-driven replacement for calling check_profit_targets per chain.
+        
+        Reconciles the chain index, runs one batched MT5 recovery for chains
+        with empty levels, then feeds one price per symbol to the engine.
+        Symbols whose price has not moved cost nothing.
+        Returns (chain, trade) pairs ready to book.
+        """
+        self.chain_engine.sync(open_trades)
+        
+        empty = self.chain_engine.empty_level_chains()
+        if empty:
+            self.recover_chains_from_mt5(empty)
+        
+        ready = []
+        for symbol in self.chain_engine.symbols():
+            current_price = self.mt5_client.get_current_price(symbol)
+            if current_price == 0:
+                continue
+            for chain, trade in self.chain_engine.on_tick(symbol, current_price):
+                self.logger.info(
+                    f"✅ Order {trade.trade_id} ready to book: "
+                    f"Chain {chain.chain_id} Level {chain.current_level} - "
+                    f"PnL=${self.chain_engine.individual_pnl(trade, current_price):.2f} >= ${self.min_profit:.2f}"
+                )
+                ready.append((chain, trade))
+        return ready
     
     def validate_chain_state(self, chain: ProfitBookingChain, 
                             open_trades: List[Trade]) -> bool:
@@ -1094,6 +1136,7 @@ class ProfitBookingManager:
                     chain.updated_at = datetime.now().isoformat()
                     self.db.save_profit_chain(chain)
                     del self.active_chains[chain_id]
+                    self.chain_engine.remove_chain(chain_id)
                     self.logger.info(f"Removed stale chain: {chain_id}")
             
             # Clean up tracking dictionaries for removed chains
@@ -1321,6 +1364,8 @@ class ProfitBookingManager:
             chain = self.get_chain(chain_id)
             if not chain: return
             
+            self.chain_engine.on_close(trade)
+            
             # 1. Track Outcome (for Strict Mode)
             if hasattr(trade, 'pnl') and trade.pnl < 0:
                 # Loss detected!
@@ -0,0 +1,383 @@
+"""
+Profit Chain Engine - Event-driven state for profit booking chains
+
+The polling loop used to rebuild every chain's level membership by scanning
+the full open_trades list, fetch one price per chain and compute each order's
+PnL from scratch - O(chains x trades) work every cycle even when nothing had
+moved. The engine keeps that state incrementally instead:
+
+- fills and closes update a per-chain, per-level order book
+- each level book keeps aggregate PnL terms, so the level's unrealized PnL is
+  O(1) for any price, and a sorted list of per-order trigger prices, so the
+  orders that crossed the $ target are found with one bisect
+- ticks are routed by symbol; a tick at an unchanged price (or for a symbol
+  with no chains) does no work at all
+- chains whose current level looks empty are recovered from MT5 in batches,
+  with one positions lookup per symbol and a retry interval per chain
+
+Features:
+- on_fill / on_close / on_tick event handlers
+- level_trades / level_pnl lookups for ProfitBookingManager
+- sync() reconciles with open_trades for orders created outside the manager
+- recover_from_mt5() batched position lookup
+
+Version: 1.0.0
+Date: 2026-01-14
+"""
+
+import logging
+import time
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from src.models import Trade, ProfitBookingChain
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LevelBook:
+    """
+    Open orders of one chain level.
+
+    For an order with dollar-per-price-unit factor k, PnL at price p is
+    sign * k * (p - entry). Summing over the level gives
+    sign * (slope * p - weighted_entry), so the running totals below are
+    enough to price the whole level.
+    """
+    orders: Dict[int, Trade] = field(default_factory=dict)
+    factors: Dict[int, float] = field(default_factory=dict)
+    triggers: List[Tuple[float, int]] = field(default_factory=list)
+    slope: float = 0.0
+    weighted_entry: float = 0.0
+
+    def add(self, key: int, trade: Trade, factor: float, trigger: Optional[float]):
+        self.orders[key] = trade
+        self.factors[key] = factor
+        self.slope += factor
+        self.weighted_entry += factor * trade.entry
+        if trigger is not None:
+            insort(self.triggers, (trigger, key))
+
+    def remove(self, key: int) -> Optional[Trade]:
+        trade = self.orders.pop(key, None)
+        if trade is None:
+            return None
+        factor = self.factors.pop(key)
+        self.slope -= factor
+        self.weighted_entry -= factor * trade.entry
+        self.triggers = [t for t in self.triggers if t[1] != key]
+        if not self.orders:
+            # Drop accumulated float error once the level is empty
+            self.slope = 0.0
+            self.weighted_entry = 0.0
+        return trade
+
+    def pnl(self, price: float, sign: int) -> float:
+        if not self.orders:
+            return 0.0
+        return sign * (self.slope * price - self.weighted_entry)
+
+
+@dataclass
+class ChainBook:
+    """Engine state for one chain"""
+    chain: ProfitBookingChain
+    levels: Dict[int, LevelBook] = field(default_factory=lambda: defaultdict(LevelBook))
+    last_price: Optional[float] = None
+    unrealized_pnl: float = 0.0
+    last_recovery_attempt: float = 0.0
+
+    @property
+    def sign(self) -> int:
+        return 1 if self.chain.direction == "buy" else -1
+
+    def current_level(self) -> LevelBook:
+        return self.levels[self.chain.current_level]
+
+
+class ProfitChainEngine:
+    """
+    Incremental index of profit chain orders driven by fill, close and
+    tick events.
+
+    The engine does not place or close orders itself; on_tick returns the
+    orders that reached the per-order target and ProfitBookingManager books
+    them as before.
+    """
+
+    def __init__(self, config, mt5_client, min_profit: float):
+        self.config = config
+        self.mt5_client = mt5_client
+        self.min_profit = min_profit
+
+        engine_config = config.get("profit_chain_engine", {})
+        self.recovery_retry_seconds = engine_config.get("recovery_retry_seconds", 60)
+        self.reconcile_interval = engine_config.get("reconcile_interval_seconds", 30)
+
+        self.chains: Dict[str, ChainBook] = {}
+        self.chains_by_symbol: Dict[str, Set[str]] = defaultdict(set)
+        self.trade_chain: Dict[int, Tuple[str, int]] = {}  # id(trade) -> (chain_id, level)
+        self._dirty_symbols: Set[str] = set()
+        self._sync_signature: Optional[FrozenSet[Tuple[int, Any]]] = None
+        self._last_full_sync = 0.0
+
+        self.stats = {
+            "ticks": 0,
+            "ticks_skipped": 0,
+            "orders_evaluated": 0,
+            "recovery_batches": 0,
+            "recovery_lookups": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Chains
+    # ------------------------------------------------------------------
+
+    def add_chain(self, chain: ProfitBookingChain):
+        if chain.chain_id in self.chains:
+            self.chains[chain.chain_id].chain = chain
+            return
+        self.chains[chain.chain_id] = ChainBook(chain=chain)
+        self.chains_by_symbol[chain.symbol].add(chain.chain_id)
+        self._dirty_symbols.add(chain.symbol)
+
+    def remove_chain(self, chain_id: str):
+        book = self.chains.pop(chain_id, None)
+        if book is None:
+            return
+        for level in book.levels.values():
+            for key in level.orders:
+                self.trade_chain.pop(key, None)
+        symbol_chains = self.chains_by_symbol.get(book.chain.symbol)
+        if symbol_chains is not None:
+            symbol_chains.discard(chain_id)
+            if not symbol_chains:
+                del self.chains_by_symbol[book.chain.symbol]
+
+    def is_tracking(self, chain_id: str) -> bool:
+        return chain_id in self.chains
+
+    def symbols(self) -> List[str]:
+        return list(self.chains_by_symbol)
+
+    # ------------------------------------------------------------------
+    # Events
+    # ------------------------------------------------------------------
+
+    def _price_factor(self, symbol: str, lot_size: float) -> float:
+        """Dollars per 1.0 price move for lot_size (0 if symbol is unknown)"""
+        try:
+            symbol_config = self.config["symbol_config"][symbol]
+            return symbol_config["pip_value_per_std_lot"] * lot_size / symbol_config["pip_size"]
+        except (KeyError, TypeError, ZeroDivisionError):
+            return 0.0
+
+    def on_fill(self, trade: Trade) -> bool:
+        """Index an open chain order. Returns False if it is not part of a tracked chain."""
+        if not trade.profit_chain_id or trade.status != "open":
+            return False
+        book = self.chains.get(trade.profit_chain_id)
+        if book is None:
+            return False
+
+        key = id(trade)
+        indexed = self.trade_chain.get(key)
+        if indexed == (trade.profit_chain_id, trade.profit_level):
+            return True
+        if indexed is not None:
+            self._unindex(key)
+
+        factor = self._price_factor(trade.symbol, trade.lot_size)
+        trigger = None
+        if factor > 0:
+            trigger = trade.entry + book.sign * self.min_profit / factor
+        book.levels[trade.profit_level].add(key, trade, factor, trigger)
+        self.trade_chain[key] = (trade.profit_chain_id, trade.profit_level)
+        self._dirty_symbols.add(book.chain.symbol)
+        return True
+
+    def on_close(self, trade: Trade) -> Optional[ProfitBookingChain]:
+        """
+        Drop a closed order from its level.
+
+        Returns the chain when this close emptied its current level, i.e.
+        when the chain may be ready to progress.
+        """
+        indexed = self.trade_chain.get(id(trade))
+        if indexed is None:
+            return None
+        chain_id, level = indexed
+        self._unindex(id(trade))
+        book = self.chains.get(chain_id)
+        if book and level == book.chain.current_level and not book.current_level().orders:
+            return book.chain
+        return None
+
+    def _unindex(self, key: int):
+        chain_id, level = self.trade_chain.pop(key)
+        book = self.chains.get(chain_id)
+        if book is not None:
+            book.levels[level].remove(key)
+            self._dirty_symbols.add(book.chain.symbol)
+
+    def on_tick(self, symbol: str, price: float) -> List[Tuple[ProfitBookingChain, Trade]]:
+        """
+        Re-price the symbol's chains and return (chain, order) pairs whose
+        order PnL reached min_profit. Unchanged prices are skipped.
+        """
+        chain_ids = self.chains_by_symbol.get(symbol)
+        if not chain_ids or not price:
+            return []
+        self.stats["ticks"] += 1
+
+        dirty = symbol in self._dirty_symbols
+        self._dirty_symbols.discard(symbol)
+
+        ready = []
+        for chain_id in list(chain_ids):
+            book = self.chains[chain_id]
+            chain = book.chain
+            if chain.status != "ACTIVE":
+                continue
+            if not dirty and book.last_price == price:
+                self.stats["ticks_skipped"] += 1
+                continue
+            book.last_price = price
+
+            level = book.current_level()
+            book.unrealized_pnl = level.pnl(price, book.sign)
+            if not level.triggers or chain.current_level >= chain.max_level:
+                continue
+
+            if book.sign > 0:
+                crossed = level.triggers[:bisect_right(level.triggers, (price, float("inf")))]
+            else:
+                crossed = level.triggers[bisect_left(level.triggers, (price, -1)):]
+            self.stats["orders_evaluated"] += len(crossed)
+            for _, key in crossed:
+                ready.append((chain, level.orders[key]))
+        return ready
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def level_trades(self, chain: ProfitBookingChain, level: Optional[int] = None) -> List[Trade]:
+        book = self.chains.get(chain.chain_id)
+        if book is None:
+            return []
+        level = chain.current_level if level is None else level
+        return [t for t in book.levels[level].orders.values() if t.status == "open"]
+
+    def level_pnl(self, chain: ProfitBookingChain, price: float) -> float:
+        book = self.chains.get(chain.chain_id)
+        if book is None:
+            return 0.0
+        return book.current_level().pnl(price, book.sign)
+
+    def individual_pnl(self, trade: Trade, price: float) -> float:
+        sign = 1 if trade.direction == "buy" else -1
+        return sign * self._price_factor(trade.symbol, trade.lot_size) * (price - trade.entry)
+
+    def unrealized_pnl(self, chain_id: str) -> float:
+        """Current-level PnL as of the last tick"""
+        book = self.chains.get(chain_id)
+        return book.unrealized_pnl if book else 0.0
+
+    # ------------------------------------------------------------------
+    # Reconciliation
+    # ------------------------------------------------------------------
+
+    def sync(self, open_trades: List[Trade], force: bool = False) -> bool:
+        """
+        Reconcile the index with the engine's open_trades list.
+
+        Catches chain orders created outside ProfitBookingManager (e.g.
+        recovery orders). Skipped while the set of open trades is unchanged
+        (so a close and an open in the same cycle still trigger a pass), with
+        a full pass every reconcile_interval seconds.
+        """
+        now = time.time()
+        signature = frozenset((id(trade), trade.trade_id) for trade in open_trades)
+        if (not force and signature == self._sync_signature
+                and now - self._last_full_sync < self.reconcile_interval):
+            return False
+        self._sync_signature = signature
+        self._last_full_sync = now
+
+        present = set()
+        for trade in open_trades:
+            if trade.profit_chain_id and trade.status == "open" and self.on_fill(trade):
+                present.add(id(trade))
+        for key in [k for k in self.trade_chain if k not in present]:
+            self._unindex(key)
+        return True
+
+    def empty_level_chains(self) -> List[ProfitBookingChain]:
+        """Active chains that expect orders but have none indexed on their level"""
+        return [
+            book.chain for book in self.chains.values()
+            if book.chain.status == "ACTIVE"
+            and book.chain.active_orders
+            and not book.current_level().orders
+        ]
+
+    def recover_from_mt5(self, chains: Iterable[ProfitBookingChain],
+                         force: bool = False) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Look up MT5 positions for several chains at once.
+
+        One get_positions call per symbol; a chain is retried at most every
+        recovery_retry_seconds unless force is set. Returns chain_id ->
+        positions whose comment carries the chain id.
+        """
+        now = time.time()
+        by_symbol: Dict[str, List[ProfitBookingChain]] = defaultdict(list)
+        for chain in chains:
+            book = self.chains.get(chain.chain_id)
+            if book is not None:
+                if not force and now - book.last_recovery_attempt < self.recovery_retry_seconds:
+                    continue
+                book.last_recovery_attempt = now
+            by_symbol[chain.symbol].append(chain)
+
+        if not by_symbol:
+            return {}
+        self.stats["recovery_batches"] += 1
+
+        found: Dict[str, List[Dict[str, Any]]] = {}
+        for symbol, symbol_chains in by_symbol.items():
+            self.stats["recovery_lookups"] += 1
+            try:
+                positions = self.mt5_client.get_positions(symbol=symbol) or []
+            except Exception as e:
+                logger.error(f"[PROFIT_ENGINE] Position lookup failed for {symbol}: {e}")
+                continue
+            for chain in symbol_chains:
+                matches = [
+                    {
+                        'ticket': position['ticket'],
+                        'volume': position['volume'],
+                        'price_open': position['price_open'],
+                        'sl_price': position['sl'],
+                        'tp_price': position['tp'],
+                        'profit': position['profit'],
+                        'comment': position['comment']
+                    }
+                    for position in positions
+                    if position.get('comment') and chain.chain_id in position['comment']
+                ]
+                if matches:
+                    found[chain.chain_id] = matches
+        return found
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "chains": len(self.chains),
+            "symbols": len(self.chains_by_symbol),
+            "indexed_orders": len(self.trade_chain),
+            **self.stats,
+        }
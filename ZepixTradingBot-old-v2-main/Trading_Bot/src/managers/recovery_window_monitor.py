@@ -4,11 +4,17 @@ Monitors price movements in real-time and triggers immediate recovery actions
 """
 
 import asyncio
-from datetime import datetime
-from typing import Dict, Optional, Any, Callable
-import MetaTrader5 as mt5
+from datetime import timedelta
+from typing import Dict, List, Optional, Any, Callable
 import logging
 
+from src.utils.clock import Clock, get_clock
+
+try:
+    import MetaTrader5 as mt5
+except ImportError:
+    mt5 = None
+
 logger = logging.getLogger(__name__)
 
 # Type alias for plugin callback
@@ -72,14 +78,16 @@ class RecoveryWindowMonitor:
     DEFAULT_RECOVERY_WINDOW = 30  # Default 30 minutes
     MONITORING_INTERVAL = 1  # Check every 1 second
     
-    def __init__(self, autonomous_manager):
+    def __init__(self, autonomous_manager, clock: Optional[Clock] = None):
         """
         Initialize Recovery Window Monitor
         
         Args:
             autonomous_manager: Reference to AutonomousSystemManager
+            clock: Time source for windows and check intervals (default: process clock)
         """
         self.autonomous_manager = autonomous_manager
+        self.clock = clock or get_clock()
         self.active_monitors: Dict[int, Dict[str, Any]] = {}
         self.monitor_tasks: Dict[int, asyncio.Task] = {}
         
@@ -135,7 +143,7 @@ class RecoveryWindowMonitor:
             "sl_price": sl_price,
             "recovery_price": recovery_price,
             "min_recovery_pips": min_recovery_pips,
-            "start_time": datetime.now(),
+            "start_time": self.clock.now(),
             "max_duration_seconds": recovery_window_minutes * 60,
             "status": "MONITORING",
             "original_order": original_order,
@@ -193,7 +201,7 @@ Checking every {self.MONITORING_INTERVAL}s...
             "direction": direction,
             "sl_price": sl_price,
             "recovery_price": recovery_70_level, # Target is 70% level
-            "start_time": datetime.now(),
+            "start_time": self.clock.now(),
             "max_duration_seconds": max_duration,
             "original_order": original_order,
             "order_type": order_type,
@@ -266,7 +274,7 @@ Checking every {self.MONITORING_INTERVAL}s...
                 check_count = monitor_data["check_count"]
                 
                 # Check if window expired
-                elapsed = (datetime.now() - start_time).total_seconds()
+                elapsed = (self.clock.now() - start_time).total_seconds()
                 if elapsed > max_duration:
                     await self._handle_timeout(order_id, elapsed)
                     break
@@ -275,7 +283,7 @@ Checking every {self.MONITORING_INTERVAL}s...
                 current_price = self._get_current_price(symbol)
                 if current_price is None:
                     logger.warning(f"Failed to get price for {symbol}, retrying...")
-                    await asyncio.sleep(self.MONITORING_INTERVAL)
+                    await self.clock.sleep(self.MONITORING_INTERVAL)
                     continue
                 
                 # Check recovery condition
@@ -335,7 +343,7 @@ Checking every {self.MONITORING_INTERVAL}s...
                     except Exception as e:
                         logger.error(f"Error checking shield status: {e}")
 
-                await asyncio.sleep(self.MONITORING_INTERVAL)
+                await self.clock.sleep(self.MONITORING_INTERVAL)
         
         except Exception as e:
             logger.error(f"Error in monitoring loop for #{order_id}: {e}", exc_info=True)
@@ -571,6 +579,11 @@ Recovery attempt in progress...
         """
         
         try:
+            if mt5 is None:
+                # Simulation: price from the engine's client
+                mt5_client = getattr(self.autonomous_manager, 'mt5_client', None)
+                return mt5_client.get_current_price(symbol) if mt5_client else None
+            
             tick = mt5.symbol_info_tick(symbol)
             if tick is None:
                 return None
@@ -608,6 +621,89 @@ Recovery attempt in progress...
         
         return len(self.active_monitors)
     
+    def export_monitors(self) -> List[Dict[str, Any]]:
+        """
+        Live monitors with their remaining window, for the engine snapshot.
+        
+        Returns:
+            List of monitor dicts with start_time replaced by remaining_seconds
+        """
+        now = self.clock.now()
+        entries = []
+        for order_id, monitor_data in list(self.active_monitors.items()):
+            task = self.monitor_tasks.get(order_id)
+            if task is not None and task.done():
+                continue
+            elapsed = (now - monitor_data["start_time"]).total_seconds()
+            remaining = monitor_data["max_duration_seconds"] - elapsed
+            if remaining <= 0:
+                continue
+            entry = {k: v for k, v in monitor_data.items() if k != "start_time"}
+            entry["remaining_seconds"] = remaining
+            entries.append(entry)
+        return entries
+    
+    def select_monitors(self, entries: List[Dict[str, Any]]) -> Dict[Any, Dict[str, Any]]:
+        """
+        Monitor data to resume from snapshot entries, without starting anything.
+        
+        Returns:
+            Dict of order_id -> monitor data with start_time rebuilt from remaining_seconds
+        """
+        now = self.clock.now()
+        selected = {}
+        for entry in entries:
+            order_id = entry.get("order_id")
+            remaining = entry.get("remaining_seconds", 0)
+            if order_id is None or order_id in self.active_monitors or remaining <= 0:
+                continue
+            monitor_data = {k: v for k, v in entry.items() if k != "remaining_seconds"}
+            elapsed = monitor_data["max_duration_seconds"] - remaining
+            monitor_data["start_time"] = now - timedelta(seconds=elapsed)
+            selected[order_id] = monitor_data
+        if selected:
+            asyncio.get_running_loop()  # Resuming needs the event loop; fail before anything starts
+        return selected
+    
+    def restore_monitors(self, monitors: Dict[Any, Dict[str, Any]]) -> int:
+        """
+        Resume monitors picked by select_monitors with the window time they had left.
+        Must be called from the running event loop.
+        
+        Returns:
+            Number of monitors restarted
+        """
+        for order_id, monitor_data in monitors.items():
+            self.active_monitors[order_id] = monitor_data
+            self.monitor_tasks[order_id] = asyncio.create_task(self._monitor_loop(order_id))
+        if monitors:
+            logger.info(f"Restored {len(monitors)} recovery monitors from snapshot")
+        return len(monitors)
+    
+    def prune_finished_monitors(self) -> int:
+        """
+        Drop monitor entries whose task has finished or was never started.
+        
+        Entries are normally removed by _cleanup_monitor; this catches ones
+        left behind when a loop task is cancelled or dies before cleanup.
+        
+        Returns:
+            int: Number of entries removed
+        """
+        
+        stale = [
+            order_id for order_id in list(self.active_monitors)
+            if order_id not in self.monitor_tasks or self.monitor_tasks[order_id].done()
+        ]
+        for order_id in stale:
+            self._cleanup_monitor(order_id)
+        for order_id in [oid for oid, task in self.monitor_tasks.items()
+                         if task.done() and oid not in self.active_monitors]:
+            del self.monitor_tasks[order_id]
+        if stale:
+            logger.info(f"Pruned {len(stale)} finished recovery monitors")
+        return len(stale)
+    
     def get_monitor_status(self, order_id: int) -> Optional[Dict]:
         """
         Get status of a specific monitor
@@ -623,7 +719,7 @@ Recovery attempt in progress...
         if not monitor_data:
             return None
         
-        elapsed = (datetime.now() - monitor_data["start_time"]).total_seconds()
+        elapsed = (self.clock.now() - monitor_data["start_time"]).total_seconds()
         remaining = monitor_data["max_duration_seconds"] - elapsed
         
         return {
@@ -695,7 +791,7 @@ Recovery attempt in progress...
             "chain_level": 0,  # Will be updated by plugin
             "metadata": {
                 "order_type": monitor_data.get("order_type", "A"),
-                "recovery_time_seconds": (datetime.now() - monitor_data["start_time"]).total_seconds(),
+                "recovery_time_seconds": (self.clock.now() - monitor_data["start_time"]).total_seconds(),
                 "check_count": monitor_data["check_count"]
             }
         }
@@ -0,0 +1,254 @@
+"""
+Risk Ledger - Append-only, crash-safe record of risk events
+
+Every PnL update, loss, reset and manual override is appended as one row to
+a SQLite table (WAL mode, one short transaction per event). The in-memory
+RiskCounters used by RiskManager are derived by replaying the ledger, and a
+periodic compaction folds old events into a single SNAPSHOT row so restart
+recovery only replays the tail.
+
+Version: 1.0.0
+Date: 2026-01-14
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, Optional, List
+
+from src.utils.clock import Clock, get_clock
+
+logger = logging.getLogger(__name__)
+
+
+class RiskEventType:
+    """Ledger event types"""
+    TRADE_PNL = "TRADE_PNL"            # closed trade result (counts as a trade)
+    LOSS = "LOSS"                      # loss recorded outside a trade close
+    RESET_DAILY_LOSS = "RESET_DAILY_LOSS"
+    RESET_DAILY_STATS = "RESET_DAILY_STATS"
+    RESET_LIFETIME_LOSS = "RESET_LIFETIME_LOSS"
+    OVERRIDE = "OVERRIDE"              # manual counter override (payload holds fields)
+    SNAPSHOT = "SNAPSHOT"              # compaction checkpoint (payload holds counters)
+
+
+@dataclass
+class RiskCounters:
+    """Daily and lifetime risk counters derived from the ledger"""
+    day: str = ""
+    daily_loss: float = 0.0
+    daily_profit: float = 0.0
+    lifetime_loss: float = 0.0
+    total_trades: int = 0
+    winning_trades: int = 0
+    # Today's closed-trade performance (not cleared by manual resets)
+    today_profit: float = 0.0
+    today_loss: float = 0.0
+    today_trade_count: int = 0
+
+    def roll_day(self, day: str):
+        """Clear daily counters when the event day changes"""
+        if self.day != day:
+            self.day = day
+            self.daily_loss = 0.0
+            self.daily_profit = 0.0
+            self.today_profit = 0.0
+            self.today_loss = 0.0
+            self.today_trade_count = 0
+
+    def apply(self, event_type: str, amount: float, day: str, payload: Optional[Dict] = None):
+        """Apply a single ledger event"""
+        if event_type == RiskEventType.SNAPSHOT:
+            for key, value in (payload or {}).items():
+                if hasattr(self, key):
+                    setattr(self, key, value)
+            return
+
+        self.roll_day(day)
+
+        if event_type == RiskEventType.TRADE_PNL:
+            self.total_trades += 1
+            self.today_trade_count += 1
+            if amount > 0:
+                self.daily_profit += amount
+                self.today_profit += amount
+                self.winning_trades += 1
+            else:
+                self.daily_loss += abs(amount)
+                self.lifetime_loss += abs(amount)
+                self.today_loss += amount
+        elif event_type == RiskEventType.LOSS:
+            self.daily_loss += abs(amount)
+            self.lifetime_loss += abs(amount)
+        elif event_type == RiskEventType.RESET_DAILY_LOSS:
+            self.daily_loss = 0.0
+            self.daily_profit = 0.0
+        elif event_type == RiskEventType.RESET_DAILY_STATS:
+            self.daily_loss = 0.0
+            self.daily_profit = 0.0
+            self.total_trades = 0
+            self.winning_trades = 0
+        elif event_type == RiskEventType.RESET_LIFETIME_LOSS:
+            self.lifetime_loss = 0.0
+        elif event_type == RiskEventType.OVERRIDE:
+            for key, value in (payload or {}).items():
+                if hasattr(self, key) and key != "day":
+                    setattr(self, key, value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class RiskLedger:
+    """
+    Append-only SQLite ledger of risk events.
+
+    Writes are single INSERTs in their own transaction (durable across a
+    crash without rewriting a whole file). Compaction replaces all events up
+    to a point with one SNAPSHOT row.
+    """
+
+    def __init__(self, db_path: str = "data/risk_ledger.db", compact_every: int = 500,
+                 clock: Optional[Clock] = None):
+        self.db_path = db_path
+        self.compact_every = compact_every
+        # Decides the trading day, so simulated time rolls daily counters too
+        self.clock = clock or get_clock()
+        self.counters = RiskCounters(day=str(self.clock.today()))
+        self._events_since_snapshot = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30.0)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_tables()
+
+    def _create_tables(self):
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS risk_events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                ts TEXT NOT NULL,
+                day TEXT NOT NULL,
+                event_type TEXT NOT NULL,
+                amount REAL DEFAULT 0.0,
+                symbol TEXT,
+                payload TEXT
+            )
+        ''')
+        self.conn.commit()
+
+    def is_empty(self) -> bool:
+        row = self.conn.execute("SELECT 1 FROM risk_events LIMIT 1").fetchone()
+        return row is None
+
+    def replay(self) -> RiskCounters:
+        """Rebuild counters from the latest snapshot plus the events after it"""
+        with self._lock:
+            counters = RiskCounters()
+            row = self.conn.execute(
+                "SELECT MAX(id) FROM risk_events WHERE event_type = ?",
+                (RiskEventType.SNAPSHOT,)
+            ).fetchone()
+            start_id = row[0] or 0
+
+            cursor = self.conn.execute(
+                "SELECT event_type, amount, day, payload FROM risk_events "
+                "WHERE id >= ? ORDER BY id",
+                (start_id,)
+            )
+            count = 0
+            for event_type, amount, day, payload in cursor:
+                counters.apply(event_type, amount or 0.0, day,
+                               json.loads(payload) if payload else None)
+                count += 1
+
+            counters.roll_day(str(self.clock.today()))
+            self.counters = counters
+            self._events_since_snapshot = count
+            return counters
+
+    def append(self, event_type: str, amount: float = 0.0, symbol: str = None,
+               payload: Optional[Dict] = None) -> RiskCounters:
+        """Append one event, update counters in memory and compact if due"""
+        now = self.clock.now()
+        day = str(now.date())
+        with self._lock:
+            self.conn.execute(
+                "INSERT INTO risk_events (ts, day, event_type, amount, symbol, payload) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (now.isoformat(), day, event_type, amount, symbol,
+                 json.dumps(payload) if payload else None)
+            )
+            self.conn.commit()
+            self.counters.apply(event_type, amount, day, payload)
+            self._events_since_snapshot += 1
+            due = self.compact_every and self._events_since_snapshot >= self.compact_every
+
+        if due:
+            self.compact()
+        return self.counters
+
+    def compact(self) -> int:
+        """
+        Fold every event into one SNAPSHOT row. Returns number of rows removed.
+        Runs in a single transaction, so a crash leaves either the old events
+        or the snapshot - never neither.
+        """
+        with self._lock:
+            now = self.clock.now()
+            try:
+                cursor = self.conn.cursor()
+                cursor.execute("BEGIN IMMEDIATE")
+                cursor.execute(
+                    "INSERT INTO risk_events (ts, day, event_type, amount, payload) "
+                    "VALUES (?, ?, ?, 0.0, ?)",
+                    (now.isoformat(), self.counters.day, RiskEventType.SNAPSHOT,
+                     json.dumps(self.counters.to_dict()))
+                )
+                snapshot_id = cursor.lastrowid
+                cursor.execute("DELETE FROM risk_events WHERE id < ?", (snapshot_id,))
+                removed = cursor.rowcount
+                self.conn.commit()
+            except Exception as e:
+                self.conn.rollback()
+                logger.error(f"[RISK_LEDGER] Compaction failed: {e}")
+                return 0
+            self._events_since_snapshot = 1
+            logger.info(f"[RISK_LEDGER] Compacted {removed} events into snapshot #{snapshot_id}")
+            return removed
+
+    def seed(self, counters: Dict[str, Any]):
+        """Initialize an empty ledger from legacy stats (one SNAPSHOT row)"""
+        with self._lock:
+            self.conn.execute(
+                "INSERT INTO risk_events (ts, day, event_type, amount, payload) "
+                "VALUES (?, ?, ?, 0.0, ?)",
+                (self.clock.now().isoformat(), counters.get("day", str(self.clock.today())),
+                 RiskEventType.SNAPSHOT, json.dumps(counters))
+            )
+            self.conn.commit()
+
+    def get_events(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Most recent events (newest first) for diagnostics"""
+        cursor = self.conn.execute(
+            "SELECT id, ts, event_type, amount, symbol, payload FROM risk_events "
+            "ORDER BY id DESC LIMIT ?",
+            (limit,)
+        )
+        return [
+            {"id": r[0], "ts": r[1], "event_type": r[2], "amount": r[3],
+             "symbol": r[4], "payload": json.loads(r[5]) if r[5] else None}
+            for r in cursor.fetchall()
+        ]
+
+    def close(self):
+        try:
+            self.conn.close()
+        except Exception:
+            pass
@@ -1,15 +1,18 @@
 import json
 import os
 import logging
-from datetime import datetime, date
-from typing import Dict, Any, List
+from typing import Dict, Any, Optional
 from src.config import Config
+from src.managers.risk_ledger import RiskLedger, RiskEventType
+from src.core.portfolio_view import PortfolioView
+from src.utils.clock import Clock, get_clock
 
 logger = logging.getLogger(__name__)
 
 class RiskManager:
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, clock: Optional[Clock] = None):
         self.config = config
+        self.clock = clock or get_clock()
         self.stats_file = "data/stats.json"
         self.daily_loss = 0.0
         self.lifetime_loss = 0.0
@@ -18,55 +21,78 @@ class RiskManager:
         self.winning_trades = 0
         self.open_trades = []
         self.mt5_client = None
+        # Append-only risk event ledger - source of truth for the counters above
+        self.ledger = RiskLedger(
+            config.get("risk_ledger_path", "data/risk_ledger.db"),
+            compact_every=config.get("risk_ledger_compact_every", 500),
+            clock=self.clock
+        )
         self.load_stats()
         
     def load_stats(self):
-        """Load statistics from file with error handling"""
+        """Rebuild statistics by replaying the risk ledger (seeded from stats.json once)"""
+        try:
+            if self.ledger.is_empty():
+                self._seed_ledger_from_stats_file()
+            self.ledger.replay()
+            self._sync_from_ledger()
+        except Exception as e:
+            print(f"WARNING: Risk ledger replay failed, resetting: {str(e)}")
+            self.reset_daily_stats()
+    
+    def _seed_ledger_from_stats_file(self):
+        """One-time migration of legacy stats.json into the ledger"""
         try:
             if os.path.exists(self.stats_file) and os.path.getsize(self.stats_file) > 0:
                 with open(self.stats_file, 'r') as f:
                     stats = json.load(f)
-                    
-                if stats.get("date") != str(date.today()):
-                    self.daily_loss = 0.0
-                    self.daily_profit = 0.0
-                else:
-                    self.daily_loss = stats.get("daily_loss", 0.0)
-                    self.daily_profit = stats.get("daily_profit", 0.0)
-                    
-                self.lifetime_loss = stats.get("lifetime_loss", 0.0)
-                self.total_trades = stats.get("total_trades", 0)
-                self.winning_trades = stats.get("winning_trades", 0)
-            else:
-                # Initialize with default values if file doesn't exist or is empty
-                self.reset_daily_stats()
-                
+                self.ledger.seed({
+                    "day": stats.get("date", str(self.clock.today())),
+                    "daily_loss": stats.get("daily_loss", 0.0),
+                    "daily_profit": stats.get("daily_profit", 0.0),
+                    "lifetime_loss": stats.get("lifetime_loss", 0.0),
+                    "total_trades": stats.get("total_trades", 0),
+                    "winning_trades": stats.get("winning_trades", 0)
+                })
         except (json.JSONDecodeError, Exception) as e:
-            print(f"WARNING: Stats file corrupted, resetting: {str(e)}")
-            self.reset_daily_stats()
+            print(f"WARNING: Stats file corrupted, starting empty ledger: {str(e)}")
+    
+    def _sync_from_ledger(self):
+        """Copy ledger-derived counters onto the public attributes"""
+        counters = self.ledger.counters
+        self.daily_loss = counters.daily_loss
+        self.daily_profit = counters.daily_profit
+        self.lifetime_loss = counters.lifetime_loss
+        self.total_trades = counters.total_trades
+        self.winning_trades = counters.winning_trades
+    
+    def _record(self, event_type: str, amount: float = 0.0, symbol: str = None, payload: Dict = None):
+        """Append a risk event and refresh in-memory counters"""
+        self.ledger.append(event_type, amount, symbol=symbol, payload=payload)
+        self._sync_from_ledger()
     
     def reset_daily_stats(self):
         """Reset daily statistics"""
-        self.daily_loss = 0.0
-        self.daily_profit = 0.0
-        self.total_trades = 0
-        self.winning_trades = 0
+        self._record(RiskEventType.RESET_DAILY_STATS)
         self.save_stats()
     
     def reset_lifetime_loss(self):
         """Reset lifetime loss counter"""
-        self.lifetime_loss = 0.0
+        self._record(RiskEventType.RESET_LIFETIME_LOSS)
         self.save_stats()
     
     def reset_daily_loss(self):
         """Reset daily loss and profit counters (keeps lifetime loss)"""
         logger.info(f"[RESET_DAILY_LOSS] Clearing daily stats (Current: Loss=${self.daily_loss:.2f}, Profit=${self.daily_profit:.2f})")
         
-        # Explicitly set to zero
-        self.daily_loss = 0.0
-        self.daily_profit = 0.0
+        # Durable once the ledger row is committed
+        try:
+            self._record(RiskEventType.RESET_DAILY_LOSS)
+        except Exception as e:
+            logger.error(f"[RESET_DAILY_LOSS] ❌ CRITICAL: Failed to record reset in risk ledger: {e}")
+            return False
         
-        # Save with verification
+        # Export snapshot file (read by /clear_daily_loss verification)
         save_success = self.save_stats()
         
         if save_success:
@@ -76,54 +102,59 @@ class RiskManager:
             logger.error(f"[RESET_DAILY_LOSS] ❌ CRITICAL: Failed to save cleared stats to file!")
             return False
     
-    def save_stats(self):
-        """Save statistics to file with verification and retry"""
+    def save_stats(self, override: bool = False):
+        """
+        Persist statistics.
+        
+        Exports the ledger counters as a JSON snapshot to stats_file for
+        external readers. After editing the counter attributes directly, pass
+        override=True to record the edited values in the ledger first;
+        without it, unrecorded edits are replaced by the ledger values.
+        Not called on the trade-close path - update_pnl/record_loss only append.
+        """
+        try:
+            if override:
+                self._record(RiskEventType.OVERRIDE, payload={
+                    key: getattr(self, key)
+                    for key in ("daily_loss", "daily_profit", "lifetime_loss", "total_trades", "winning_trades")
+                })
+            else:
+                self._sync_from_ledger()
+        except Exception as e:
+            logger.error(f"ERROR: Failed to record risk override: {str(e)}")
+            return False
+        
+        return self._export_stats_file()
+    
+    def _export_stats_file(self) -> bool:
+        """Atomically write the legacy stats.json snapshot"""
         stats = {
-            "date": str(date.today()),
+            "date": str(self.clock.today()),
             "daily_loss": self.daily_loss,
             "daily_profit": self.daily_profit,
             "lifetime_loss": self.lifetime_loss,
             "total_trades": self.total_trades,
             "winning_trades": self.winning_trades
         }
-        
-        # Try to save with retry logic
-        max_retries = 2
-        for attempt in range(max_retries):
-            try:
-                # Ensure directory exists
-                os.makedirs(os.path.dirname(self.stats_file), exist_ok=True)
-                
-                # Write stats file
-                with open(self.stats_file, 'w') as f:
-                    json.dump(stats, f, indent=4)
-                
-                # CRITICAL FIX: Verify file was written correctly
-                with open(self.stats_file, 'r') as f:
-                    verify_data = json.load(f)
-                
-                # Check if daily_loss matches what we tried to save
-                if abs(verify_data.get("daily_loss", -999) - self.daily_loss) < 0.01:
-                    logger.info(f"✅ Stats saved successfully: Daily Loss=${self.daily_loss:.2f}, Lifetime=${self.lifetime_loss:.2f}")
-                    return True
-                else:
-                    raise ValueError(f"Verification failed: Expected daily_loss={self.daily_loss}, got {verify_data.get('daily_loss')}")
-                    
-            except Exception as e:
-                error_msg = f"ERROR: Stats save attempt {attempt + 1}/{max_retries} failed: {str(e)}"
-                print(error_msg)
-                logger.error(error_msg)
-                
-                if attempt < max_retries - 1:
-                    # Wait before retry
-                    import time
-                    time.sleep(1)
-                else:
-                    # Final attempt failed
-                    logger.error(f"CRITICAL: Failed to save stats after {max_retries} attempts. File: {self.stats_file}")
-                    return False
-        
-        return False
+        try:
+            os.makedirs(os.path.dirname(self.stats_file), exist_ok=True)
+            temp_file = f"{self.stats_file}.tmp"
+            with open(temp_file, 'w') as f:
+                json.dump(stats, f, indent=4)
+            os.replace(temp_file, self.stats_file)
+            logger.info(f"✅ Stats saved successfully: Daily Loss=${self.daily_loss:.2f}, Lifetime=${self.lifetime_loss:.2f}")
+            return True
+        except Exception as e:
+            error_msg = f"ERROR: Stats export failed: {str(e)}"
+            print(error_msg)
+            logger.error(error_msg)
+            return False
+    
+    def compact_ledger(self) -> int:
+        """Fold the ledger into a snapshot and refresh stats.json (periodic maintenance)"""
+        removed = self.ledger.compact()
+        self._export_stats_file()
+        return removed
     
     def get_fixed_lot_size(self, balance: float) -> float:
         """Get fixed lot size based on account balance or active tier"""
@@ -228,18 +259,9 @@ class RiskManager:
         
         return True
     
-    def update_pnl(self, pnl: float):
-        """Update PnL and risk statistics"""
-        self.total_trades += 1
-        
-        if pnl > 0:
-            self.daily_profit += pnl
-            self.winning_trades += 1
-        else:
-            self.daily_loss += abs(pnl)
-            self.lifetime_loss += abs(pnl)
-        
-        self.save_stats()
+    def update_pnl(self, pnl: float, symbol: str = None):
+        """Update PnL and risk statistics (single ledger append, no file rewrite)"""
+        self._record(RiskEventType.TRADE_PNL, pnl, symbol=symbol)
     
     def add_open_trade(self, trade):
         """Add trade to open trades list"""
@@ -428,13 +450,19 @@ class RiskManager:
             "account_balance": account_balance
         }
     
-    def get_todays_performance(self, db) -> Dict[str, Any]:
+    def get_todays_performance(self, db=None) -> Dict[str, Any]:
         """
-        Calculate today's profit, loss, and net PnL from database
+        Calculate today's profit, loss, and net PnL
+        The trades table is authoritative (it also holds closes that never pass
+        through update_pnl, e.g. reconciled or DB-only closes); the risk ledger
+        counters are used when no database is given or the query fails.
         Returns: {"profit": float, "loss": float, "net": float, "trade_count": int}
         """
+        if db is None:
+            return self._todays_ledger_performance()
+        
         try:
-            today = date.today()
+            today = self.clock.today()
             
             # Query database for trades closed today
             cursor = db.conn.cursor()
@@ -459,13 +487,31 @@ class RiskManager:
             
         except Exception as e:
             logger.error(f"Error calculating today's performance: {e}")
-            return {'profit': 0.0, 'loss': 0.0, 'net': 0.0, 'trade_count': 0}
+            return self._todays_ledger_performance()
+    
+    def _todays_ledger_performance(self) -> Dict[str, Any]:
+        """Today's closed-trade totals recorded through update_pnl"""
+        counters = self.ledger.counters
+        counters.roll_day(str(self.clock.today()))
+        return {
+            'profit': counters.today_profit,
+            'loss': counters.today_loss,
+            'net': counters.today_profit + counters.today_loss,
+            'trade_count': counters.today_trade_count
+        }
     
     def get_live_open_trades_pnl(self, trading_engine, mt5_client, pip_calculator) -> Dict[str, Any]:
         """
         Calculate real-time PnL for all open trades
         Returns: {"total_live_pnl": float, "trade_details": List[Dict]}
+        
+        Served from the engine's PortfolioView when available (no broker calls);
+        otherwise every open trade is priced from MT5.
         """
+        portfolio = getattr(trading_engine, 'portfolio', None)
+        if isinstance(portfolio, PortfolioView):
+            return portfolio.snapshot().live_pnl()
+        
         try:
             open_trades = trading_engine.get_open_trades()
             total_live_pnl = 0.0
@@ -579,9 +625,7 @@ class RiskManager:
             symbol: Optional symbol for tracking
         """
         loss = abs(loss_amount)
-        self.daily_loss += loss
-        self.lifetime_loss += loss
-        self.save_stats()
+        self._record(RiskEventType.LOSS, loss, symbol=symbol)
         logger.info(f"Loss recorded: ${loss:.2f} (Daily: ${self.daily_loss:.2f}, Lifetime: ${self.lifetime_loss:.2f})")
     
     def check_daily_limit(self, symbol: str = None) -> bool:
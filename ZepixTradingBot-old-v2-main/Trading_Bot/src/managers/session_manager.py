@@ -10,6 +10,8 @@ from typing import Optional, Dict, Any, List, Tuple
 import json
 import pytz
 
+from src.utils.clock import Clock, get_clock
+
 logger = logging.getLogger(__name__)
 
 class SessionManager:
@@ -27,8 +29,9 @@ class SessionManager:
         'dead_zone': {'start': "03:30", 'end': "05:00", 'name': 'Dead Zone', 'allowed': []}
     }
     
-    def __init__(self, config, db, mt5_client):
+    def __init__(self, config, db, mt5_client, clock: Optional[Clock] = None):
         self.config = config
+        self.clock = clock or get_clock()
         self.db = db
         self.mt5_client = mt5_client
         self.active_session_id: Optional[str] = None
@@ -72,7 +75,7 @@ class SessionManager:
                 logger.warning(f"Session already active: {self.active_session_id}")
                 return self.active_session_id
             
-            session_id = f"SES_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+            session_id = f"SES_{self.clock.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
             self.db.create_session(session_id, symbol, direction, signal)
             
             # Store metadata
@@ -152,7 +155,7 @@ class SessionManager:
 
     def get_current_time(self) -> datetime:
         """Get current time in configured timezone"""
-        return datetime.now(self.timezone)
+        return self.clock.now(self.timezone)
 
     def time_to_minutes(self, time_obj) -> int:
         """Convert time object or HH:MM string to minutes"""
@@ -258,7 +261,7 @@ class SessionManager:
             diff = (start_mins - current_mins) % 1440
             
             if 14 <= diff <= 16: # Around 15 mins
-                key = f"{datetime.now().date()}_{sess_id}_15m"
+                key = f"{self.clock.now().date()}_{sess_id}_15m"
                 if key not in self.alert_cooldown:
                     self.alert_cooldown[key] = True
                     return f"⚠️ {sess_data['name']} Session starts in 15 minutes!"
@@ -2,6 +2,7 @@
 Command Executor - Executes commands from user context
 """
 import logging
+from collections import deque
 from datetime import datetime
 from typing import Dict, Any, Optional, List
 from .parameter_validator import ParameterValidator
@@ -15,11 +16,14 @@ class CommandExecutor:
     Executes commands with parameters from user context
     """
     
+    # Execution records kept in memory (oldest dropped first)
+    MAX_EXECUTION_LOG = 500
+    
     def __init__(self, telegram_bot, context_manager=None):
         self.bot = telegram_bot
         self.validator = ParameterValidator()
         self.dynamic_handlers = DynamicHandlers(telegram_bot)
-        self.execution_log: List[Dict[str, Any]] = []  # Store execution history
+        self.execution_log: deque = deque(maxlen=self.MAX_EXECUTION_LOG)  # Store execution history
         self.context_manager = context_manager  # Store reference to context manager
     
     def _create_message_dict(self, command: str, params: Dict[str, Any]) -> dict:
@@ -436,7 +440,7 @@ class CommandExecutor:
     
     def get_execution_log(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Get recent execution log entries"""
-        return self.execution_log[-limit:] if len(self.execution_log) > limit else self.execution_log
+        return list(self.execution_log)[-limit:]
     
     def get_execution_stats(self) -> Dict[str, Any]:
         """Get execution statistics"""
@@ -18,6 +18,8 @@ from datetime import datetime
 from typing import Optional, Callable, List
 import logging
 
+from src.utils.clock import Clock, get_clock
+
 try:
     import pytz
     HAS_PYTZ = True
@@ -38,14 +40,16 @@ class FixedClockSystem:
     - Integration with Session Manager
     """
     
-    def __init__(self, timezone_name: str = 'Asia/Kolkata'):
+    def __init__(self, timezone_name: str = 'Asia/Kolkata', clock: Optional[Clock] = None):
         """
         Initialize Fixed Clock System.
         
         Args:
             timezone_name: Timezone name (default: Asia/Kolkata for IST)
+            clock: Time source (default: process clock)
         """
         self.timezone_name = timezone_name
+        self.clock = clock or get_clock()
         
         if HAS_PYTZ:
             self.timezone = pytz.timezone(timezone_name)
@@ -67,9 +71,9 @@ class FixedClockSystem:
             datetime object in IST timezone
         """
         if self.timezone:
-            return datetime.now(self.timezone)
+            return self.clock.now(self.timezone)
         else:
-            return datetime.now()
+            return self.clock.now()
     
     def format_time_string(self) -> str:
         """
@@ -205,7 +209,7 @@ class FixedClockSystem:
                 
                 # Wait for next update or stop signal
                 try:
-                    await asyncio.wait_for(
+                    await self.clock.wait_for(
                         self._stop_event.wait(),
                         timeout=update_interval
                     )
@@ -216,7 +220,7 @@ class FixedClockSystem:
                     
             except Exception as e:
                 logger.error(f"Clock loop error: {e}")
-                await asyncio.sleep(5)  # Wait before retry
+                await self.clock.sleep(5)  # Wait before retry
         
         logger.info("Clock loop stopped")
     
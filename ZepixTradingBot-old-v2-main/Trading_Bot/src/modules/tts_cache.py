@@ -0,0 +1,383 @@
+"""
+TTS Cache & Worker Module
+Pre-synthesized voice alert audio with a dedicated TTS worker thread.
+
+Features:
+- One worker thread owns the pyttsx3 engine (no per-alert pyttsx3.init())
+- Rendered audio cached on disk, keyed by normalized text
+- LRU size cap on disk (file count and total bytes); files being read are pinned
+- Fixed phrases pre-rendered at startup
+- Async-friendly: callers await futures, the event loop never blocks on TTS
+
+Usage:
+    worker = TTSWorker(TTSCache("data/tts_cache"), player=TTSWorker.default_player())
+    worker.prerender(VoiceTextGenerator.fixed_phrases())
+    path = await worker.render_async("Stop loss hit on EURUSD.")
+    with worker.cache.hold("Stop loss hit on EURUSD.") as path:
+        ...  # Not evicted while held
+
+Author: Zepix Trading Bot Development Team
+Version: 1.0
+Created: 2026-01-14
+"""
+
+import asyncio
+import concurrent.futures
+import hashlib
+import logging
+import os
+import queue
+import re
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Optional
+
+
+def normalize_tts_text(text: str) -> str:
+    """Normalize text for cache lookup (case and whitespace insensitive)"""
+    return re.sub(r"\s+", " ", (text or "").strip()).lower()
+
+
+def default_engine_factory(rate: int = 150, volume: float = 1.0):
+    """Create and configure a pyttsx3 engine (called on the worker thread)"""
+    import pyttsx3
+    engine = pyttsx3.init()
+    engine.setProperty('rate', rate)
+    engine.setProperty('volume', volume)
+    return engine
+
+
+class TTSCache:
+    """
+    Disk cache of rendered TTS audio files with an LRU cap.
+
+    Files are named by the SHA1 of the normalized text, so a restart picks up
+    the previous session's renders. Files held via hold() are skipped by
+    eviction until released.
+    """
+
+    def __init__(self, cache_dir: str = "data/tts_cache", max_files: int = 200,
+                 max_bytes: int = 50 * 1024 * 1024, extension: str = ".wav"):
+        self.cache_dir = cache_dir
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.extension = extension
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # key -> size, oldest first
+        self._pinned: Dict[str, int] = {}  # key -> active hold() count
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_existing()
+
+    def _load_existing(self):
+        """Index files left by a previous session, oldest access first"""
+        files = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(self.extension):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if stat.st_size == 0:
+                continue
+            files.append((stat.st_mtime, name[:-len(self.extension)], stat.st_size))
+
+        for _, key, size in sorted(files):
+            self._entries[key] = size
+            self._total_bytes += size
+        self._evict()
+
+    @staticmethod
+    def key_for(text: str) -> str:
+        """Cache key for a piece of text"""
+        return hashlib.sha1(normalize_tts_text(text).encode("utf-8")).hexdigest()
+
+    def path_for(self, text: str) -> str:
+        """File path where the rendered audio for text lives"""
+        return os.path.join(self.cache_dir, self.key_for(text) + self.extension)
+
+    def get(self, text: str) -> Optional[str]:
+        """Return cached audio path (and mark as recently used), or None"""
+        key = self.key_for(text)
+        with self._lock:
+            if key in self._entries and os.path.exists(self.path_for(text)):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self.path_for(text)
+            self._entries.pop(key, None)
+            self.misses += 1
+        return None
+
+    @contextmanager
+    def hold(self, text: str):
+        """
+        Yield the cached path for text (or None) and keep it from being
+        evicted until the block exits, e.g. while the file is being uploaded.
+        """
+        key = self.key_for(text)
+        path = self.path_for(text)
+        with self._lock:
+            if key in self._entries and os.path.exists(path):
+                self._entries.move_to_end(key)
+                self._pinned[key] = self._pinned.get(key, 0) + 1
+                self.hits += 1
+            else:
+                self._entries.pop(key, None)
+                self.misses += 1
+                path = None
+        try:
+            yield path
+        finally:
+            if path:
+                with self._lock:
+                    self._pinned[key] -= 1
+                    if not self._pinned[key]:
+                        del self._pinned[key]
+                    self._evict()  # Catch up on anything skipped while pinned
+
+    def add(self, text: str) -> Optional[str]:
+        """Register a freshly rendered file. Returns its path or None if empty."""
+        path = self.path_for(text)
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return None
+        if size == 0:
+            return None
+
+        key = self.key_for(text)
+        with self._lock:
+            self._total_bytes -= self._entries.pop(key, 0)
+            self._entries[key] = size
+            self._total_bytes += size
+            self._evict(keep=key)
+        return path
+
+    def _evict(self, keep: Optional[str] = None):
+        """Delete least recently used, unpinned files (other than keep) until within both caps"""
+        for key in list(self._entries):
+            if len(self._entries) <= self.max_files and self._total_bytes <= self.max_bytes:
+                break
+            if key in self._pinned or key == keep:
+                continue
+            size = self._entries.pop(key)
+            self._total_bytes -= size
+            try:
+                os.remove(os.path.join(self.cache_dir, key + self.extension))
+            except OSError:
+                pass
+
+    def get_stats(self) -> dict:
+        """Cache statistics"""
+        return {
+            'files': len(self._entries),
+            'bytes': self._total_bytes,
+            'pinned': len(self._pinned),
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+
+class TTSWorker:
+    """
+    Dedicated thread that owns the TTS engine.
+
+    Jobs (render to cache file, speak aloud) are queued and executed in order
+    on the worker thread; callers receive concurrent.futures.Future objects.
+    """
+
+    RENDER = "render"
+    SPEAK = "speak"
+
+    def __init__(self, cache: TTSCache, rate: int = 150, volume: float = 1.0,
+                 engine_factory: Optional[Callable] = None,
+                 player: Optional[Callable[[str], bool]] = None):
+        """
+        Args:
+            cache: TTSCache for rendered audio
+            rate: Speech rate (words per minute)
+            volume: Volume level (0.0 to 1.0)
+            engine_factory: Callable returning a pyttsx3-compatible engine
+            player: Callable playing a cached audio file (see default_player());
+                    without one, speak() uses the engine directly
+        """
+        self.cache = cache
+        self.rate = rate
+        self.volume = volume
+        self.engine_factory = engine_factory or (lambda: default_engine_factory(rate, volume))
+        self.player = player
+        self.logger = logging.getLogger(__name__)
+        self._jobs: "queue.Queue" = queue.Queue()
+        self._pending = {}  # cache key -> Future (dedupes concurrent renders)
+        self._pending_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._engine = None
+        self.engine_available = True
+
+    @staticmethod
+    def default_player() -> Optional[Callable[[str], bool]]:
+        """winsound playback of cached WAV files (Windows only)"""
+        try:
+            import winsound
+        except ImportError:
+            return None
+
+        def play(path: str) -> bool:
+            winsound.PlaySound(path, winsound.SND_FILENAME)
+            return True
+        return play
+
+    def start(self):
+        """Start the worker thread (idempotent)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="tts-worker", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the worker after queued jobs finish"""
+        if self._thread and self._thread.is_alive():
+            self._jobs.put(None)
+            self._thread.join(timeout)
+
+    def render(self, text: str) -> concurrent.futures.Future:
+        """Queue rendering of text into the cache. Resolves to the file path (or None)."""
+        cached = self.cache.get(text)
+        if cached:
+            future = concurrent.futures.Future()
+            future.set_result(cached)
+            return future
+
+        key = self.cache.key_for(text)
+        with self._pending_lock:
+            if key in self._pending:
+                return self._pending[key]
+            future = concurrent.futures.Future()
+            self._pending[key] = future
+        self._submit(self.RENDER, text, future)
+        return future
+
+    def speak(self, text: str) -> concurrent.futures.Future:
+        """Queue playback of text on the speakers. Resolves to True on success."""
+        future = concurrent.futures.Future()
+        self._submit(self.SPEAK, text, future)
+        return future
+
+    async def render_async(self, text: str) -> Optional[str]:
+        """Await a render without blocking the event loop"""
+        return await asyncio.wrap_future(self.render(text))
+
+    async def speak_async(self, text: str) -> bool:
+        """Await speaker playback without blocking the event loop"""
+        return await asyncio.wrap_future(self.speak(text))
+
+    def prerender(self, phrases: Iterable[str]) -> int:
+        """Queue background renders for phrases not yet cached. Returns count queued."""
+        queued = 0
+        for phrase in phrases:
+            if phrase and not self.cache.get(phrase):
+                self.render(phrase)
+                queued += 1
+        return queued
+
+    def _submit(self, kind: str, text: str, future: concurrent.futures.Future):
+        self.start()
+        self._jobs.put((kind, text, future))
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            kind, text, future = job
+            try:
+                if kind == self.RENDER:
+                    result = self._do_render(text)
+                    with self._pending_lock:
+                        self._pending.pop(self.cache.key_for(text), None)
+                else:
+                    result = self._do_speak(text)
+                future.set_result(result)
+            except Exception as e:
+                self.logger.error(f"TTS {kind} failed: {e}")
+                with self._pending_lock:
+                    self._pending.pop(self.cache.key_for(text), None)
+                future.set_result(None if kind == self.RENDER else False)
+
+        if self._engine:
+            try:
+                self._engine.stop()
+            except Exception:
+                pass
+            self._engine = None
+
+    def _get_engine(self):
+        """Create the engine lazily on the worker thread (COM-safe)"""
+        if self._engine is None and self.engine_available:
+            try:
+                self._engine = self.engine_factory()
+            except Exception as e:
+                self.engine_available = False
+                self.logger.error(f"TTS engine unavailable: {e}")
+        return self._engine
+
+    def _reset_engine(self):
+        """Drop a failed engine so the next job recreates it"""
+        try:
+            if self._engine:
+                self._engine.stop()
+        except Exception:
+            pass
+        self._engine = None
+
+    def _do_render(self, text: str) -> Optional[str]:
+        cached = self.cache.get(text)
+        if cached:
+            return cached
+        engine = self._get_engine()
+        if engine is None:
+            return None
+        path = self.cache.path_for(text)
+        try:
+            engine.save_to_file(text, path)
+            engine.runAndWait()
+        except Exception:
+            self._reset_engine()
+            raise
+        return self.cache.add(text)
+
+    def _do_speak(self, text: str) -> bool:
+        if not text or not text.strip():
+            return False
+        # Render once into the cache, then replay the file on later calls
+        if self.player:
+            path = self._do_render(text)
+            if path:
+                return bool(self.player(path))
+
+        engine = self._get_engine()
+        if engine is None:
+            return False
+        try:
+            engine.say(text)
+            engine.runAndWait()
+        except Exception:
+            self._reset_engine()
+            raise
+        return True
+
+    def get_stats(self) -> dict:
+        """Worker and cache statistics"""
+        return {
+            **self.cache.get_stats(),
+            'queued_jobs': self._jobs.qsize(),
+            'engine_available': self.engine_available,
+            'running': bool(self._thread and self._thread.is_alive()),
+        }
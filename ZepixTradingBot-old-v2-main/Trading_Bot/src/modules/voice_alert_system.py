@@ -11,6 +11,7 @@ Features:
 - Retry mechanism with exponential backoff (max 3 retries)
 - Clean Telegram chat (NO voice files)
 - Works even when Telegram closed (Windows audio)
+- Cached, pre-rendered TTS on a dedicated worker thread (V3.2)
 
 Usage:
     alert_system = VoiceAlertSystem(bot, chat_id)
@@ -29,12 +30,13 @@ from typing import Dict, List, Optional
 from enum import Enum
 import logging
 import uuid
-import concurrent.futures
 from telegram import Bot
 from telegram.error import TelegramError
 
 # V2.0: Import Windows Audio Player
 from src.modules.windows_audio_player import WindowsAudioPlayer
+from src.modules.tts_cache import TTSCache, TTSWorker
+from src.telegram.voice_alert_integration import VoiceTextGenerator
 
 
 class AlertPriority(Enum):
@@ -62,7 +64,9 @@ class VoiceAlertSystem:
     V3.1 Update: Compatible with both telegram.Bot and custom TelegramBot classes
     """
     
-    def __init__(self, bot=None, chat_id: str = None, sms_gateway=None, telegram_bot=None):
+    def __init__(self, bot=None, chat_id: str = None, sms_gateway=None, telegram_bot=None,
+                 tts_cache_dir: str = "data/tts_cache", tts_cache_max_files: int = 200,
+                 prerender_phrases: Optional[List[str]] = None):
         """
         Initialize Voice Alert System V3.1 with Windows audio support.
         
@@ -71,6 +75,9 @@ class VoiceAlertSystem:
             chat_id: Target Telegram chat ID
             sms_gateway: Optional SMS gateway for critical alerts
             telegram_bot: Custom TelegramBot instance (from telegram_bot_fixed.py)
+            tts_cache_dir: Directory for pre-synthesized voice files
+            tts_cache_max_files: LRU cap on cached voice files
+            prerender_phrases: Extra phrases to synthesize at startup
         """
         # Support both bot types
         self.bot = bot  # python-telegram-bot Bot
@@ -90,6 +97,20 @@ class VoiceAlertSystem:
             self.logger.error(f"Windows audio player initialization failed: {e}")
             self.windows_player = None
         
+        # V3.2: Dedicated TTS worker thread + on-disk cache of rendered phrases
+        self.tts_worker = None
+        try:
+            rate = self.windows_player.rate if self.windows_player else 150
+            volume = self.windows_player.volume if self.windows_player else 1.0
+            self.tts_worker = TTSWorker(
+                TTSCache(tts_cache_dir, max_files=tts_cache_max_files),
+                rate=rate, volume=volume, player=TTSWorker.default_player()
+            )
+            self.tts_worker.prerender(VoiceTextGenerator.fixed_phrases() + list(prerender_phrases or []))
+        except Exception as e:
+            self.logger.error(f"TTS worker initialization failed: {e}")
+            self.tts_worker = None
+        
         self.logger.info("VoiceAlertSystem V2.0 initialized")
     
     async def send_voice_alert(self, message: str, priority: AlertPriority = AlertPriority.MEDIUM):
@@ -159,7 +180,7 @@ class VoiceAlertSystem:
         Play audio on Windows laptop speakers via TTS.
         
         V2.0: Uses pyttsx3 for direct speaker output.
-        Runs in thread to avoid blocking async event loop.
+        V3.2: Runs on the shared TTS worker thread; cached phrases replay instantly.
         
         Args:
             message: Alert message text
@@ -167,21 +188,13 @@ class VoiceAlertSystem:
         Returns:
             True if successful, False otherwise
         """
-        if not self.windows_player:
+        if not self.windows_player or not self.tts_worker:
             self.logger.warning("Windows audio player not available, skipping")
             return False
         
         try:
-            # Run TTS in a thread to avoid blocking async event loop
-            loop = asyncio.get_event_loop()
-            
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future = loop.run_in_executor(
-                    executor,
-                    self.windows_player.speak,
-                    message
-                )
-                success = await asyncio.wait_for(future, timeout=10.0)
+            # Queue on the TTS worker thread - never blocks the event loop
+            success = await asyncio.wait_for(self.tts_worker.speak_async(message), timeout=10.0)
             
             if success:
                 self.logger.info("Windows speaker audio played successfully")
@@ -202,7 +215,8 @@ class VoiceAlertSystem:
         Send voice message via Telegram for phone notification.
         
         V2.5: Uses pyttsx3 to generate voice file, then sends to Telegram.
-        Ensures phone receives notification sound + playable audio.
+        V3.2: Voice file comes from the TTS cache (rendered on the worker thread),
+        so repeated phrases send instantly and the file is kept for reuse.
         
         Args:
             message: Alert message text
@@ -211,42 +225,30 @@ class VoiceAlertSystem:
             True if successful, False otherwise
         """
         try:
-            import tempfile
-            import os
-            
-            # Generate voice file using pyttsx3
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as tmp_file:
-                voice_file_path = tmp_file.name
+            if not self.tts_worker:
+                self.logger.error("TTS generation failed: worker not available")
+                return False
             
-            # Generate TTS audio
-            engine = None
-            try:
-                import pyttsx3
-                engine = pyttsx3.init()
-                engine.setProperty('rate', 150)
-                engine.setProperty('volume', 1.0)
-                engine.save_to_file(message, voice_file_path)
-                engine.runAndWait()
-                
-                self.logger.info(f"Voice file generated: {voice_file_path}")
-            except Exception as e:
-                self.logger.error(f"TTS generation failed: {e}")
+            # Get voice file from cache (renders on the worker thread on a miss)
+            voice_file_path = await asyncio.wait_for(
+                self.tts_worker.render_async(message), timeout=15.0
+            )
+            if not voice_file_path:
+                self.logger.error("TTS generation failed")
                 return False
-            finally:
-                if engine:
-                    try:
-                        engine.stop()
-                    except:
-                        pass
             
-            # Send voice message to Telegram
+            # Send voice message to Telegram (held so a concurrent render cannot evict it)
             try:
-                with open(voice_file_path, 'rb') as audio_file:
-                    self.bot.send_voice(
-                        chat_id=self.chat_id,
-                        voice=audio_file,
-                        caption=f"🔊 Voice Alert: {message[:50]}{'...' if len(message) > 50 else ''}"
-                    )
+                with self.tts_worker.cache.hold(message) as voice_file_path:
+                    if not voice_file_path:
+                        self.logger.error("TTS file evicted before send")
+                        return False
+                    with open(voice_file_path, 'rb') as audio_file:
+                        self.bot.send_voice(
+                            chat_id=self.chat_id,
+                            voice=audio_file,
+                            caption=f"🔊 Voice Alert: {message[:50]}{'...' if len(message) > 50 else ''}"
+                        )
                 
                 self.logger.info("Voice message sent successfully to Telegram")
                 return True
@@ -254,15 +256,10 @@ class VoiceAlertSystem:
             except Exception as e:
                 self.logger.error(f"Telegram voice send failed: {e}")
                 return False
-            
-            finally:
-                # Cleanup temporary file
-                try:
-                    if os.path.exists(voice_file_path):
-                        os.remove(voice_file_path)
-                except:
-                    pass
         
+        except asyncio.TimeoutError:
+            self.logger.error("TTS generation timeout (>15s)")
+            return False
         except Exception as e:
             self.logger.error(f"Voice message error: {e}")
             return False
@@ -435,6 +432,7 @@ class VoiceAlertSystem:
         return {
             'total_queued': len(self.alert_queue),
             'is_processing': self.is_processing,
+            'tts': self.tts_worker.get_stats() if self.tts_worker else None,
             'pending': [a for a in self.alert_queue if a['status'] == 'PENDING'],
             'retrying': [a for a in self.alert_queue if a['retry_count'] > 0]
         }
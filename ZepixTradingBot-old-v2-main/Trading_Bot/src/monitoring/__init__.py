@@ -1,7 +1,8 @@
 """
 Monitoring Module - Plugin Health Monitoring System
 
-This module provides health monitoring for all V3 and V6 plugins.
+This module provides health monitoring for all V3 and V6 plugins and
+memory telemetry for long-lived in-process state.
 
 Version: 1.0.0
 Date: 2026-01-14
@@ -18,6 +19,13 @@ from .plugin_health_monitor import (
     AlertLevel,
     HealthStatus
 )
+from .memory_telemetry import (
+    MemoryTelemetry,
+    ComponentBudget,
+    MemoryBudgetAlert,
+    EvictionPolicy,
+    estimate_size
+)
 
 __all__ = [
     'PluginHealthMonitor',
@@ -28,5 +36,10 @@ __all__ = [
     'HealthSnapshot',
     'HealthAlert',
     'AlertLevel',
-    'HealthStatus'
+    'HealthStatus',
+    'MemoryTelemetry',
+    'ComponentBudget',
+    'MemoryBudgetAlert',
+    'EvictionPolicy',
+    'estimate_size'
 ]
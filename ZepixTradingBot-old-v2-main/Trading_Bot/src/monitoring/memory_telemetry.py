@@ -0,0 +1,545 @@
+"""
+Memory Telemetry - Size budgets and leak guards for long-lived in-process state
+
+The bot runs for weeks, and several structures (command logs, shadow
+histories, duplicate-alert buffers, recovery monitors) only ever grow unless
+something trims them. Each such container is registered here with an item
+cap and/or a byte budget and an eviction policy. A periodic check measures
+every component, evicts past its cap, alerts when a component stays over
+budget, and takes a tracemalloc top-N snapshot so growth can be traced back
+to the allocating source line.
+
+Features:
+- register(): container getter + max_items / budget_bytes + eviction policy
+- Sampled deep-size estimate per component (bounded cost on large containers)
+- Periodic tracemalloc top-N allocation sites with growth since last snapshot
+  (opt-in: tracing slows every allocation; on-demand snapshots always work)
+- Budget alerts with per-component cooldown (Telegram + logs)
+- get_report() / format_report() for the HTTP endpoint and Telegram command
+
+Version: 1.0.0
+Date: 2026-01-14
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class EvictionPolicy(Enum):
+    """What to do when a component exceeds its cap"""
+    OLDEST = "oldest"          # Drop oldest entries (list/deque front, dict insertion order)
+    CALLBACK = "callback"      # Call the registered evict(container, excess) function
+    ALERT_ONLY = "alert_only"  # Never touch the container, just alert
+
+
+@dataclass
+class ComponentBudget:
+    """Registration of one tracked container"""
+    name: str
+    getter: Callable[[], Any]
+    max_items: Optional[int] = None
+    budget_bytes: Optional[int] = None
+    policy: EvictionPolicy = EvictionPolicy.OLDEST
+    evict: Optional[Callable[[Any, int], int]] = None
+    items: int = 0
+    size_bytes: int = 0
+    peak_bytes: int = 0
+    evicted: int = 0
+    over_budget: bool = False
+    last_measured: Optional[datetime] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'items': self.items,
+            'size_kb': round(self.size_bytes / 1024, 1),
+            'peak_kb': round(self.peak_bytes / 1024, 1),
+            'max_items': self.max_items,
+            'budget_kb': round(self.budget_bytes / 1024, 1) if self.budget_bytes else None,
+            'policy': self.policy.value,
+            'evicted': self.evicted,
+            'over_budget': self.over_budget,
+            'last_measured': self.last_measured.isoformat() if self.last_measured else None
+        }
+
+
+@dataclass
+class MemoryBudgetAlert:
+    """Raised when a component is still over budget after eviction"""
+    component: str
+    items: int
+    size_bytes: int
+    max_items: Optional[int]
+    budget_bytes: Optional[int]
+    timestamp: datetime = field(default_factory=datetime.now)
+
+    @property
+    def message(self) -> str:
+        limits = []
+        if self.max_items is not None:
+            limits.append(f"{self.items}/{self.max_items} items")
+        if self.budget_bytes is not None:
+            limits.append(f"{self.size_bytes / 1024:.0f}/{self.budget_bytes / 1024:.0f} KB")
+        return f"Memory budget exceeded: {self.component} ({', '.join(limits)})"
+
+
+def estimate_size(obj: Any, sample: int = 32, depth: int = 3) -> int:
+    """
+    Approximate deep size of obj in bytes.
+
+    Containers are measured by sampling up to `sample` elements and
+    extrapolating, so a 100k-entry log costs the same to measure as a
+    100-entry one. Nested containers recurse up to `depth` levels.
+    """
+    return _estimate(obj, sample, depth, set())
+
+
+def _estimate(obj: Any, sample: int, depth: int, seen: set) -> int:
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj, 0)
+    if depth <= 0 or isinstance(obj, (str, bytes, bytearray, int, float, bool, type(None))):
+        return size
+
+    if isinstance(obj, dict):
+        count = len(obj)
+        if not count:
+            return size
+        total = 0
+        taken = 0
+        for key, value in obj.items():
+            total += _estimate(key, sample, depth - 1, seen) + _estimate(value, sample, depth - 1, seen)
+            taken += 1
+            if taken >= sample:
+                break
+        return size + int(total * count / taken)
+
+    if isinstance(obj, (list, tuple, set, frozenset, deque)) or \
+            (hasattr(obj, '__len__') and hasattr(obj, '__iter__') and not hasattr(obj, '__dict__')):
+        try:
+            count = len(obj)
+        except TypeError:
+            return size
+        if not count:
+            return size
+        total = 0
+        taken = 0
+        for item in obj:
+            total += _estimate(item, sample, depth - 1, seen)
+            taken += 1
+            if taken >= sample:
+                break
+        return size + int(total * count / max(taken, 1))
+
+    if hasattr(obj, '__dict__'):
+        return size + _estimate(vars(obj), sample, depth - 1, seen)
+    if hasattr(obj, '__slots__'):
+        return size + sum(
+            _estimate(getattr(obj, slot), sample, depth - 1, seen)
+            for slot in obj.__slots__ if hasattr(obj, slot)
+        )
+    return size
+
+
+def evict_oldest(container: Any, excess: int) -> int:
+    """Drop the `excess` oldest entries in place. Returns entries removed."""
+    if excess <= 0:
+        return 0
+    if isinstance(container, list):
+        excess = min(excess, len(container))
+        del container[:excess]
+        return excess
+    if isinstance(container, deque):
+        removed = 0
+        while container and removed < excess:
+            container.popleft()
+            removed += 1
+        return removed
+    if isinstance(container, OrderedDict):
+        removed = 0
+        while container and removed < excess:
+            container.popitem(last=False)
+            removed += 1
+        return removed
+    if isinstance(container, dict):
+        keys = list(container.keys())[:excess]
+        for key in keys:
+            del container[key]
+        return len(keys)
+    return 0
+
+
+def process_rss_bytes() -> int:
+    """Resident set size of this process (0 if it cannot be read)"""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE')
+    except Exception:
+        pass
+    try:
+        import resource
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss if sys.platform == 'darwin' else rss * 1024
+    except Exception:
+        return 0
+
+
+class MemoryTelemetry:
+    """
+    Registry of long-lived containers with size caps.
+
+    Components are registered with a getter rather than the container itself,
+    so owners that rebind their attribute (e.g. `self.x = [...]`) are still
+    measured correctly. check() is cheap enough to run every minute.
+    """
+
+    def __init__(self, config: Dict = None, telegram_bot=None):
+        """
+        Args:
+            config: `memory_telemetry` config section
+            telegram_bot: Optional bot with send_message() for budget alerts
+        """
+        self.config = config or {}
+        self.telegram_bot = telegram_bot
+        self.check_interval = self.config.get('check_interval_seconds', 60)
+        self.snapshot_interval = self.config.get('snapshot_interval_seconds', 900)
+        self.top_n = self.config.get('tracemalloc_top_n', 10)
+        self.tracemalloc_enabled = self.config.get('tracemalloc_enabled', False)
+        self.tracemalloc_frames = self.config.get('tracemalloc_frames', 1)
+        self._alert_cooldown_sec = self.config.get('alert_cooldown_seconds', 900)
+
+        self._components: Dict[str, ComponentBudget] = {}
+        self._last_alert_time: Dict[str, float] = {}
+        self._alert_callbacks: List[Callable[[MemoryBudgetAlert], Any]] = []
+        self.alerts: deque = deque(maxlen=100)
+
+        self._last_snapshot: Optional[tracemalloc.Snapshot] = None
+        self._last_snapshot_time: float = 0.0
+        self.top_allocations: List[Dict[str, Any]] = []
+
+        self._running = False
+        self._task: Optional[asyncio.Task] = None
+        self.checks = 0
+
+    # ------------------------------------------------------------------
+    # Registration
+    # ------------------------------------------------------------------
+
+    def register(self, name: str, getter: Callable[[], Any],
+                 max_items: Optional[int] = None, budget_bytes: Optional[int] = None,
+                 policy: EvictionPolicy = EvictionPolicy.OLDEST,
+                 evict: Optional[Callable[[Any, int], int]] = None) -> ComponentBudget:
+        """
+        Track a container.
+
+        Args:
+            name: Component name shown in reports (e.g. "alert_processor.recent_alerts")
+            getter: Returns the container (or None when the owner is not loaded)
+            max_items: Item cap enforced by the eviction policy
+            budget_bytes: Estimated size budget; also enforced by OLDEST eviction
+            policy: EvictionPolicy
+            evict: evict(container, excess) -> removed, required for CALLBACK
+        """
+        if policy == EvictionPolicy.CALLBACK and evict is None:
+            raise ValueError(f"Component {name} uses CALLBACK eviction without an evict function")
+        component = ComponentBudget(
+            name=name, getter=getter, max_items=max_items,
+            budget_bytes=budget_bytes, policy=policy, evict=evict
+        )
+        self._components[name] = component
+        return component
+
+    def register_attributes(self, owner: Any, prefix: str, attributes: Dict[str, Optional[int]],
+                            policy: EvictionPolicy = EvictionPolicy.ALERT_ONLY,
+                            evict: Optional[Callable[[Any, int], int]] = None) -> List[str]:
+        """
+        Track containers held as attributes of one owner.
+
+        Each attribute is registered as "<prefix>.<attribute>" (leading
+        underscores dropped) and read through getattr, so rebinding is seen.
+        A None cap falls back to the container's own maxlen/max_signals.
+        Does nothing for a None owner; returns the registered names.
+        """
+        if owner is None:
+            return []
+        names = []
+        for attribute, max_items in attributes.items():
+            getter = (lambda attr=attribute: getattr(owner, attr, None))
+            if max_items is None:
+                container = getter()
+                max_items = getattr(container, 'maxlen', None) or getattr(container, 'max_signals', None)
+            name = f"{prefix}.{attribute.lstrip('_')}"
+            self.register(name, getter, max_items=max_items, policy=policy, evict=evict)
+            names.append(name)
+        return names
+
+    def unregister(self, name: str):
+        self._components.pop(name, None)
+
+    def add_alert_callback(self, callback: Callable[[MemoryBudgetAlert], Any]):
+        """callback(alert) is called (sync or async) for every budget alert"""
+        self._alert_callbacks.append(callback)
+
+    @property
+    def components(self) -> Dict[str, ComponentBudget]:
+        return dict(self._components)
+
+    # ------------------------------------------------------------------
+    # Measurement and enforcement
+    # ------------------------------------------------------------------
+
+    def measure(self, name: str) -> Optional[ComponentBudget]:
+        """Refresh item count and size estimate for one component"""
+        component = self._components.get(name)
+        if component is None:
+            return None
+        container = self._resolve(component)
+        if container is None:
+            component.items = 0
+            component.size_bytes = 0
+        else:
+            try:
+                component.items = len(container)
+            except TypeError:
+                component.items = 0
+            component.size_bytes = estimate_size(container)
+        component.peak_bytes = max(component.peak_bytes, component.size_bytes)
+        component.last_measured = datetime.now()
+        return component
+
+    def enforce(self, name: str) -> int:
+        """Apply the component's eviction policy. Returns entries evicted."""
+        component = self._components.get(name)
+        if component is None or component.policy == EvictionPolicy.ALERT_ONLY:
+            return 0
+        container = self._resolve(component)
+        if container is None:
+            return 0
+
+        excess = self._excess(component)
+        if excess <= 0:
+            return 0
+
+        try:
+            if component.policy == EvictionPolicy.CALLBACK:
+                removed = component.evict(container, excess) or 0
+            else:
+                removed = evict_oldest(container, excess)
+        except Exception as e:
+            logger.error(f"[MEMORY] Eviction failed for {name}: {e}")
+            return 0
+
+        if removed:
+            component.evicted += removed
+            logger.info(f"[MEMORY] Evicted {removed} entries from {name}")
+            self.measure(name)
+        return removed
+
+    def check(self) -> List[MemoryBudgetAlert]:
+        """
+        Measure, evict and collect alerts for every component.
+        Synchronous so it can also be called from the Telegram thread.
+        """
+        alerts = []
+        for name in list(self._components):
+            component = self.measure(name)
+            if self._excess(component) > 0:
+                self.enforce(name)
+            component.over_budget = self._excess(component) > 0
+            if component.over_budget and self._should_alert(name):
+                alert = MemoryBudgetAlert(
+                    component=name, items=component.items, size_bytes=component.size_bytes,
+                    max_items=component.max_items, budget_bytes=component.budget_bytes
+                )
+                self.alerts.append(alert)
+                alerts.append(alert)
+                logger.warning(f"[MEMORY] {alert.message}")
+        self.checks += 1
+        return alerts
+
+    def _resolve(self, component: ComponentBudget) -> Any:
+        try:
+            return component.getter()
+        except Exception as e:
+            logger.debug(f"[MEMORY] Getter for {component.name} failed: {e}")
+            return None
+
+    @staticmethod
+    def _excess(component: ComponentBudget) -> int:
+        """Entries over the item cap, or over the byte budget (estimated by average entry size)"""
+        excess = 0
+        if component.max_items is not None:
+            excess = max(excess, component.items - component.max_items)
+        if component.budget_bytes is not None and component.size_bytes > component.budget_bytes \
+                and component.items:
+            per_item = component.size_bytes / component.items
+            excess = max(excess, int((component.size_bytes - component.budget_bytes) / per_item) + 1)
+        return excess
+
+    def _should_alert(self, name: str) -> bool:
+        now = time.monotonic()
+        last = self._last_alert_time.get(name)
+        if last is not None and now - last < self._alert_cooldown_sec:
+            return False
+        self._last_alert_time[name] = now
+        return True
+
+    # ------------------------------------------------------------------
+    # tracemalloc
+    # ------------------------------------------------------------------
+
+    def take_snapshot(self, top_n: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Top-N allocation sites by size, with growth since the previous snapshot.
+        Starts tracemalloc on first use if it is not already tracing.
+        """
+        top_n = top_n or self.top_n
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.tracemalloc_frames)
+            logger.info(f"[MEMORY] tracemalloc started ({self.tracemalloc_frames} frame(s))")
+
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        if self._last_snapshot is not None:
+            stats = snapshot.compare_to(self._last_snapshot, 'lineno')
+        else:
+            stats = snapshot.statistics('lineno')
+
+        top = []
+        for stat in sorted(stats, key=lambda s: s.size, reverse=True)[:top_n]:
+            frame = stat.traceback[0]
+            top.append({
+                'location': f"{frame.filename}:{frame.lineno}",
+                'size_kb': round(stat.size / 1024, 1),
+                'count': stat.count,
+                'growth_kb': round(getattr(stat, 'size_diff', 0) / 1024, 1),
+            })
+
+        self._last_snapshot = snapshot
+        self._last_snapshot_time = time.monotonic()
+        self.top_allocations = top
+        return top
+
+    # ------------------------------------------------------------------
+    # Background loop
+    # ------------------------------------------------------------------
+
+    async def start(self):
+        """Start periodic checks (and tracemalloc snapshots if enabled)"""
+        if self._running:
+            return
+        self._running = True
+        self._task = asyncio.create_task(self._loop())
+        logger.info(f"[MEMORY] Telemetry started ({len(self._components)} components, "
+                    f"every {self.check_interval}s)")
+
+    async def stop(self):
+        self._running = False
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _loop(self):
+        while self._running:
+            try:
+                await self.run_once()
+                await asyncio.sleep(self.check_interval)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"[MEMORY] Telemetry loop error: {e}")
+                await asyncio.sleep(self.check_interval)
+
+    async def run_once(self) -> List[MemoryBudgetAlert]:
+        """One check pass plus a tracemalloc snapshot when it is due"""
+        alerts = self.check()
+        if self.tracemalloc_enabled and \
+                time.monotonic() - self._last_snapshot_time >= self.snapshot_interval:
+            await asyncio.get_running_loop().run_in_executor(None, self.take_snapshot)
+        for alert in alerts:
+            await self._dispatch_alert(alert)
+        return alerts
+
+    async def _dispatch_alert(self, alert: MemoryBudgetAlert):
+        for callback in self._alert_callbacks:
+            try:
+                result = callback(alert)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                logger.error(f"[MEMORY] Alert callback failed: {e}")
+
+        if self.telegram_bot and hasattr(self.telegram_bot, 'send_message'):
+            try:
+                result = self.telegram_bot.send_message(f"⚠️ <b>Memory Alert</b>\n{alert.message}")
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                logger.error(f"[MEMORY] Failed to send Telegram alert: {e}")
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def get_report(self, measure: bool = True) -> Dict[str, Any]:
+        """Resident size by component plus the latest allocation snapshot"""
+        if measure:
+            for name in list(self._components):
+                self.measure(name)
+        components = {
+            name: component.to_dict()
+            for name, component in sorted(
+                self._components.items(), key=lambda kv: kv[1].size_bytes, reverse=True
+            )
+        }
+        return {
+            'process_rss_mb': round(process_rss_bytes() / (1024 * 1024), 1),
+            'tracked_kb': round(sum(c.size_bytes for c in self._components.values()) / 1024, 1),
+            'components': components,
+            'top_allocations': list(self.top_allocations),
+            'tracemalloc_tracing': tracemalloc.is_tracing(),
+            'recent_alerts': [
+                {'component': a.component, 'message': a.message, 'timestamp': a.timestamp.isoformat()}
+                for a in list(self.alerts)[-10:]
+            ],
+            'checks': self.checks,
+        }
+
+    def format_report(self, top_n: int = 5) -> str:
+        """HTML summary for Telegram"""
+        report = self.get_report()
+        lines = [
+            "🧠 <b>Memory Diagnostics</b>",
+            f"Process RSS: {report['process_rss_mb']} MB",
+            f"Tracked state: {report['tracked_kb']} KB",
+            "",
+            "<b>By component</b>"
+        ]
+        for name, stats in report['components'].items():
+            flag = "⚠️ " if stats['over_budget'] else ""
+            cap = f"/{stats['max_items']}" if stats['max_items'] is not None else ""
+            lines.append(f"{flag}{name}: {stats['items']}{cap} items, {stats['size_kb']} KB")
+        if report['top_allocations']:
+            lines.append("")
+            lines.append("<b>Top allocations</b>")
+            for entry in report['top_allocations'][:top_n]:
+                lines.append(f"{entry['location']}: {entry['size_kb']} KB ({entry['growth_kb']:+} KB)")
+        return "\n".join(lines)
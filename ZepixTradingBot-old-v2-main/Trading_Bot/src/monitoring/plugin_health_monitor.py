@@ -17,7 +17,6 @@ Date: 2026-01-14
 
 import asyncio
 import logging
-import sqlite3
 import threading
 import time
 from collections import deque
@@ -26,6 +25,8 @@ from datetime import datetime, timedelta
 from enum import Enum
 from typing import Dict, List, Optional, Any, Callable
 
+from src.core.database_access import get_db_pool
+
 logger = logging.getLogger(__name__)
 
 
@@ -119,6 +120,13 @@ class PluginResourceMetrics:
     db_connections_max: int = 5
     db_query_time_avg_ms: float = 0.0
     open_file_handles: int = 0
+    # From PluginProfiler, over the interval since the previous snapshot
+    wall_time_ms: float = 0.0
+    cpu_time_ms: float = 0.0
+    loop_time_pct: float = 0.0
+    service_time_ms: float = 0.0
+    max_step_ms: float = 0.0
+    alloc_kb: float = 0.0
 
 
 @dataclass
@@ -225,6 +233,7 @@ class PluginHealthMonitor:
         self.plugin_registry = plugin_registry
         self.telegram_manager = telegram_manager
         self.db_path = db_path
+        self._db = get_db_pool(db_path)
         self.config = config or {}
         
         # Health thresholds
@@ -256,6 +265,9 @@ class PluginHealthMonitor:
         self._restart_attempts: Dict[str, int] = {}  # plugin_id -> restart count
         self._max_restart_attempts = self.config.get('max_restart_attempts', 3)
         
+        # Previous profiler sample per plugin, for per-interval rates
+        self._usage_samples: Dict[str, tuple] = {}  # plugin_id -> (monotonic, usage dict)
+        
         # Callbacks
         self._alert_callbacks: List[Callable] = []
         self._restart_callbacks: List[Callable] = []
@@ -268,58 +280,55 @@ class PluginHealthMonitor:
     def _init_database(self):
         """Initialize health database schema"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Plugin health snapshots table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS plugin_health_snapshots (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    plugin_id TEXT NOT NULL,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    is_running BOOLEAN,
-                    is_responsive BOOLEAN,
-                    health_status TEXT,
-                    uptime_seconds INTEGER,
-                    avg_execution_time_ms REAL,
-                    p95_execution_time_ms REAL,
-                    signals_processed_1h INTEGER,
-                    win_rate_pct REAL,
-                    memory_usage_mb REAL,
-                    cpu_usage_pct REAL,
-                    db_connections_active INTEGER,
-                    total_errors INTEGER,
-                    error_rate_pct REAL
-                )
-            """)
-            
-            # Create index for efficient queries
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_health_plugin_time 
-                ON plugin_health_snapshots (plugin_id, timestamp)
-            """)
-            
-            # Health alerts table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS health_alerts (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    plugin_id TEXT NOT NULL,
-                    alert_level TEXT NOT NULL,
-                    message TEXT NOT NULL,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    resolved BOOLEAN DEFAULT FALSE,
-                    resolved_at DATETIME
-                )
-            """)
-            
-            # Create index for alerts
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_alerts_plugin_time 
-                ON health_alerts (plugin_id, timestamp)
-            """)
+            with self._db.transaction() as conn:
+                cursor = conn.cursor()
+            
+                # Plugin health snapshots table
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS plugin_health_snapshots (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        plugin_id TEXT NOT NULL,
+                        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                        is_running BOOLEAN,
+                        is_responsive BOOLEAN,
+                        health_status TEXT,
+                        uptime_seconds INTEGER,
+                        avg_execution_time_ms REAL,
+                        p95_execution_time_ms REAL,
+                        signals_processed_1h INTEGER,
+                        win_rate_pct REAL,
+                        memory_usage_mb REAL,
+                        cpu_usage_pct REAL,
+                        db_connections_active INTEGER,
+                        total_errors INTEGER,
+                        error_rate_pct REAL
+                    )
+                """)
+            
+                # Create index for efficient queries
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_health_plugin_time 
+                    ON plugin_health_snapshots (plugin_id, timestamp)
+                """)
+            
+                # Health alerts table
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS health_alerts (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        plugin_id TEXT NOT NULL,
+                        alert_level TEXT NOT NULL,
+                        message TEXT NOT NULL,
+                        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                        resolved BOOLEAN DEFAULT FALSE,
+                        resolved_at DATETIME
+                    )
+                """)
             
-            conn.commit()
-            conn.close()
+                # Create index for alerts
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_alerts_plugin_time 
+                    ON health_alerts (plugin_id, timestamp)
+                """)
             
             logger.info("[PluginHealthMonitor] Database initialized")
             
@@ -486,11 +495,51 @@ class PluginHealthMonitor:
                     metrics.orders_placed_1h = stats.get('orders_placed', 0)
                     metrics.win_rate_pct = stats.get('win_rate', 0)
             
+            # Fall back to measured entry-point call times
+            usage = self._plugin_usage(plugin_id)
+            if usage and usage["calls"] and not metrics.avg_execution_time_ms:
+                metrics.avg_execution_time_ms = usage["avg_call_ms"]
+                metrics.p95_execution_time_ms = usage["p95_call_ms"]
+                metrics.p99_execution_time_ms = usage["p99_call_ms"]
+            
         except Exception as e:
             logger.warning(f"[PluginHealthMonitor] Plugin {plugin_id} performance check failed: {e}")
         
         return metrics
     
+    def _plugin_usage(self, plugin_id: str) -> Optional[Dict[str, Any]]:
+        """Cumulative usage from the registry's PluginProfiler, if any"""
+        profiler = getattr(self.plugin_registry, 'profiler', None)
+        if profiler is None or not hasattr(profiler, 'get_usage'):
+            return None
+        return profiler.get_usage(plugin_id)
+    
+    def _apply_usage(self, plugin_id: str, metrics: PluginResourceMetrics):
+        """Fill resource metrics from profiler deltas since the previous snapshot"""
+        usage = self._plugin_usage(plugin_id)
+        if usage is None:
+            return
+        now = time.monotonic()
+        previous = self._usage_samples.get(plugin_id)
+        self._usage_samples[plugin_id] = (now, usage)
+        if previous is None:
+            since, before = now - 1.0, {}
+        else:
+            since, before = previous
+        elapsed_ms = max((now - since) * 1000.0, 1e-6)
+        
+        def delta(key):
+            return usage[key] - before.get(key, 0.0)
+        
+        metrics.wall_time_ms = delta("wall_ms")
+        metrics.cpu_time_ms = delta("cpu_ms")
+        metrics.service_time_ms = delta("service_ms")
+        metrics.cpu_usage_pct = 100.0 * metrics.cpu_time_ms / elapsed_ms
+        metrics.loop_time_pct = 100.0 * delta("loop_ms") / elapsed_ms
+        metrics.max_step_ms = usage["max_step_ms"]
+        metrics.alloc_kb = usage["alloc_kb"]
+        metrics.memory_usage_mb = max(0.0, usage["alloc_kb"] / 1024.0)
+    
     async def _collect_resource_metrics(
         self,
         plugin_id: str,
@@ -500,7 +549,10 @@ class PluginHealthMonitor:
         metrics = PluginResourceMetrics(plugin_id=plugin_id)
         
         try:
-            # Try to get resource stats from plugin
+            # Measured by the registry's entry-point wrappers
+            self._apply_usage(plugin_id, metrics)
+            
+            # Plugin-reported stats (e.g. worker processes) take precedence
             if hasattr(plugin, 'get_resource_stats'):
                 stats = plugin.get_resource_stats()
                 if asyncio.iscoroutine(stats):
@@ -575,36 +627,33 @@ class PluginHealthMonitor:
         
         # Store in database (async-safe)
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                INSERT INTO plugin_health_snapshots (
-                    plugin_id, timestamp, is_running, is_responsive, health_status,
-                    uptime_seconds, avg_execution_time_ms, p95_execution_time_ms,
-                    signals_processed_1h, win_rate_pct, memory_usage_mb, cpu_usage_pct,
-                    db_connections_active, total_errors, error_rate_pct
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                plugin_id,
-                snapshot.timestamp.isoformat(),
-                snapshot.availability.is_running,
-                snapshot.availability.is_responsive,
-                snapshot.health_status.value,
-                snapshot.availability.uptime_seconds,
-                snapshot.performance.avg_execution_time_ms,
-                snapshot.performance.p95_execution_time_ms,
-                snapshot.performance.signals_processed_1h,
-                snapshot.performance.win_rate_pct,
-                snapshot.resources.memory_usage_mb,
-                snapshot.resources.cpu_usage_pct,
-                snapshot.resources.db_connections_active,
-                snapshot.errors.total_errors,
-                snapshot.errors.error_rate_pct
-            ))
-            
-            conn.commit()
-            conn.close()
+            with self._db.transaction() as conn:
+                cursor = conn.cursor()
+            
+                cursor.execute("""
+                    INSERT INTO plugin_health_snapshots (
+                        plugin_id, timestamp, is_running, is_responsive, health_status,
+                        uptime_seconds, avg_execution_time_ms, p95_execution_time_ms,
+                        signals_processed_1h, win_rate_pct, memory_usage_mb, cpu_usage_pct,
+                        db_connections_active, total_errors, error_rate_pct
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (
+                    plugin_id,
+                    snapshot.timestamp.isoformat(),
+                    snapshot.availability.is_running,
+                    snapshot.availability.is_responsive,
+                    snapshot.health_status.value,
+                    snapshot.availability.uptime_seconds,
+                    snapshot.performance.avg_execution_time_ms,
+                    snapshot.performance.p95_execution_time_ms,
+                    snapshot.performance.signals_processed_1h,
+                    snapshot.performance.win_rate_pct,
+                    snapshot.resources.memory_usage_mb,
+                    snapshot.resources.cpu_usage_pct,
+                    snapshot.resources.db_connections_active,
+                    snapshot.errors.total_errors,
+                    snapshot.errors.error_rate_pct
+                ))
             
         except Exception as e:
             logger.error(f"[PluginHealthMonitor] Failed to store snapshot: {e}")
@@ -692,6 +741,17 @@ class PluginHealthMonitor:
             if not self.plugin_registry:
                 return False
             
+            # Worker-hosted plugins: replace the process, keep the registry entry
+            if getattr(self.plugin_registry, 'is_worker_hosted', None) and \
+               self.plugin_registry.is_worker_hosted(plugin_id):
+                success = await self.plugin_registry.restart_worker(plugin_id)
+                for callback in self._restart_callbacks:
+                    try:
+                        callback(plugin_id, success)
+                    except Exception as e:
+                        logger.error(f"[PluginHealthMonitor] Restart callback error: {e}")
+                return success
+            
             # Unload plugin
             if plugin_id in self.plugin_registry.plugins:
                 plugin = self.plugin_registry.plugins[plugin_id]
@@ -758,16 +818,13 @@ class PluginHealthMonitor:
         
         # Store in database
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            with self._db.transaction() as conn:
+                cursor = conn.cursor()
             
-            cursor.execute("""
-                INSERT INTO health_alerts (plugin_id, alert_level, message, timestamp)
-                VALUES (?, ?, ?, ?)
-            """, (plugin_id, level.value, message, datetime.now().isoformat()))
-            
-            conn.commit()
-            conn.close()
+                cursor.execute("""
+                    INSERT INTO health_alerts (plugin_id, alert_level, message, timestamp)
+                    VALUES (?, ?, ?, ?)
+                """, (plugin_id, level.value, message, datetime.now().isoformat()))
             
         except Exception as e:
             logger.error(f"[PluginHealthMonitor] Failed to store alert: {e}")
@@ -853,17 +910,14 @@ class PluginHealthMonitor:
         
         # Update in database
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                UPDATE health_alerts 
-                SET resolved = TRUE, resolved_at = ?
-                WHERE id = ?
-            """, (datetime.now().isoformat(), alert_id))
+            with self._db.transaction() as conn:
+                cursor = conn.cursor()
             
-            conn.commit()
-            conn.close()
+                cursor.execute("""
+                    UPDATE health_alerts 
+                    SET resolved = TRUE, resolved_at = ?
+                    WHERE id = ?
+                """, (datetime.now().isoformat(), alert_id))
             
         except Exception as e:
             logger.error(f"[PluginHealthMonitor] Failed to resolve alert: {e}")
@@ -918,6 +972,10 @@ class PluginHealthMonitor:
             text += f"├ Exec Time: {snapshot.performance.p95_execution_time_ms:.0f}ms (P95)\n"
             text += f"├ Memory: {snapshot.resources.memory_usage_mb:.1f}MB\n"
             text += f"├ CPU: {snapshot.resources.cpu_usage_pct:.1f}%\n"
+            if snapshot.resources.wall_time_ms or snapshot.resources.max_step_ms:
+                text += (f"├ Event Loop: {snapshot.resources.loop_time_pct:.1f}% "
+                         f"(max step {snapshot.resources.max_step_ms:.0f}ms)\n")
+                text += f"├ ServiceAPI: {snapshot.resources.service_time_ms:.0f}ms\n"
             text += f"└ Error Rate: {snapshot.errors.error_rate_pct:.2f}%\n\n"
         
         # Recent alerts
@@ -5,12 +5,17 @@ from src.models import Alert
 from src.v3_alert_models import ZepixV3Alert
 
 class AlertProcessor:
+    # Hard cap on stored entry alerts, even inside the duplicate window
+    MAX_RECENT_ALERTS = 500
+    
     def __init__(self, config: Config, trend_manager=None, telegram_bot=None):
         self.config = config
         self.trend_manager = trend_manager  # For checking if trend actually changed
         self.telegram_bot = telegram_bot  # For sending notifications
         self.recent_alerts: List[Alert] = []
         self.alert_window = timedelta(minutes=5)
+        # Local store time per alert (by id) so cleanup works without raw timestamps
+        self._stored_at: Dict[int, datetime] = {}
     
     def process_mtf_trends(self, trend_string: str, symbol: str) -> None:
         """
@@ -216,22 +221,26 @@ class AlertProcessor:
             cleaned_alerts = []
             
             for alert in self.recent_alerts:
-                timestamp_str = None
+                # Age by local store time; raw timestamps may be in the sender's timezone
+                alert_time = self._stored_at.get(id(alert))
                 
-                if alert.raw_data and isinstance(alert.raw_data, dict):
+                if alert_time is None and alert.raw_data and isinstance(alert.raw_data, dict):
                     timestamp_str = alert.raw_data.get('timestamp')
+                    if timestamp_str:
+                        try:
+                            alert_time = datetime.fromisoformat(timestamp_str)
+                        except (ValueError, TypeError):
+                            pass
                 
-                if timestamp_str:
-                    try:
-                        alert_time = datetime.fromisoformat(timestamp_str)
-                        if current_time - alert_time < self.alert_window:
-                            cleaned_alerts.append(alert)
-                    except (ValueError, TypeError):
-                        cleaned_alerts.append(alert)
-                else:
+                if alert_time is None or current_time - alert_time < self.alert_window:
                     cleaned_alerts.append(alert)
             
+            if len(cleaned_alerts) > self.MAX_RECENT_ALERTS:
+                cleaned_alerts = cleaned_alerts[-self.MAX_RECENT_ALERTS:]
+            
             self.recent_alerts = cleaned_alerts
+            kept = {id(alert) for alert in cleaned_alerts}
+            self._stored_at = {k: v for k, v in self._stored_at.items() if k in kept}
             
         except Exception as e:
             print(f"WARNING: Error cleaning alerts: {str(e)}")
@@ -260,6 +269,8 @@ class AlertProcessor:
             # Only store if it's actually an entry alert
             if alert.type == 'entry':
                 self.recent_alerts.append(alert)
+                self._stored_at[id(alert)] = datetime.now()
+                self.clean_old_alerts()
                 print(f"INFO: Entry alert stored after successful execution for duplicate detection")
         except Exception as e:
             print(f"WARNING: Failed to store entry alert: {str(e)}")
\ No newline at end of file
@@ -1,9 +1,11 @@
 import asyncio
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from datetime import timedelta
+from typing import Dict, List, Optional, Any, Set
 from src.models import Trade
 from src.config import Config
+from src.core.config_snapshot import ConfigSnapshot
 from src.utils.optimized_logger import logger as opt_logger
+from src.utils.clock import Clock, get_clock
 import logging
 
 class PriceMonitorService:
@@ -15,8 +17,10 @@ class PriceMonitorService:
     """
     
     def __init__(self, config: Config, mt5_client, reentry_manager, 
-                 trend_manager, pip_calculator, trading_engine):
+                 trend_manager, pip_calculator, trading_engine, clock: Optional[Clock] = None):
         self.config = config
+        # Time source for expirations and the monitor interval (virtual in simulations)
+        self.clock = clock or get_clock()
         self.mt5_client = mt5_client
         self.reentry_manager = reentry_manager
         self.trend_manager = trend_manager
@@ -33,6 +37,10 @@ class PriceMonitorService:
         # Track symbols being monitored
         self.monitored_symbols = set()
         
+        # When True, per-symbol checks run on the engine's symbol shards
+        # (check_symbol_opportunities) and the global loop skips them
+        self.symbol_sharding = False
+        
         # SL hunt re-entry tracking
         self.sl_hunt_pending = {}  # symbol -> {'price': sl+offset, 'direction': 'buy', 'chain_id': ...}
         
@@ -45,15 +53,74 @@ class PriceMonitorService:
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
     
+    @property
+    def settings(self):
+        """
+        Current compiled config snapshot, swapped atomically on reload.
+        
+        A section read once stays consistent even if a reload lands during
+        the pass. Plain dict configs (tests, scripts) are read directly.
+        """
+        snapshot = getattr(self.config, "snapshot", None)
+        return snapshot if isinstance(snapshot, ConfigSnapshot) else self.config
+    
+    def export_pending(self) -> Dict[str, Any]:
+        """Pending re-entry registrations, for the engine warm-restart snapshot"""
+        return {
+            "sl_hunt": {symbol: list(items) for symbol, items in self.sl_hunt_pending.items()},
+            "tp_continuation": {symbol: list(items) for symbol, items in self.tp_continuation_pending.items()},
+            "exit_continuation": dict(self.exit_continuation_pending)
+        }
+    
+    def select_pending(self, pending: Dict[str, Any]) -> Dict[str, Any]:
+        """Unexpired snapshot entries not registered yet, in export_pending layout (no side effects)"""
+        now = self.clock.now()
+        
+        def live(item):
+            expiration = item.get("expiration_time")
+            return expiration is None or expiration > now
+        
+        selected = {"sl_hunt": {}, "tp_continuation": {}, "exit_continuation": {}}
+        for target, key in ((self.sl_hunt_pending, "sl_hunt"),
+                            (self.tp_continuation_pending, "tp_continuation")):
+            for symbol, items in pending.get(key, {}).items():
+                current = target.get(symbol, [])
+                added = [item for item in items if live(item) and item not in current]
+                if added:
+                    selected[key][symbol] = added
+        for symbol, item in pending.get("exit_continuation", {}).items():
+            if symbol not in self.exit_continuation_pending and live(item):
+                selected["exit_continuation"][symbol] = item
+        return selected
+    
+    def restore_pending(self, pending: Dict[str, Any]) -> int:
+        """Re-register entries picked by select_pending"""
+        restored = 0
+        for target, key in ((self.sl_hunt_pending, "sl_hunt"),
+                            (self.tp_continuation_pending, "tp_continuation")):
+            for symbol, added in pending[key].items():
+                target[symbol] = target.get(symbol, []) + added
+                self.monitored_symbols.add(symbol)
+                restored += len(added)
+        for symbol, item in pending["exit_continuation"].items():
+            self.exit_continuation_pending[symbol] = item
+            self.monitored_symbols.add(symbol)
+            restored += 1
+        return restored
+    
     def get_service_status(self) -> Dict[str, Any]:
         """
         DIAGNOSTIC: Get comprehensive service status for debugging
         Returns detailed information about service state, pending re-entries, and configuration
         """
+        re_entry = self.settings["re_entry_config"]
         return {
             "service_running": self.is_running,
             "monitor_task_active": self.monitor_task is not None and not self.monitor_task.done() if self.monitor_task else False,
             "monitored_symbols": list(self.monitored_symbols),
+            "symbol_sharding": self.symbol_sharding,
+            "shards": self.trading_engine.shard_manager.get_stats()
+                if getattr(self.trading_engine, 'shard_manager', None) else {},
             "pending_counts": {
                 "sl_hunt": len(self.sl_hunt_pending),
                 "tp_continuation": len(self.tp_continuation_pending),
@@ -65,12 +132,12 @@ class PriceMonitorService:
                 "exit_continuation": dict(self.exit_continuation_pending)
             },
             "configuration": {
-                "sl_hunt_enabled": self.config["re_entry_config"].get("sl_hunt_reentry_enabled", False),
-                "tp_reentry_enabled": self.config["re_entry_config"].get("tp_reentry_enabled", False),
-                "exit_continuation_enabled": self.config["re_entry_config"].get("exit_continuation_enabled", False),
-                "monitor_interval": self.config["re_entry_config"].get("price_monitor_interval_seconds", 30),
-                "sl_hunt_offset_pips": self.config["re_entry_config"].get("sl_hunt_offset_pips", 1.0),
-                "tp_continuation_gap_pips": self.config["re_entry_config"].get("tp_continuation_price_gap_pips", 2.0)
+                "sl_hunt_enabled": re_entry.get("sl_hunt_reentry_enabled", False),
+                "tp_reentry_enabled": re_entry.get("tp_reentry_enabled", False),
+                "exit_continuation_enabled": re_entry.get("exit_continuation_enabled", False),
+                "monitor_interval": re_entry.get("price_monitor_interval_seconds", 30),
+                "sl_hunt_offset_pips": re_entry.get("sl_hunt_offset_pips", 1.0),
+                "tp_continuation_gap_pips": re_entry.get("tp_continuation_price_gap_pips", 2.0)
             }
         }
     
@@ -129,19 +196,20 @@ class PriceMonitorService:
     async def _monitor_loop(self):
         # Background loop - runs silently in INFO mode, detailed logs in DEBUG mode
         cycle_count = 0
-        interval = self.config["re_entry_config"]["price_monitor_interval_seconds"]
+        re_entry = self.settings["re_entry_config"]
+        interval = re_entry["price_monitor_interval_seconds"]
         
         self.logger.debug(
             f"🔄 Monitor loop started - Interval: {interval}s, "
-            f"Config: SL Hunt={self.config['re_entry_config'].get('sl_hunt_reentry_enabled', False)}, "
-            f"TP={self.config['re_entry_config'].get('tp_reentry_enabled', False)}, "
-            f"Exit={self.config['re_entry_config'].get('exit_continuation_enabled', False)}"
+            f"Config: SL Hunt={re_entry.get('sl_hunt_reentry_enabled', False)}, "
+            f"TP={re_entry.get('tp_reentry_enabled', False)}, "
+            f"Exit={re_entry.get('exit_continuation_enabled', False)}"
         )
         
         while self.is_running:
             try:
                 cycle_count += 1
-                cycle_start_time = datetime.now()
+                cycle_start_time = self.clock.now()
                 
                 # Background heartbeat - saved to file in DEBUG mode
                 if cycle_count % 50 == 0:
@@ -155,13 +223,13 @@ class PriceMonitorService:
                 
                 await self._check_all_opportunities()
                 
-                cycle_duration = (datetime.now() - cycle_start_time).total_seconds()
+                cycle_duration = (self.clock.now() - cycle_start_time).total_seconds()
                 if cycle_duration > interval:
                     self.logger.warning(
                         f"⚠️ Monitor cycle took {cycle_duration:.2f}s (longer than interval {interval}s)"
                     )
                 
-                await asyncio.sleep(interval)
+                await self.clock.sleep(interval)
                 self.monitor_error_count = 0  # Reset on success
                 
             except asyncio.CancelledError:
@@ -187,7 +255,7 @@ class PriceMonitorService:
                 
                 import traceback
                 traceback.print_exc()
-                await asyncio.sleep(interval)
+                await self.clock.sleep(interval)
         
         self.logger.debug(f"Monitor loop stopped after {cycle_count} cycles")
     
@@ -198,8 +266,8 @@ class PriceMonitorService:
                 "exit_price": exit_price,
                 "direction": new_direction,
                 "strategy": strategy,
-                "start_time": datetime.now(),
-                "expiration_time": datetime.now() + timedelta(seconds=max_wait_seconds),
+                "start_time": self.clock.now(),
+                "expiration_time": self.clock.now() + timedelta(seconds=max_wait_seconds),
                 "min_gap_pips": min_gap_pips,
                 "exit_reason": exit_reason
             }
@@ -222,22 +290,58 @@ class PriceMonitorService:
         # 🆕 CRITICAL: Check margin health and auto-close risky positions if needed
         await self._check_margin_health()
         
-        # Check SL hunt re-entries
-        await self._check_sl_hunt_reentries()
+        if not self.symbol_sharding:
+            await self._check_symbol_scoped_opportunities()
+        
+        # Check Autonomous Opportunities
+        await self._check_autonomous_opportunities()
+    
+    async def check_symbol_opportunities(self, symbol: str):
+        """Run the per-symbol re-entry and profit chain checks for one shard"""
+        await self._check_symbol_scoped_opportunities({symbol})
+    
+    async def _check_symbol_scoped_opportunities(self, symbols: Optional[Set[str]] = None):
+        """Checks whose state is keyed by symbol (None = all symbols)"""
+        await self._check_sl_hunt_reentries(symbols)
         
         # Check TP continuation re-entries
-        await self._check_tp_continuation_reentries()
+        await self._check_tp_continuation_reentries(symbols)
         
         # Check Exit continuation re-entries (NEW)
-        await self._check_exit_continuation_reentries()
+        await self._check_exit_continuation_reentries(symbols)
         
         # Check Profit Booking chains (NEW)
-        await self._check_profit_booking_chains()
+        await self._check_profit_booking_chains(symbols)
+    
+    @staticmethod
+    def _select_symbols(pending: Dict, symbols: Optional[Set[str]]) -> List[str]:
+        """Pending symbols restricted to the requested shard symbols"""
+        if symbols is None:
+            return list(pending.keys())
+        return [symbol for symbol in list(pending.keys()) if symbol in symbols]
+    
+    def _reserve_budget(self, symbol: str, lot_size: float):
+        """
+        Take a slot from the engine's shared RiskBudget before placing an order.
         
-        # Check Autonomous Opportunities
-        await self._check_autonomous_opportunities()
+        Returns:
+            The reservation (None when no budget is configured), or False if denied
+        """
+        budget = getattr(self.trading_engine, 'risk_budget', None)
+        if budget is None:
+            return None
+        reservation = budget.try_reserve(symbol, lot_size)
+        if reservation is None:
+            self.logger.warning(f"⚠️ [RISK_BUDGET_BLOCKED] {symbol}: Re-entry skipped, global risk budget exhausted")
+            return False
+        return reservation
+    
+    def _release_budget(self, reservation):
+        budget = getattr(self.trading_engine, 'risk_budget', None)
+        if budget is not None and reservation:
+            budget.release(reservation)
 
-    async def _check_profit_booking_chains(self):
+    async def _check_profit_booking_chains(self, symbols: Optional[Set[str]] = None):
         """Check for profit booking order recoveries"""
         if not hasattr(self.trading_engine, 'profit_booking_reentry_manager'):
             return
@@ -267,7 +371,7 @@ class PriceMonitorService:
             # Let's use 20 pips for Gold, 10 for others as safe "Tight" recovery SL
             tight_sl_pips = 20.0 if symbol == "XAUUSD" else 10.0
             
-            symbol_config = self.config["symbol_config"][symbol]
+            symbol_config = self.settings["symbol_config"][symbol]
             sl_distance = tight_sl_pips * symbol_config["pip_size"]
             
             if direction == "buy":
@@ -291,14 +395,14 @@ class PriceMonitorService:
                 lot_size=lot_size,
                 direction=direction,
                 strategy="PROFIT_RECOVERY",
-                open_time=datetime.now().isoformat(),
+                open_time=self.clock.now().isoformat(),
                 profit_chain_id=chain_id,
                 profit_level=level, # Staying at same level to retry it
                 order_type="PROFIT_TRAIL",
                 is_re_entry=True
             )
             # Determine SL System based on user config (Dynamic Switch Support)
-            active_system = self.config.get("active_sl_system", "sl-1")
+            active_system = self.settings.get("active_sl_system", "sl-1")
             
             # Default "Tight" SL logic (SL-2 style) if unspecified or for Order B
             # Allows user to switch global SL system to affect recovery
@@ -321,7 +425,7 @@ class PriceMonitorService:
                  current_price = self.mt5_client.get_current_price(symbol) # Changed from self.mt5_service to self.mt5_client
                  if not current_price: return
                  
-                 symbol_config = self.config["symbol_config"][symbol]
+                 symbol_config = self.settings["symbol_config"][symbol]
                  sl_distance = tight_sl_pips * symbol_config["pip_size"]
 
                  if direction == "buy":
@@ -380,7 +484,7 @@ class PriceMonitorService:
         return
         
         try:
-            if not self.config["re_entry_config"].get("autonomous_enabled", False):
+            if not self.settings["re_entry_config"].get("autonomous_enabled", False):
                 return
 
             # opportunities = self.reentry_manager.check_autonomous_reentry()
@@ -442,9 +546,9 @@ class PriceMonitorService:
         return
         try:
             # Get current margin metrics
-            margin_level = self.mt5_client.get_margin_level()
-            free_margin = self.mt5_client.get_free_margin()
             account_info = self.mt5_client.get_account_info_detailed()
+            margin_level = account_info.get("margin_level", 0)
+            free_margin = account_info.get("free_margin", 0)
             
             equity = account_info.get("equity", 0)
             balance = account_info.get("balance", 0)
@@ -544,15 +648,15 @@ class PriceMonitorService:
             import traceback
             traceback.print_exc()
     
-    async def _check_sl_hunt_reentries(self):
+    async def _check_sl_hunt_reentries(self, symbols: Optional[Set[str]] = None):
         """
         Check if price has reached SL + offset for automatic re-entry
         After SL hunt, wait for price to recover to SL + 1 pip, then re-enter
         """
-        if not self.config["re_entry_config"]["sl_hunt_reentry_enabled"]:
+        if not self.settings["re_entry_config"]["sl_hunt_reentry_enabled"]:
             return
         
-        for symbol in list(self.sl_hunt_pending.keys()):
+        for symbol in self._select_symbols(self.sl_hunt_pending, symbols):
             # Handle list of pending items
             pending_items = self.sl_hunt_pending[symbol]
             
@@ -561,7 +665,7 @@ class PriceMonitorService:
             
             for pending in pending_items:
                 # Check if window expired
-                if 'expiration_time' in pending and datetime.now() > pending['expiration_time']:
+                if 'expiration_time' in pending and self.clock.now() > pending['expiration_time']:
                     self.logger.info(f"⏳ SL Hunt window expired for {symbol} (Chain: {pending.get('chain_id')})")
                     continue
                     
@@ -637,22 +741,22 @@ class PriceMonitorService:
             else:
                 self.sl_hunt_pending[symbol] = active_items
     
-    async def _check_tp_continuation_reentries(self):
+    async def _check_tp_continuation_reentries(self, symbols: Optional[Set[str]] = None):
         """
         Check if price has moved enough after TP hit for re-entry
         After TP, wait for price gap (e.g., 2 pips), then re-enter with reduced SL
         """
-        if not self.config["re_entry_config"]["tp_reentry_enabled"]:
+        if not self.settings["re_entry_config"]["tp_reentry_enabled"]:
             return
         
-        for symbol in list(self.tp_continuation_pending.keys()):
+        for symbol in self._select_symbols(self.tp_continuation_pending, symbols):
             # Handle list of pending items
             pending_items = self.tp_continuation_pending[symbol]
             active_items = []
             
             for pending in pending_items:
                 # Check if window expired
-                if 'expiration_time' in pending and datetime.now() > pending['expiration_time']:
+                if 'expiration_time' in pending and self.clock.now() > pending['expiration_time']:
                     self.logger.info(f"⏳ TP Continuation window expired for {symbol} (Chain: {pending.get('chain_id')})")
                     continue
                 
@@ -665,8 +769,8 @@ class PriceMonitorService:
                 
                 # Target price logic
                 tp_price = pending['tp_price']
-                pip_size = self.config["symbol_config"][symbol]["pip_size"]
-                gap_pips = self.config["re_entry_config"].get("tp_continuation_price_gap_pips", 2) # Use existing config key
+                pip_size = self.settings["symbol_config"][symbol]["pip_size"]
+                gap_pips = self.settings["re_entry_config"].get("tp_continuation_price_gap_pips", 2) # Use existing config key
                 
                 if pending['direction'] == 'buy':
                     target_price = tp_price + (gap_pips * pip_size)
@@ -731,16 +835,16 @@ class PriceMonitorService:
             else:
                 self.tp_continuation_pending[symbol] = active_items
     
-    async def _check_exit_continuation_reentries(self):
+    async def _check_exit_continuation_reentries(self, symbols: Optional[Set[str]] = None):
         """
         Check for re-entry after Exit Appeared/Reversal exit signals
         After exit (Exit Appeared/Reversal), continue monitoring for re-entry with price gap
         Example: Exit @ 3640.200 -> Monitor -> Re-entry @ 3642.200 (gap required)
         """
-        if not self.config["re_entry_config"].get("exit_continuation_enabled", True):
+        if not self.settings["re_entry_config"].get("exit_continuation_enabled", True):
             return
         
-        for symbol in list(self.exit_continuation_pending.keys()):
+        for symbol in self._select_symbols(self.exit_continuation_pending, symbols):
             pending = self.exit_continuation_pending[symbol]
             
             # Get current price from MT5
@@ -752,10 +856,10 @@ class PriceMonitorService:
             direction = pending['direction']
             logic = pending.get('logic', 'combinedlogic-1')
             exit_reason = pending.get('exit_reason', 'EXIT')
-            price_gap_pips = self.config["re_entry_config"]["tp_continuation_price_gap_pips"]
+            price_gap_pips = self.settings["re_entry_config"]["tp_continuation_price_gap_pips"]
             
             # Calculate pip value for symbol
-            symbol_config = self.config["symbol_config"][symbol]
+            symbol_config = self.settings["symbol_config"][symbol]
             pip_size = symbol_config["pip_size"]
             price_gap = price_gap_pips * pip_size
             
@@ -850,7 +954,7 @@ class PriceMonitorService:
         self.logger.info(f"✅ [SL_HUNT_RECOVERY_START] {symbol}: Chain valid, executing re-entry...")
         
         # Calculate new SL with reduction
-        reduction_per_level = self.config["re_entry_config"]["sl_reduction_per_level"]
+        reduction_per_level = self.settings["re_entry_config"]["sl_reduction_per_level"]
         sl_adjustment = (1 - reduction_per_level) ** chain.current_level
         
         # ✅ CRITICAL FIX: Get account balance FIRST (needed for SL calculation regardless of lot size source)
@@ -880,7 +984,7 @@ class PriceMonitorService:
         )
         
         tp_price = self.pip_calculator.calculate_tp_price(
-            price, sl_price, direction, self.config["rr_ratio"]
+            price, sl_price, direction, self.settings["rr_ratio"]
         )
         
         # Create trade
@@ -892,44 +996,51 @@ class PriceMonitorService:
             lot_size=lot_size,
             direction=direction,
             strategy=logic,
-            open_time=datetime.now().isoformat(),
+            open_time=self.clock.now().isoformat(),
             chain_id=chain_id,
             chain_level=chain.current_level + 1,
             is_re_entry=True
         )
         
-        # Place order
-        if not self.config["simulate_orders"]:
-            trade_id = self.mt5_client.place_order(
-                symbol=symbol,
-                order_type=direction,
-                lot_size=lot_size,
-                price=price,
-                sl=sl_price,
-                tp=tp_price,
-                comment=f"{logic}_SL_HUNT_REENTRY"
-            )
-            if trade_id:
-                trade.trade_id = trade_id
-                self.logger.info(f"✅ [SL_HUNT_ORDER_PLACED] {symbol}: MT5 Order #{trade_id} placed successfully")
-            else:
-                self.logger.error(f"❌ [SL_HUNT_ORDER_FAILED] {symbol}: MT5 order placement returned None")
-                # Send failure notification
-                if hasattr(self.trading_engine, 'telegram_bot'):
-                    self.trading_engine.telegram_bot.send_message(
-                        f"⚠️ SL HUNT RECOVERY FAILED\n"
-                        f"Symbol: {symbol}\n"
-                        f"Reason: MT5 order placement failed\n"
-                        f"Chain: {chain_id}"
-                    )
-                return False  # Don't update chain if order failed
+        # Reserve global headroom first - another shard may be placing an order too
+        reservation = self._reserve_budget(symbol, lot_size)
+        if reservation is False:
+            return False
+        try:
+            # Place order
+            if not self.settings["simulate_orders"]:
+                trade_id = self.mt5_client.place_order(
+                    symbol=symbol,
+                    order_type=direction,
+                    lot_size=lot_size,
+                    price=price,
+                    sl=sl_price,
+                    tp=tp_price,
+                    comment=f"{logic}_SL_HUNT_REENTRY"
+                )
+                if trade_id:
+                    trade.trade_id = trade_id
+                    self.logger.info(f"✅ [SL_HUNT_ORDER_PLACED] {symbol}: MT5 Order #{trade_id} placed successfully")
+                else:
+                    self.logger.error(f"❌ [SL_HUNT_ORDER_FAILED] {symbol}: MT5 order placement returned None")
+                    # Send failure notification
+                    if hasattr(self.trading_engine, 'telegram_bot'):
+                        self.trading_engine.telegram_bot.send_message(
+                            f"⚠️ SL HUNT RECOVERY FAILED\n"
+                            f"Symbol: {symbol}\n"
+                            f"Reason: MT5 order placement failed\n"
+                            f"Chain: {chain_id}"
+                        )
+                    return False  # Don't update chain if order failed
         
-        # Update chain
-        self.reentry_manager.update_chain_level(chain_id, trade.trade_id)
+            # Update chain
+            self.reentry_manager.update_chain_level(chain_id, trade.trade_id)
         
-        # Add to open trades
-        self.trading_engine.open_trades.append(trade)
-        self.trading_engine.risk_manager.add_open_trade(trade)
+            # Add to open trades
+            self.trading_engine.open_trades.append(trade)
+            self.trading_engine.risk_manager.add_open_trade(trade)
+        finally:
+            self._release_budget(reservation)
         
         # Send Telegram notification
         sl_reduction_percent = (1 - sl_adjustment) * 100
@@ -971,7 +1082,7 @@ class PriceMonitorService:
         self.logger.info(f"✅ [TP_CONTINUATION_START] {symbol}: Chain valid, executing re-entry...")
 
         # Calculate new SL with reduction
-        reduction_per_level = self.config["re_entry_config"]["sl_reduction_per_level"]
+        reduction_per_level = self.settings["re_entry_config"]["sl_reduction_per_level"]
         sl_adjustment = (1 - reduction_per_level) ** chain.current_level
         
         account_balance = self.mt5_client.get_account_balance()
@@ -995,7 +1106,7 @@ class PriceMonitorService:
         )
         
         tp_price = self.pip_calculator.calculate_tp_price(
-            price, sl_price, direction, self.config["rr_ratio"]
+            price, sl_price, direction, self.settings["rr_ratio"]
         )
         
         # Create trade
@@ -1007,50 +1118,57 @@ class PriceMonitorService:
             lot_size=lot_size,
             direction=direction,
             strategy=logic,
-            open_time=datetime.now().isoformat(),
+            open_time=self.clock.now().isoformat(),
             chain_id=chain_id,
             chain_level=chain.current_level + 1,
             is_re_entry=True
         )
         
-        # Place order
-        if not self.config["simulate_orders"]:
-            trade_id = self.mt5_client.place_order(
-                symbol=symbol,
-                order_type=direction,
-                lot_size=lot_size,
-                price=price,
-                sl=sl_price,
-                tp=tp_price,
-                comment=f"{logic}_TP{chain.current_level}_REENTRY"
-            )
-            if trade_id:
-                trade.trade_id = trade_id
-                self.logger.info(f"✅ [TP_CONTINUATION_ORDER_PLACED] {symbol}: MT5 Order #{trade_id} placed successfully")
-            else:
-                self.logger.error(f"❌ [TP_CONTINUATION_ORDER_FAILED] {symbol}: MT5 order placement returned None")
-                if hasattr(self.trading_engine, 'telegram_bot'):
-                    self.trading_engine.telegram_bot.send_message(
-                        f"⚠️ TP CONTINUATION FAILED\n"
-                        f"Symbol: {symbol}\n"
-                        f"Reason: MT5 order placement failed\n"
-                        f"Chain: {chain_id}"
-                    )
-                return False
+        # Reserve global headroom first - another shard may be placing an order too
+        reservation = self._reserve_budget(symbol, lot_size)
+        if reservation is False:
+            return False
+        try:
+            # Place order
+            if not self.settings["simulate_orders"]:
+                trade_id = self.mt5_client.place_order(
+                    symbol=symbol,
+                    order_type=direction,
+                    lot_size=lot_size,
+                    price=price,
+                    sl=sl_price,
+                    tp=tp_price,
+                    comment=f"{logic}_TP{chain.current_level}_REENTRY"
+                )
+                if trade_id:
+                    trade.trade_id = trade_id
+                    self.logger.info(f"✅ [TP_CONTINUATION_ORDER_PLACED] {symbol}: MT5 Order #{trade_id} placed successfully")
+                else:
+                    self.logger.error(f"❌ [TP_CONTINUATION_ORDER_FAILED] {symbol}: MT5 order placement returned None")
+                    if hasattr(self.trading_engine, 'telegram_bot'):
+                        self.trading_engine.telegram_bot.send_message(
+                            f"⚠️ TP CONTINUATION FAILED\n"
+                            f"Symbol: {symbol}\n"
+                            f"Reason: MT5 order placement failed\n"
+                            f"Chain: {chain_id}"
+                        )
+                    return False
         
-        # Update chain
-        self.reentry_manager.update_chain_level(chain_id, trade.trade_id)
+            # Update chain
+            self.reentry_manager.update_chain_level(chain_id, trade.trade_id)
         
-        # Add to open trades
-        self.trading_engine.open_trades.append(trade)
-        self.trading_engine.risk_manager.add_open_trade(trade)
+            # Add to open trades
+            self.trading_engine.open_trades.append(trade)
+            self.trading_engine.risk_manager.add_open_trade(trade)
+        finally:
+            self._release_budget(reservation)
         
         # Save to database
         tp_level = chain.current_level + 1
         self.trading_engine.db.conn.cursor().execute('''
             INSERT INTO tp_reentry_events VALUES (?,?,?,?,?,?,?,?,?)
         ''', (None, chain_id, symbol, tp_level, chain.total_profit, price, 
-              (1-sl_adjustment)*100, 0, datetime.now().isoformat()))
+              (1-sl_adjustment)*100, 0, self.clock.now().isoformat()))
         self.trading_engine.db.conn.commit()
         
         # Send Telegram notification
@@ -1120,8 +1238,8 @@ class PriceMonitorService:
                 return
         
         try:
-            symbol_config = self.config["symbol_config"][trade.symbol]
-            offset_pips = self.config["re_entry_config"]["sl_hunt_offset_pips"]
+            symbol_config = self.settings["symbol_config"][trade.symbol]
+            offset_pips = self.settings["re_entry_config"]["sl_hunt_offset_pips"]
             pip_size = symbol_config["pip_size"]
             
             # Calculate target price (SL + offset)
@@ -1139,13 +1257,13 @@ class PriceMonitorService:
             )
             
             # Get timeframe-specific window
-            timeframe_config = self.config.get("timeframe_specific_config", {})
+            timeframe_config = self.settings.get("timeframe_specific_config", {})
             if timeframe_config.get("enabled", False) and logic in timeframe_config:
                 window_minutes = timeframe_config[logic].get("recovery_window_minutes", 30)
             else:
-                window_minutes = self.config["re_entry_config"].get("recovery_window_minutes", 30)
+                window_minutes = self.settings["re_entry_config"].get("recovery_window_minutes", 30)
 
-            expiration_time = datetime.now() + timedelta(minutes=window_minutes)
+            expiration_time = self.clock.now() + timedelta(minutes=window_minutes)
             
             # Use list for multiple concurrent chains
             if trade.symbol not in self.sl_hunt_pending:
@@ -1227,13 +1345,13 @@ class PriceMonitorService:
             )
             
             # Get timeframe-specific window
-            timeframe_config = self.config.get("timeframe_specific_config", {})
+            timeframe_config = self.settings.get("timeframe_specific_config", {})
             if timeframe_config.get("enabled", False) and logic in timeframe_config:
                 window_minutes = timeframe_config[logic].get("recovery_window_minutes", 30)
             else:
-                window_minutes = self.config["re_entry_config"].get("recovery_window_minutes", 30)
+                window_minutes = self.settings["re_entry_config"].get("recovery_window_minutes", 30)
 
-            expiration_time = datetime.now() + timedelta(minutes=window_minutes)
+            expiration_time = self.clock.now() + timedelta(minutes=window_minutes)
 
             # Use list for multiple concurrent chains
             if trade.symbol not in self.tp_continuation_pending:
@@ -1315,13 +1433,13 @@ class PriceMonitorService:
             del self.exit_continuation_pending[symbol]
             self.logger.info(f"STOPPED: Exit continuation stopped for {symbol}: {reason}")
     
-    async def _check_profit_booking_chains(self):
+    async def _check_profit_booking_chains(self, symbols: Optional[Set[str]] = None):
         """
         Check profit booking chains for profit target achievement
         Runs every 30 seconds to monitor combined PnL
         """
         # Check if profit booking enabled
-        profit_config = self.config.get("profit_booking_config", {})
+        profit_config = self.settings.get("profit_booking_config", {})
         if not profit_config.get("enabled", True):
             return
         
@@ -1331,13 +1449,12 @@ class PriceMonitorService:
             return
         
         # Periodic cleanup of stale chains (every 5 minutes)
-        import time
         if not hasattr(self, '_last_cleanup_time'):
-            self._last_cleanup_time = time.time()
+            self._last_cleanup_time = self.clock.time()
         
-        if time.time() - self._last_cleanup_time > 300:  # 5 minutes
+        if self.clock.time() - self._last_cleanup_time > 300:  # 5 minutes
             profit_manager.cleanup_stale_chains()
-            self._last_cleanup_time = time.time()
+            self._last_cleanup_time = self.clock.time()
         
         # Get all active profit chains
         active_chains = profit_manager.get_all_chains()
@@ -1348,7 +1465,9 @@ class PriceMonitorService:
         open_trades = getattr(self.trading_engine, 'open_trades', [])
         
         # Check each chain
-        for chain_id, chain in active_chains.items():
+        for chain_id, chain in list(active_chains.items()):
+            if symbols is not None and chain.symbol not in symbols:
+                continue
             try:
                 # Validate chain state (now with deduplication)
                 if not profit_manager.validate_chain_state(chain, open_trades):
@@ -240,13 +240,7 @@ class BaseTelegramBot:
                         if data.get("ok"):
                             for result in data.get("result", []):
                                 offset = result["update_id"] + 1
-                                message = result.get("message", {})
-                                text = message.get("text", "")
-                                chat_id = message.get("chat", {}).get("id")
-                                
-                                if text == "/start" and chat_id:
-                                    logger.info(f"[{self.bot_name}] Received /start from {chat_id}")
-                                    self.send_message(welcome_message, chat_id=chat_id)
+                                self.handle_simple_update(result, welcome_message)
                                     
                 except Exception as e:
                     logger.error(f"[{self.bot_name}] Polling error: {e}")
@@ -257,6 +251,16 @@ class BaseTelegramBot:
         t = threading.Thread(target=_poll, daemon=True)
         t.start()
     
+    def handle_simple_update(self, update: Dict[str, Any], welcome_message: str):
+        """Reply to /start with the welcome message"""
+        message = update.get("message", {})
+        text = message.get("text", "")
+        chat_id = message.get("chat", {}).get("id")
+        
+        if text == "/start" and chat_id:
+            logger.info(f"[{self.bot_name}] Received /start from {chat_id}")
+            self.send_message(welcome_message, chat_id=chat_id)
+    
     # ========================================
     # ENHANCED UX METHODS (Phase 4)
     # ========================================
@@ -79,6 +79,28 @@ class BaseIndependentBot:
         if self.app and self.is_active:
             logger.info(f"[{self.bot_type}] Starting polling...")
             await self.app.updater.start_polling()
+    
+    async def start_webhook(self, ingress, name: str) -> bool:
+        """
+        Receive updates through the app server's webhook route instead of polling.
+        
+        Updates are put on the Application's own update_queue, so the same
+        registered handlers process them. Returns False if setWebhook failed
+        (caller should fall back to polling).
+        """
+        if not (self.app and self.is_active):
+            return False
+        ingress.register_bot(name, self.token, self._enqueue_webhook_update)
+        loop = asyncio.get_running_loop()
+        if await loop.run_in_executor(None, ingress.set_webhook, name):
+            logger.info(f"[{self.bot_type}] Receiving updates via webhook")
+            return True
+        ingress.unregister_bot(name)
+        return False
+    
+    async def _enqueue_webhook_update(self, data: Dict[str, Any]):
+        """Hand a webhook update to the Application's dispatcher"""
+        await self.app.update_queue.put(TelegramUpdate.de_json(data, self.bot))
             
     def _register_handlers(self):
         """Register default handlers - Override in subclasses"""
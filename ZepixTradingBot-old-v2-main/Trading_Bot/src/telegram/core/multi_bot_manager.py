@@ -16,6 +16,7 @@ from ..bots.notification_bot import NotificationBot
 from ..bots.analytics_bot import AnalyticsBot
 from .token_manager import TokenManager
 from .message_router import MessageRouter
+from ..webhook_ingress import get_webhook_ingress
 
 logger = logging.getLogger(__name__)
 
@@ -102,6 +103,25 @@ class MultiBotManager:
             
         if self.analytics_bot:
             await self.analytics_bot.initialize()
+        
+        await self._start_update_delivery()
+    
+    async def _start_update_delivery(self):
+        """
+        Webhook through the app server when a public URL is configured,
+        otherwise long-polling. A shared bot (SINGLE_BOT mode) is started once.
+        """
+        ingress = get_webhook_ingress()
+        started = []
+        for name, bot in (("controller", self.controller_bot),
+                          ("notification", self.notification_bot),
+                          ("analytics", self.analytics_bot)):
+            if not bot or not bot.is_active or any(bot is b for b in started):
+                continue
+            started.append(bot)
+            if ingress.enabled and await bot.start_webhook(ingress, name):
+                continue
+            await bot.start_polling()
             
     async def stop(self):
         """Stop all active bots"""
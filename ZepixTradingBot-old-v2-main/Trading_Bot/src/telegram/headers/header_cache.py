@@ -12,23 +12,30 @@ import time
 from typing import Dict, Optional
 
 class HeaderCache:
-    """Thread-safe cache for sticky header content"""
+    """Thread-safe cache for sticky header content
+
+    Entries stored with a portfolio version stay valid until that version
+    changes (no TTL); unversioned entries expire after ttl_seconds.
+    """
 
     def __init__(self, ttl_seconds: int = 2):
-        self.cache: Dict[str, Dict] = {} # {style: {'content': str, 'timestamp': float}}
+        self.cache: Dict[str, Dict] = {} # {style: {'content': str, 'timestamp': float, 'version': int}}
         self.ttl = ttl_seconds
 
-    def get(self, style: str) -> Optional[str]:
+    def get(self, style: str, version: Optional[int] = None) -> Optional[str]:
         """Get cached header if valid"""
         if style in self.cache:
             entry = self.cache[style]
+            if version is not None and entry.get('version') is not None:
+                return entry['content'] if entry['version'] == version else None
             if time.time() - entry['timestamp'] < self.ttl:
                 return entry['content']
         return None
 
-    def set(self, style: str, content: str):
+    def set(self, style: str, content: str, version: Optional[int] = None):
         """Set cached header"""
         self.cache[style] = {
             'content': content,
-            'timestamp': time.time()
+            'timestamp': time.time(),
+            'version': version
         }
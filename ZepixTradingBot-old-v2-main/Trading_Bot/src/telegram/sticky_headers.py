@@ -58,7 +58,9 @@ class StickyHeader:
         edit_callback: Optional[Callable] = None,
         pin_callback: Optional[Callable] = None,
         unpin_callback: Optional[Callable] = None,
-        content_generator: Optional[Callable] = None
+        content_generator: Optional[Callable] = None,
+        version_source: Optional[Callable[[], Any]] = None,
+        idle_refresh_seconds: int = 300
     ):
         """
         Initialize StickyHeader.
@@ -72,6 +74,10 @@ class StickyHeader:
             pin_callback: Function to pin messages
             unpin_callback: Function to unpin messages
             content_generator: Function that returns header content
+            version_source: Returns the data version or change key (e.g.
+                PortfolioView.version, or clock_change_key() for headers that
+                show the time); scheduled updates are skipped while it is unchanged
+            idle_refresh_seconds: Max seconds between edits when the version is unchanged
         """
         self.chat_id = chat_id
         self.header_type = header_type
@@ -83,6 +89,10 @@ class StickyHeader:
         self.pin_callback = pin_callback
         self.unpin_callback = unpin_callback
         self.content_generator = content_generator
+        self.version_source = version_source
+        self.idle_refresh_seconds = idle_refresh_seconds
+        self._rendered_version: Any = None
+        self._rendered_at = 0.0
         
         # State
         self.message_id: Optional[int] = None
@@ -98,6 +108,7 @@ class StickyHeader:
             "last_update": None,
             "update_count": 0,
             "regenerate_count": 0,
+            "skipped_count": 0,
             "error_count": 0
         }
         
@@ -238,6 +249,7 @@ class StickyHeader:
         self.state = StickyHeaderState.UPDATING
         
         try:
+            version = self._current_version()
             content = self._get_content()
             
             kwargs = {
@@ -252,6 +264,8 @@ class StickyHeader:
             
             self.edit_callback(**kwargs)
             
+            self._rendered_version = version
+            self._rendered_at = time.monotonic()
             self.stats["last_update"] = datetime.now().isoformat()
             self.stats["update_count"] += 1
             self.state = StickyHeaderState.ACTIVE
@@ -300,11 +314,30 @@ class StickyHeader:
             f"━━━━━━━━━━━━━━━━━━━━━━━━"
         )
     
+    def _current_version(self) -> Any:
+        if not self.version_source:
+            return None
+        try:
+            return self.version_source()
+        except Exception as e:
+            logger.debug(f"Header version source error: {e}")
+            return None
+    
+    def _is_stale(self) -> bool:
+        """True unless the data version is unchanged since the last edit"""
+        version = self._current_version()
+        if version is None or version != self._rendered_version:
+            return True
+        return time.monotonic() - self._rendered_at >= self.idle_refresh_seconds
+    
     def _update_loop(self):
         """Main update loop (runs in thread)"""
         while self._running and not self._stop_event.is_set():
             try:
-                self._update_header()
+                if self._is_stale():
+                    self._update_header()
+                else:
+                    self.stats["skipped_count"] += 1
             except Exception as e:
                 logger.error(f"Header update loop error: {e}")
             
@@ -386,7 +419,8 @@ class StickyHeaderManager:
         pin_callback: Optional[Callable] = None,
         unpin_callback: Optional[Callable] = None,
         content_generator: Optional[Callable] = None,
-        inline_keyboard: Optional[Dict] = None
+        inline_keyboard: Optional[Dict] = None,
+        version_source: Optional[Callable[[], Any]] = None
     ) -> StickyHeader:
         """
         Create a new sticky header.
@@ -402,6 +436,7 @@ class StickyHeaderManager:
             unpin_callback: Function to unpin messages
             content_generator: Function that returns header content
             inline_keyboard: Optional inline keyboard
+            version_source: Data version; unchanged versions skip scheduled edits
             
         Returns:
             StickyHeader instance
@@ -421,7 +456,8 @@ class StickyHeaderManager:
                 edit_callback=edit_callback,
                 pin_callback=pin_callback,
                 unpin_callback=unpin_callback,
-                content_generator=content_generator
+                content_generator=content_generator,
+                version_source=version_source
             )
             
             # Set inline keyboard
@@ -641,6 +677,29 @@ class HybridStickySystem:
         }
 
 
+def clock_change_key(version_source: Callable[[], Any],
+                     session_source: Optional[Callable[[], Any]] = None) -> Callable[[], Any]:
+    """
+    Change key for headers that show the time and trading session.
+    
+    The data version alone stays constant on a quiet market, which would
+    freeze the header clock until the idle refresh. Keying on the rendered
+    minute and session as well edits the header once a minute at most.
+    
+    Args:
+        version_source: Returns the data version (e.g. PortfolioView.version)
+        session_source: Returns the current session name
+        
+    Returns:
+        version_source for StickyHeader
+    """
+    def key():
+        session = session_source() if session_source else None
+        return version_source(), datetime.now().strftime('%Y-%m-%d %H:%M'), session
+    
+    return key
+
+
 # Content generators for different bot types
 
 def create_controller_content_generator(data_providers: Dict[str, Callable]) -> Callable:
@@ -15,7 +15,7 @@ Date: 2026-01-14
 
 import logging
 from datetime import datetime
-from typing import Optional, Dict, Any, Callable, Set
+from typing import Optional, Dict, Any, Callable, List, Set
 from enum import Enum
 
 from .notification_router import NotificationPriority, NotificationType
@@ -182,6 +182,19 @@ class VoiceTextGenerator:
                 message = message[:100] + "..."
             return message
         return "New notification received."
+    
+    # Generators whose output without data is a complete, variable-free phrase
+    FIXED_PHRASE_GENERATORS = (
+        "generate_bot_started_voice",
+        "generate_bot_stopped_voice",
+        "generate_mt5_disconnect_voice",
+        "generate_generic_voice",
+    )
+    
+    @classmethod
+    def fixed_phrases(cls) -> List[str]:
+        """Phrases spoken verbatim (worth pre-rendering for TTS)"""
+        return [getattr(cls, name)({}) for name in cls.FIXED_PHRASE_GENERATORS]
 
 
 class VoiceAlertIntegration:
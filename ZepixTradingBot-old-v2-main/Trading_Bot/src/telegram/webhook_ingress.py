@@ -0,0 +1,347 @@
+"""
+Telegram Webhook Ingress - Push delivery of bot updates through the FastAPI app
+
+Long-polling costs each bot a thread and an open getUpdates connection, and
+the poll/sleep cycle adds up to a second before a button press is handled.
+With a public URL configured, Telegram instead POSTs every update to a
+per-bot secret path on the existing app.py server. The ingress validates the
+request, drops retries it has already seen, and queues the update for the
+same handler the polling loop would have called. One worker per bot drains
+its queue in order, so updates for a bot are still processed sequentially.
+
+Without a public URL (or when the server is not running, e.g. main.py), the
+ingress reports itself disabled and bots fall back to long-polling.
+
+Config (`telegram_webhook` section):
+    public_url:       https://bot.example.com (empty = polling)
+    path_prefix:      /telegram
+    secret:           HMAC key for path/header secrets (default: random per process)
+    max_queue_size:   Pending updates per bot
+    allowed_updates:  ["message", "callback_query"]
+
+Version: 1.0.0
+Date: 2026-01-14
+"""
+
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import secrets
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+UpdateHandler = Callable[[Dict[str, Any]], Any]
+
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+
+@dataclass
+class WebhookBot:
+    """One bot registered with the ingress"""
+    name: str
+    token: str
+    handler: UpdateHandler
+    path_secret: str
+    header_secret: str
+    run_in_thread: bool = False
+    queue: Optional[asyncio.Queue] = None
+    worker: Optional[asyncio.Task] = None
+    seen_updates: "OrderedDict[int, None]" = field(default_factory=OrderedDict)
+    received: int = 0
+    processed: int = 0
+    duplicates: int = 0
+    rejected: int = 0
+    errors: int = 0
+    last_update_at: Optional[float] = None
+    webhook_set: bool = False
+
+
+class TelegramWebhookIngress:
+    """
+    Routes Telegram webhook POSTs to registered bot handlers.
+
+    Paths and secret headers are derived from the bot token with HMAC, so
+    the token itself never appears in a URL or log line.
+    """
+
+    def __init__(self, config: Dict[str, Any] = None):
+        self.bots: Dict[str, WebhookBot] = {}
+        self.mounted = False
+        self._app = None
+        self._route = None
+        self.configure(config or {})
+
+    def configure(self, config: Dict[str, Any]):
+        """Apply the `telegram_webhook` config section"""
+        self.public_url = (config.get("public_url") or "").rstrip("/")
+        path_prefix = "/" + (config.get("path_prefix") or "/telegram").strip("/")
+        remount = self._app is not None and path_prefix != self.path_prefix
+        self.path_prefix = path_prefix
+        self._secret = (config.get("secret") or secrets.token_hex(32)).encode()
+        self.max_queue_size = config.get("max_queue_size", 1000)
+        self.allowed_updates = config.get("allowed_updates", ["message", "callback_query"])
+        self.dedupe_window = config.get("dedupe_window", 1000)
+        for bot in self.bots.values():
+            bot.path_secret = self._derive("path", bot.token)
+            bot.header_secret = self._derive("header", bot.token)
+        if remount:
+            # Mounted at import with the default prefix; follow the configured one
+            self._add_route()
+
+    @property
+    def enabled(self) -> bool:
+        """Webhook mode needs both a public URL and a running server route"""
+        return bool(self.public_url) and self.mounted
+
+    # ------------------------------------------------------------------
+    # Registration
+    # ------------------------------------------------------------------
+
+    def _derive(self, purpose: str, token: str) -> str:
+        return hmac.new(self._secret, f"{purpose}:{token}".encode(), hashlib.sha256).hexdigest()[:48]
+
+    def register_bot(self, name: str, token: str, handler: UpdateHandler,
+                     run_in_thread: bool = False) -> WebhookBot:
+        """
+        Register a bot's update handler.
+
+        Args:
+            name: Path segment for the bot (e.g. "controller")
+            token: Bot token (used for setWebhook and secret derivation)
+            handler: handler(update_dict); may be sync or async
+            run_in_thread: Run a sync handler in the default executor
+                           (for handlers that make blocking HTTP calls)
+        """
+        bot = WebhookBot(
+            name=name,
+            token=token,
+            handler=handler,
+            path_secret=self._derive("path", token),
+            header_secret=self._derive("header", token),
+            run_in_thread=run_in_thread
+        )
+        self.bots[name] = bot
+        return bot
+
+    def unregister_bot(self, name: str):
+        bot = self.bots.pop(name, None)
+        if bot and bot.worker:
+            bot.worker.cancel()
+
+    def webhook_path(self, name: str) -> str:
+        bot = self.bots[name]
+        return f"{self.path_prefix}/{name}/{bot.path_secret}"
+
+    def webhook_url(self, name: str) -> str:
+        return f"{self.public_url}{self.webhook_path(name)}"
+
+    # ------------------------------------------------------------------
+    # Telegram API
+    # ------------------------------------------------------------------
+
+    def set_webhook(self, name: str, session: requests.Session = None) -> bool:
+        """Point Telegram at this bot's path (blocking - run in executor from async code)"""
+        bot = self.bots[name]
+        session = session or requests.Session()
+        try:
+            response = session.post(
+                f"https://api.telegram.org/bot{bot.token}/setWebhook",
+                json={
+                    "url": self.webhook_url(name),
+                    "secret_token": bot.header_secret,
+                    "allowed_updates": self.allowed_updates,
+                    "max_connections": 10,
+                },
+                timeout=10
+            )
+            result = response.json()
+        except Exception as e:
+            logger.error(f"[WEBHOOK:{name}] setWebhook failed: {e}")
+            return False
+
+        bot.webhook_set = bool(result.get("ok"))
+        if bot.webhook_set:
+            logger.info(f"[WEBHOOK:{name}] Registered at {self.public_url}{self.path_prefix}/{name}/…")
+        else:
+            logger.error(f"[WEBHOOK:{name}] setWebhook rejected: {result.get('description')}")
+        return bot.webhook_set
+
+    def delete_webhook(self, name: str, session: requests.Session = None) -> bool:
+        """Remove the webhook so the bot can long-poll again"""
+        bot = self.bots[name]
+        session = session or requests.Session()
+        try:
+            response = session.post(
+                f"https://api.telegram.org/bot{bot.token}/deleteWebhook",
+                json={"drop_pending_updates": False},
+                timeout=10
+            )
+            ok = bool(response.json().get("ok"))
+        except Exception as e:
+            logger.error(f"[WEBHOOK:{name}] deleteWebhook failed: {e}")
+            return False
+        bot.webhook_set = bot.webhook_set and not ok
+        return ok
+
+    # ------------------------------------------------------------------
+    # Ingestion
+    # ------------------------------------------------------------------
+
+    async def handle_request(self, name: str, path_secret: str,
+                             header_secret: Optional[str], body: bytes) -> int:
+        """
+        Validate and enqueue one webhook POST.
+
+        Returns the HTTP status to answer with. Telegram retries anything
+        other than 2xx, so only a full queue returns 503; malformed or
+        unauthorised requests get 4xx and are never retried into a handler.
+        """
+        bot = self.bots.get(name)
+        if bot is None or not hmac.compare_digest(path_secret, bot.path_secret):
+            return 404
+        if not header_secret or not hmac.compare_digest(header_secret, bot.header_secret):
+            bot.rejected += 1
+            logger.warning(f"[WEBHOOK:{name}] Rejected update with bad secret header")
+            return 403
+
+        try:
+            update = json.loads(body)
+        except (ValueError, TypeError):
+            bot.rejected += 1
+            return 400
+        update_id = update.get("update_id") if isinstance(update, dict) else None
+        if not isinstance(update_id, int):
+            bot.rejected += 1
+            return 400
+
+        bot.received += 1
+        if update_id in bot.seen_updates:
+            bot.duplicates += 1
+            return 200
+        bot.seen_updates[update_id] = None
+        while len(bot.seen_updates) > self.dedupe_window:
+            bot.seen_updates.popitem(last=False)
+
+        self._ensure_worker(bot)
+        try:
+            bot.queue.put_nowait(update)
+        except asyncio.QueueFull:
+            bot.seen_updates.pop(update_id, None)  # let Telegram's retry through
+            logger.error(f"[WEBHOOK:{name}] Update queue full, asking Telegram to retry")
+            return 503
+        bot.last_update_at = time.time()
+        return 200
+
+    def _ensure_worker(self, bot: WebhookBot):
+        if bot.queue is None:
+            bot.queue = asyncio.Queue(maxsize=self.max_queue_size)
+        if bot.worker is None or bot.worker.done():
+            bot.worker = asyncio.create_task(self._drain(bot), name=f"telegram-webhook-{bot.name}")
+
+    async def _drain(self, bot: WebhookBot):
+        loop = asyncio.get_running_loop()
+        while True:
+            update = await bot.queue.get()
+            try:
+                if bot.run_in_thread:
+                    result = await loop.run_in_executor(None, bot.handler, update)
+                else:
+                    result = bot.handler(update)
+                if asyncio.iscoroutine(result):
+                    await result
+                bot.processed += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                bot.errors += 1
+                logger.error(f"[WEBHOOK:{bot.name}] Handler failed for update "
+                             f"{update.get('update_id')}: {e}")
+            finally:
+                bot.queue.task_done()
+
+    async def drain(self):
+        """Wait until every queued update has been handled"""
+        for bot in list(self.bots.values()):
+            if bot.queue is not None:
+                await bot.queue.join()
+
+    async def stop(self):
+        for bot in self.bots.values():
+            if bot.worker:
+                bot.worker.cancel()
+                try:
+                    await bot.worker
+                except asyncio.CancelledError:
+                    pass
+                bot.worker = None
+
+    # ------------------------------------------------------------------
+    # Server integration
+    # ------------------------------------------------------------------
+
+    def mount(self, app):
+        """Add the POST {path_prefix}/{bot}/{secret} route to a FastAPI app"""
+        self._app = app
+        self._add_route()
+        self.mounted = True
+
+    def _add_route(self):
+        from fastapi import Request, Response
+
+        async def telegram_webhook(bot_name: str, path_secret: str, request: Request):
+            status = await self.handle_request(
+                bot_name, path_secret,
+                request.headers.get(SECRET_HEADER),
+                await request.body()
+            )
+            return Response(status_code=status)
+
+        routes = self._app.router.routes
+        if self._route in routes:
+            routes.remove(self._route)
+        self._app.add_api_route(
+            f"{self.path_prefix}/{{bot_name}}/{{path_secret}}",
+            telegram_webhook,
+            methods=["POST"],
+            include_in_schema=False
+        )
+        self._route = routes[-1]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "public_url": self.public_url or None,
+            "bots": {
+                name: {
+                    "webhook_set": bot.webhook_set,
+                    "received": bot.received,
+                    "processed": bot.processed,
+                    "duplicates": bot.duplicates,
+                    "rejected": bot.rejected,
+                    "errors": bot.errors,
+                    "queue_depth": bot.queue.qsize() if bot.queue else 0,
+                }
+                for name, bot in self.bots.items()
+            }
+        }
+
+
+_webhook_ingress: Optional[TelegramWebhookIngress] = None
+
+
+def get_webhook_ingress(config: Dict[str, Any] = None) -> TelegramWebhookIngress:
+    """Process-wide ingress shared by the app server and the bots"""
+    global _webhook_ingress
+    if _webhook_ingress is None:
+        _webhook_ingress = TelegramWebhookIngress(config)
+    elif config is not None:
+        _webhook_ingress.configure(config)
+    return _webhook_ingress
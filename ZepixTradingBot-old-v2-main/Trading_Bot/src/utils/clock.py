@@ -0,0 +1,229 @@
+"""
+Clock - Injectable time source for time-based trading logic
+
+Recovery windows, SL-hunt / TP-continuation expirations, the reversal-exit
+grace period, session windows, the fixed clock and daily risk resets all
+depend on wall-clock time. Reading datetime.now() and calling asyncio.sleep()
+directly makes their tests wait in real time.
+
+Components take a Clock (defaulting to the process-wide clock) and use it
+for now(), today(), time() and sleep():
+
+- SystemClock: real time (production default)
+- VirtualClock: time moves only when advanced; sleepers wake in order, so a
+  30-minute recovery window simulates in milliseconds
+- AcceleratedClock: real time scaled by a factor (for soak runs)
+
+Usage:
+    clock = VirtualClock(start=datetime(2026, 1, 14, 9, 0))
+    monitor = RecoveryWindowMonitor(engine, clock=clock)
+    await clock.advance(30 * 60)   # wakes every sleeper due in the window
+
+    with use_clock(clock):          # process-wide, for whole-engine scenarios
+        engine = TradingEngine(...)
+
+Version: 1.0.0
+Date: 2026-01-14
+"""
+
+import asyncio
+import heapq
+import itertools
+import time as _time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime, date, timezone, tzinfo
+from typing import Any, Awaitable, List, Optional, Tuple, Union
+
+
+class Clock(ABC):
+    """Time source interface. Subclasses implement time() and sleep()."""
+
+    @abstractmethod
+    def time(self) -> float:
+        """Current time as a POSIX timestamp"""
+
+    def monotonic(self) -> float:
+        """Monotonic seconds for measuring durations"""
+        return self.time()
+
+    def now(self, tz: Optional[tzinfo] = None) -> datetime:
+        """Same contract as datetime.now(tz): naive local time when tz is None"""
+        return datetime.fromtimestamp(self.time(), tz)
+
+    def utcnow(self) -> datetime:
+        """Naive UTC time (same contract as datetime.utcnow())"""
+        return datetime.fromtimestamp(self.time(), timezone.utc).replace(tzinfo=None)
+
+    def today(self) -> date:
+        """Local date (same contract as date.today())"""
+        return self.now().date()
+
+    @abstractmethod
+    async def sleep(self, seconds: float):
+        """Suspend the caller for seconds of this clock's time"""
+
+    async def wait_for(self, awaitable: Awaitable, timeout: Optional[float]) -> Any:
+        """asyncio.wait_for measured on this clock"""
+        if timeout is None:
+            return await awaitable
+        task = asyncio.ensure_future(awaitable)
+        sleeper = asyncio.ensure_future(self.sleep(timeout))
+        try:
+            done, _ = await asyncio.wait({task, sleeper}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            sleeper.cancel()
+        if task in done:
+            return task.result()
+        task.cancel()
+        raise asyncio.TimeoutError()
+
+
+class SystemClock(Clock):
+    """Real time"""
+
+    def time(self) -> float:
+        return _time.time()
+
+    def monotonic(self) -> float:
+        return _time.monotonic()
+
+    def now(self, tz: Optional[tzinfo] = None) -> datetime:
+        return datetime.now(tz)
+
+    def today(self) -> date:
+        return date.today()
+
+    async def sleep(self, seconds: float):
+        await asyncio.sleep(seconds)
+
+    async def wait_for(self, awaitable: Awaitable, timeout: Optional[float]) -> Any:
+        return await asyncio.wait_for(awaitable, timeout)
+
+
+def _timestamp(start: Union[datetime, float, None]) -> float:
+    if start is None:
+        return _time.time()
+    if isinstance(start, datetime):
+        return start.timestamp()
+    return float(start)
+
+
+class VirtualClock(Clock):
+    """
+    Simulated time that only moves when advanced.
+
+    sleep() parks the caller until virtual time reaches its wake-up instant.
+    advance() steps time forward sleeper by sleeper, letting woken tasks run
+    (and schedule their next sleep) before moving on, so periodic loops see
+    every interval they would have seen in real time.
+
+    With auto_advance=True a sleep with no earlier sleeper pending jumps time
+    straight to its wake-up instant, for single-task scenarios that should
+    simply run to completion.
+    """
+
+    # Event loop passes given to woken tasks before time moves again
+    SETTLE_PASSES = 5
+
+    def __init__(self, start: Union[datetime, float, None] = None, auto_advance: bool = False):
+        self._now = _timestamp(start)
+        self.auto_advance = auto_advance
+        self._sleepers: List[Tuple[float, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+
+    def time(self) -> float:
+        return self._now
+
+    @property
+    def pending(self) -> int:
+        """Number of tasks currently sleeping on this clock"""
+        return sum(1 for _, _, f in self._sleepers if not f.done())
+
+    async def sleep(self, seconds: float):
+        if seconds <= 0:
+            await asyncio.sleep(0)
+            return
+        wake_at = self._now + seconds
+        if self.auto_advance and not any(w <= wake_at and not f.done() for w, _, f in self._sleepers):
+            self._now = wake_at
+            await asyncio.sleep(0)
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._sleepers, (wake_at, next(self._seq), future))
+        await future
+
+    async def _settle(self):
+        for _ in range(self.SETTLE_PASSES):
+            await asyncio.sleep(0)
+
+    async def advance(self, seconds: float):
+        """Move time forward by seconds, waking due sleepers in order"""
+        await self.advance_to(self._now + seconds)
+
+    async def advance_to(self, target: Union[datetime, float]):
+        """Move time forward to target, waking due sleepers in order"""
+        target = _timestamp(target)
+        await self._settle()
+        while self._sleepers and self._sleepers[0][0] <= target:
+            wake_at, _, future = heapq.heappop(self._sleepers)
+            self._now = max(self._now, wake_at)
+            if not future.done():
+                future.set_result(None)
+                await self._settle()
+        self._now = max(self._now, target)
+        await self._settle()
+
+    async def run_until_idle(self, limit: float = 7 * 24 * 3600):
+        """Keep advancing to the next sleeper until none remain (or limit seconds pass)"""
+        deadline = self._now + limit
+        await self._settle()
+        while self._sleepers and self._sleepers[0][0] <= deadline:
+            await self.advance_to(self._sleepers[0][0])
+
+    def set(self, moment: Union[datetime, float]):
+        """Jump to moment without waking sleepers (for setting up a scenario)"""
+        self._now = _timestamp(moment)
+
+
+class AcceleratedClock(Clock):
+    """Real time running factor times faster from start"""
+
+    def __init__(self, factor: float = 60.0, start: Union[datetime, float, None] = None):
+        if factor <= 0:
+            raise ValueError("factor must be positive")
+        self.factor = factor
+        self._start = _timestamp(start)
+        self._real_start = _time.monotonic()
+
+    def time(self) -> float:
+        return self._start + (_time.monotonic() - self._real_start) * self.factor
+
+    async def sleep(self, seconds: float):
+        await asyncio.sleep(max(0.0, seconds) / self.factor)
+
+
+_clock: Clock = SystemClock()
+
+
+def get_clock() -> Clock:
+    """Process-wide default clock"""
+    return _clock
+
+
+def set_clock(clock: Optional[Clock]) -> Clock:
+    """Replace the process-wide clock (None restores SystemClock). Returns the previous one."""
+    global _clock
+    previous = _clock
+    _clock = clock or SystemClock()
+    return previous
+
+
+@contextmanager
+def use_clock(clock: Clock):
+    """Temporarily install clock as the process-wide default"""
+    previous = set_clock(clock)
+    try:
+        yield clock
+    finally:
+        set_clock(previous)
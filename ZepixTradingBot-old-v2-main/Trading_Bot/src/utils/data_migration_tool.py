@@ -10,6 +10,8 @@ Features:
 - Perform integrity checks after migration
 - Support dry-run mode for validation
 - Rollback capability for failed migrations
+- Resumable bulk mode: streamed chunks, one transaction and checkpoint per
+  chunk, per-chunk checksums, throughput/progress reporting
 
 Version: 1.0.0
 """
@@ -20,10 +22,14 @@ import json
 import hashlib
 import logging
 import shutil
-from typing import Dict, Any, List, Optional, Tuple
+import time
+from typing import Dict, Any, List, Optional, Tuple, Callable
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
+from pathlib import Path
+
+from src.core.database_access import get_db_pool
 
 logger = logging.getLogger(__name__)
 
@@ -53,6 +59,10 @@ class MigrationResult:
     source_total_pnl: float = 0.0
     target_total_pnl: float = 0.0
     pnl_difference: float = 0.0
+    chunks_completed: int = 0
+    checksum_mismatches: int = 0
+    resumed: bool = False
+    rows_per_second: float = 0.0
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
@@ -69,7 +79,11 @@ class MigrationResult:
             "integrity_check_passed": self.integrity_check_passed,
             "source_total_pnl": self.source_total_pnl,
             "target_total_pnl": self.target_total_pnl,
-            "pnl_difference": self.pnl_difference
+            "pnl_difference": self.pnl_difference,
+            "chunks_completed": self.chunks_completed,
+            "checksum_mismatches": self.checksum_mismatches,
+            "resumed": self.resumed,
+            "rows_per_second": self.rows_per_second
         }
 
 
@@ -153,20 +167,23 @@ class DataMigrationTool:
         os.makedirs(self.backup_dir, exist_ok=True)
     
     def _connect_source(self) -> sqlite3.Connection:
-        """Connect to source V4 database."""
+        """
+        Connect to source V4 database.
+        
+        Read-only and outside the shared pools, so the legacy file keeps its
+        journal mode and no connection to it outlives the migration.
+        """
         if not os.path.exists(self.source_db):
             raise FileNotFoundError(f"Source database not found: {self.source_db}")
         
-        conn = sqlite3.connect(self.source_db)
+        conn = sqlite3.connect(f"{Path(self.source_db).resolve().as_uri()}?mode=ro", uri=True)
         conn.row_factory = sqlite3.Row
         return conn
     
     def _connect_target(self, plugin_id: str) -> sqlite3.Connection:
         """Connect to target V5 plugin database."""
         db_path = os.path.join(self.target_dir, f"zepix_{plugin_id}.db")
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        return get_db_pool(db_path).connect(row_factory=sqlite3.Row)
     
     def _create_backup(self, db_path: str) -> str:
         """
@@ -342,6 +359,23 @@ class DataMigrationTool:
             )
         """)
         
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS migration_checkpoints (
+                migration_key TEXT PRIMARY KEY,
+                last_rowid INTEGER DEFAULT 0,
+                chunks_completed INTEGER DEFAULT 0,
+                records_migrated INTEGER DEFAULT 0,
+                records_skipped INTEGER DEFAULT 0,
+                records_failed INTEGER DEFAULT 0,
+                source_total_pnl REAL DEFAULT 0,
+                target_total_pnl REAL DEFAULT 0,
+                checksum TEXT,
+                status TEXT,
+                started_at TIMESTAMP,
+                updated_at TIMESTAMP
+            )
+        """)
+        
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_trades_status ON trades(status)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_trades_symbol ON trades(symbol)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_trades_entry_time ON trades(entry_time)")
@@ -554,6 +588,332 @@ class DataMigrationTool:
         self._migration_history.append(result)
         return result
     
+    # Columns compared between source and target for per-chunk checksums
+    CHECKSUM_COLUMNS = [m.v5_column for m in V4_TO_V5_COLUMN_MAPPING] + ["signal_data"]
+    
+    @staticmethod
+    def _checksum_value(value: Any) -> Any:
+        """Normalize a value so SQLite column affinity does not change its checksum."""
+        if value is None:
+            return None
+        if isinstance(value, (int, float)):
+            return format(float(value), ".10g")
+        try:
+            return format(float(value), ".10g")
+        except (ValueError, TypeError):
+            return str(value)
+    
+    def _chunk_checksum(self, rows: List[Any]) -> str:
+        """SHA-256 over the checksum columns of rows, in order."""
+        digest = hashlib.sha256()
+        for row in rows:
+            values = [self._checksum_value(row[column]) for column in self.CHECKSUM_COLUMNS]
+            digest.update(json.dumps(values).encode("utf-8"))
+        return digest.hexdigest()
+    
+    def _bulk_filter(self, strategy_filter: Optional[str]) -> Tuple[str, List[Any]]:
+        """WHERE fragment and params for the source query (same filter as migrate_to_plugin)."""
+        if strategy_filter:
+            return " AND (strategy LIKE ? OR logic_type LIKE ?)", [f"%{strategy_filter}%", f"%{strategy_filter}%"]
+        return "", []
+    
+    def _load_checkpoint(self, conn: sqlite3.Connection, migration_key: str) -> Optional[Dict[str, Any]]:
+        row = conn.execute(
+            "SELECT * FROM migration_checkpoints WHERE migration_key = ?", (migration_key,)
+        ).fetchone()
+        return dict(row) if row else None
+    
+    def _save_checkpoint(
+        self,
+        conn: sqlite3.Connection,
+        migration_key: str,
+        last_rowid: int,
+        result: MigrationResult,
+        checksum: str,
+        status: str
+    ):
+        """Write the checkpoint in the caller's transaction (committed with the chunk)."""
+        conn.execute("""
+            INSERT INTO migration_checkpoints
+            (migration_key, last_rowid, chunks_completed, records_migrated, records_skipped,
+             records_failed, source_total_pnl, target_total_pnl, checksum, status, started_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(migration_key) DO UPDATE SET
+                last_rowid = excluded.last_rowid,
+                chunks_completed = excluded.chunks_completed,
+                records_migrated = excluded.records_migrated,
+                records_skipped = excluded.records_skipped,
+                records_failed = excluded.records_failed,
+                source_total_pnl = excluded.source_total_pnl,
+                target_total_pnl = excluded.target_total_pnl,
+                checksum = excluded.checksum,
+                status = excluded.status,
+                updated_at = excluded.updated_at
+        """, (
+            migration_key, last_rowid, result.chunks_completed, result.records_migrated,
+            result.records_skipped, result.records_failed, result.source_total_pnl,
+            result.target_total_pnl, checksum, status, result.started_at.isoformat(),
+            datetime.now().isoformat()
+        ))
+    
+    def _migrate_chunk(self, conn: sqlite3.Connection, rows: List[sqlite3.Row]) -> Dict[str, Any]:
+        """
+        Map and insert one chunk inside the current transaction (not committed).
+        
+        Existing/duplicate tickets are skipped up front so the inserted rows are
+        known exactly and can be checksummed against what landed in the target.
+        """
+        chunk = {"migrated": 0, "skipped": 0, "failed": 0}
+        migration_timestamp = datetime.now().isoformat()
+        mapped = []
+        for v4_row in rows:
+            try:
+                v5_data = self._map_v4_to_v5(v4_row)
+                v5_data["migrated_from"] = "v4"
+                v5_data["migration_timestamp"] = migration_timestamp
+                mapped.append(v5_data)
+            except Exception as e:
+                logger.error(f"Failed to map trade: {e}")
+                chunk["failed"] += 1
+        
+        tickets = [m["mt5_ticket"] for m in mapped if m["mt5_ticket"] is not None]
+        existing = set()
+        for start in range(0, len(tickets), 500):
+            batch = tickets[start:start + 500]
+            found = conn.execute(
+                f"SELECT mt5_ticket FROM trades WHERE mt5_ticket IN ({', '.join('?' for _ in batch)})",
+                batch
+            ).fetchall()
+            existing.update(row[0] for row in found)
+        
+        to_insert = []
+        for v5_data in mapped:
+            ticket = v5_data["mt5_ticket"]
+            if ticket is not None:
+                if ticket in existing:
+                    chunk["skipped"] += 1
+                    continue
+                existing.add(ticket)
+            to_insert.append(v5_data)
+        
+        base_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM trades").fetchone()[0]
+        inserted = to_insert
+        if to_insert:
+            columns = list(to_insert[0].keys())
+            sql = (f"INSERT INTO trades ({', '.join(columns)}) "
+                   f"VALUES ({', '.join('?' for _ in columns)})")
+            try:
+                conn.executemany(sql, [[m[c] for c in columns] for m in to_insert])
+            except sqlite3.Error as e:
+                # A bad row aborts the batch; redo the chunk row by row to isolate it
+                logger.warning(f"Bulk insert failed ({e}), retrying chunk row by row")
+                conn.rollback()
+                inserted = []
+                for v5_data in to_insert:
+                    try:
+                        conn.execute(sql, [v5_data[c] for c in columns])
+                        inserted.append(v5_data)
+                    except sqlite3.Error as row_error:
+                        logger.error(f"Failed to migrate trade: {row_error}")
+                        chunk["failed"] += 1
+        chunk["migrated"] = len(inserted)
+        
+        landed = conn.execute(
+            f"SELECT {', '.join(self.CHECKSUM_COLUMNS)} FROM trades WHERE id > ? ORDER BY id",
+            (base_id,)
+        ).fetchall()
+        chunk["source_checksum"] = self._chunk_checksum(inserted)
+        chunk["target_checksum"] = self._chunk_checksum(landed)
+        chunk["source_pnl"] = sum(m["profit_dollars"] or 0.0 for m in inserted)
+        chunk["target_pnl"] = sum(row["profit_dollars"] or 0.0 for row in landed)
+        return chunk
+    
+    def migrate_to_plugin_bulk(
+        self,
+        plugin_id: str,
+        strategy_filter: Optional[str] = None,
+        chunk_size: int = 5000,
+        resume: bool = True,
+        dry_run: bool = False,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> MigrationResult:
+        """
+        Streaming, resumable migration for large V4 histories.
+        
+        Source rows are read in rowid order through a single cursor in chunks
+        of chunk_size. Each chunk is inserted with executemany and committed in
+        its own transaction together with a checkpoint (last source rowid and
+        running totals), so an interrupted run resumes after the last committed
+        chunk. Each chunk is verified by comparing a checksum of the rows sent
+        with the rows that landed; a mismatch rolls the chunk back and stops.
+        
+        Args:
+            plugin_id: Target plugin ID (e.g., 'combined_v3', 'price_action_1m')
+            strategy_filter: Optional filter to migrate only specific strategies
+            chunk_size: Source rows per chunk/transaction
+            resume: Continue from the stored checkpoint (False starts over)
+            dry_run: If True, only count the rows that would be migrated
+            progress_callback: Called after each chunk with a progress dict
+            
+        Returns:
+            MigrationResult with migration details and throughput
+        """
+        migration_key = f"v4_to_{plugin_id}" + (f":{strategy_filter}" if strategy_filter else "")
+        result = MigrationResult(
+            status=MigrationStatus.IN_PROGRESS,
+            source_db=self.source_db,
+            target_db=os.path.join(self.target_dir, f"zepix_{plugin_id}.db"),
+            started_at=datetime.now()
+        )
+        where, params = self._bulk_filter(strategy_filter)
+        source_conn = None
+        target_conn = None
+        
+        try:
+            source_conn = self._connect_source()
+            
+            if dry_run:
+                count = source_conn.execute(
+                    f"SELECT COUNT(*) FROM trades WHERE 1=1{where}", params
+                ).fetchone()[0]
+                logger.info(f"[DRY RUN] Would migrate {count} trades to {plugin_id}")
+                result.records_migrated = count
+                result.status = MigrationStatus.COMPLETED
+                result.completed_at = datetime.now()
+                self._migration_history.append(result)
+                return result
+            
+            target_exists = os.path.exists(result.target_db)
+            target_conn = self._connect_target(plugin_id)
+            self._ensure_v5_schema(target_conn, plugin_id)
+            
+            if not resume:
+                target_conn.execute("DELETE FROM migration_checkpoints WHERE migration_key = ?", (migration_key,))
+                target_conn.commit()
+            checkpoint = self._load_checkpoint(target_conn, migration_key)
+            
+            last_rowid = 0
+            chain = ""
+            if checkpoint:
+                last_rowid = checkpoint["last_rowid"]
+                chain = checkpoint["checksum"] or ""
+                result.resumed = True
+                result.chunks_completed = checkpoint["chunks_completed"]
+                result.records_migrated = checkpoint["records_migrated"]
+                result.records_skipped = checkpoint["records_skipped"]
+                result.records_failed = checkpoint["records_failed"]
+                result.source_total_pnl = checkpoint["source_total_pnl"]
+                result.target_total_pnl = checkpoint["target_total_pnl"]
+                logger.info(
+                    f"Resuming {migration_key} after source row {last_rowid} "
+                    f"({result.chunks_completed} chunks done)"
+                )
+            elif target_exists:
+                self._create_backup(result.target_db)
+            
+            total = source_conn.execute(
+                f"SELECT COUNT(*) FROM trades WHERE rowid > ?{where}", [last_rowid] + params
+            ).fetchone()[0]
+            source_cursor = source_conn.execute(
+                f"SELECT rowid AS _rowid, * FROM trades WHERE rowid > ?{where} ORDER BY rowid",
+                [last_rowid] + params
+            )
+            
+            started = time.monotonic()
+            processed = 0
+            while True:
+                rows = source_cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                
+                chunk = self._migrate_chunk(target_conn, rows)
+                if chunk["source_checksum"] != chunk["target_checksum"]:
+                    target_conn.rollback()
+                    result.checksum_mismatches += 1
+                    raise RuntimeError(
+                        f"Checksum mismatch in chunk {result.chunks_completed + 1} "
+                        f"(source rows {rows[0]['_rowid']}-{rows[-1]['_rowid']})"
+                    )
+                
+                last_rowid = rows[-1]["_rowid"]
+                chain = hashlib.sha256((chain + chunk["target_checksum"]).encode("utf-8")).hexdigest()
+                result.chunks_completed += 1
+                result.records_migrated += chunk["migrated"]
+                result.records_skipped += chunk["skipped"]
+                result.records_failed += chunk["failed"]
+                result.source_total_pnl += chunk["source_pnl"]
+                result.target_total_pnl += chunk["target_pnl"]
+                self._save_checkpoint(target_conn, migration_key, last_rowid, result, chain, "IN_PROGRESS")
+                target_conn.commit()
+                
+                processed += len(rows)
+                elapsed = time.monotonic() - started
+                result.rows_per_second = processed / elapsed if elapsed > 0 else 0.0
+                progress = {
+                    "migration_key": migration_key,
+                    "chunk": result.chunks_completed,
+                    "rows_processed": processed,
+                    "rows_total": total,
+                    "percent": round(processed / total * 100.0, 1) if total else 100.0,
+                    "rows_per_second": round(result.rows_per_second, 1),
+                    "eta_seconds": round((total - processed) / result.rows_per_second, 1)
+                                   if result.rows_per_second else None,
+                    "last_rowid": last_rowid
+                }
+                logger.info(
+                    f"[Migration] {migration_key} chunk {progress['chunk']}: "
+                    f"{processed}/{total} rows ({progress['percent']}%), "
+                    f"{progress['rows_per_second']} rows/s"
+                )
+                if progress_callback:
+                    progress_callback(progress)
+            
+            self._save_checkpoint(target_conn, migration_key, last_rowid, result, chain, "COMPLETED")
+            result.pnl_difference = abs(result.source_total_pnl - result.target_total_pnl)
+            result.integrity_check_passed = result.pnl_difference < 0.01
+            result.completed_at = datetime.now()
+            target_conn.execute("""
+                INSERT INTO migration_log 
+                (source_db, migration_type, records_migrated, records_failed, started_at, completed_at, status, checksum, notes)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                self.source_db,
+                migration_key,
+                result.records_migrated,
+                result.records_failed,
+                result.started_at.isoformat(),
+                result.completed_at.isoformat(),
+                "COMPLETED",
+                chain,
+                f"bulk: {result.chunks_completed} chunks, {result.rows_per_second:.0f} rows/s"
+                + (" (resumed)" if result.resumed else "")
+            ))
+            target_conn.commit()
+            
+            result.status = MigrationStatus.COMPLETED
+            logger.info(
+                f"Bulk migration completed: {result.records_migrated} migrated, "
+                f"{result.records_failed} failed, {result.records_skipped} skipped "
+                f"in {result.chunks_completed} chunks"
+            )
+            
+        except Exception as e:
+            if target_conn is not None:
+                target_conn.rollback()
+            result.status = MigrationStatus.FAILED
+            result.error_message = str(e)
+            result.completed_at = datetime.now()
+            logger.error(f"Bulk migration failed: {e}")
+        
+        finally:
+            if target_conn is not None:
+                target_conn.close()
+            if source_conn is not None:
+                source_conn.close()
+        
+        self._migration_history.append(result)
+        return result
+    
     def migrate_to_v3_plugin(self, dry_run: bool = True) -> MigrationResult:
         """
         Migrate V4 trades to V3 Combined Logic plugin database.
@@ -775,6 +1135,14 @@ Timing:
   - Duration: {duration}
 """
         
+        if result.chunks_completed:
+            report += (
+                f"\nBulk:\n"
+                f"  - Chunks: {result.chunks_completed}\n"
+                f"  - Throughput: {result.rows_per_second:.0f} rows/s\n"
+                f"  - Resumed: {'Yes' if result.resumed else 'No'}\n"
+            )
+        
         if result.error_message:
             report += f"\nError: {result.error_message}\n"
         
@@ -1,5 +1,6 @@
-from typing import Dict, Tuple
+from typing import Dict, Tuple, Optional
 from src.config import Config
+from src.clients.symbol_registry import SymbolRegistry, default_pip_size
 
 class PipCalculator:
     """
@@ -8,8 +9,10 @@ class PipCalculator:
     MT5Client handles the mapping to broker symbols (GOLD)
     """
     
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, symbol_registry: Optional[SymbolRegistry] = None):
         self.config = config
+        # Broker metadata cache (shared with MT5Client) for symbols missing from config
+        self.symbol_registry = symbol_registry
         
     def calculate_sl_price(self, symbol: str, entry_price: float, 
                           direction: str, lot_size: float, 
@@ -127,7 +130,12 @@ class PipCalculator:
         Pip value is the monetary value of one pip movement
         """
         
-        symbol_config = self.config["symbol_config"][symbol]
+        symbol_config = (self.config["symbol_config"] or {}).get(symbol)
+        if symbol_config is None and self.symbol_registry is not None:
+            # Not configured - derive from broker tick value
+            return self.symbol_registry.pip_value(symbol, lot_size)
+        if symbol_config is None:
+            raise KeyError(symbol)
         
         # Get pip value for 1 standard lot (base value)
         pip_value_std = symbol_config["pip_value_per_std_lot"]
@@ -142,12 +150,14 @@ class PipCalculator:
         Get pip size for a symbol
         Returns: float (pip size in price units)
         """
+        if self.symbol_registry is not None:
+            return self.symbol_registry.pip_size(symbol)
         try:
             symbol_config = self.config["symbol_config"][symbol]
             return symbol_config["pip_size"]
-        except KeyError:
+        except (KeyError, TypeError):
             # Default pip size if symbol not found
-            return 0.0001
+            return default_pip_size(symbol)
     
     def get_pip_value(self, symbol: str, lot_size: float) -> float:
         """
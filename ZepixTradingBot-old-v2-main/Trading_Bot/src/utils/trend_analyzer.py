@@ -1,75 +1,255 @@
-import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from collections import deque
+from datetime import datetime
 import logging
 
+from src.utils.clock import get_clock
+from src.core.event_bus import TrendChanged
+
+# Indicator periods (SMA fast/slow, bars before the latest for HH/LL)
+FAST_PERIOD = 7
+SLOW_PERIOD = 14
+EXTREMA_WINDOW = 4
+HISTORY_BARS = 20
+
+TIMEFRAME_UNITS = {"m": 60, "h": 3600, "d": 86400}
+
+
+def timeframe_seconds(timeframe):
+    """'15m' -> 900, '1h' -> 3600, 'M15' / 'H1' style also accepted"""
+    tf = str(timeframe).strip().lower()
+    if tf[0] in TIMEFRAME_UNITS and tf[1:].isdigit():
+        tf = tf[1:] + tf[0]
+    return int(tf[:-1] or 1) * TIMEFRAME_UNITS[tf[-1]]
+
+
+class TrendState:
+    """
+    Streaming indicator state for one (symbol, timeframe).
+
+    Running sums give SMA7/SMA14 and monotonic deques give the rolling
+    high/low of the 4 bars before the latest, so each bar is O(1) amortized.
+    """
+
+    def __init__(self, key=None):
+        self.key = key  # (symbol, timeframe)
+        self.closes = deque(maxlen=SLOW_PERIOD)
+        self.sum_fast = 0.0
+        self.sum_slow = 0.0
+        self.latest = None  # (high, low) of the most recent bar
+        self.max_window = deque()  # (index, high), decreasing
+        self.min_window = deque()  # (index, low), increasing
+        self.count = 0
+        self.last_time = None
+        self.trend = None  # Cached until the next bar
+        self.last_trend = None  # Last scored trend, survives new bars
+        self.score = 0
+        self.valid_until = 0.0
+
+    @property
+    def warm(self):
+        return self.count >= SLOW_PERIOD
+
+    def push(self, high, low, close, bar_time=None):
+        """Append a closed bar"""
+        index = self.count
+        if self.latest is not None:
+            prev_high, prev_low = self.latest
+            while self.max_window and self.max_window[-1][1] <= prev_high:
+                self.max_window.pop()
+            self.max_window.append((index - 1, prev_high))
+            while self.min_window and self.min_window[-1][1] >= prev_low:
+                self.min_window.pop()
+            self.min_window.append((index - 1, prev_low))
+            for window in (self.max_window, self.min_window):
+                while window[0][0] < index - EXTREMA_WINDOW:
+                    window.popleft()
+
+        if len(self.closes) >= FAST_PERIOD:
+            self.sum_fast -= self.closes[-FAST_PERIOD]
+        if len(self.closes) == SLOW_PERIOD:
+            self.sum_slow -= self.closes[0]
+        self.closes.append(close)
+        self.sum_fast += close
+        self.sum_slow += close
+
+        self.latest = (high, low)
+        self.last_time = bar_time
+        self.count += 1
+        self.trend = None
+
+    def replace_last(self, high, low, close):
+        """Update the most recent bar in place (bar was still forming)"""
+        delta = close - self.closes[-1]
+        self.closes[-1] = close
+        self.sum_fast += delta
+        self.sum_slow += delta
+        self.latest = (high, low)
+        self.trend = None
+
+
 class TrendAnalyzer:
     """
     Autonomous trend detection for re-entry decisions.
     Uses Price Action (High/Low analysis) and simple Momentum.
+
+    State is kept per (symbol, timeframe) and updated incrementally, either
+    pushed via on_bar_close() or pulled from mt5_client.get_candles() once
+    per bar. Scores are cached until the next bar closes; score_all() scores
+    every watched symbol in one vectorized pass. With an event_bus attached,
+    a TrendChanged event is published whenever a scored trend flips.
     """
-    
-    def __init__(self, mt5_client):
+
+    def __init__(self, mt5_client, clock=None, event_bus=None):
         self.mt5_client = mt5_client
+        self.clock = clock or get_clock()
+        self.event_bus = event_bus
         self.logger = logging.getLogger(__name__)
-        
+        self.states = {}  # (symbol, timeframe) -> TrendState
+        self.watched = {}  # timeframe -> set of symbols
+        self.stats = {"hits": 0, "misses": 0, "fetches": 0, "bars": 0}
+
+    def _state(self, symbol, timeframe):
+        key = (symbol, timeframe)
+        state = self.states.get(key)
+        if state is None:
+            state = self.states[key] = TrendState(key)
+        return state
+
+    def _next_close(self, timeframe):
+        """Epoch seconds at which the current bar closes"""
+        period = timeframe_seconds(timeframe)
+        return (int(self.clock.time()) // period + 1) * period
+
+    def watch(self, symbols, timeframe="15m"):
+        """Add symbols to the batch scored by score_all()"""
+        self.watched.setdefault(timeframe, set()).update(symbols)
+
+    def on_bar_close(self, symbol, timeframe, bar):
+        """Feed a closed bar ({'high', 'low', 'close', optional 'time'}); O(1)"""
+        state = self._state(symbol, timeframe)
+        self._apply(state, bar)
+        state.valid_until = self._next_close(timeframe)
+
+    def _apply(self, state, bar):
+        bar_time = bar.get('time')
+        if bar_time is not None and state.last_time is not None:
+            if bar_time < state.last_time:
+                return
+            if bar_time == state.last_time:
+                state.replace_last(bar['high'], bar['low'], bar['close'])
+                return
+        state.push(bar['high'], bar['low'], bar['close'], bar_time)
+        self.stats["bars"] += 1
+
+    def _refresh(self, symbol, timeframe, state):
+        """Pull only the bars missed since the last update"""
+        if state.count and state.last_time is not None:
+            # Bar times are open times. Re-fetch the last bar we hold as well:
+            # it may have been the forming bar, and it is overwritten with its
+            # final close by _apply()
+            missed = int((self.clock.time() - self._epoch(state.last_time)) // timeframe_seconds(timeframe))
+            count = max(1, min(HISTORY_BARS, missed + 1))
+        else:
+            count = HISTORY_BARS
+        candles = self.mt5_client.get_candles(symbol, timeframe, count)
+        self.stats["fetches"] += 1
+        if not candles:
+            self.logger.warning(f"TrendAnalyzer: No candles found for {symbol}")
+            # Retry on the next bar rather than on every call
+            state.valid_until = self._next_close(timeframe)
+            return
+        if candles[-1].get('time') is None:
+            # No bar times to line up against; rebuild from the fetched window
+            self.states[(symbol, timeframe)] = state = TrendState((symbol, timeframe))
+        for bar in candles:
+            self._apply(state, bar)
+        state.valid_until = self._next_close(timeframe)
+
+    @staticmethod
+    def _epoch(bar_time):
+        if isinstance(bar_time, datetime):
+            return bar_time.timestamp()
+        return float(bar_time)
+
+    def _fresh_state(self, symbol, timeframe):
+        state = self._state(symbol, timeframe)
+        if state.trend is not None and self.clock.time() < state.valid_until:
+            self.stats["hits"] += 1
+            return state
+        self.stats["misses"] += 1
+        if self.clock.time() >= state.valid_until:
+            self._refresh(symbol, timeframe, state)
+            state = self.states[(symbol, timeframe)]
+        return state
+
+    def _score_states(self, states):
+        """Score states in one vectorized pass and cache the trend on each"""
+        warm = [s for s in states if s.warm]
+        for state in states:
+            if not state.warm:
+                state.score, state.trend = 0, "NEUTRAL"
+        if warm:
+            self._score_warm(warm)
+        if self.event_bus is not None:
+            for state in states:
+                if state.last_trend is not None and state.trend != state.last_trend and state.key:
+                    self.event_bus.publish(TrendChanged(
+                        symbol=state.key[0], timeframe=state.key[1],
+                        previous=state.last_trend, trend=state.trend
+                    ))
+        for state in states:
+            state.last_trend = state.trend
+
+    @staticmethod
+    def _score_warm(warm):
+        sma_fast = np.array([s.sum_fast for s in warm]) / FAST_PERIOD
+        sma_slow = np.array([s.sum_slow for s in warm]) / SLOW_PERIOD
+        close = np.array([s.closes[-1] for s in warm])
+        prev_close = np.array([s.closes[-2] for s in warm])
+        high = np.array([s.latest[0] for s in warm])
+        low = np.array([s.latest[1] for s in warm])
+        window_high = np.array([s.max_window[0][1] for s in warm])
+        window_low = np.array([s.min_window[0][1] for s in warm])
+
+        # SCORING SYSTEM: MA cross, momentum, higher high / lower low
+        scores = (np.sign(sma_fast - sma_slow) + np.sign(close - prev_close)
+                  + (high >= window_high) - (low <= window_low)).astype(int)
+        trends = np.where(scores >= 2, "BULLISH", np.where(scores <= -2, "BEARISH", "NEUTRAL"))
+        for state, score, trend in zip(warm, scores, trends):
+            state.score, state.trend = int(score), str(trend)
+
     def get_current_trend(self, symbol, timeframe="15m"):
         """
         Determines the current trend for a symbol.
         Returns: 'BULLISH', 'BEARISH', or 'NEUTRAL'
         """
         try:
-            # Get last 20 candles
-            candles = self.mt5_client.get_candles(symbol, timeframe, 20)
-            if not candles:
-                self.logger.warning(f"TrendAnalyzer: No candles found for {symbol}")
-                return "NEUTRAL"
-            
-            # Convert to DataFrame for easier analysis
-            df = pd.DataFrame(candles)
-            
-            # 1. Price Momentum Check (Last 3 candles)
-            close = df['close'].values
-            momentum_bullish = close[-1] > close [-2]
-            momentum_bearish = close[-1] < close [-2]
-            
-            # 2. Moving Average Check (Simple SMA 7 vs SMA 14)
-            sma_7 = np.mean(close[-7:])
-            sma_14 = np.mean(close[-14:])
-            
-            ma_bullish = sma_7 > sma_14
-            ma_bearish = sma_7 < sma_14
-            
-            # 3. Simple High/Low Check (Price Action)
-            # Recent high higher than previous high?
-            highs = df['high'].values
-            lows = df['low'].values
-            
-            hh_bullish = highs[-1] >= np.max(highs[-5:-1])
-            ll_bearish = lows[-1] <= np.min(lows[-5:-1])
-            
-            # SCORING SYSTEM
-            score = 0
-            if ma_bullish: score += 1
-            if momentum_bullish: score += 1
-            if hh_bullish: score += 1
-            
-            if ma_bearish: score -= 1
-            if momentum_bearish: score -= 1
-            if ll_bearish: score -= 1
-            
-            # Determine Trend
-            if score >= 2:
-                return "BULLISH"
-            elif score <= -2:
-                return "BEARISH"
-            else:
-                return "NEUTRAL"
-                
+            state = self._fresh_state(symbol, timeframe)
+            if state.trend is None:
+                self._score_states([state])
+            return state.trend
+
         except Exception as e:
             self.logger.error(f"Error in TrendAnalyzer.get_current_trend: {e}")
             return "NEUTRAL"
 
+    def score_all(self, timeframe="15m", symbols=None):
+        """
+        Trend for every watched symbol (or `symbols`) in one pass.
+        Returns: {symbol: 'BULLISH' | 'BEARISH' | 'NEUTRAL'}
+        """
+        symbols = list(symbols if symbols is not None else self.watched.get(timeframe, ()))
+        states = {}
+        for symbol in symbols:
+            try:
+                states[symbol] = self._fresh_state(symbol, timeframe)
+            except Exception as e:
+                self.logger.error(f"Error refreshing trend for {symbol}: {e}")
+        self._score_states([s for s in states.values() if s.trend is None])
+        return {symbol: states[symbol].trend if symbol in states else "NEUTRAL"
+                for symbol in symbols}
+
     def is_aligned(self, trade_direction, trend):
         """
         Checks if trade direction matches the detected trend.
@@ -133,7 +133,9 @@ class AuditConfig(Config):
 
 class TestTradeDatabase(TradeDatabase):
     def __init__(self, db_name):
-        self.conn = sqlite3.connect(db_name, check_same_thread=False)
+        from src.core.database_access import get_db_pool
+        self.pool = get_db_pool(db_name)
+        self.conn = self.pool.writer_connection
         self.create_tables()
 
 class MockAlertProcessor:
@@ -0,0 +1,191 @@
+"""
+Account State Service Tests
+
+Tests for:
+1. AccountStateService - TTL caching, single reload under concurrency, bounded stale fallback
+2. Invalidation - fills and closes force the next read to reload
+3. MT5Client - account getters served from one shared snapshot
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import namedtuple
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.clients.account_state import AccountStateService, AccountSnapshot
+
+AccountInfo = namedtuple("AccountInfo", "balance equity margin margin_free margin_level leverage")
+
+
+class CountingLoader:
+    """Loader returning a new balance on every call"""
+
+    def __init__(self, delay: float = 0.0):
+        self.calls = 0
+        self.delay = delay
+        self.fail = False
+
+    def __call__(self):
+        self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("terminal offline")
+        balance = 1000.0 + self.calls
+        return AccountInfo(balance, balance + 5, 100.0, balance - 95, 1000.0, 500)
+
+
+class TestAccountStateService:
+    """Test snapshot caching"""
+
+    def test_reads_within_ttl_hit_cache(self):
+        loader = CountingLoader()
+        service = AccountStateService(loader, ttl_seconds=60)
+
+        first = service.get()
+        second = service.get()
+
+        assert first is second
+        assert loader.calls == 1
+        assert first.free_margin == 906.0 and first.leverage == 500
+        stats = service.get_stats()
+        assert stats["hits"] == 1 and stats["misses"] == 1 and stats["hit_rate"] == 0.5
+
+    def test_expired_snapshot_reloads(self):
+        loader = CountingLoader()
+        service = AccountStateService(loader, ttl_seconds=0.01)
+
+        first = service.get()
+        time.sleep(0.02)
+        second = service.get()
+
+        assert second.balance == 1002.0
+        assert second.version == first.version + 1
+
+    def test_max_age_tightens_freshness(self):
+        loader = CountingLoader()
+        service = AccountStateService(loader, ttl_seconds=60)
+        service.get()
+        time.sleep(0.01)
+
+        assert service.get(max_age=0.001).balance == 1002.0
+
+    def test_concurrent_readers_share_one_reload(self):
+        loader = CountingLoader(delay=0.05)
+        service = AccountStateService(loader, ttl_seconds=60)
+        results = []
+
+        threads = [threading.Thread(target=lambda: results.append(service.get())) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert loader.calls == 1
+        assert len({id(r) for r in results}) == 1
+
+    def test_failed_reload_serves_last_snapshot(self):
+        loader = CountingLoader()
+        service = AccountStateService(loader, ttl_seconds=60)
+        first = service.get()
+        service.invalidate("close")
+        loader.fail = True
+
+        assert service.get() is first
+        assert service.stats["failures"] == 1
+
+    def test_failed_reloads_stop_serving_after_max_staleness(self):
+        loader = CountingLoader()
+        service = AccountStateService(loader, ttl_seconds=0.01, max_stale_seconds=0.05)
+        first = service.get()
+        loader.fail = True
+
+        time.sleep(0.02)
+        assert service.get() is first  # Past TTL, within the staleness bound
+        time.sleep(0.04)
+
+        assert service.get() is None
+        assert service.stats["expired"] == 1
+        loader.fail = False
+        assert service.get().balance == 1004.0
+
+    def test_snapshot_from_dict(self):
+        snapshot = AccountSnapshot.from_account_info(
+            {"balance": 10.0, "equity": 11.0, "free_margin": 9.0, "margin": 2.0,
+             "margin_level": 550.0, "source": "simulation"})
+
+        assert snapshot.to_dict() == {"balance": 10.0, "equity": 11.0, "free_margin": 9.0,
+                                      "margin": 2.0, "margin_level": 550.0}
+        assert snapshot.source == "simulation"
+
+
+class TestInvalidation:
+    """Test event-based invalidation"""
+
+    def test_invalidate_forces_reload(self):
+        loader = CountingLoader()
+        service = AccountStateService(loader, ttl_seconds=60)
+        service.get()
+
+        service.invalidate("fill")
+
+        assert service.get().balance == 1002.0
+        assert service.get_stats()["last_invalidation"] == "fill"
+
+    def test_invalidation_during_load_keeps_snapshot_stale(self):
+        service = None
+
+        def loader():
+            # A fill lands while the account is being read
+            service.invalidate("fill")
+            return AccountInfo(1.0, 1.0, 0.0, 1.0, 0.0, 1)
+
+        service = AccountStateService(loader, ttl_seconds=60)
+        service.get()
+        service.get()
+
+        assert service.stats["refreshes"] == 2
+
+
+class TestMT5ClientAccountState:
+    """Test MT5Client account getters on the shared snapshot"""
+
+    @pytest.fixture
+    def client(self):
+        try:
+            from src.clients.mt5_client import MT5Client
+        except ImportError:
+            pytest.skip("MT5Client not available for import")
+
+        client = MT5Client({"simulate_orders": True, "account_state_ttl_seconds": 60})
+        client.initialized = True
+        return client
+
+    def test_getters_share_one_load(self, client):
+        client.get_account_balance()
+        client.get_account_equity()
+        client.get_free_margin()
+        client.get_margin_level()
+        assert client.is_margin_safe()
+        assert client.get_account_info_detailed()["margin_level"] == 1000.0
+
+        stats = client.account_state.get_stats()
+        assert stats["misses"] == 1 and stats["hits"] == 5
+
+    def test_orders_and_closes_invalidate(self, client):
+        client.get_account_balance()
+
+        client.place_order("EURUSD", "buy", 0.1, 1.1, 1.09)
+        client.get_account_balance()
+        client.close_position(123456)
+        client.get_account_balance()
+
+        stats = client.account_state.get_stats()
+        assert stats["invalidations"] == 2
+        assert stats["misses"] == 3
+        assert stats["last_invalidation"] == "close"
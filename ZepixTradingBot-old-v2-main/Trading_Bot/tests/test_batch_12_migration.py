@@ -394,6 +394,123 @@ class TestDataMigrationTool:
         assert "Migrated: 3" in report
 
 
+class TestBulkMigration:
+    """Test resumable chunked bulk migration"""
+    
+    ROWS = 2500
+    
+    @pytest.fixture
+    def large_v4_database(self):
+        """Create a V4 database with a few thousand trades"""
+        temp_dir = tempfile.mkdtemp()
+        db_path = os.path.join(temp_dir, "trading_bot.db")
+        conn = sqlite3.connect(db_path)
+        conn.execute("""
+            CREATE TABLE trades (
+                id INTEGER PRIMARY KEY,
+                trade_id TEXT,
+                symbol TEXT,
+                entry_price REAL,
+                lot_size REAL,
+                direction TEXT,
+                strategy TEXT,
+                pnl REAL,
+                status TEXT,
+                open_time DATETIME,
+                chain_id TEXT
+            )
+        """)
+        conn.executemany("""
+            INSERT INTO trades (trade_id, symbol, entry_price, lot_size, direction, strategy, pnl, status, open_time, chain_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [
+            (str(100000 + i), "XAUUSD" if i % 2 else "EURUSD", 2000.0 + i / 100, 0.1,
+             "BUY" if i % 3 else "SELL", "V3_Combined", round((i % 17) - 8.25, 2), "closed",
+             f"2024-01-01 00:{i % 60:02d}:00", f"chain_{i // 10}")
+            for i in range(self.ROWS)
+        ])
+        conn.commit()
+        conn.close()
+        
+        yield temp_dir, db_path
+        
+        shutil.rmtree(temp_dir)
+    
+    def make_tool(self, temp_dir, db_path):
+        return DataMigrationTool(
+            source_db=db_path,
+            target_dir=os.path.join(temp_dir, "target"),
+            backup_dir=os.path.join(temp_dir, "backup")
+        )
+    
+    def test_bulk_migration_chunks_and_verifies(self, large_v4_database):
+        """Test all rows land in chunks with matching checksums and P&L"""
+        temp_dir, db_path = large_v4_database
+        tool = self.make_tool(temp_dir, db_path)
+        progress = []
+        
+        result = tool.migrate_to_plugin_bulk("combined_v3", chunk_size=1000, progress_callback=progress.append)
+        
+        assert result.status == MigrationStatus.COMPLETED
+        assert result.records_migrated == self.ROWS
+        assert result.chunks_completed == 3
+        assert result.integrity_check_passed
+        assert result.rows_per_second > 0
+        assert [p["rows_processed"] for p in progress] == [1000, 2000, 2500]
+        assert progress[-1]["percent"] == 100.0
+        assert tool.verify_integrity("combined_v3")["passed"]
+        assert "Chunks: 3" in tool.format_migration_report(result)
+    
+    def test_interrupted_migration_resumes_from_checkpoint(self, large_v4_database):
+        """Test an interrupted run continues after the last committed chunk"""
+        temp_dir, db_path = large_v4_database
+        tool = self.make_tool(temp_dir, db_path)
+        
+        def interrupt(progress):
+            if progress["chunk"] == 2:
+                raise KeyboardInterrupt
+        
+        with pytest.raises(KeyboardInterrupt):
+            tool.migrate_to_plugin_bulk("combined_v3", chunk_size=1000, progress_callback=interrupt)
+        resumed = tool.migrate_to_plugin_bulk("combined_v3", chunk_size=1000)
+        
+        assert resumed.resumed and resumed.status == MigrationStatus.COMPLETED
+        assert resumed.records_migrated == self.ROWS
+        assert resumed.chunks_completed == 3
+        assert resumed.integrity_check_passed
+        target = sqlite3.connect(os.path.join(temp_dir, "target", "zepix_combined_v3.db"))
+        assert target.execute("SELECT COUNT(*) FROM trades").fetchone()[0] == self.ROWS
+        target.close()
+    
+    def test_rerun_skips_existing_tickets(self, large_v4_database):
+        """Test a fresh run over migrated data inserts nothing new"""
+        temp_dir, db_path = large_v4_database
+        tool = self.make_tool(temp_dir, db_path)
+        tool.migrate_to_plugin_bulk("combined_v3", chunk_size=1000)
+        
+        again = tool.migrate_to_plugin_bulk("combined_v3", chunk_size=1000, resume=False)
+        
+        assert again.status == MigrationStatus.COMPLETED
+        assert again.records_migrated == 0
+        assert again.records_skipped == self.ROWS
+    
+    def test_bad_rows_isolated_within_chunk(self, large_v4_database):
+        """Test a constraint violation fails only the offending row"""
+        temp_dir, db_path = large_v4_database
+        conn = sqlite3.connect(db_path)
+        conn.execute("UPDATE trades SET direction = 'LONG' WHERE id = 1500")
+        conn.commit()
+        conn.close()
+        tool = self.make_tool(temp_dir, db_path)
+        
+        result = tool.migrate_to_plugin_bulk("combined_v3", chunk_size=1000)
+        
+        assert result.status == MigrationStatus.COMPLETED
+        assert result.records_failed == 1
+        assert result.records_migrated == self.ROWS - 1
+        assert result.integrity_check_passed
+
+
 class TestFactoryFunction:
     """Test factory function"""
     
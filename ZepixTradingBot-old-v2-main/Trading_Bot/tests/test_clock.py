@@ -0,0 +1,257 @@
+"""
+Clock Tests
+
+Tests for:
+1. VirtualClock - sleepers wake in order, wait_for timeouts, auto-advance
+2. AcceleratedClock / process clock - scaling, temporary installation, abstract interface
+3. Time-based components - recovery windows, SL-hunt expirations, sessions,
+   fixed clock loop and daily risk rollover driven by simulated time
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.clock import (
+    AcceleratedClock, Clock, SystemClock, VirtualClock, get_clock, use_clock
+)
+
+START = datetime(2026, 1, 14, 9, 0, 0)
+
+
+class TestVirtualClock:
+    """Test simulated time"""
+
+    def test_advance_wakes_sleepers_in_order(self):
+        async def scenario():
+            clock = VirtualClock(start=START)
+            woke = []
+
+            async def sleeper(name, seconds):
+                await clock.sleep(seconds)
+                woke.append((name, clock.now()))
+
+            tasks = [asyncio.create_task(sleeper("late", 120)),
+                     asyncio.create_task(sleeper("early", 60))]
+            await clock.advance(90)
+            assert [name for name, _ in woke] == ["early"]
+            assert clock.pending == 1
+
+            await clock.advance(60)
+            await asyncio.gather(*tasks)
+            return woke, clock
+
+        woke, clock = asyncio.run(scenario())
+
+        assert woke == [("early", START + timedelta(seconds=60)),
+                        ("late", START + timedelta(seconds=120))]
+        assert clock.now() == START + timedelta(seconds=150)
+
+    def test_periodic_loop_sees_every_interval(self):
+        async def scenario():
+            clock = VirtualClock(start=START)
+            ticks = []
+
+            async def loop():
+                while True:
+                    await clock.sleep(1)
+                    ticks.append(clock.time())
+
+            task = asyncio.create_task(loop())
+            await clock.advance(30 * 60)
+            task.cancel()
+            return ticks
+
+        started = time.perf_counter()
+        ticks = asyncio.run(scenario())
+
+        assert len(ticks) == 1800
+        assert time.perf_counter() - started < 5
+
+    def test_wait_for_times_out_on_virtual_time(self):
+        async def scenario():
+            clock = VirtualClock(start=START)
+            never = asyncio.Event()
+            waiter = asyncio.create_task(clock.wait_for(never.wait(), timeout=300))
+            await clock.advance(299)
+            assert not waiter.done()
+            await clock.advance(1)
+            with pytest.raises(asyncio.TimeoutError):
+                await waiter
+
+        asyncio.run(scenario())
+
+    def test_auto_advance_runs_single_task_to_completion(self):
+        clock = VirtualClock(start=START, auto_advance=True)
+
+        asyncio.run(clock.sleep(3600))
+
+        assert clock.now() == START + timedelta(hours=1)
+        assert clock.today() == START.date()
+
+
+class TestProcessClock:
+    """Test accelerated and process-wide clocks"""
+
+    def test_accelerated_clock_scales_sleep(self):
+        clock = AcceleratedClock(factor=1000, start=START)
+
+        started = time.perf_counter()
+        asyncio.run(clock.sleep(10))
+
+        assert time.perf_counter() - started < 1
+        assert clock.now() >= START + timedelta(seconds=10)
+
+    def test_use_clock_restores_previous(self):
+        virtual = VirtualClock(start=START)
+
+        with use_clock(virtual):
+            assert get_clock() is virtual
+        assert isinstance(get_clock(), SystemClock)
+
+    def test_clock_interface_is_abstract(self):
+        class HalfClock(Clock):
+            def time(self):
+                return 0.0
+
+        with pytest.raises(TypeError):
+            Clock()
+        with pytest.raises(TypeError):
+            HalfClock()  # sleep() not implemented
+
+
+class TestTimeBasedComponents:
+    """Test components driven by a virtual clock"""
+
+    def test_recovery_window_times_out_in_simulated_time(self):
+        try:
+            from src.managers.recovery_window_monitor import RecoveryWindowMonitor
+        except ImportError:
+            pytest.skip("RecoveryWindowMonitor not available for import")
+
+        async def scenario():
+            clock = VirtualClock(start=START)
+            manager = MagicMock()
+            manager.config = {"sl_hunt_recovery.min_recovery_pips": 2}
+            manager.handle_recovery_timeout = AsyncMock()
+
+            monitor = RecoveryWindowMonitor(manager, clock=clock)
+            # Price stays below the recovery level for the whole window
+            monitor._get_current_price = lambda symbol: 1.0950
+            await monitor.start_monitoring(1, "EURUSD", "BUY", 1.0960, original_order=None)
+
+            await clock.advance(29 * 60)
+            status = monitor.get_monitor_status(1)
+            await clock.advance(2 * 60)
+            return manager, monitor, status
+
+        started = time.perf_counter()
+        manager, monitor, status = asyncio.run(scenario())
+
+        assert status is not None
+        manager.handle_recovery_timeout.assert_awaited_once_with(order_id=1, order_type="A")
+        assert monitor.get_active_monitors_count() == 0
+        assert time.perf_counter() - started < 5
+
+    def test_sl_hunt_window_expires_on_virtual_clock(self):
+        try:
+            from src.services.price_monitor_service import PriceMonitorService
+        except ImportError:
+            pytest.skip("PriceMonitorService not available for import")
+
+        async def scenario():
+            clock = VirtualClock(start=START)
+            config = {"re_entry_config": {"sl_hunt_reentry_enabled": True}}
+            service = PriceMonitorService(config, MagicMock(), MagicMock(), MagicMock(),
+                                          MagicMock(), MagicMock(), clock=clock)
+            # Price never reaches the target, so only expiry can clear the entry
+            service._get_current_price = lambda symbol, direction: 1.0900
+            service.sl_hunt_pending["EURUSD"] = [{
+                "target_price": 1.1000, "direction": "buy", "chain_id": "c1",
+                "expiration_time": clock.now() + timedelta(minutes=30)}]
+
+            await clock.advance(29 * 60)
+            await service._check_sl_hunt_reentries()
+            still_pending = "EURUSD" in service.sl_hunt_pending
+            await clock.advance(2 * 60)
+            await service._check_sl_hunt_reentries()
+            return still_pending, service
+
+        still_pending, service = asyncio.run(scenario())
+
+        assert still_pending
+        assert "EURUSD" not in service.sl_hunt_pending
+
+    def test_session_follows_virtual_clock(self):
+        try:
+            import pytz
+            from src.managers.session_manager import SessionManager
+        except ImportError:
+            pytest.skip("SessionManager not available for import")
+
+        tz = pytz.timezone("Asia/Kolkata")
+        clock = VirtualClock(start=tz.localize(datetime(2026, 1, 14, 10, 0)))
+        db = MagicMock()
+        db.get_active_session.return_value = None
+        config = {"session_manager": {"timezone": "Asia/Kolkata", "sessions": {
+            "asian": {"start": "05:30", "end": "14:30", "allowed_symbols": ["USDJPY"]},
+            "london": {"start": "13:00", "end": "22:00", "allowed_symbols": ["EURUSD"]},
+        }}}
+        manager = SessionManager(config, db, MagicMock(), clock=clock)
+
+        assert manager.get_current_session() == "asian"
+        clock.set(tz.localize(datetime(2026, 1, 14, 15, 0)))
+        assert manager.get_current_session() == "london"
+        clock.set(tz.localize(datetime(2026, 1, 14, 23, 0)))
+        assert manager.get_current_session() == "none"
+
+    def test_fixed_clock_loop_ticks_on_virtual_time(self):
+        try:
+            from src.modules.fixed_clock_system import FixedClockSystem
+        except ImportError:
+            pytest.skip("FixedClockSystem not available for import")
+
+        async def scenario():
+            clock = VirtualClock(start=START)
+            system = FixedClockSystem(clock=clock)
+            messages = []
+            system.register_callback(messages.append)
+
+            task = asyncio.create_task(system.start_clock_loop(update_interval=1))
+            await clock.advance(59)
+            system.stop_clock()
+            await clock.advance(1)
+            await task
+            return messages
+
+        messages = asyncio.run(scenario())
+
+        assert len(messages) == 60
+
+    def test_daily_risk_counters_roll_at_virtual_midnight(self):
+        try:
+            from src.managers.risk_ledger import RiskLedger, RiskEventType
+        except ImportError:
+            pytest.skip("RiskLedger not available for import")
+
+        clock = VirtualClock(start=datetime(2026, 1, 14, 23, 0))
+        with tempfile.TemporaryDirectory() as tmp:
+            ledger = RiskLedger(os.path.join(tmp, "ledger.db"), clock=clock)
+            ledger.append(RiskEventType.LOSS, 50.0)
+            assert ledger.counters.daily_loss == 50.0
+
+            clock.set(datetime(2026, 1, 15, 0, 30))
+            ledger.append(RiskEventType.LOSS, 20.0)
+
+            assert ledger.counters.day == "2026-01-15"
+            assert ledger.counters.daily_loss == 20.0
+            assert ledger.counters.lifetime_loss == 70.0
+            ledger.close()
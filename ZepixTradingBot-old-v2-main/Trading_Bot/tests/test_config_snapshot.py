@@ -0,0 +1,235 @@
+"""
+Config Snapshot Tests
+
+Tests for:
+1. FrozenSection / ConfigSnapshot - attribute access, immutability, diffs
+2. ConfigSnapshotStore - atomic swap, section-filtered notifications
+3. ConfigFileWatcher - change detection (polling and inotify backends)
+4. ConfigManager - snapshots published on load, reload and update
+5. Consumers - PriceMonitorService reads the published snapshot
+"""
+
+import json
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.config_snapshot import (
+    FrozenSection, ConfigSnapshot, ConfigSnapshotStore, ConfigFileWatcher
+)
+from src.core.config_manager import ConfigManager
+
+
+SAMPLE = {
+    "simulate_orders": True,
+    "re_entry_config": {"sl_hunt_reentry_enabled": True, "max_chain_levels": 2},
+    "risk_tiers": {"5000": {"per_trade_cap": 150}},
+    "strategies": ["combinedlogic-1", "combinedlogic-2"],
+}
+
+
+class TestFrozenSnapshot:
+    """Test compiled snapshot objects"""
+
+    def test_attribute_and_item_access(self):
+        snap = ConfigSnapshot(SAMPLE)
+
+        assert snap.simulate_orders is True
+        assert snap.re_entry_config.sl_hunt_reentry_enabled is True
+        assert snap.risk_tiers["5000"].per_trade_cap == 150
+        assert snap.strategies == ("combinedlogic-1", "combinedlogic-2")
+        assert snap.section("missing") == {}
+
+    def test_immutable_and_detached_from_source(self):
+        source = json.loads(json.dumps(SAMPLE))
+        snap = ConfigSnapshot(source)
+        source["re_entry_config"]["max_chain_levels"] = 9
+
+        assert snap.re_entry_config.max_chain_levels == 2
+        with pytest.raises(TypeError):
+            snap.re_entry_config.max_chain_levels = 3
+        with pytest.raises(TypeError):
+            snap.simulate_orders = False
+
+    def test_to_dict_roundtrip(self):
+        assert FrozenSection(SAMPLE).to_dict() == SAMPLE
+
+    def test_changed_sections(self):
+        old = ConfigSnapshot(SAMPLE)
+        data = json.loads(json.dumps(SAMPLE))
+        data["re_entry_config"]["max_chain_levels"] = 3
+        data["new_key"] = 1
+
+        assert ConfigSnapshot(data).changed_sections(old) == ("new_key", "re_entry_config")
+
+
+class TestSnapshotStore:
+    """Test atomic publish and subscriber fan-out"""
+
+    def test_only_changed_sections_notified(self):
+        store = ConfigSnapshotStore()
+        store.publish(SAMPLE)
+        received = []
+        store.subscribe(lambda changed, snap: received.append(changed))
+
+        data = json.loads(json.dumps(SAMPLE))
+        data["simulate_orders"] = False
+        assert store.publish(data) == ("simulate_orders",)
+
+        assert received == [{"simulate_orders": False}]
+        assert store.current.simulate_orders is False
+        assert store.version == 2
+
+    def test_section_filter_and_noop_publish(self):
+        store = ConfigSnapshotStore()
+        store.publish(SAMPLE)
+        received = []
+        store.subscribe(lambda changed, snap: received.append(changed), sections=["re_entry_config"])
+
+        data = json.loads(json.dumps(SAMPLE))
+        data["simulate_orders"] = False
+        store.publish(data)
+        store.publish(data)
+        assert received == []
+
+        data["re_entry_config"]["sl_hunt_reentry_enabled"] = False
+        store.publish(data)
+        assert len(received) == 1
+        assert received[0]["re_entry_config"].sl_hunt_reentry_enabled is False
+        assert store.version == 3
+
+    def test_failing_subscriber_does_not_block_others(self):
+        store = ConfigSnapshotStore()
+        received = []
+
+        def broken(changed, snap):
+            raise RuntimeError("boom")
+
+        store.subscribe(broken)
+        store.subscribe(lambda changed, snap: received.append(snap.version))
+        store.publish(SAMPLE)
+
+        assert received == [1]
+
+
+class TestConfigFileWatcher:
+    """Test file change detection"""
+
+    def test_polling_check_detects_changes(self, tmp_path):
+        config_file = tmp_path / "config.json"
+        config_file.write_text("{}")
+        plugin_dir = tmp_path / "plugins"
+        plugin_dir.mkdir()
+        changed = []
+
+        watcher = ConfigFileWatcher(changed.append, use_inotify=False)
+        watcher.watch_file(str(config_file))
+        watcher.watch_directory(str(plugin_dir), suffix="_config.json")
+        watcher._mtimes = {p: watcher._stat(p) for p in watcher._candidates()}
+
+        assert watcher.check() == []
+        config_file.write_text('{"a": 1}')
+        (plugin_dir / "v3_config.json").write_text("{}")
+        (plugin_dir / "notes.txt").write_text("ignored")
+
+        assert sorted(watcher.check()) == sorted([
+            str(config_file), str(plugin_dir / "v3_config.json")
+        ])
+
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux only")
+    def test_inotify_backend_reports_atomic_replace(self, tmp_path):
+        config_file = tmp_path / "config.json"
+        config_file.write_text("{}")
+        changed = []
+
+        watcher = ConfigFileWatcher(changed.append)
+        watcher.watch_file(str(config_file))
+        watcher.start()
+        try:
+            temp = tmp_path / "config.json.tmp"
+            temp.write_text('{"a": 2}')
+            os.replace(temp, config_file)
+            deadline = time.time() + 5
+            while not changed and time.time() < deadline:
+                time.sleep(0.05)
+        finally:
+            watcher.stop()
+
+        assert watcher.backend in ("inotify", "polling")
+        if watcher.backend == "inotify":
+            assert changed == [str(config_file)]
+
+
+class TestConfigManagerSnapshots:
+    """Test ConfigManager publishes snapshots"""
+
+    @pytest.fixture
+    def manager(self, tmp_path):
+        config_path = tmp_path / "config.json"
+        config_path.write_text(json.dumps(SAMPLE))
+        plugin_dir = tmp_path / "plugins"
+        plugin_dir.mkdir()
+        (plugin_dir / "v3_config.json").write_text(json.dumps({"enabled": True}))
+        manager = ConfigManager(str(config_path), str(plugin_dir), enable_watching=False)
+        yield manager
+        manager.stop_watching()
+
+    def test_snapshot_after_load(self, manager):
+        assert manager.get_snapshot().re_entry_config.max_chain_levels == 2
+        assert manager.get_plugin_snapshot("v3").enabled is True
+
+    def test_update_publishes_changed_section(self, manager):
+        received = []
+        manager.subscribe_sections(lambda changed, snap: received.append(set(changed)))
+
+        manager.update("re_entry_config.max_chain_levels", 5, save=False)
+
+        assert manager.get_snapshot().re_entry_config.max_chain_levels == 5
+        assert received == [{"re_entry_config"}]
+
+    def test_file_change_callback_reloads(self, manager):
+        data = dict(SAMPLE, simulate_orders=False)
+        with open(manager.config_path, "w") as f:
+            json.dump(data, f)
+        os.utime(manager.config_path, (time.time() + 5, time.time() + 5))
+
+        manager._on_file_changed(manager.config_path)
+
+        assert manager.get_snapshot().simulate_orders is False
+        assert manager.get_status()["snapshot_version"] == 2
+
+
+class TestSnapshotConsumers:
+    """Test services read the published snapshot"""
+
+    def test_price_monitor_reads_published_snapshot(self):
+        try:
+            from src.services.price_monitor_service import PriceMonitorService
+        except ImportError:
+            pytest.skip("PriceMonitorService not available for import")
+
+        class SnapshotConfig(dict):
+            def __init__(self, data):
+                super().__init__(data)
+                self.snapshots = ConfigSnapshotStore("test")
+                self.snapshots.publish(data)
+
+            @property
+            def snapshot(self):
+                return self.snapshots.current
+
+        data = dict(SAMPLE, re_entry_config={"sl_hunt_reentry_enabled": True,
+                                             "price_monitor_interval_seconds": 30})
+        config = SnapshotConfig(data)
+        service = PriceMonitorService(config, None, None, None, None, None)
+
+        config["re_entry_config"] = {"sl_hunt_reentry_enabled": False}  # Not yet published
+        assert service.get_service_status()["configuration"]["sl_hunt_enabled"] is True
+        config.snapshots.publish(dict(config))
+
+        assert service.get_service_status()["configuration"]["sl_hunt_enabled"] is False
+        assert PriceMonitorService(data, None, None, None, None, None).settings is data
@@ -0,0 +1,149 @@
+"""
+Data Lifecycle Tests
+
+Tests for:
+1. Archival - closed rows past retention move to monthly archive files
+2. Schema drift - archives pick up columns added to the hot table later
+3. Union queries - hot and archived rows read back as one history
+4. Maintenance - quiet-hour detection, ANALYZE and incremental vacuum
+"""
+
+import os
+import sys
+from datetime import date, datetime, timezone
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.database_access import get_db_pool, close_all_pools
+from src.core.data_lifecycle import (
+    DataLifecycleManager, list_archives, query_with_archives
+)
+
+NOW = datetime(2026, 6, 15, 12, 0, tzinfo=timezone.utc)  # Monday
+
+
+@pytest.fixture
+def trade_db(tmp_path):
+    path = str(tmp_path / "trading_bot.db")
+    pool = get_db_pool(path)
+    pool.executescript("""
+        CREATE TABLE trades (id INTEGER PRIMARY KEY, symbol TEXT, pnl REAL,
+                             status TEXT, close_time DATETIME);
+        CREATE TABLE sl_events (id INTEGER PRIMARY KEY, trade_id TEXT, hit_time DATETIME);
+    """)
+    rows = [
+        (1, "EURUSD", 10.0, "closed", "2026-01-10T09:00:00"),
+        (2, "EURUSD", -5.0, "closed", "2026-01-20 15:00:00"),
+        (3, "XAUUSD", 7.5, "closed", "2026-02-03T10:30:00"),
+        (4, "XAUUSD", 0.0, "open", "2026-01-05T00:00:00"),   # Not closed: stays hot
+        (5, "GBPUSD", 3.0, "closed", "2026-06-01T08:00:00"),  # Inside retention
+    ]
+    pool.executemany("INSERT INTO trades VALUES (?, ?, ?, ?, ?)", rows)
+    pool.execute("INSERT INTO sl_events VALUES (1, '2', '2026-01-20T14:00:00')")
+    yield path
+    close_all_pools()
+
+
+def make_manager(path, **config):
+    return DataLifecycleManager({"databases": [path], "batch_size": 2, **config})
+
+
+class TestArchival:
+    """Test moving cold rows to monthly archives"""
+
+    def test_closed_rows_move_to_monthly_files(self, trade_db):
+        manager = make_manager(trade_db)
+
+        moved = manager.archive_database(trade_db, now=NOW)
+
+        assert moved == {"trades": 3, "sl_events": 1}
+        assert sorted(list_archives(trade_db)) == ["2026-01", "2026-02"]
+        hot = get_db_pool(trade_db).query("SELECT id FROM trades ORDER BY id")
+        assert [r[0] for r in hot] == [4, 5]
+
+    def test_rerun_is_idempotent(self, trade_db):
+        manager = make_manager(trade_db)
+        manager.archive_database(trade_db, now=NOW)
+
+        assert manager.archive_database(trade_db, now=NOW) == {}
+        assert manager.stats["rows_archived"] == 4
+
+    def test_archive_gains_new_hot_columns(self, trade_db):
+        manager = make_manager(trade_db)
+        manager.archive_database(trade_db, now=NOW)
+
+        pool = get_db_pool(trade_db)
+        pool.execute("ALTER TABLE trades ADD COLUMN logic_type TEXT")
+        pool.execute("INSERT INTO trades VALUES (6, 'EURUSD', 1.0, 'closed', '2026-01-25T10:00:00', 'LOGIC1')")
+        manager.archive_database(trade_db, now=NOW)
+
+        rows = query_with_archives(pool, "trades", "close_time", "2026-01-01", "2026-02-01", as_dicts=True)
+        assert {r["id"]: r["logic_type"] for r in rows} == {4: None, 1: None, 2: None, 6: "LOGIC1"}
+
+
+class TestUnionQueries:
+    """Test reading hot and archived rows together"""
+
+    def test_long_range_report_spans_tiers(self, trade_db):
+        make_manager(trade_db).archive_database(trade_db, now=NOW)
+        pool = get_db_pool(trade_db)
+
+        rows = query_with_archives(pool, "trades", "close_time", "2026-01-01",
+                                   where="status = ?", params=("closed",), descending=True)
+
+        assert [r[0] for r in rows] == [5, 3, 2, 1]
+
+    def test_archives_outside_range_are_not_attached(self, trade_db):
+        make_manager(trade_db).archive_database(trade_db, now=NOW)
+
+        rows = query_with_archives(get_db_pool(trade_db), "trades", "close_time",
+                                   "2026-05-01", columns=["id", "pnl"])
+
+        assert [tuple(r) for r in rows] == [(5, 3.0)]
+
+    def test_trade_database_history_includes_archives(self, trade_db, tmp_path, monkeypatch):
+        try:
+            from src.database import TradeDatabase
+        except ImportError:
+            pytest.skip("TradeDatabase not available for import")
+
+        monkeypatch.chdir(tmp_path)
+        os.makedirs("data", exist_ok=True)
+        db = TradeDatabase()
+        db.conn.execute("INSERT INTO trades (id, symbol, pnl, status, close_time) "
+                        "VALUES (1, 'EURUSD', 4.0, 'closed', '2020-03-10T10:00:00')")
+        db.conn.commit()
+        manager = make_manager(os.path.join("data", "trading_bot.db"))
+        manager.archive_database(os.path.join("data", "trading_bot.db"))
+
+        assert db.conn.execute("SELECT COUNT(*) FROM trades").fetchone()[0] == 0
+        assert [t["pnl"] for t in db.get_trades_by_date(date(2020, 3, 10))] == [4.0]
+        assert len(db.get_trade_history(days=365 * 20)) == 1
+
+
+class TestMaintenance:
+    """Test quiet-hour maintenance"""
+
+    def test_quiet_time_window(self):
+        manager = DataLifecycleManager({"quiet_hours_utc": [21, 23]})
+
+        assert manager.is_quiet_time(NOW.replace(hour=21, minute=30))
+        assert not manager.is_quiet_time(NOW)
+        assert manager.is_quiet_time(datetime(2026, 6, 13, 12, tzinfo=timezone.utc))  # Saturday
+        wrapping = DataLifecycleManager({"quiet_hours_utc": [22, 2], "weekends_quiet": False})
+        assert wrapping.is_quiet_time(NOW.replace(hour=1))
+
+    def test_maintenance_only_runs_when_quiet(self, trade_db):
+        manager = make_manager(trade_db)
+
+        busy = manager.run_pass(now=NOW)
+        quiet = manager.run_pass(now=NOW.replace(hour=22))
+
+        assert busy["maintenance"] == {}
+        result = quiet["maintenance"][trade_db]
+        assert result["analyzed"] and result["converted"]
+        with get_db_pool(trade_db).writer() as conn:
+            assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+            assert conn.execute("SELECT name FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone()
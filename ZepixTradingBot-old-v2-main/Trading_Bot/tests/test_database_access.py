@@ -0,0 +1,231 @@
+"""
+Database Access Layer Tests
+
+Tests for:
+1. DatabasePool - tuned PRAGMAs, writer/reader split under WAL, transactions
+2. Shared pools per file - one pool per path, stale file detection
+3. Async API - executor-backed queries and writes
+4. Profiling - per-statement query-time histograms
+5. Callers - PluginDatabase, DatabaseService, PluginHealthMonitor on shared pools;
+   DataMigrationTool reads its source read-only
+"""
+
+import asyncio
+import os
+import sqlite3
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.database_access import (
+    DatabasePool, StatementHistogram, get_db_pool, close_db_pool,
+    get_query_stats, reset_query_stats, normalize_sql
+)
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = get_db_pool(str(tmp_path / "access.db"))
+    pool.executescript("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT, qty INTEGER)")
+    yield pool
+    close_db_pool(pool.db_path)
+
+
+class TestDatabasePool:
+    """Test connection setup and the reader/writer split"""
+
+    def test_pragmas_are_tuned(self, pool):
+        with pool.reader() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+            assert conn.execute("PRAGMA cache_size").fetchone()[0] == -8192
+            assert conn.execute("PRAGMA mmap_size").fetchone()[0] == 64 * 1024 * 1024
+            assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+
+    def test_reads_use_separate_connections(self, pool):
+        with pool.reader() as reader, pool.writer() as writer:
+            assert reader is not writer
+
+    def test_reader_sees_committed_writes_during_open_write(self, pool):
+        pool.execute("INSERT INTO items (name, qty) VALUES (?, ?)", ("a", 1))
+        with pool.writer() as writer:
+            writer.execute("INSERT INTO items (name, qty) VALUES (?, ?)", ("b", 2))
+            # Uncommitted write does not block or leak into readers
+            assert pool.query("SELECT COUNT(*) FROM items")[0][0] == 1
+            writer.commit()
+        assert pool.query("SELECT COUNT(*) FROM items")[0][0] == 2
+
+    def test_transaction_rolls_back_on_error(self, pool):
+        with pytest.raises(ValueError):
+            with pool.transaction() as conn:
+                conn.execute("INSERT INTO items (name, qty) VALUES (?, ?)", ("x", 1))
+                raise ValueError("boom")
+        assert pool.query_one("SELECT COUNT(*) FROM items")[0] == 0
+
+    def test_concurrent_writers_are_serialised(self, pool):
+        def writer(n):
+            for i in range(50):
+                pool.execute("INSERT INTO items (name, qty) VALUES (?, ?)", (f"t{n}", i))
+
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert pool.query_one("SELECT COUNT(*) FROM items")[0] == 200
+
+    def test_memory_database_reads_through_writer(self):
+        pool = DatabasePool(":memory:")
+        pool.execute("CREATE TABLE t (v INTEGER)")
+        pool.execute("INSERT INTO t VALUES (1)")
+        assert pool.query("SELECT v FROM t") == [(1,)]
+        pool.close()
+
+
+class TestSharedPools:
+    """Test one pool per database file"""
+
+    def test_same_path_returns_same_pool(self, tmp_path):
+        path = str(tmp_path / "shared.db")
+        try:
+            assert get_db_pool(path) is get_db_pool(os.path.join(str(tmp_path), ".", "shared.db"))
+        finally:
+            close_db_pool(path)
+
+    def test_replaced_file_gets_fresh_pool(self, tmp_path):
+        path = str(tmp_path / "replaced.db")
+        first = get_db_pool(path)
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+        second = get_db_pool(path)
+        try:
+            assert second is not first
+            assert second.query("SELECT 1") == [(1,)]
+        finally:
+            close_db_pool(path)
+
+
+class TestAsyncAndProfiling:
+    """Test the executor-backed API and statement histograms"""
+
+    def test_async_api(self, pool):
+        async def scenario():
+            await pool.aexecutemany("INSERT INTO items (name, qty) VALUES (?, ?)",
+                                    [("a", 1), ("b", 2), ("c", 3)])
+            await pool.aexecute("UPDATE items SET qty = qty * 10 WHERE name = ?", ("b",))
+            rows = await asyncio.gather(*[pool.aquery("SELECT SUM(qty) FROM items") for _ in range(5)])
+            return rows, await pool.aquery_one("SELECT qty FROM items WHERE name = ?", ("b",))
+
+        rows, qty = asyncio.run(scenario())
+        assert all(r == [(24,)] for r in rows)
+        assert qty == (20,)
+
+    def test_statement_histograms(self, pool):
+        reset_query_stats()
+        for i in range(10):
+            pool.query("SELECT   name FROM items\n WHERE qty = ?", (i,))
+        with pytest.raises(sqlite3.OperationalError):
+            pool.query("SELECT missing FROM items")
+
+        stats = get_query_stats(top=None)
+        histogram = stats["statements"][normalize_sql("SELECT name FROM items WHERE qty = ?")]
+        assert histogram["count"] == 10
+        assert sum(histogram["buckets"].values()) == 10
+        assert stats["statements"]["SELECT missing FROM items"]["errors"] == 1
+        assert os.path.abspath(pool.db_path) in stats["pools"]
+
+    def test_histogram_percentiles(self):
+        histogram = StatementHistogram()
+        for ms in [0.05] * 90 + [20.0] * 10:
+            histogram.record(ms)
+
+        assert histogram.percentile(50) == 0.1
+        assert histogram.percentile(99) == 25.0
+        assert histogram.to_dict()["max_ms"] == 20.0
+
+
+class TestCallers:
+    """Test database classes on the shared layer"""
+
+    def test_plugin_database_uses_shared_pool(self, tmp_path):
+        try:
+            from src.core.plugin_database import PluginDatabase
+        except ImportError:
+            pytest.skip("PluginDatabase not available for import")
+
+        db = PluginDatabase(plugin_id="pooled", db_dir=str(tmp_path), pool_size=2)
+        try:
+            trade_id = db.save_trade({"ticket": 1, "symbol": "EURUSD", "direction": "BUY",
+                                      "lot_size": 0.1, "entry_price": 1.1})
+            assert db.get_trade(trade_id)["symbol"] == "EURUSD"
+            assert db.pool is get_db_pool(db.db_path)
+            assert db.pool.settings["reader_pool_size"] == 2
+        finally:
+            db.close()
+
+    def test_database_service_shares_pool_across_plugins_on_one_file(self, tmp_path):
+        try:
+            from src.core.services.database_service import DatabaseService
+        except ImportError:
+            pytest.skip("DatabaseService not available for import")
+
+        service = DatabaseService(base_path=str(tmp_path))
+
+        async def scenario():
+            pool_1m = await service.get_pool('v6_price_action_1m')
+            pool_5m = await service.get_pool('v6_price_action_5m')
+            await service.initialize_database('v6_price_action_1m', "CREATE TABLE trades (id INTEGER PRIMARY KEY, profit REAL)")
+            await service.insert_record('v6_price_action_5m', 'trades', {'profit': 5.0})
+            count = await service.count_records('v6_price_action_1m', 'trades')
+            await service.close_connection('v6_price_action_1m')
+            still_open = not pool_5m.closed
+            await service.close_all()
+            return pool_1m is pool_5m, count, still_open, pool_5m.closed
+
+        shared, count, still_open, closed = asyncio.run(scenario())
+        assert shared and count == 1 and still_open and closed
+
+    def test_health_monitor_stores_snapshots_on_pool(self, tmp_path):
+        try:
+            from src.monitoring.plugin_health_monitor import PluginHealthMonitor
+        except ImportError:
+            pytest.skip("PluginHealthMonitor not available for import")
+
+        db_path = str(tmp_path / "health.db")
+        monitor = PluginHealthMonitor(plugin_registry=None, db_path=db_path)
+        monitor.resolve_alert(1)
+
+        assert monitor._db is get_db_pool(db_path)
+        assert monitor._db.stats["writes"] >= 2
+        close_db_pool(db_path)
+
+    def test_migration_source_opened_read_only(self, tmp_path):
+        try:
+            from src.utils.data_migration_tool import DataMigrationTool
+        except ImportError:
+            pytest.skip("DataMigrationTool not available for import")
+
+        source = str(tmp_path / "legacy #1.db")
+        legacy = sqlite3.connect(source)
+        legacy.execute("CREATE TABLE trades (id INTEGER PRIMARY KEY, pnl REAL)")
+        legacy.execute("INSERT INTO trades (pnl) VALUES (5.0)")
+        legacy.commit()
+        legacy.close()
+        tool = DataMigrationTool(source_db=source, target_dir=str(tmp_path),
+                                 backup_dir=str(tmp_path / "backups"))
+
+        conn = tool._connect_source()
+        assert conn.execute("SELECT pnl FROM trades").fetchone()["pnl"] == 5.0
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("INSERT INTO trades (pnl) VALUES (1.0)")
+        conn.close()
+
+        check = sqlite3.connect(source)
+        assert check.execute("PRAGMA journal_mode").fetchone()[0] == "delete"  # Not switched to WAL
+        check.close()
@@ -0,0 +1,292 @@
+"""
+Engine Snapshot Tests
+
+Tests for:
+1. Snapshot encoding - versioned binary header, checksum, typed round-trip
+2. EngineSnapshotStore - capture/restore of trades, chains, pending re-entries,
+   recovery windows (remaining time) and risk counters
+3. Write policy - interval, unchanged-state skip, age limit
+4. Failed restore - nothing applied, engine left for full recovery
+5. Downtime closes - broker close price/time, no stale re-entry windows
+"""
+
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.engine_snapshot import (
+    EngineSnapshotStore, FORMAT_VERSION, HEADER, decode_snapshot, encode_snapshot
+)
+from src.managers.profit_booking_manager import ProfitBookingManager
+from src.managers.recovery_window_monitor import RecoveryWindowMonitor
+from src.managers.reentry_manager import ReEntryManager
+from src.managers.risk_ledger import RiskLedger, RiskEventType
+from src.models import Trade, ReEntryChain, ProfitBookingChain
+from src.services.price_monitor_service import PriceMonitorService
+from src.utils.clock import VirtualClock
+
+START = datetime(2026, 1, 14, 9, 0, 0)
+
+
+def make_trade(trade_id, **extra):
+    return Trade(symbol="EURUSD", entry=1.1000, sl=1.0950, tp=1.1050, lot_size=0.1,
+                 direction="buy", strategy="combinedlogic-1", trade_id=trade_id,
+                 open_time=START.isoformat(), **extra)
+
+
+def make_engine(tmpdir, clock):
+    """Engine-shaped object holding the real state owners"""
+    ledger = RiskLedger(db_path=os.path.join(tmpdir, "ledger.db"), clock=clock)
+    risk_trades = []
+    recovery = RecoveryWindowMonitor(SimpleNamespace(config={}), clock=clock)
+    return SimpleNamespace(
+        open_trades=[],
+        trade_count=0,
+        reentry_manager=ReEntryManager({}),
+        profit_booking_manager=ProfitBookingManager({}, None, None, None, None),
+        price_monitor=PriceMonitorService({}, None, None, None, None, None, clock=clock),
+        autonomous_manager=SimpleNamespace(recovery_monitor=recovery),
+        risk_manager=SimpleNamespace(ledger=ledger, open_trades=risk_trades,
+                                     add_open_trade=risk_trades.append),
+    )
+
+
+def populate(engine, clock):
+    engine.open_trades += [make_trade(101, chain_id="c1", profit_chain_id="p1"),
+                           make_trade(102, status="closed")]
+    engine.trade_count = 7
+    engine.reentry_manager.active_chains["c1"] = ReEntryChain(
+        chain_id="c1", symbol="EURUSD", direction="buy", original_entry=1.1,
+        original_sl_distance=0.005, current_level=2, max_level=5,
+        created_at=START.isoformat(), last_update=START.isoformat(), trades=[101])
+    engine.profit_booking_manager.active_chains["p1"] = ProfitBookingChain(
+        chain_id="p1", symbol="EURUSD", direction="buy", base_lot=0.1, current_level=1,
+        max_level=4, active_orders=[101], created_at=START.isoformat(),
+        updated_at=START.isoformat())
+    engine.price_monitor.sl_hunt_pending["EURUSD"] = [
+        {"target_price": 1.0951, "direction": "buy", "chain_id": "c1", "sl_price": 1.095,
+         "logic": "combinedlogic-1", "expiration_time": clock.now() + timedelta(minutes=30)},
+        {"target_price": 1.0900, "direction": "buy", "chain_id": "old", "sl_price": 1.089,
+         "logic": "combinedlogic-1", "expiration_time": clock.now() + timedelta(minutes=1)},
+    ]
+    engine.price_monitor.exit_continuation_pending["GBPUSD"] = {
+        "exit_price": 1.25, "direction": "sell", "expiration_time": clock.now() + timedelta(hours=1)}
+    engine.autonomous_manager.recovery_monitor.active_monitors[555] = {
+        "order_id": 555, "symbol": "EURUSD", "direction": "BUY", "sl_price": 1.095,
+        "recovery_price": 1.0952, "start_time": clock.now() - timedelta(seconds=600),
+        "max_duration_seconds": 1800, "status": "MONITORING", "check_count": 12,
+        "original_order": make_trade(555), "order_type": "A", "plugin_id": None}
+    engine.risk_manager.ledger.append(RiskEventType.TRADE_PNL, -25.0)
+
+
+class TestSnapshotEncoding:
+    """Test the binary format"""
+
+    def test_round_trip_preserves_types(self):
+        state = {"trades": [make_trade(1)], "when": START, "symbols": {"EURUSD"}}
+        blob = encode_snapshot(state, created_at=1000.0)
+        decoded = decode_snapshot(blob)
+
+        assert isinstance(decoded["trades"][0], Trade) and decoded["trades"][0].trade_id == 1
+        assert decoded["when"] == START and decoded["symbols"] == {"EURUSD"}
+        assert decoded["_created_at"] == 1000.0
+
+    def test_corrupt_or_foreign_version_ignored(self):
+        blob = bytearray(encode_snapshot({"a": 1}, created_at=0.0))
+        corrupt = bytes(blob[:-1]) + bytes([blob[-1] ^ 0xFF])
+        header = HEADER.unpack_from(bytes(blob))
+        other_version = HEADER.pack(header[0], FORMAT_VERSION + 1, *header[2:]) + bytes(blob[HEADER.size:])
+
+        assert decode_snapshot(corrupt) is None
+        assert decode_snapshot(other_version) is None
+        assert decode_snapshot(b"junk") is None
+
+
+class TestWarmRestart:
+    """Test capture and restore into a fresh engine"""
+
+    def test_restore_into_fresh_engine(self, tmp_path):
+        clock = VirtualClock(start=START)
+        old = make_engine(str(tmp_path / "old"), clock)
+        populate(old, clock)
+        store = EngineSnapshotStore({"path": str(tmp_path / "engine.bin")}, clock=clock)
+        assert store.save(old)
+        for task in old.autonomous_manager.recovery_monitor.monitor_tasks.values():
+            task.cancel()
+
+        clock.set(clock.time() + 120)  # Downtime; the 1-minute SL hunt window expires
+        fresh = make_engine(str(tmp_path / "new"), clock)
+
+        async def run():
+            restored = store.load_and_restore(fresh)
+            monitor = fresh.autonomous_manager.recovery_monitor
+            for task in monitor.monitor_tasks.values():
+                task.cancel()
+            return restored, monitor.get_monitor_status(555)
+
+        restored, status = asyncio.run(run())
+
+        assert [t.trade_id for t in fresh.open_trades] == [101]
+        assert fresh.risk_manager.open_trades == fresh.open_trades
+        assert fresh.trade_count == 7
+        assert fresh.reentry_manager.active_chains["c1"].current_level == 2
+        assert fresh.profit_booking_manager.active_chains["p1"].active_orders == [101]
+        assert [p["chain_id"] for p in fresh.price_monitor.sl_hunt_pending["EURUSD"]] == ["c1"]
+        assert "GBPUSD" in fresh.price_monitor.exit_continuation_pending
+        assert fresh.autonomous_manager.recovery_monitor.active_monitors[555]["original_order"].trade_id == 555
+        assert round(status["remaining_seconds"]) == 1200  # Window time left is kept
+        assert fresh.risk_manager.ledger.counters.daily_loss == 25.0
+        assert restored["open_trades"] == 1 and restored["recovery_monitors"] == 1
+
+    def test_restore_does_not_override_existing_ledger(self, tmp_path):
+        clock = VirtualClock(start=START)
+        old = make_engine(str(tmp_path / "old"), clock)
+        populate(old, clock)
+        state = decode_snapshot(encode_snapshot(EngineSnapshotStore.capture(old), clock.time()))
+        fresh = make_engine(str(tmp_path / "new"), clock)
+        fresh.risk_manager.ledger.append(RiskEventType.TRADE_PNL, -5.0)
+        fresh.autonomous_manager.recovery_monitor = None
+
+        restored = EngineSnapshotStore.restore(fresh, state)
+
+        assert fresh.risk_manager.ledger.counters.daily_loss == 5.0
+        assert "risk_counters" not in restored and restored["recovery_monitors"] == 0
+
+
+class TestWritePolicy:
+    """Test periodic writes and the age limit"""
+
+    def test_interval_and_unchanged_skip(self, tmp_path):
+        clock = VirtualClock(start=START)
+        engine = make_engine(str(tmp_path), clock)
+        engine.open_trades.append(make_trade(1))
+        store = EngineSnapshotStore({"path": str(tmp_path / "engine.bin"), "interval_seconds": 30},
+                                    clock=clock)
+
+        assert store.maybe_save(engine)
+        clock.set(clock.time() + 10)
+        assert not store.maybe_save(engine)  # Interval not reached
+        clock.set(clock.time() + 30)
+        assert not store.maybe_save(engine)  # Nothing changed
+        engine.open_trades.append(make_trade(2))
+        clock.set(clock.time() + 30)
+        assert store.maybe_save(engine)
+
+        assert store.stats["writes"] == 2 and store.stats["skipped_unchanged"] == 1
+        assert not os.path.exists(str(tmp_path / "engine.bin.tmp"))
+
+    def test_stale_or_missing_snapshot_ignored(self, tmp_path):
+        clock = VirtualClock(start=START)
+        engine = make_engine(str(tmp_path), clock)
+        store = EngineSnapshotStore({"path": str(tmp_path / "engine.bin"), "max_age_seconds": 3600},
+                                    clock=clock)
+
+        assert store.load() is None
+        store.save(engine)
+        clock.set(clock.time() + 3601)
+
+        assert store.load_and_restore(engine) is None
+
+
+class TestFailedRestore:
+    """Test that a restore failing partway applies nothing"""
+
+    def test_bad_entry_leaves_engine_untouched(self, tmp_path):
+        clock = VirtualClock(start=START)
+        old = make_engine(str(tmp_path / "old"), clock)
+        populate(old, clock)
+        state = EngineSnapshotStore.capture(old)
+        for task in old.autonomous_manager.recovery_monitor.monitor_tasks.values():
+            task.cancel()
+        del state["recovery_monitors"][0]["max_duration_seconds"]  # Fails after trades and chains
+        store = EngineSnapshotStore({"path": str(tmp_path / "engine.bin")}, clock=clock)
+        with open(store.path, "wb") as f:
+            f.write(encode_snapshot(state, clock.time()))
+        fresh = make_engine(str(tmp_path / "new"), clock)
+
+        async def run():
+            return store.load_and_restore(fresh)
+
+        assert asyncio.run(run()) is None
+        assert fresh.open_trades == [] and fresh.risk_manager.open_trades == []
+        assert fresh.trade_count == 0
+        assert fresh.reentry_manager.active_chains == {}
+        assert fresh.profit_booking_manager.active_chains == {}
+        assert not fresh.price_monitor.sl_hunt_pending and not fresh.price_monitor.exit_continuation_pending
+        assert fresh.autonomous_manager.recovery_monitor.active_monitors == {}
+        assert fresh.risk_manager.ledger.is_empty()
+
+
+def make_reconcile_engine(clock, trade, closed_at):
+    """Engine whose restored trade is gone at the broker, closed by SL at closed_at"""
+    try:
+        from src.core.trading_engine import TradingEngine
+    except ImportError:
+        pytest.skip("TradingEngine not available for import")
+    engine = TradingEngine.__new__(TradingEngine)
+    engine.config = {"re_entry_config": {"recovery_window_minutes": 30}}
+    engine.clock = clock
+    engine._simulate_orders = False
+    engine.open_trades = [trade]
+    engine.mt5_client = MagicMock()
+    engine.mt5_client.get_current_price.return_value = 1.0990
+    engine.mt5_client.get_closed_trade_profit.return_value = -50.0
+    engine.mt5_client.get_closed_trade_exit.return_value = {"price": 1.0950, "time": closed_at}
+    engine.risk_manager = MagicMock()
+    engine.db = MagicMock()
+    engine.telegram_bot = MagicMock()
+    engine.event_bus = MagicMock()
+    engine.pip_calculator = MagicMock()
+    engine.profit_booking_reentry_manager = MagicMock()
+    engine.autonomous_manager = MagicMock(reverse_shield_manager=None)
+    return engine
+
+
+class TestDowntimeCloses:
+    """Test reconciling trades the broker closed while the bot was down"""
+
+    def run_reconcile(self, monkeypatch, downtime):
+        monkeypatch.setitem(sys.modules, "MetaTrader5", SimpleNamespace(positions_get=lambda **kw: None))
+        clock = VirtualClock(start=START)
+        closed_at = clock.now() - downtime
+        trade = make_trade(101, profit_chain_id="p1", profit_level=1)
+        engine = make_reconcile_engine(clock, trade, closed_at)
+        asyncio.run(engine.reconcile_with_mt5())
+        return engine, trade, closed_at
+
+    def test_stale_close_uses_broker_exit_and_arms_nothing(self, monkeypatch):
+        engine, trade, closed_at = self.run_reconcile(monkeypatch, timedelta(hours=2))
+
+        assert trade.status == "closed" and engine.open_trades == []
+        assert trade.close_time == closed_at.isoformat()
+        event = engine.event_bus.publish.call_args_list[0].args[0]
+        assert event.reason == "SL_HIT_AUTO_CLOSED" and event.close_price == 1.0950
+        engine.profit_booking_reentry_manager.register_sl_hit.assert_not_called()
+
+    def test_recent_close_still_registers_recovery(self, monkeypatch):
+        engine, trade, _ = self.run_reconcile(monkeypatch, timedelta(minutes=5))
+
+        engine.profit_booking_reentry_manager.register_sl_hit.assert_called_once()
+
+    def test_stale_manual_close_skips_exit_continuation(self):
+        from src.core.event_bus import OrderClosed
+        clock = VirtualClock(start=START)
+        trade = make_trade(101, status="closed",
+                           close_time=(clock.now() - timedelta(hours=2)).isoformat())
+        engine = make_reconcile_engine(clock, trade, None)
+        event = OrderClosed(trade_id=101, symbol="EURUSD", direction="buy", reason="MANUAL_EXIT",
+                            close_price=1.1010, pnl=10.0, trade=trade)
+
+        asyncio.run(engine._on_order_closed(event))
+        engine.autonomous_manager.register_exit_continuation.assert_not_called()
+
+        trade.close_time = clock.now().isoformat()
+        asyncio.run(engine._on_order_closed(event))
+        engine.autonomous_manager.register_exit_continuation.assert_called_once()
@@ -0,0 +1,252 @@
+"""
+Order Event Bus Tests
+
+Tests for:
+1. OrderEventBus - typed fan-out to sync and async subscribers
+2. Bounded and lossless per-subscriber queues, slow subscribers, errors and topic metrics
+3. Producers - close publishing, plugin SL/TP hooks and TrendChanged
+"""
+
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.event_bus import (
+    OrderEventBus, OrderClosed, SLHit, TPHit, TickBatch, TrendChanged
+)
+
+
+def closed(trade_id=1, reason="SL_HIT", pnl=-10.0):
+    return OrderClosed(trade_id=trade_id, symbol="EURUSD", direction="buy", reason=reason,
+                       close_price=1.0950, pnl=pnl, strategy="combinedlogic-1")
+
+
+class TestFanOut:
+    """Test typed dispatch"""
+
+    def test_sync_and_async_subscribers_receive_their_type_only(self):
+        bus = OrderEventBus()
+        sync_seen, async_seen, ticks = [], [], []
+
+        async def on_closed(event):
+            await asyncio.sleep(0)
+            async_seen.append(event.trade_id)
+
+        bus.subscribe(OrderClosed, lambda event: sync_seen.append(event.trade_id), name="sync")
+        bus.subscribe(OrderClosed, on_closed, name="async")
+        bus.subscribe(TickBatch, lambda event: ticks.append(event.prices), name="ticks")
+
+        async def run():
+            for trade_id in range(3):
+                assert bus.publish(closed(trade_id)) == 2
+            bus.publish(TickBatch(prices={"EURUSD": 1.1}))
+            assert bus.publish(TPHit(trade_id=9, symbol="EURUSD", direction="buy", tp_price=1.2,
+                                     close_price=1.2, pnl=5.0)) == 0
+            assert await bus.drain()
+
+        asyncio.run(run())
+
+        assert sync_seen == async_seen == [0, 1, 2]
+        assert ticks == [{"EURUSD": 1.1}]
+
+    def test_unsubscribe_by_name(self):
+        bus = OrderEventBus()
+        seen = []
+        bus.subscribe(SLHit, seen.append, name="plugin_a")
+        bus.subscribe(TPHit, seen.append, name="plugin_a")
+
+        assert bus.unsubscribe("plugin_a") == 2
+        assert bus.publish(closed()) == 0
+
+
+class TestBackpressure:
+    """Test bounded queues and slow subscribers"""
+
+    def test_slow_subscriber_does_not_block_publisher_or_others(self):
+        bus = OrderEventBus()
+        fast = []
+
+        async def slow(event):
+            await asyncio.sleep(0.2)
+
+        bus.subscribe(OrderClosed, slow, name="slow")
+        bus.subscribe(OrderClosed, lambda event: fast.append(event.trade_id), name="fast")
+
+        async def run():
+            started = time.perf_counter()
+            bus.publish(closed(1))
+            publish_ms = (time.perf_counter() - started) * 1000
+            await asyncio.sleep(0.02)
+            return publish_ms, list(fast)
+
+        publish_ms, fast_before_slow_done = asyncio.run(run())
+
+        assert publish_ms < 50
+        assert fast_before_slow_done == [1]
+
+    def test_full_queue_drops_oldest(self):
+        bus = OrderEventBus({"queue_size": 3})
+        seen = []
+        bus.subscribe(OrderClosed, lambda event: seen.append(event.trade_id), name="slow")
+
+        for trade_id in range(5):
+            bus.publish(closed(trade_id))  # No loop yet: queued only
+
+        async def run():
+            await bus.drain()
+
+        asyncio.run(run())
+        stats = bus.get_stats()["topics"]["OrderClosed"]
+
+        assert seen == [2, 3, 4]
+        assert stats["dropped"] == 2 and stats["delivered"] == 3
+
+    def test_lossless_subscriber_keeps_every_event(self, caplog):
+        bus = OrderEventBus({"queue_size": 3})
+        engine, other = [], []
+        bus.subscribe(OrderClosed, lambda event: engine.append(event.trade_id), name="engine",
+                      lossless=True)
+        bus.subscribe(OrderClosed, lambda event: other.append(event.trade_id), name="other")
+
+        for trade_id in range(7):
+            bus.publish(closed(trade_id))
+
+        async def run():
+            await bus.stop()
+
+        asyncio.run(run())
+
+        assert engine == list(range(7))
+        assert other == [4, 5, 6]
+        assert bus.get_stats()["topics"]["OrderClosed"]["dropped"] == 4
+        assert "lossless, not dropping" in caplog.text
+
+    def test_handler_errors_counted_and_worker_survives(self):
+        bus = OrderEventBus()
+        seen = []
+
+        def handler(event):
+            if event.trade_id == 1:
+                raise ValueError("boom")
+            seen.append(event.trade_id)
+
+        bus.subscribe(OrderClosed, handler, name="flaky")
+
+        async def run():
+            for trade_id in range(3):
+                bus.publish(closed(trade_id))
+            await bus.drain()
+            await bus.stop()
+
+        asyncio.run(run())
+        stats = bus.get_stats()["topics"]["OrderClosed"]
+
+        assert seen == [0, 2]
+        assert stats["errors"] == 1 and stats["published"] == 3
+        assert stats["max_latency_ms"] >= stats["avg_latency_ms"] > 0
+
+
+class TestProducers:
+    """Test engine, registry and TrendAnalyzer integration"""
+
+    def test_close_publishes_order_closed_and_sl_hit(self):
+        try:
+            from src.core.trading_engine import TradingEngine
+        except ImportError:
+            pytest.skip("TradingEngine not available for import")
+
+        bus = OrderEventBus()
+        received = []
+        for event_type in (OrderClosed, SLHit, TPHit):
+            bus.subscribe(event_type, received.append, name=event_type.__name__)
+        trade = SimpleNamespace(trade_id=5, symbol="EURUSD", direction="buy", strategy="combinedlogic-1",
+                                sl=1.0950, tp=1.1100)
+        engine = SimpleNamespace(event_bus=bus)
+
+        async def run():
+            TradingEngine._publish_close(engine, trade, "SL_HIT", 1.0950, -50.0)
+            TradingEngine._publish_close(engine, trade, "TREND_REVERSAL", 1.1000, 0.0)
+            await bus.drain()
+
+        asyncio.run(run())
+
+        by_type = {}
+        for event in received:
+            by_type.setdefault(type(event).__name__, []).append(event)
+        sl_hit = by_type["SLHit"][0]
+
+        assert [e.reason for e in by_type["OrderClosed"]] == ["SL_HIT", "TREND_REVERSAL"]
+        assert len(by_type["SLHit"]) == 1 and "TPHit" not in by_type
+        assert sl_hit.sl_price == 1.0950 and sl_hit.trade is trade
+        assert "trade" not in sl_hit.to_dict()
+
+    def test_plugin_hooks_routed_through_bus(self):
+        from src.core.plugin_system.plugin_registry import PluginRegistry
+
+        class Plugin:
+            def __init__(self, enabled=True):
+                self.enabled = enabled
+                self.sl_events = []
+
+            async def on_sl_hit(self, event):
+                self.sl_events.append(event)
+                return True
+
+        registry = PluginRegistry(config={"plugin_system": {"plugin_dir": "nonexistent"}},
+                                  service_api=None)
+        active, disabled = Plugin(), Plugin(enabled=False)
+        registry.plugins.update({"active": active, "disabled": disabled})
+        for plugin_id, plugin in registry.plugins.items():
+            registry._bind_hooks(plugin_id, plugin)
+        bus = OrderEventBus({"plugin_hooks": True})
+        registry.attach_event_bus(bus)
+
+        async def run():
+            bus.publish(SLHit(trade_id=3, symbol="EURUSD", direction="sell", sl_price=1.1,
+                              close_price=1.1, pnl=-20.0))
+            await bus.drain()
+            return await registry.on_sl_hit({"trade_id": 4})
+
+        results = asyncio.run(run())
+
+        assert [e["trade_id"] for e in active.sl_events] == [3, 4]
+        assert disabled.sl_events == []
+        assert results == {"active": True}
+
+    def test_trend_flip_publishes_trend_changed(self):
+        from src.utils.clock import VirtualClock
+        from src.utils.trend_analyzer import TrendAnalyzer
+        from datetime import datetime
+
+        bus = OrderEventBus()
+        changes = []
+        bus.subscribe(TrendChanged, changes.append, name="trend")
+        analyzer = TrendAnalyzer(None, clock=VirtualClock(start=datetime(2026, 1, 14, 9)),
+                                 event_bus=bus)
+
+        async def run():
+            price = 1.1000
+            for i in range(20):
+                price += 0.0010
+                analyzer.on_bar_close("EURUSD", "15m", {'time': i, 'high': price + 0.0005,
+                                                        'low': price - 0.0005, 'close': price})
+                analyzer.get_current_trend("EURUSD")
+            for i in range(20, 40):
+                price -= 0.0010
+                analyzer.on_bar_close("EURUSD", "15m", {'time': i, 'high': price + 0.0005,
+                                                        'low': price - 0.0005, 'close': price})
+                analyzer.get_current_trend("EURUSD")
+            await bus.drain()
+
+        asyncio.run(run())
+        flips = [(c.previous, c.trend) for c in changes]
+
+        assert ("NEUTRAL", "BULLISH") in flips
+        assert flips[-1][1] == "BEARISH"
+        assert all(c.symbol == "EURUSD" and c.timeframe == "15m" for c in changes)
@@ -0,0 +1,208 @@
+"""
+Live State Stream Tests
+
+Tests for:
+1. LiveStateHub - snapshot on connect, per-topic deltas and topic subscriptions
+2. Sampling cost independent of client count, per-client backpressure
+3. Engine sources - portfolio, chains, plugins and routing from in-memory state
+"""
+
+import asyncio
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.api.live_stream import LiveStateHub, HEARTBEAT
+
+
+def parse(frame):
+    """(event, payload) from one SSE frame"""
+    lines = dict(line.split(": ", 1) for line in frame.decode().strip().split("\n"))
+    return lines["event"], json.loads(lines["data"])
+
+
+class CountingSource:
+    def __init__(self, state):
+        self.state = state
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return dict(self.state)
+
+
+async def take(stream, count):
+    """Next `count` event frames, skipping the retry hint"""
+    frames = []
+    while len(frames) < count:
+        frame = await asyncio.wait_for(stream.__anext__(), 1.0)
+        if not frame.startswith(b"retry:"):
+            frames.append(parse(frame))
+    return frames
+
+
+class TestDeltas:
+    """Test snapshot-on-connect and delta encoding"""
+
+    def test_snapshot_then_changed_and_removed_keys(self):
+        trades = CountingSource({"1": {"pnl": 5.0}, "2": {"pnl": -3.0}})
+        pnl = CountingSource({"total": 2.0})
+        hub = LiveStateHub({"interval_seconds": 60}, sources={"trades": trades, "pnl": pnl})
+
+        async def run():
+            client = hub.connect(["trades"])
+            stream = hub.stream(client)
+            first = await take(stream, 1)
+            trades.state = {"1": {"pnl": 7.5}, "3": {"pnl": 1.0}}
+            pnl.state = {"total": 8.5}
+            hub.sample()
+            second = await take(stream, 1)
+            await stream.aclose()
+            return first, second
+
+        first, second = asyncio.run(run())
+
+        assert first == [("snapshot", {"topic": "trades", "seq": 1,
+                                       "data": {"1": {"pnl": 5.0}, "2": {"pnl": -3.0}}})]
+        event, delta = second[0]
+        assert event == "delta" and delta["topic"] == "trades" and delta["seq"] == 2
+        assert delta["set"] == {"1": {"pnl": 7.5}, "3": {"pnl": 1.0}} and delta["del"] == ["2"]
+        assert pnl.calls == 0  # Nobody subscribed to pnl
+        assert hub.get_stats()["clients"] == 0
+
+    def test_unchanged_state_sends_nothing(self):
+        source = CountingSource({"a": 1})
+        hub = LiveStateHub({"interval_seconds": 60, "heartbeat_seconds": 0.01},
+                           sources={"pnl": source})
+
+        async def run():
+            client = hub.connect()
+            stream = hub.stream(client)
+            await take(stream, 1)
+            hub.sample()
+            frame = await asyncio.wait_for(stream.__anext__(), 1.0)
+            await stream.aclose()
+            return frame
+
+        assert asyncio.run(run()) == HEARTBEAT
+        assert hub.stats["deltas"] == 0
+
+
+class TestFanOut:
+    """Test shared sampling and backpressure"""
+
+    def test_many_clients_share_one_collection(self):
+        source = CountingSource({"a": 1})
+        hub = LiveStateHub({"interval_seconds": 60}, sources={"pnl": source})
+
+        async def run():
+            clients = [hub.connect() for _ in range(50)]
+            for client in clients:
+                client.needs_snapshot = False  # Snapshots already delivered
+            calls_before = source.calls
+            source.state = {"a": 2}
+            delivered = hub.sample()
+            frames = {c.queue[0] for c in clients}
+            await hub.stop()
+            return source.calls - calls_before, delivered, frames
+
+        calls, delivered, frames = asyncio.run(run())
+
+        assert calls == 1 and delivered == 50
+        assert len(frames) == 1  # Same encoded bytes for every client
+
+    def test_slow_client_resyncs_with_snapshot(self):
+        source = CountingSource({"n": 0})
+        hub = LiveStateHub({"interval_seconds": 60, "client_queue_size": 3},
+                           sources={"pnl": source})
+
+        async def run():
+            slow, fast = hub.connect(), hub.connect()
+            slow_stream, fast_stream = hub.stream(slow), hub.stream(fast)
+            await take(slow_stream, 1)
+            await take(fast_stream, 1)
+            fast_seen = []
+            for n in range(1, 6):
+                source.state = {"n": n}
+                hub.sample()
+                fast_seen += await take(fast_stream, 1)
+            slow_seen = await take(slow_stream, 1)
+            await slow_stream.aclose()
+            await fast_stream.aclose()
+            return fast_seen, slow_seen, slow.resyncs
+
+        fast_seen, slow_seen, resyncs = asyncio.run(run())
+
+        assert [p["set"]["n"] for _, p in fast_seen] == [1, 2, 3, 4, 5]
+        assert resyncs == 1
+        assert slow_seen == [("snapshot", {"topic": "pnl", "seq": 6, "data": {"n": 5}})]
+
+    def test_client_limit_and_disabled(self):
+        hub = LiveStateHub({"max_clients": 1}, sources={"pnl": CountingSource({})})
+
+        async def run():
+            first, second = hub.connect(), hub.connect()
+            await hub.stop()
+            hub.configure({"enabled": False})
+            return first, second, hub.connect()
+
+        first, second, disabled = asyncio.run(run())
+
+        assert first is not None and second is None and disabled is None
+        assert hub.stats["rejected"] == 2
+
+
+class TestEngineSources:
+    """Test the built-in collectors against in-memory engine state"""
+
+    def test_collectors_read_portfolio_chains_plugins_and_routing(self):
+        try:
+            from src.core.portfolio_view import PortfolioView
+            from src.core.plugin_system.plugin_registry import PluginRegistry
+            from src.core.plugin_router import PluginRouter
+            from src.models import Trade, ReEntryChain
+        except ImportError:
+            pytest.skip("Engine components not available for import")
+
+        trade = Trade(symbol="EURUSD", entry=1.1000, sl=1.0950, tp=1.1100, lot_size=0.1,
+                      direction="buy", strategy="combinedlogic-1", trade_id=42,
+                      open_time="2026-01-14T09:00:00")
+        portfolio = PortfolioView(trade_source=lambda: [trade])
+        portfolio.sync()
+        portfolio.on_tick("EURUSD", 1.1010)
+        registry = PluginRegistry(config={"plugin_system": {"plugin_dir": "nonexistent"}},
+                                  service_api=None)
+        registry.plugins["v3_combined"] = SimpleNamespace(enabled=True)
+        router = PluginRouter(registry)
+        router.record_route({"strategy": "V3_FULL"}, "v3_combined")
+        router.record_route({"strategy": "V3_FULL"}, "v3_combined", success=False)
+        router.record_route({"strategy": "UNKNOWN"})
+        chain = ReEntryChain(chain_id="c1", symbol="EURUSD", direction="buy", original_entry=1.1,
+                             original_sl_distance=0.005, current_level=2, max_level=5,
+                             created_at="", last_update="")
+        engine = SimpleNamespace(
+            portfolio=portfolio, plugin_registry=registry,
+            reentry_manager=SimpleNamespace(active_chains={"c1": chain}),
+            profit_booking_manager=SimpleNamespace(active_chains={}), plugin_router=router,
+        )
+        hub = LiveStateHub()
+        hub.attach(engine)
+
+        trades = hub.sources["trades"]()
+        chains = hub.sources["chains"]()
+        plugins = hub.sources["plugins"]()
+        routing = hub.sources["routing"]()
+        router.record_route({"strategy": "V3_FULL"}, "v3_combined")
+
+        assert trades["42"]["price"] == 1.1010 and trades["42"]["pnl"] > 0
+        assert hub.sources["pnl"]()["open_trades"] == 1
+        assert chains == {"reentry:c1": {"symbol": "EURUSD", "direction": "buy", "level": 2,
+                                         "max_level": 5, "status": "active", "total_profit": 0.0}}
+        assert plugins["v3_combined"]["enabled"] and plugins["v3_combined"]["calls"] == 0
+        assert routing["total_routed"] == 3 and routing["no_plugin_found"] == 1
+        assert routing["by_plugin"] == {"v3_combined": {"success": 1, "failed": 1}}  # Copied, not shared
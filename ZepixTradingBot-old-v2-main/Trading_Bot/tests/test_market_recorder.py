@@ -0,0 +1,178 @@
+"""
+Market Recorder Tests
+
+Tests for:
+1. MarketRecorder - buffered ticks and alerts written as compressed blocks per day and symbol
+2. MarketRecordingReader - memory-mapped range scans, index and corruption tolerance
+3. Hooks - MT5Client tick listeners and the off-thread writer
+4. Retention - day directories outside retention_days removed by the writer
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.market_recorder import MarketRecorder, MarketRecordingReader, BLOCK, INDEX
+from src.utils.clock import VirtualClock
+
+DAY_START = datetime(2026, 1, 14, tzinfo=timezone.utc).timestamp()
+
+
+def make_recorder(tmp_path, **config):
+    clock = VirtualClock(start=datetime(2026, 1, 14, 9, 0, tzinfo=timezone.utc))
+    recorder = MarketRecorder(dict({"path": str(tmp_path)}, **config), clock=clock)
+    return recorder, MarketRecordingReader(str(tmp_path))
+
+
+class TestRoundTrip:
+    """Test writing and reading back ticks and alerts"""
+
+    def test_ticks_round_trip_across_blocks(self, tmp_path):
+        recorder, reader = make_recorder(tmp_path, block_rows=100)
+        base = DAY_START + 9 * 3600
+        for i in range(250):
+            recorder.record_tick("EURUSD", 1.1 + i * 1e-5, 1.1002 + i * 1e-5, float(i), ts=base + i * 0.25)
+        recorder.record_tick("XAUUSD", 2650.0, 2650.5, ts=base)
+
+        assert recorder.flush() == 251
+        ticks = reader.read_ticks("EURUSD")
+
+        assert recorder.stats["blocks"] == 4  # 100 + 100 + 50 EURUSD, 1 XAUUSD
+        assert len(ticks["time"]) == 250
+        assert np.allclose(ticks["time"], base + np.arange(250) * 0.25)
+        assert ticks["bid"][10] == 1.1 + 10 * 1e-5 and ticks["volume"][-1] == 249.0
+        assert reader.symbols("2026-01-14") == ["EURUSD", "XAUUSD"]
+        assert recorder.get_stats()["compression_ratio"] > 1.0
+
+    def test_range_scan_spans_days(self, tmp_path):
+        recorder, reader = make_recorder(tmp_path, block_rows=10)
+        for hour in range(48):
+            recorder.record_tick("GBPUSD", 1.26 + hour / 1000, 1.2602 + hour / 1000,
+                                 ts=DAY_START + hour * 3600)
+        recorder.flush()
+
+        window = reader.read_ticks("GBPUSD", start=DAY_START + 20 * 3600, end=DAY_START + 30 * 3600)
+
+        assert reader.days() == ["2026-01-14", "2026-01-15"]
+        assert len(window["time"]) == 11
+        assert window["time"][0] == DAY_START + 20 * 3600
+        assert window["bid"][-1] == 1.26 + 30 / 1000
+
+    def test_alert_payload_recorded_before_modification(self, tmp_path):
+        recorder, reader = make_recorder(tmp_path)
+        alert = {"type": "entry", "symbol": "EURUSD", "signal": "buy", "price": 1.0850}
+        recorder.record_alert(alert)
+        alert["signal"] = "sell"  # Plugins mutate the dict after recording
+        recorder.clock.set(recorder.clock.time() + 5)
+        recorder.record_alert('{"type": "exit", "symbol": "XAUUSD"}')
+        recorder.record_alert("not json")
+        recorder.flush()
+
+        alerts = reader.read_alerts()
+
+        assert [a["symbol"] for a in alerts] == ["EURUSD", "XAUUSD", "_"]
+        assert alerts[0]["payload"]["signal"] == "buy"
+        assert alerts[2]["payload"] == "not json"
+        assert reader.read_alerts("XAUUSD")[0]["payload"] == {"type": "exit", "symbol": "XAUUSD"}
+
+
+class TestDurability:
+    """Test tolerance of partial writes and a lost index"""
+
+    def test_torn_tail_and_missing_index(self, tmp_path):
+        recorder, reader = make_recorder(tmp_path, block_rows=5)
+        for i in range(10):
+            recorder.record_tick("EURUSD", 1.0 + i, 1.0 + i, ts=DAY_START + i)
+        recorder.flush()
+        path = recorder.segment_path("2026-01-14", "EURUSD", 1)
+        with open(path, "ab") as f:
+            f.write(b"ZREC\x01partial")  # Crash mid-block
+        with open(path + ".idx", "ab") as f:
+            f.write(b"\x00" * (INDEX.size // 2))
+
+        assert len(reader.read_ticks("EURUSD")["time"]) == 10
+        os.remove(path + ".idx")
+        assert list(reader.read_ticks("EURUSD", start=DAY_START + 6)["bid"]) == [7.0, 8.0, 9.0, 10.0]
+
+    def test_full_buffer_drops_instead_of_growing(self, tmp_path):
+        recorder, reader = make_recorder(tmp_path, max_pending=3)
+        for i in range(5):
+            recorder.record_tick("EURUSD", 1.0, 1.0, ts=DAY_START + i)
+
+        assert recorder.get_stats()["pending"] == 3 and recorder.stats["dropped"] == 2
+        assert reader.days() == []  # Nothing written on the calling thread
+
+
+class TestHooks:
+    """Test MT5Client tick listeners and the writer thread"""
+
+    def test_polled_prices_recorded_off_thread(self, tmp_path):
+        import src.clients.mt5_client as mt5_module
+
+        ticks = {"XAUUSD": SimpleNamespace(bid=2650.0, ask=2650.4, last=2650.2, volume=3, time=0),
+                 "EURUSD": SimpleNamespace(bid=1.0850, ask=1.0851, last=1.0850, volume=1, time=0)}
+        fake_mt5 = SimpleNamespace(symbol_info_tick=ticks.get)
+        recorder, reader = make_recorder(tmp_path, flush_interval_seconds=0.01)
+
+        with patch.object(mt5_module, "MT5_AVAILABLE", True), \
+             patch.object(mt5_module, "mt5", fake_mt5, create=True):
+            client = mt5_module.MT5Client({"simulate_orders": False, "symbol_mapping": {}})
+            client.initialized = True
+            client.add_tick_listener(recorder.record_tick)
+            client.add_tick_listener(lambda *args: 1 / 0)  # A broken listener must not break polling
+
+            recorder.start()
+            assert client.get_current_price("XAUUSD") == 2650.2
+            assert client.get_symbol_tick("EURUSD")["bid"] == 1.0850
+            deadline = time.time() + 2
+            while recorder.stats["blocks"] < 2 and time.time() < deadline:
+                time.sleep(0.01)
+            recorder.stop()
+
+        assert list(reader.read_ticks("XAUUSD")["ask"]) == [2650.4]
+        assert list(reader.read_ticks("EURUSD")["bid"]) == [1.0850]
+        assert os.path.getsize(recorder.segment_path("2026-01-14", "XAUUSD", 1)) > BLOCK.size
+
+    def test_simulated_prices_not_recorded(self, tmp_path):
+        from src.clients.mt5_client import MT5Client
+
+        recorder, _ = make_recorder(tmp_path)
+        client = MT5Client({"simulate_orders": True, "symbol_mapping": {}})
+        client.initialized = True
+        client.add_tick_listener(recorder.record_tick)
+
+        assert client.get_current_price("XAUUSD") == 2650.0
+        assert client.get_symbol_tick("EURUSD")["bid"] == 1.0850
+        assert recorder.get_stats()["pending"] == 0
+
+
+class TestRetention:
+    """Test removal of old recording days"""
+
+    def test_days_outside_window_removed_on_day_change(self, tmp_path):
+        recorder, reader = make_recorder(tmp_path, block_rows=10, retention_days=2)
+        for day in range(4):  # 2026-01-11 .. 2026-01-14
+            recorder.record_tick("EURUSD", 1.1, 1.1, ts=DAY_START - (3 - day) * 86400)
+        recorder.flush()
+        os.makedirs(os.path.join(str(tmp_path), "notes"))  # Not a day directory
+
+        recorder._prune_on_day_change()
+        recorder._prune_on_day_change()  # Same day: no second scan
+
+        assert reader.days() == ["2026-01-13", "2026-01-14", "notes"]  # Other directories untouched
+        assert recorder.stats["pruned_days"] == 2
+
+    def test_zero_retention_keeps_everything(self, tmp_path):
+        recorder, reader = make_recorder(tmp_path, retention_days=0)
+        recorder.record_tick("EURUSD", 1.1, 1.1, ts=DAY_START - 400 * 86400)
+        recorder.flush()
+
+        assert recorder.prune() == 0
+        assert len(reader.days()) == 1
@@ -0,0 +1,231 @@
+"""
+Memory Telemetry Tests
+
+Tests for:
+1. estimate_size / evict_oldest - sampled sizing, in-place eviction
+2. MemoryTelemetry - caps, byte budgets, callback eviction, alert cooldown
+3. tracemalloc snapshots and reports
+4. Owners - CommandExecutor, AlertProcessor and RecoveryWindowMonitor stay bounded
+"""
+
+import asyncio
+import os
+import sys
+import tracemalloc
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.monitoring.memory_telemetry import (
+    MemoryTelemetry, EvictionPolicy, estimate_size, evict_oldest
+)
+
+
+class TestSizing:
+    """Test size estimation and eviction helpers"""
+
+    def test_estimate_grows_with_content(self):
+        small = [{'id': i, 'text': 'x' * 10} for i in range(10)]
+        large = [{'id': i, 'text': 'x' * 10} for i in range(1000)]
+
+        assert estimate_size(large) > estimate_size(small) * 50
+        assert estimate_size([]) > 0
+
+    def test_evict_oldest_supports_common_containers(self):
+        items = list(range(10))
+        ring = deque(range(10))
+        ordered = OrderedDict((i, i) for i in range(10))
+        plain = {i: i for i in range(10)}
+
+        assert evict_oldest(items, 3) == 3 and items[0] == 3
+        assert evict_oldest(ring, 3) == 3 and ring[0] == 3
+        assert evict_oldest(ordered, 3) == 3 and next(iter(ordered)) == 3
+        assert evict_oldest(plain, 3) == 3 and next(iter(plain)) == 3
+        assert evict_oldest((1, 2), 1) == 0
+
+
+class TestMemoryTelemetry:
+    """Test registration, enforcement and alerts"""
+
+    def test_item_cap_evicts_oldest(self):
+        owner = {'log': list(range(50))}
+        telemetry = MemoryTelemetry()
+        telemetry.register('log', lambda: owner['log'], max_items=20)
+
+        alerts = telemetry.check()
+
+        assert owner['log'] == list(range(30, 50))
+        assert alerts == []
+        assert telemetry.components['log'].evicted == 30
+
+    def test_getter_follows_rebound_attribute(self):
+        owner = {'log': [1]}
+        telemetry = MemoryTelemetry()
+        telemetry.register('log', lambda: owner['log'], max_items=5)
+        owner['log'] = list(range(8))
+
+        telemetry.check()
+
+        assert owner['log'] == [3, 4, 5, 6, 7]
+
+    def test_byte_budget_evicts(self):
+        data = [f"{i:04d}" * 250 for i in range(100)]
+        telemetry = MemoryTelemetry()
+        telemetry.register('blobs', lambda: data, budget_bytes=20 * 1024)
+
+        telemetry.check()
+
+        assert 0 < len(data) < 25
+        assert telemetry.components['blobs'].size_bytes <= 20 * 1024
+
+    def test_alert_only_component_alerts_with_cooldown(self):
+        data = list(range(10))
+        received = []
+        telemetry = MemoryTelemetry({'alert_cooldown_seconds': 3600})
+        telemetry.add_alert_callback(received.append)
+        telemetry.register('metrics', lambda: data, max_items=5, policy=EvictionPolicy.ALERT_ONLY)
+
+        asyncio.run(telemetry.run_once())
+        asyncio.run(telemetry.run_once())
+
+        assert len(data) == 10
+        assert len(received) == 1
+        assert received[0].component == 'metrics'
+        assert '10/5 items' in received[0].message
+
+    def test_callback_policy_requires_evict(self):
+        telemetry = MemoryTelemetry()
+        with pytest.raises(ValueError):
+            telemetry.register('x', lambda: [], policy=EvictionPolicy.CALLBACK)
+
+    def test_failing_getter_reports_empty(self):
+        telemetry = MemoryTelemetry()
+
+        def broken():
+            raise AttributeError('owner not loaded')
+
+        telemetry.register('missing', broken, max_items=1)
+        telemetry.check()
+
+        assert telemetry.components['missing'].items == 0
+
+    def test_telegram_alert_awaits_async_send(self):
+        sent = []
+
+        class AsyncBot:
+            async def send_message(self, text):
+                sent.append(text)
+
+        telemetry = MemoryTelemetry(telegram_bot=AsyncBot())
+        telemetry.register('metrics', lambda: [1, 2, 3], max_items=1,
+                           policy=EvictionPolicy.ALERT_ONLY)
+        asyncio.run(telemetry.run_once())
+
+        assert len(sent) == 1 and 'metrics' in sent[0]
+
+
+    def test_register_attributes_names_and_default_caps(self):
+        class Owner:
+            def __init__(self):
+                self._log = deque(maxlen=5)
+                self.items = []
+
+        owner = Owner()
+        telemetry = MemoryTelemetry()
+        names = telemetry.register_attributes(owner, "owner", {"_log": None, "items": 2},
+                                              policy=EvictionPolicy.OLDEST)
+        owner.items = [1, 2, 3, 4]  # Rebound after registration
+        telemetry.check()
+
+        assert names == ["owner.log", "owner.items"]
+        assert telemetry.components["owner.log"].max_items == 5
+        assert owner.items == [3, 4]
+        assert telemetry.register_attributes(None, "missing", {"x": 1}) == []
+        assert not telemetry.tracemalloc_enabled  # Tracing is opt-in
+
+
+class TestReports:
+    """Test snapshots and report output"""
+
+    def test_snapshot_and_report(self):
+        telemetry = MemoryTelemetry({'tracemalloc_top_n': 3})
+        data = [str(i) * 20 for i in range(200)]
+        telemetry.register('data', lambda: data)
+
+        try:
+            top = telemetry.take_snapshot()
+            report = telemetry.get_report()
+        finally:
+            tracemalloc.stop()
+
+        assert len(top) <= 3
+        assert report['components']['data']['items'] == 200
+        assert report['tracked_kb'] > 0
+        assert report['tracemalloc_tracing'] is True
+        assert 'data: 200 items' in telemetry.format_report()
+
+
+class TestOwners:
+    """Test the long-lived containers that register with telemetry"""
+
+    def test_command_executor_log_is_capped(self):
+        try:
+            from src.menu.command_executor import CommandExecutor
+        except ImportError:
+            pytest.skip("CommandExecutor not available for import")
+
+        executor = CommandExecutor(MagicMock())
+        for i in range(CommandExecutor.MAX_EXECUTION_LOG + 50):
+            executor.execution_log.append({'command': f'c{i}', 'status': 'success'})
+
+        assert len(executor.execution_log) == CommandExecutor.MAX_EXECUTION_LOG
+        assert executor.get_execution_log(limit=2)[-1]['command'] == f'c{CommandExecutor.MAX_EXECUTION_LOG + 49}'
+
+    def test_alert_processor_ages_alerts_without_timestamp(self):
+        try:
+            from src.processors.alert_processor import AlertProcessor
+            from src.models import Alert
+        except ImportError:
+            pytest.skip("AlertProcessor not available for import")
+
+        processor = AlertProcessor(MagicMock())
+        old = Alert(type='entry', symbol='EURUSD', signal='buy', tf='5m')
+        processor.store_entry_alert(old)
+        processor._stored_at[id(old)] = datetime.now() - timedelta(minutes=10)
+
+        fresh = Alert(type='entry', symbol='XAUUSD', signal='sell', tf='5m')
+        processor.store_entry_alert(fresh)
+
+        assert processor.recent_alerts == [fresh]
+        assert list(processor._stored_at) == [id(fresh)]
+
+    def test_recovery_monitor_prunes_finished_entries(self):
+        try:
+            from src.managers.recovery_window_monitor import RecoveryWindowMonitor
+        except ImportError:
+            pytest.skip("RecoveryWindowMonitor not available for import")
+
+        async def scenario():
+            monitor = RecoveryWindowMonitor(MagicMock())
+            done = asyncio.create_task(asyncio.sleep(0))
+            running = asyncio.create_task(asyncio.sleep(10))
+            await asyncio.sleep(0.01)
+            monitor.active_monitors = {1: {}, 2: {}, 3: {}}
+            monitor.monitor_tasks = {1: done, 2: running}
+
+            telemetry = MemoryTelemetry()
+            telemetry.register_attributes(
+                monitor, "recovery_window_monitor", {"active_monitors": 1},
+                policy=EvictionPolicy.CALLBACK,
+                evict=lambda container, excess: monitor.prune_finished_monitors()
+            )
+            telemetry.check()
+            remaining = set(monitor.active_monitors)
+            running.cancel()
+            return remaining
+
+        assert asyncio.run(scenario()) == {2}
@@ -0,0 +1,202 @@
+"""
+Multi-Account Execution Tests
+
+Tests for:
+1. AccountRiskState - per-account lot scaling and entry limits
+2. Account runtime on the PaperBroker - mirrors follow primary tickets
+3. AccountCoordinator - fan-out to worker processes, aggregation, MT5Client listener
+"""
+
+import asyncio
+import os
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.clients.paper_broker import PaperBroker
+from src.core.multi_account import (
+    AccountCoordinator, AccountRiskState, AccountSpec, _AccountRuntime
+)
+
+
+def paper_account(account_id, **settings):
+    return {"account_id": account_id, "broker": "paper", "seed": 7, **settings}
+
+
+class TestAccountRiskState:
+    """Test lot scaling and limits"""
+
+    def test_fixed_and_balance_scaling(self):
+        fixed = AccountRiskState(AccountSpec.from_config({"account_id": "a", "lot_multiplier": 0.5}))
+        by_balance = AccountRiskState(AccountSpec.from_config(
+            {"account_id": "b", "lot_scaling": "balance", "max_lot": 1.0}))
+
+        assert fixed.scale_lot(0.25, 10000, 10000) == 0.12  # Rounded down to the lot step
+        assert by_balance.scale_lot(0.2, 50000, 10000) == 1.0  # Capped at max_lot
+        assert by_balance.scale_lot(0.01, 2000, 10000) == 0.0  # Below min_lot
+
+    def test_daily_loss_limit_blocks_entries(self):
+        risk = AccountRiskState(AccountSpec.from_config(
+            {"account_id": "a", "daily_loss_limit": 100, "max_open_positions": 2}))
+        risk.roll_day(10000)
+
+        assert risk.check_entry(9950, 0) == (True, "")
+        assert not risk.check_entry(9900, 0)[0]
+        assert "max open positions" in risk.check_entry(10000, 2)[1]
+
+
+class TestAccountRuntime:
+    """Test the worker-side account logic without a process"""
+
+    def make_runtime(self, state_path="", **settings):
+        spec = AccountSpec.from_config(paper_account("prop", **settings))
+        spec.state_path = state_path
+        broker = PaperBroker(spec.settings)
+        broker.initialize()
+        return _AccountRuntime(None, spec, broker), broker
+
+    def test_close_and_modify_follow_primary_ticket(self):
+        runtime, broker = self.make_runtime(lot_multiplier=2.0)
+
+        placed = runtime.place({"ticket": 11, "symbol": "EURUSD", "order_type": "buy",
+                                "lot_size": 0.1, "sl": 1.09, "tp": 1.12})
+        modified = runtime.modify({"ticket": 11, "sl": 1.095})
+        closed = runtime.close({"ticket": 11})
+
+        assert placed["status"] == "filled" and placed["lot_size"] == 0.2
+        assert modified == {"status": "modified", "ticket": placed["ticket"]}
+        assert closed["status"] == "closed"
+        assert broker.get_positions() == []
+        assert runtime.close({"ticket": 99})["status"] == "skipped"
+
+    def test_broker_closes_free_the_position_cap_and_map_survives_restart(self, tmp_path):
+        state_path = str(tmp_path / "prop.mirrors.json")
+        runtime, broker = self.make_runtime(max_open_positions=2, state_path=state_path)
+        first = runtime.place({"ticket": 1, "symbol": "EURUSD", "order_type": "buy", "lot_size": 0.1})
+        runtime.place({"ticket": 2, "symbol": "EURUSD", "order_type": "buy", "lot_size": 0.1})
+        capped = runtime.place({"ticket": 3, "symbol": "EURUSD", "order_type": "buy", "lot_size": 0.1})
+        broker.close_position(first["ticket"])  # Mirror's own SL hit at the broker
+
+        reopened = runtime.place({"ticket": 3, "symbol": "EURUSD", "order_type": "buy", "lot_size": 0.1})
+        restarted = _AccountRuntime(None, runtime.spec, broker)
+
+        assert capped["status"] == "skipped"
+        assert reopened["status"] == "filled"
+        assert runtime.status()["dropped_mirrors"] == 1
+        assert set(restarted.mirrors) == {2, 3}
+        assert restarted.close({"ticket": 2})["status"] == "closed"
+
+    def test_losing_day_halts_new_entries(self):
+        runtime, broker = self.make_runtime(daily_loss_limit=50)
+        runtime.place({"ticket": 1, "symbol": "EURUSD", "order_type": "buy", "lot_size": 1.0})
+        broker.set_price("EURUSD", 1.0900)  # ~ -$1000 floating
+
+        result = runtime.place({"ticket": 2, "symbol": "EURUSD", "order_type": "buy", "lot_size": 1.0})
+
+        assert result["status"] == "skipped"
+        assert "daily loss limit" in result["reason"]
+        assert runtime.status()["halted"]
+
+
+class TestAccountCoordinator:
+    """Test fan-out across worker processes"""
+
+    def test_fan_out_scales_and_aggregates(self, tmp_path):
+        async def scenario():
+            coordinator = AccountCoordinator({"enabled": True, "state_dir": str(tmp_path), "accounts": [
+                paper_account("prop_a", lot_multiplier=1.0),
+                paper_account("prop_b", lot_multiplier=0.5),
+                paper_account("prop_c", min_lot=0.5),
+            ]})
+            assert await coordinator.start() == 3
+            try:
+                placed = await coordinator.fan_out("place", {
+                    "ticket": 1, "symbol": "XAUUSD", "order_type": "buy", "lot_size": 0.2})
+                closed = await coordinator.fan_out("close", {"ticket": 1})
+                stats = coordinator.get_stats()
+            finally:
+                await coordinator.stop()
+            return placed, closed, stats
+
+        placed, closed, stats = asyncio.run(scenario())
+
+        lots = {a: r.get("lot_size") for a, r in placed["accounts"].items()}
+        assert lots == {"prop_a": 0.2, "prop_b": 0.1, "prop_c": None}
+        assert (placed["succeeded"], placed["skipped"], placed["failed"]) == (2, 1, 0)
+        assert closed["succeeded"] == 2
+        assert stats["accounts"]["prop_a"]["open_positions"] == 0
+        assert "prop_c: skipped" in AccountCoordinator.format_summary(placed)
+
+    def test_primary_executions_are_mirrored_under_load(self, tmp_path):
+        try:
+            from src.clients.mt5_client import MT5Client
+        except ImportError:
+            pytest.skip("MT5Client not available for import")
+
+        notifications = []
+
+        async def scenario():
+            random.seed(41)  # Simulated primary tickets are random; keep them distinct
+            primary = MT5Client({"simulate_orders": True})
+            primary.initialized = True
+            coordinator = AccountCoordinator(
+                {"enabled": True, "state_dir": str(tmp_path),
+                 "accounts": [paper_account(f"prop_{i}") for i in range(3)]},
+                primary_client=primary, notifier=notifications.append)
+            await coordinator.start()
+            primary.add_execution_listener(coordinator.on_primary_execution)
+            try:
+                started = time.perf_counter()
+                tickets = [primary.place_order("EURUSD", "buy", 0.1, 1.1, 1.09) for _ in range(100)]
+                for ticket in tickets[:50]:
+                    primary.close_position(ticket)
+                await coordinator.drain()
+                elapsed = time.perf_counter() - started
+                stats = coordinator.get_stats()
+            finally:
+                await coordinator.stop()
+            return stats, elapsed
+
+        stats, elapsed = asyncio.run(scenario())
+
+        assert stats["fan_outs"] == 150 and stats["failures"] == 0
+        for account in stats["accounts"].values():
+            assert account["filled"] == 100
+            assert account["open_positions"] == 50
+        # Entries notify; clean closes do not
+        assert len(notifications) == 100
+        assert elapsed < 30
+
+    def test_external_primary_close_reaches_mirrors_once(self, tmp_path):
+        async def scenario():
+            coordinator = AccountCoordinator({"enabled": True, "state_dir": str(tmp_path),
+                                              "notify": False, "accounts": [paper_account("prop_a")]})
+            await coordinator.start()
+            try:
+                for ticket in (5, 6):
+                    await coordinator.fan_out("place", {
+                        "ticket": ticket, "symbol": "EURUSD", "order_type": "buy", "lot_size": 0.1})
+                # 5: closed by the broker's SL; 6: closed by the bot, then OrderClosed follows
+                coordinator.on_primary_closed(SimpleNamespace(trade_id=5, reason="SL_HIT_AUTO_CLOSED"))
+                coordinator.on_primary_execution("close", {"ticket": 6, "percentage": 100})
+                coordinator.on_primary_closed(SimpleNamespace(trade_id=6, reason="MANUAL"))
+                await coordinator.drain()
+                status = await coordinator.refresh_status()
+                closes = [r["accounts"]["prop_a"]["status"] for r in coordinator.last_results
+                          if r["event"] == "close"]
+                stats = coordinator.get_stats()
+            finally:
+                await coordinator.stop()
+            return status, closes, stats
+
+        status, closes, stats = asyncio.run(scenario())
+
+        assert closes == ["closed", "closed"]
+        assert stats["external_closes"] == 1
+        assert status["prop_a"]["open_positions"] == 0
+        assert os.path.exists(tmp_path / "prop_a.mirrors.json")
@@ -0,0 +1,218 @@
+"""
+Order Template Tests
+
+Tests for:
+1. OrderTemplate - price arithmetic matches the V3 SL/TP rules
+2. OrderTemplateService - warm lookups, rebuild on tier/config/metadata change
+3. Integration - ServiceAPI lookup and V3 dual orders served from templates
+"""
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.order_templates import OrderTemplate, OrderTemplateService
+
+
+class FakeMT5:
+    """Account balance source with a call counter"""
+
+    def __init__(self, balance=10000.0):
+        self.balance = balance
+        self.balance_calls = 0
+
+    def get_account_balance(self):
+        self.balance_calls += 1
+        return self.balance
+
+
+class FakeRisk:
+    """Tier lot lookup with a call counter"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def get_fixed_lot_size(self, balance):
+        self.calls += 1
+        return 0.2 if balance >= 10000 else 0.1
+
+
+def make_service(balance=10000.0, **config):
+    config = {"fixed_lot_sizes": {"5000": 0.1, "10000": 0.2},
+              "risk_config": {"default_sl_pips": 40}, **config}
+    mt5, risk = FakeMT5(balance), FakeRisk()
+    return OrderTemplateService(config, mt5_client=mt5, risk_manager=risk), mt5, risk
+
+
+class TestOrderTemplate:
+    """Test template price arithmetic"""
+
+    def test_fixed_dollar_and_fallback_sl(self):
+        buy = OrderTemplate("p", "XAUUSD", "default", "BUY", base_lot=0.1, fallback_sl_pips=50)
+        sell = OrderTemplate("p", "EURUSD", "default", "SELL", base_lot=0.1)
+
+        # $10 / (0.1 lot * 10) = 10 pips; gold pip = 0.01 * 10
+        assert buy.fixed_dollar_sl(2000.0, 0.1) == pytest.approx(1999.0)
+        assert buy.fallback_sl(2000.0) == pytest.approx(1999.5)
+        assert sell.fixed_dollar_sl(1.1, 0.1) == pytest.approx(1.11)
+        assert sell.tp_for(1.1, 1.11, rr_ratio=2) == pytest.approx(1.08)
+
+    def test_check_stops(self):
+        template = OrderTemplate("p", "EURUSD", "default", "BUY", base_lot=0.1, min_stop_distance=0.001)
+
+        assert template.check_stops(1.1, 1.098, 1.103) == (True, "")
+        assert not template.check_stops(1.1, 1.1005)[0]
+        assert not template.check_stops(1.1, 1.102)[0]
+
+
+class TestOrderTemplateService:
+    """Test template caching and rebuilds"""
+
+    def test_warm_lookup_skips_tier_resolution(self):
+        service, mt5, risk = make_service()
+        service.register_plugin("v3", lambda logic, direction: {"rr_ratio": 2.0, "lot_multiplier": 1.5})
+
+        first = service.get("v3", "EURUSD", "LOGIC1", "buy")
+        for _ in range(5):
+            assert service.get("v3", "EURUSD", "LOGIC1", "BUY") is first
+
+        assert risk.calls == 1
+        assert first.base_lot == 0.2 and first.rr_ratio == 2.0
+        assert first.lot_for() == pytest.approx(0.3)
+        assert first.fallback_sl_pips == 40
+        assert service.stats["hits"] == 5
+
+    def test_rebuilds_when_balance_tier_changes(self):
+        service, mt5, risk = make_service()
+        first = service.get("v3", "EURUSD")
+
+        mt5.balance = 10500.0  # Same tier
+        assert service.get("v3", "EURUSD") is first
+        mt5.balance = 6000.0   # Drops a tier
+        rebuilt = service.get("v3", "EURUSD")
+
+        assert rebuilt.base_lot == 0.1
+        assert service.stats["rebuilds"] == 1
+
+    def test_invalidate_and_refresh_keep_templates_armed(self):
+        service, mt5, risk = make_service()
+        service.register_plugin("v6", logics=["default"])
+        assert service.arm("v6", ["EURUSD", "XAUUSD"]) == 4
+
+        service.invalidate(symbol="XAUUSD")
+
+        assert service.refresh() == 2
+        assert service.get_stats()["templates"] == 4
+        assert risk.calls == 6
+
+    def test_invalid_lot_blocks_template(self):
+        service, mt5, risk = make_service()
+        risk.get_fixed_lot_size = lambda balance: 0.0
+
+        template = service.get("v3", "EURUSD")
+
+        assert not template.valid
+        assert "No lot size" in template.reason
+
+
+class TestIntegration:
+    """Test plugin-facing integration"""
+
+    def test_config_reload_invalidates(self):
+        try:
+            from src.core.config_snapshot import ConfigSnapshotStore
+        except ImportError:
+            pytest.skip("ConfigSnapshotStore not available for import")
+
+        class SnapshotConfig(dict):
+            def __init__(self, data):
+                super().__init__(data)
+                self.snapshots = ConfigSnapshotStore("test")
+                self.snapshots.publish(data)
+
+            @property
+            def snapshot(self):
+                return self.snapshots.current
+
+            def subscribe(self, callback, sections=None):
+                self.snapshots.subscribe(callback, sections)
+
+        config = SnapshotConfig({"fixed_lot_sizes": {"5000": 0.1}, "default_risk_tier": "5000"})
+        service = OrderTemplateService(config, mt5_client=FakeMT5(), risk_manager=FakeRisk())
+        first = service.get("v3", "EURUSD")
+
+        config["default_risk_tier"] = "10000"
+        config.snapshots.publish(dict(config))
+
+        assert service.get("v3", "EURUSD") is not first
+
+    def test_v3_dual_orders_use_template(self):
+        try:
+            from src.logic_plugins.v3_combined.order_manager import V3OrderManager
+            from src.core.plugin_system.service_api import ServiceAPI
+        except ImportError:
+            pytest.skip("V3OrderManager not available for import")
+
+        service, mt5, risk = make_service()
+        placed = []
+
+        class TemplateServiceAPI:
+            """ServiceAPI stand-in exposing only the template methods"""
+            get_order_template = ServiceAPI.get_order_template
+            register_order_templates = ServiceAPI.register_order_templates
+            order_templates = service
+            _plugin_id = "core"
+
+            def calculate_lot_size(self, symbol):
+                raise AssertionError("tier lot should come from the template")
+
+            async def place_order_async(self, **kwargs):
+                placed.append(kwargs)
+                return {"success": True, "trade_id": len(placed)}
+
+            def send_notification(self, message, priority):
+                pass
+
+        class Plugin:
+            plugin_id = "v3_combined"
+            shadow_mode = False
+            plugin_config = {"dual_orders": {"split_ratio": 0.5, "order_b_fixed_sl_dollars": 10.0},
+                             "logic_multipliers": {"combinedlogic-1": 1.25}, "rr_ratio": 2.0}
+
+        manager = V3OrderManager(Plugin(), TemplateServiceAPI())
+        alert = {"symbol": "EURUSD", "direction": "buy", "price": 1.1, "consensus_score": 9}
+
+        result = asyncio.run(manager.place_v3_dual_orders(alert, "combinedlogic-1", 1.0))
+
+        assert result["status"] == "success"
+        assert [o["lot_size"] for o in placed] == [0.1, 0.1]
+        # Order A fallback SL 40 pips, TP at 2R; Order B $10 fixed SL
+        assert placed[0]["sl_price"] == pytest.approx(1.096)
+        assert placed[0]["tp_price"] == pytest.approx(1.108)
+        assert placed[1]["sl_price"] == pytest.approx(1.09)
+        assert ("v3_combined", "EURUSD", "combinedlogic-1", "BUY") in service._templates
+
+    def test_v6_lot_call_not_sized_from_template(self):
+        try:
+            from src.core.plugin_system.service_api import ServiceAPI
+        except ImportError:
+            pytest.skip("ServiceAPI not available for import")
+
+        service, mt5, risk = make_service()
+        api = ServiceAPI.__new__(ServiceAPI)
+        api._engine = SimpleNamespace(order_templates=service)
+        api._plugin_id = "v6_price_action_1m"
+
+        # V6 plugins pass entry/SL prices; they keep their 0.01 fallback
+        # rather than silently trading the full tier lot
+        with pytest.raises(TypeError):
+            asyncio.run(api.calculate_lot_size_async(
+                plugin_id="v6_price_action_1m", symbol="EURUSD",
+                sl_price=1.095, entry_price=1.1
+            ))
+        assert service.get_stats()["templates"] == 0
@@ -0,0 +1,244 @@
+"""
+Plugin Hot Reload Tests
+
+Tests for:
+1. PluginHotReloader - new code loaded next to the old, state handed over
+2. Drain of in-flight calls before the routing switch, failures keep the old instance
+3. Shadow candidates - evaluated through PluginRouter, gated promotion, discard
+"""
+
+import asyncio
+import os
+import sys
+import textwrap
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.plugin_system.plugin_hot_reload import PluginHotReloader, SHADOW_SUFFIX
+from src.core.plugin_system.plugin_registry import PluginRegistry
+from src.core.plugin_router import PluginRouter
+from src.core.shadow_mode_manager import ShadowModeManager, ExecutionMode
+
+PLUGIN_SOURCE = '''
+import asyncio
+from src.core.plugin_system.base_plugin import BaseLogicPlugin
+from .helper import VERSION
+
+
+class CounterPlugin(BaseLogicPlugin):
+    def __init__(self, plugin_id, config, service_api):
+        super().__init__(plugin_id, config, service_api)
+        self.count = 0
+
+    async def process_entry_signal(self, alert):
+        self.count += 1
+        await asyncio.sleep(alert.get("delay", 0))
+        return {"action": "execute", "version": VERSION, "count": self.count}
+
+    async def process_exit_signal(self, alert):
+        return {"action": "close"}
+
+    async def process_reversal_signal(self, alert):
+        return {"action": "reverse"}
+
+    def can_process_signal(self, signal):
+        return True
+
+    def export_state(self):
+        return dict(super().export_state(), count=self.count)
+
+    def import_state(self, state):
+        super().import_state(state)
+        self.count = state.get("count", 0)
+'''
+
+
+def write_version(package_dir, version, broken=False):
+    """Write the plugin package; helper.py carries the version marker"""
+    plugin_dir = os.path.join(package_dir, "counter")
+    os.makedirs(plugin_dir, exist_ok=True)
+    files = {
+        "__init__.py": "",
+        "helper.py": f"VERSION = {version}\n",
+        "plugin.py": PLUGIN_SOURCE + ("\nthis is not python\n" if broken else ""),
+    }
+    for name, source in files.items():
+        path = os.path.join(plugin_dir, name)
+        with open(path, "w") as f:
+            f.write(textwrap.dedent(source))
+        # Rewrites within one second must not reuse stale bytecode
+        os.utime(path, (version * 100, version * 100))
+
+
+def make_registry(tmp_path, monkeypatch, version=1):
+    package = "hot_" + uuid.uuid4().hex[:8]
+    package_dir = tmp_path / package
+    package_dir.mkdir()
+    (package_dir / "__init__.py").write_text("")
+    write_version(str(package_dir), version)
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    registry = PluginRegistry(config={"plugin_system": {"plugin_dir": package}}, service_api=None)
+    assert registry.load_plugin("counter")
+    return registry, str(package_dir)
+
+
+class TestReload:
+    """Test loading new code and handing over state"""
+
+    def test_reload_switches_code_and_keeps_state(self, tmp_path, monkeypatch):
+        registry, package_dir = make_registry(tmp_path, monkeypatch)
+        reloader = PluginHotReloader(registry)
+
+        async def run():
+            old = registry.get_plugin("counter")
+            first = await old.process_entry_signal({})
+            write_version(package_dir, 2)
+            result = await reloader.reload_plugin("counter")
+            second = await registry.get_plugin("counter").process_entry_signal({})
+            return old, first, result, second
+
+        old, first, result, second = asyncio.run(run())
+
+        assert first == {"action": "execute", "version": 1, "count": 1}
+        assert result.success and result.generation == 1
+        assert second == {"action": "execute", "version": 2, "count": 2}
+        assert registry.get_plugin("counter") is not old
+        assert registry._hook_handlers["on_sl_hit"]["counter"][0] is registry.get_plugin("counter")
+        assert registry.profiler.get_usage("counter")["calls"] == 2
+
+    def test_old_generation_modules_released(self, tmp_path, monkeypatch):
+        registry, package_dir = make_registry(tmp_path, monkeypatch)
+        reloader = PluginHotReloader(registry)
+        package = os.path.basename(package_dir)
+
+        async def run():
+            for version in (2, 3):
+                write_version(package_dir, version)
+                assert (await reloader.reload_plugin("counter")).success
+            return await registry.get_plugin("counter").process_entry_signal({})
+
+        assert asyncio.run(run())["version"] == 3
+        assert f"{package}.counter__r2.plugin" in sys.modules
+        assert f"{package}.counter__r1.plugin" not in sys.modules
+
+
+class TestDrain:
+    """Test in-flight drain and failure handling"""
+
+    def test_switch_waits_for_in_flight_call(self, tmp_path, monkeypatch):
+        registry, package_dir = make_registry(tmp_path, monkeypatch)
+        reloader = PluginHotReloader(registry)
+        old = registry.get_plugin("counter")
+
+        async def run():
+            in_flight = asyncio.ensure_future(old.process_entry_signal({"delay": 0.05}))
+            await asyncio.sleep(0)
+            assert registry.profiler.in_flight(old) == 1
+            write_version(package_dir, 2)
+            result = await reloader.reload_plugin("counter")
+            return result, in_flight.done(), await in_flight
+
+        result, finished_before_switch, old_result = asyncio.run(run())
+
+        assert result.success and result.drain_ms >= 30
+        assert finished_before_switch
+        assert old_result["version"] == 1
+        assert registry.get_plugin("counter").count == 1  # Exported after the call finished
+
+    def test_drain_timeout_and_import_error_keep_old_instance(self, tmp_path, monkeypatch):
+        registry, package_dir = make_registry(tmp_path, monkeypatch)
+        reloader = PluginHotReloader(registry, config={"drain_timeout_seconds": 0.01})
+        old = registry.get_plugin("counter")
+
+        async def run():
+            in_flight = asyncio.ensure_future(old.process_entry_signal({"delay": 0.1}))
+            await asyncio.sleep(0)
+            write_version(package_dir, 2)
+            timed_out = await reloader.reload_plugin("counter")
+            await in_flight
+            write_version(package_dir, 3, broken=True)
+            broken = await reloader.reload_plugin("counter")
+            return timed_out, broken
+
+        timed_out, broken = asyncio.run(run())
+
+        assert not timed_out.success and "still running" in timed_out.message
+        assert not broken.success and "import failed" in broken.message
+        assert registry.get_plugin("counter") is old
+        assert [r.action for r in reloader.history] == ["reload", "reload"]
+
+
+class TestShadowPromotion:
+    """Test shadow evaluation before promotion"""
+
+    def test_candidate_evaluated_then_promoted(self, tmp_path, monkeypatch):
+        registry, package_dir = make_registry(tmp_path, monkeypatch)
+        shadow = ShadowModeManager({"spill_enabled": False})
+        shadow.set_mode(ExecutionMode.SHADOW)
+        router = PluginRouter(registry, shadow_manager=shadow)
+        reloader = PluginHotReloader(registry, shadow_manager=shadow,
+                                     config={"min_shadow_comparisons": 2})
+        old = registry.get_plugin("counter")
+        candidate_id = "counter" + SHADOW_SUFFIX
+
+        async def run():
+            write_version(package_dir, 2)
+            started = await reloader.reload_plugin("counter", shadow=True)
+            candidate = registry.shadow_candidates[candidate_id]
+            live = await router.route_signal({"plugin_hint": "counter", "type": "entry"})
+            await router.drain_shadow_tasks()
+            gated = await reloader.promote("counter")
+            await router.route_signal({"plugin_hint": "counter", "type": "entry"})
+            await router.drain_shadow_tasks()
+            promoted = await reloader.promote("counter")
+            return started, candidate, live, gated, promoted
+
+        started, candidate, live, gated, promoted = asyncio.run(run())
+        new = registry.get_plugin("counter")
+
+        assert started.success and candidate.config["shadow_mode"]
+        assert live["version"] == 1  # Live routing untouched while in shadow
+        assert candidate.count == 2  # Candidate saw both signals
+        assert not gated.success and "shadow gate" in gated.message
+        assert promoted.success and new is not old and new is not candidate
+        assert new.plugin_id == "counter" and "shadow_mode" not in new.config
+        assert new.count == old.count == 2
+        assert candidate_id not in registry.shadow_candidates
+        assert not shadow.is_plugin_in_shadow(candidate_id)
+
+    def test_unevaluated_candidate_needs_force(self, tmp_path, monkeypatch):
+        registry, package_dir = make_registry(tmp_path, monkeypatch)
+        shadow = ShadowModeManager({"spill_enabled": False})
+        reloader = PluginHotReloader(registry, shadow_manager=shadow,
+                                     config={"min_shadow_comparisons": 0})
+        old = registry.get_plugin("counter")
+
+        async def run():
+            write_version(package_dir, 2)
+            await reloader.reload_plugin("counter", shadow=True)
+            return await reloader.promote("counter"), await reloader.promote("counter", force=True)
+
+        gated, forced = asyncio.run(run())
+
+        assert not gated.success and "0 compared" in gated.message
+        assert forced.success and registry.get_plugin("counter") is not old
+
+    def test_discard_keeps_live_version(self, tmp_path, monkeypatch):
+        registry, package_dir = make_registry(tmp_path, monkeypatch)
+        shadow = ShadowModeManager({"spill_enabled": False})
+        reloader = PluginHotReloader(registry, shadow_manager=shadow)
+        old = registry.get_plugin("counter")
+
+        async def run():
+            write_version(package_dir, 2)
+            await reloader.reload_plugin("counter", shadow=True)
+            return reloader.discard("counter"), await reloader.promote("counter")
+
+        discarded, promoted = asyncio.run(run())
+
+        assert discarded.success and not promoted.success
+        assert registry.get_plugin("counter") is old
+        assert registry.shadow_candidates == {}
+        assert reloader.get_stats()["shadow_candidates"] == []
@@ -0,0 +1,202 @@
+"""
+Plugin Worker Tests
+
+Tests for:
+1. PluginWorkerHandle - calls into a worker process, manifest-driven method shape
+2. ServiceAPI proxy - sync and async core services called from the worker
+3. Isolation - CPU-bound plugin does not block the core loop, per-call timeouts
+4. Recovery - PluginRegistry / PluginHealthMonitor restart a worker in place
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.plugin_system.plugin_worker import (
+    PluginWorkerHandle, PluginWorkerError, PluginWorkerTimeout
+)
+
+
+class WorkerTestPlugin:
+    """Minimal plugin imported by the worker process"""
+
+    def __init__(self, plugin_id, config, service_api):
+        self.plugin_id = plugin_id
+        self.config = config
+        self.service_api = service_api
+        self.enabled = config.get("enabled", True)
+
+    def get_supported_strategies(self):
+        return ["TEST_STRATEGY"]
+
+    def describe(self):
+        return {"plugin_id": self.plugin_id, "pid": os.getpid()}
+
+    async def process_entry_signal(self, alert):
+        return {"status": "success", "symbol": alert["symbol"], "pid": os.getpid()}
+
+    async def burn(self, seconds):
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            pass
+        return "done"
+
+    async def quote(self, symbol):
+        spread = await self.service_api.get_current_spread(symbol)
+        price = self.service_api.get_price(symbol)
+        return {"spread": spread, "price": price}
+
+
+class CoreServices:
+    """Core-side ServiceAPI stand-in"""
+
+    def __init__(self):
+        self.calls = []
+
+    def get_price(self, symbol):
+        self.calls.append(("get_price", symbol))
+        return 1.2345
+
+    async def get_current_spread(self, symbol):
+        self.calls.append(("get_current_spread", symbol))
+        return 0.8
+
+
+def make_handle(services=None, **kwargs):
+    handle = PluginWorkerHandle(
+        plugin_id="worker_test",
+        module_path=WorkerTestPlugin.__module__,
+        class_name="WorkerTestPlugin",
+        config={"enabled": True},
+        service_api=services or CoreServices(),
+        start_timeout=60.0,
+        **kwargs
+    )
+    assert handle.start()
+    return handle
+
+
+@pytest.fixture(scope="module")
+def handle():
+    handle = make_handle(call_timeout=0.5)
+    yield handle
+    handle.stop()
+
+
+class TestWorkerCalls:
+    """Test calls through the handle"""
+
+    def test_async_call_runs_in_other_process(self, handle):
+        result = asyncio.run(handle.process_entry_signal({"symbol": "EURUSD"}))
+
+        assert result["status"] == "success"
+        assert result["pid"] == handle.process.pid != os.getpid()
+
+    def test_manifest_shapes_methods(self, handle):
+        assert asyncio.iscoroutinefunction(handle.process_entry_signal)
+        assert not asyncio.iscoroutinefunction(handle.describe)
+        assert handle.describe()["plugin_id"] == "worker_test"
+        assert handle.get_supported_strategies() == ["TEST_STRATEGY"]
+        assert not hasattr(handle, "process_exit_signal")
+        assert handle.get_status()["execution_mode"] == "process"
+
+    def test_service_calls_are_proxied_to_core(self, handle):
+        services = handle.service_api
+        result = asyncio.run(handle.quote("XAUUSD"))
+
+        assert result == {"spread": 0.8, "price": 1.2345}
+        assert ("get_current_spread", "XAUUSD") in services.calls
+        assert ("get_price", "XAUUSD") in services.calls
+
+
+class TestIsolation:
+    """Test CPU isolation and timeouts"""
+
+    def test_cpu_bound_plugin_does_not_block_core_loop(self, handle):
+        async def scenario():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.01)
+
+            task = asyncio.create_task(ticker())
+            result = await handle.call("burn", 0.3, timeout=5)
+            task.cancel()
+            return result, ticks
+
+        result, ticks = asyncio.run(scenario())
+        assert result == "done"
+        assert ticks >= 10
+
+    def test_timeout_and_unresponsive_ping(self, handle):
+        async def scenario():
+            with pytest.raises(PluginWorkerTimeout):
+                await handle.call("burn", 1.5, timeout=0.2)
+            busy = await handle.ping(timeout=0.2)
+            await asyncio.sleep(1.5)
+            return busy, await handle.ping(timeout=2)
+
+        busy, recovered = asyncio.run(scenario())
+        assert busy is False
+        assert recovered is True
+        assert handle.stats["timeouts"] >= 1
+
+
+class TestRecovery:
+    """Test restarting workers without restarting the bot"""
+
+    def test_health_monitor_restarts_dead_worker(self, tmp_path):
+        try:
+            from src.core.plugin_system.plugin_registry import PluginRegistry
+            from src.monitoring.plugin_health_monitor import PluginHealthMonitor
+        except ImportError:
+            pytest.skip("PluginRegistry not available for import")
+
+        registry = PluginRegistry({}, CoreServices())
+        handle = make_handle()
+        registry.workers["worker_test"] = handle
+        registry.plugins["worker_test"] = handle
+        monitor = PluginHealthMonitor(plugin_registry=registry, db_path=str(tmp_path / "health.db"))
+
+        old_pid = handle.process.pid
+        handle.process.kill()
+        handle.process.join(5)
+
+        async def scenario():
+            with pytest.raises(PluginWorkerError):
+                await handle.process_entry_signal({"symbol": "EURUSD"})
+            dead = await handle.ping()
+            restarted = await monitor._restart_plugin("worker_test")
+            return dead, restarted, await handle.process_entry_signal({"symbol": "EURUSD"})
+
+        try:
+            dead, restarted, result = asyncio.run(scenario())
+        finally:
+            registry.shutdown_workers()
+
+        assert dead is False
+        assert restarted is True
+        assert registry.plugins["worker_test"] is handle
+        assert result["pid"] != old_pid
+        assert handle.restarts == 1
+
+    def test_registry_routes_configured_plugins_to_workers(self):
+        try:
+            from src.core.plugin_system.plugin_registry import PluginRegistry
+        except ImportError:
+            pytest.skip("PluginRegistry not available for import")
+
+        registry = PluginRegistry(
+            {"plugin_system": {"process_workers": {"plugins": ["v6_price_action_1m"]}}}, CoreServices()
+        )
+
+        assert registry.runs_in_worker("v6_price_action_1m") is True
+        assert registry.runs_in_worker("v3_combined") is False
@@ -0,0 +1,231 @@
+"""
+Portfolio View Tests
+
+Tests for:
+1. PortfolioView - incremental ticks, fills, closes and modifies with versioning
+2. Snapshots and renders - consistent, rebuilt once per version
+3. Consumers - RiskManager live PnL, version-aware HeaderCache and StickyHeader (clock change key)
+"""
+
+import os
+import sys
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.portfolio_view import PortfolioView
+
+
+class FlatPips:
+    """1 pip = 0.0001, $10 per pip per lot"""
+
+    def get_pip_size(self, symbol):
+        return 0.01 if symbol == "XAUUSD" else 0.0001
+
+    def get_pip_value(self, symbol, lot_size):
+        return 10.0 * lot_size
+
+
+def make_trade(trade_id, symbol="EURUSD", direction="buy", entry=1.1000, lot_size=1.0, **extra):
+    return SimpleNamespace(trade_id=trade_id, symbol=symbol, direction=direction, entry=entry,
+                           sl=entry - 0.0050, tp=entry + 0.0100, lot_size=lot_size,
+                           strategy="combinedlogic-1", status="open", **extra)
+
+
+def make_view(trades=None, **sources):
+    trades = [] if trades is None else trades
+    view = PortfolioView(pip_calculator=FlatPips(), trade_source=lambda: trades, **sources)
+    return view, trades
+
+
+class TestIncrementalUpdates:
+    """Test tick/fill/close/modify events"""
+
+    def test_ticks_reprice_only_that_symbol(self):
+        view, trades = make_view()
+        trades += [make_trade(1), make_trade(2, direction="sell"),
+                   make_trade(3, symbol="XAUUSD", entry=2000.0, lot_size=0.1)]
+        view.sync()
+
+        view.on_tick("EURUSD", 1.1020)
+        version = view.version
+        assert not view.on_tick("EURUSD", 1.1020)  # Unchanged price, no new version
+        view.on_tick("XAUUSD", 1995.0)
+        snapshot = view.snapshot()
+
+        pnl = {p.trade_id: round(p.pnl, 2) for p in snapshot.positions}
+        assert version == view.version - 1
+        assert pnl == {1: 200.0, 2: -200.0, 3: -500.0}
+        assert round(snapshot.total_pnl, 2) == -500.0
+
+    def test_execution_events_update_positions(self):
+        view, trades = make_view()
+        trades.append(make_trade(7))
+        view.sync()
+        view.on_tick("EURUSD", 1.1010)
+
+        view.on_execution("modify", {"ticket": 7, "sl": 1.1000})
+        assert view.snapshot().positions[0].sl == 1.1000
+
+        view.on_execution("close", {"ticket": 7, "percentage": 50})
+        assert view.snapshot().open_count == 1  # Partial close keeps the position
+        view.on_execution("close", {"ticket": 7})
+        snapshot = view.snapshot()
+
+        assert snapshot.open_count == 0 and snapshot.total_pnl == 0.0
+        assert view.get_stats()["closes"] == 1
+
+    def test_fill_is_picked_up_on_next_read(self):
+        view, trades = make_view()
+        view.sync()
+
+        view.on_execution("place", {"ticket": 42, "symbol": "EURUSD"})
+        trades.append(make_trade(42, chain_id="chain-1", chain_level=2))
+        snapshot = view.snapshot()
+
+        assert [p.trade_id for p in snapshot.positions] == [42]
+        assert snapshot.chains == {"chain-1": 2}
+        assert view.get_stats()["pending_fills"] == 0
+
+    def test_sync_reconciles_external_changes(self):
+        view, trades = make_view()
+        trades += [make_trade(1), make_trade(2)]
+        view.sync()
+        version = view.version
+
+        assert not view.sync()  # Nothing changed
+        trades.pop(0)
+        trades[0].lot_size = 0.5
+        assert view.sync()
+
+        snapshot = view.snapshot()
+        assert view.version == version + 1
+        assert [(p.trade_id, p.lot_size) for p in snapshot.positions] == [(2, 0.5)]
+
+
+class TestSnapshots:
+    """Test consistent snapshots and memoized renders"""
+
+    def test_snapshot_summary_from_sources(self):
+        counters = SimpleNamespace(daily_loss=30.0, lifetime_loss=90.0, total_trades=8,
+                                   winning_trades=6, today_profit=120.0, today_loss=-30.0,
+                                   today_trade_count=4)
+        view, _ = make_view(
+            risk_source=lambda: counters,
+            account_source=lambda: {"balance": 10250.0, "equity": 10300.0},
+            status_source=lambda: {"trading_enabled": False, "session": "London"},
+        )
+        view.sync()
+        snapshot = view.snapshot()
+
+        assert (snapshot.balance, snapshot.equity) == (10250.0, 10300.0)
+        assert snapshot.today == {"profit": 120.0, "loss": -30.0, "net": 90.0, "trade_count": 4}
+        assert snapshot.win_rate == 75.0 and snapshot.daily_loss == 30.0
+        providers = view.data_providers()
+        assert providers["bot_status"]() == "PAUSED"
+        assert providers["current_session"]() == "London"
+
+    def test_snapshot_and_render_rebuilt_once_per_version(self):
+        view, trades = make_view()
+        trades.append(make_trade(1))
+        view.sync()
+        renders = []
+
+        def renderer(snapshot):
+            renders.append(snapshot.version)
+            return f"open={snapshot.open_count}"
+
+        first = view.snapshot()
+        for _ in range(100):
+            assert view.snapshot() is first
+            view.render("dashboard", renderer)
+        view.on_tick("EURUSD", 1.1005)
+        view.render("dashboard", renderer)
+
+        assert len(renders) == 2
+        assert view.get_stats()["snapshot_builds"] == 2
+        assert first.positions[0].current_price == 1.1000  # Old snapshot is unchanged
+
+
+class TestConsumers:
+    """Test surfaces reading from the view"""
+
+    def test_risk_manager_serves_live_pnl_without_broker_calls(self):
+        try:
+            from src.managers.risk_manager import RiskManager
+        except ImportError:
+            pytest.skip("RiskManager not available for import")
+
+        view, trades = make_view()
+        trades.append(make_trade(5, direction="sell"))
+        view.sync()
+        view.on_tick("EURUSD", 1.0990)
+        engine = SimpleNamespace(portfolio=view)
+        mt5 = MagicMock()
+
+        result = RiskManager.get_live_open_trades_pnl(MagicMock(), engine, mt5, FlatPips())
+
+        assert round(result["total_live_pnl"], 2) == 100.0
+        assert result["trade_details"][0]["direction"] == "SELL"
+        mt5.get_current_price.assert_not_called()
+
+    def test_header_cache_valid_until_version_changes(self):
+        from src.telegram.headers.header_cache import HeaderCache
+
+        cache = HeaderCache(ttl_seconds=0)
+        cache.set("controller", "v1", version=3)
+
+        assert cache.get("controller", version=3) == "v1"
+        assert cache.get("controller", version=4) is None
+
+    def test_sticky_header_skips_edits_while_version_unchanged(self):
+        from src.telegram.sticky_headers import StickyHeader
+
+        view, trades = make_view()
+        edits = []
+        header = StickyHeader("1", edit_callback=lambda **kwargs: edits.append(kwargs["text"]),
+                              content_generator=lambda: f"trades={view.snapshot().open_count}",
+                              version_source=lambda: view.version)
+        header.message_id = 10
+
+        for _ in range(3):
+            if header._is_stale():
+                header._update_header()
+        trades.append(make_trade(1))
+        view.sync()
+        if header._is_stale():
+            header._update_header()
+
+        assert edits == ["trades=0", "trades=1"]
+
+    def test_clock_change_key_refreshes_time_and_session(self):
+        from src.telegram import sticky_headers
+        from src.telegram.sticky_headers import StickyHeader, clock_change_key
+
+        view, _ = make_view()
+        session = ["London"]
+        edits = []
+        header = StickyHeader("1", edit_callback=lambda **kwargs: edits.append(kwargs["text"]),
+                              content_generator=lambda: f"session={session[0]}",
+                              version_source=clock_change_key(lambda: view.version, lambda: session[0]))
+        header.message_id = 10
+
+        class FrozenClock:
+            minute = datetime(2026, 1, 14, 9, 0, 5)
+
+            @classmethod
+            def now(cls):
+                return cls.minute
+
+        with patch.object(sticky_headers, "datetime", FrozenClock):
+            header._update_header()
+            assert not header._is_stale()  # Same version, minute and session
+            FrozenClock.minute = datetime(2026, 1, 14, 9, 1, 0)
+            assert header._is_stale()  # Header clock must tick
+            header._update_header()
+            session[0] = "New York"
+            assert header._is_stale()
@@ -0,0 +1,159 @@
+"""
+Risk Ledger Tests
+
+Tests for:
+1. RiskLedger - append, replay, compaction, day rollover
+2. RiskManager - counters derived from the ledger, legacy stats.json seeding,
+   flagged manual overrides, restart recovery and today's performance
+"""
+
+import json
+import os
+import sys
+from datetime import date, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.managers.risk_ledger import RiskLedger, RiskEventType, RiskCounters
+
+
+class TestRiskLedger:
+    """Test the append-only ledger"""
+
+    def test_append_and_replay(self, tmp_path):
+        path = str(tmp_path / "ledger.db")
+        ledger = RiskLedger(path, compact_every=0)
+        ledger.append(RiskEventType.TRADE_PNL, 25.0, symbol="EURUSD")
+        ledger.append(RiskEventType.TRADE_PNL, -40.0, symbol="XAUUSD")
+        ledger.append(RiskEventType.LOSS, 10.0)
+        ledger.close()
+
+        counters = RiskLedger(path).replay()
+
+        assert counters.total_trades == 2
+        assert counters.winning_trades == 1
+        assert counters.daily_profit == 25.0
+        assert counters.daily_loss == 50.0
+        assert counters.lifetime_loss == 50.0
+        assert counters.today_loss == -40.0
+
+    def test_compaction_preserves_counters(self, tmp_path):
+        path = str(tmp_path / "ledger.db")
+        ledger = RiskLedger(path, compact_every=5)
+        for _ in range(12):
+            ledger.append(RiskEventType.TRADE_PNL, -1.0)
+        expected = ledger.counters.to_dict()
+
+        rows = ledger.conn.execute("SELECT COUNT(*) FROM risk_events").fetchone()[0]
+        assert rows < 12
+
+        assert RiskLedger(path).replay().to_dict() == expected
+
+    def test_resets(self, tmp_path):
+        ledger = RiskLedger(str(tmp_path / "ledger.db"))
+        ledger.append(RiskEventType.TRADE_PNL, -30.0)
+        ledger.append(RiskEventType.RESET_DAILY_LOSS)
+
+        assert ledger.counters.daily_loss == 0.0
+        assert ledger.counters.lifetime_loss == 30.0
+
+        ledger.append(RiskEventType.RESET_LIFETIME_LOSS)
+        assert ledger.counters.lifetime_loss == 0.0
+
+    def test_day_rollover_on_replay(self, tmp_path):
+        path = str(tmp_path / "ledger.db")
+        ledger = RiskLedger(path)
+        yesterday = str(date.today() - timedelta(days=1))
+        ledger.seed(RiskCounters(day=yesterday, daily_loss=80.0, lifetime_loss=200.0).to_dict())
+
+        counters = ledger.replay()
+
+        assert counters.daily_loss == 0.0
+        assert counters.lifetime_loss == 200.0
+
+
+class TestRiskManagerLedger:
+    """Test RiskManager on top of the ledger"""
+
+    @pytest.fixture
+    def workdir(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        os.makedirs("data")
+        return tmp_path
+
+    def make_manager(self):
+        from src.managers.risk_manager import RiskManager
+        return RiskManager({"risk_tiers": {}, "fixed_lot_sizes": {}})
+
+    def test_update_pnl_does_not_rewrite_stats_file(self, workdir):
+        manager = self.make_manager()
+        manager.update_pnl(-20.0, symbol="EURUSD")
+        manager.update_pnl(15.0)
+
+        assert not os.path.exists("data/stats.json")
+        assert manager.daily_loss == 20.0
+        assert manager.daily_profit == 15.0
+        assert manager.total_trades == 2
+
+    def test_restart_recovery(self, workdir):
+        manager = self.make_manager()
+        manager.update_pnl(-20.0)
+        manager.record_loss(5.0)
+        manager.ledger.close()
+
+        restarted = self.make_manager()
+
+        assert restarted.daily_loss == 25.0
+        assert restarted.lifetime_loss == 25.0
+        assert restarted.get_todays_performance()["trade_count"] == 1
+
+    def test_seeds_from_legacy_stats_file(self, workdir):
+        with open("data/stats.json", "w") as f:
+            json.dump({"date": str(date.today()), "daily_loss": 12.5, "daily_profit": 3.0,
+                       "lifetime_loss": 99.0, "total_trades": 7, "winning_trades": 4}, f)
+
+        manager = self.make_manager()
+
+        assert manager.daily_loss == 12.5
+        assert manager.lifetime_loss == 99.0
+        assert manager.total_trades == 7
+
+    def test_reset_daily_loss_exports_stats_file(self, workdir):
+        manager = self.make_manager()
+        manager.update_pnl(-50.0)
+
+        assert manager.reset_daily_loss() is True
+        with open("data/stats.json") as f:
+            assert json.load(f)["daily_loss"] == 0.0
+        assert manager.lifetime_loss == 50.0
+
+    def test_manual_override_is_recorded(self, workdir):
+        manager = self.make_manager()
+        manager.lifetime_loss = 42.0
+        manager.save_stats(override=True)
+        manager.daily_loss = 99.0
+        manager.save_stats()  # Not flagged: the ledger value wins
+        manager.ledger.close()
+
+        restarted = self.make_manager()
+        assert restarted.lifetime_loss == 42.0
+        assert restarted.daily_loss == 0.0 and manager.daily_loss == 0.0
+
+    def test_todays_performance_includes_db_only_closes(self, workdir):
+        import sqlite3
+        from types import SimpleNamespace
+
+        manager = self.make_manager()
+        manager.update_pnl(-10.0)
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE trades (pnl REAL, close_time TEXT, status TEXT)")
+        today = date.today().isoformat()
+        conn.executemany("INSERT INTO trades VALUES (?, ?, 'closed')",
+                         [(-10.0, today + " 10:00:00"), (25.0, today + " 11:00:00")])  # Second is DB-only
+
+        performance = manager.get_todays_performance(SimpleNamespace(conn=conn))
+
+        assert performance == {'profit': 25.0, 'loss': -10.0, 'net': 15.0, 'trade_count': 2}
+        assert manager.get_todays_performance(SimpleNamespace(conn=None))["trade_count"] == 1
@@ -0,0 +1,160 @@
+"""
+Symbol Metadata Registry Tests
+
+Tests for:
+1. SymbolRegistry - load once, TTL refresh, stale fallback, invalidation
+2. Config fallback (simulation mode) and pip size resolution
+3. Shared price_to_pips rule used by TradeDatabase and MarketDataService
+4. MT5Client.validate_order_parameters served from the registry
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.clients.symbol_registry import SymbolRegistry, SymbolMetadata, price_to_pips, default_pip_size
+
+
+def make_info(**overrides):
+    data = dict(
+        digits=5, point=0.00001, trade_stops_level=20, volume_min=0.01,
+        volume_max=50.0, volume_step=0.01, trade_contract_size=100000.0,
+        trade_tick_value=1.0, trade_tick_size=0.00001, trade_mode=4, visible=True
+    )
+    data.update(overrides)
+    return SimpleNamespace(**data)
+
+
+class TestSymbolRegistry:
+    """Test loading and caching behaviour"""
+
+    def test_loads_once_per_session(self):
+        loader = Mock(return_value=make_info())
+        registry = SymbolRegistry(loader)
+
+        first = registry.get("EURUSD")
+        second = registry.get("EURUSD")
+
+        assert first is second
+        assert loader.call_count == 1
+        assert first.digits == 5
+        assert first.stops_level == 20
+        assert registry.get_stats()["hits"] == 1
+
+    def test_refreshes_after_interval(self):
+        loader = Mock(return_value=make_info())
+        registry = SymbolRegistry(loader, refresh_interval=60)
+
+        with patch("src.clients.symbol_registry.time.time", return_value=1000.0):
+            registry.get("EURUSD")
+        with patch("src.clients.symbol_registry.time.time", return_value=1030.0):
+            registry.get("EURUSD")
+            assert loader.call_count == 1
+        with patch("src.clients.symbol_registry.time.time", return_value=1100.0):
+            assert registry.refresh_stale() == 1
+
+        assert loader.call_count == 2
+
+    def test_serves_stale_entry_when_refresh_fails(self):
+        loader = Mock(return_value=make_info())
+        registry = SymbolRegistry(loader, refresh_interval=0)
+        registry.get("EURUSD")
+
+        loader.return_value = None
+        meta = registry.get("EURUSD")
+
+        assert meta is not None
+        assert registry.get_stats()["failures"] == 1
+
+    def test_symbol_mapping_applied(self):
+        loader = Mock(return_value=make_info(digits=2, point=0.01))
+        registry = SymbolRegistry(loader, symbol_mapper=lambda s: "GOLD" if s == "XAUUSD" else s)
+
+        meta = registry.get("XAUUSD")
+
+        loader.assert_called_once_with("GOLD")
+        assert meta.broker_symbol == "GOLD"
+
+    def test_invalidate(self):
+        loader = Mock(return_value=make_info())
+        registry = SymbolRegistry(loader)
+        registry.get("EURUSD")
+        registry.invalidate()
+        registry.get("EURUSD")
+
+        assert loader.call_count == 2
+
+    def test_config_fallback(self):
+        config = {"symbol_config": {"EURUSD": {"pip_size": 0.0001, "contract_size": 100000}}}
+        registry = SymbolRegistry(Mock(return_value=None), config=config)
+
+        meta = registry.get("EURUSD")
+
+        assert meta.source == "config"
+        assert meta.digits == 5
+        assert registry.get("UNKNOWN") is None
+
+
+class TestPipMath:
+    """Test pip size and conversion rules"""
+
+    def test_pip_size_prefers_config(self):
+        config = {"symbol_config": {"XAUUSD": {"pip_size": 0.01}}}
+        registry = SymbolRegistry(Mock(return_value=make_info(digits=2, point=0.01)), config=config)
+
+        assert registry.pip_size("XAUUSD") == 0.01
+
+    def test_pip_size_from_broker_digits(self):
+        registry = SymbolRegistry(Mock(return_value=make_info(digits=3, point=0.001)))
+
+        assert registry.pip_size("EURJPY") == pytest.approx(0.01)
+
+    def test_pip_value_from_tick_value(self):
+        registry = SymbolRegistry(Mock(return_value=make_info()))
+
+        assert registry.pip_value("EURUSD", 1.0) == pytest.approx(10.0)
+
+    def test_price_to_pips(self):
+        assert price_to_pips("EURUSD", 0.0050) == pytest.approx(50.0)
+        assert price_to_pips("USDJPY", 0.50) == pytest.approx(50.0)
+        assert price_to_pips("XAUUSD", 5.0) == pytest.approx(50.0)
+        assert default_pip_size("xagusd") == 0.1
+
+    def test_normalize_volume(self):
+        meta = SymbolMetadata(symbol="EURUSD", broker_symbol="EURUSD", digits=5,
+                              point=0.00001, volume_min=0.01, volume_max=1.0, volume_step=0.01)
+
+        assert meta.normalize_volume(0.123) == 0.12
+        assert meta.normalize_volume(5.0) == 1.0
+        assert meta.normalize_volume(0.0) == 0.01
+
+
+class TestMT5ClientIntegration:
+    """Test MT5Client order validation uses the registry"""
+
+    def test_validate_uses_cached_metadata(self):
+        import src.clients.mt5_client as mt5_module
+
+        fake_mt5 = Mock()
+        fake_mt5.symbol_info = Mock(return_value=make_info())
+        fake_mt5.ORDER_TYPE_BUY = 0
+        fake_mt5.ORDER_TYPE_SELL = 1
+
+        config = {"simulate_orders": False, "symbol_mapping": {}}
+        with patch.object(mt5_module, "MT5_AVAILABLE", True), \
+             patch.object(mt5_module, "mt5", fake_mt5, create=True):
+            client = mt5_module.MT5Client(config)
+            for _ in range(3):
+                ok, _ = client.validate_order_parameters("EURUSD", "buy", 1.1000, 1.0950, 1.1050)
+                assert ok
+
+            ok, msg = client.validate_order_parameters("EURUSD", "buy", 1.1000, 1.09999)
+            assert not ok
+            assert "less than minimum" in msg
+
+        assert fake_mt5.symbol_info.call_count == 1
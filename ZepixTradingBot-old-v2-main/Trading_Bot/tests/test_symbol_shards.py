@@ -0,0 +1,145 @@
+"""
+Symbol Shard Tests
+
+Tests for:
+1. RiskBudget - atomic reservations against open-trade, lot and loss limits
+2. SymbolShard - periodic cycles, queued jobs, error isolation
+3. SymbolShardManager - slow symbol does not delay others, idle retirement
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.symbol_shards import RiskBudget, SymbolShardManager
+
+
+class TestRiskBudget:
+    """Test the shared global budget"""
+
+    def test_open_trade_limit_counts_reservations(self):
+        budget = RiskBudget(max_open_trades=3, open_exposure=lambda: (1, 0.1))
+
+        first = budget.try_reserve("EURUSD", 0.1)
+        second = budget.try_reserve("XAUUSD", 0.1)
+        third = budget.try_reserve("GBPUSD", 0.1)
+
+        assert first and second
+        assert third is None
+        budget.release(first)
+        assert budget.try_reserve("GBPUSD", 0.1) is not None
+        assert budget.get_stats()["denied"] == 1
+
+    def test_lot_limit_and_loss_guard(self):
+        budget = RiskBudget(max_total_lots=1.0, open_exposure=lambda: (2, 0.8))
+        assert budget.try_reserve("EURUSD", 0.3) is None
+        assert budget.try_reserve("EURUSD", 0.2) is not None
+
+        blocked = RiskBudget(loss_guard=lambda: False)
+        assert blocked.try_reserve("EURUSD", 0.01) is None
+
+    def test_limits_reread_on_every_check(self):
+        config = {"risk_management": {"max_open_trades": 1}}
+        budget = RiskBudget(open_exposure=lambda: (1, 0.5),
+                            limits=lambda: config.get("risk_management", {}))
+        assert budget.try_reserve("EURUSD", 0.1) is None
+
+        config["risk_management"]["max_open_trades"] = 3  # Risk menu edit
+        config["risk_management"]["max_total_lots"] = 0.55
+        assert budget.try_reserve("EURUSD", 0.1) is None
+        assert budget.try_reserve("EURUSD", 0.05) is not None
+        assert budget.get_stats()["max_open_trades"] == 3
+
+    def test_context_manager_always_releases(self):
+        budget = RiskBudget(max_open_trades=1)
+        with pytest.raises(RuntimeError):
+            with budget.reserve("EURUSD", 0.1) as reservation:
+                assert reservation is not None
+                raise RuntimeError("order failed")
+
+        assert budget.get_stats()["reserved_trades"] == 0
+
+
+class TestSymbolShards:
+    """Test per-symbol workers"""
+
+    def test_slow_symbol_does_not_delay_others(self):
+        cycles = {"EURUSD": 0, "XAUUSD": 0}
+
+        async def cycle(symbol):
+            cycles[symbol] += 1
+            if symbol == "XAUUSD":
+                await asyncio.sleep(0.5)  # slow broker close
+
+        async def scenario():
+            manager = SymbolShardManager(cycle, interval=0.02)
+            manager.sync(["EURUSD", "XAUUSD"])
+            await asyncio.sleep(0.3)
+            stats = manager.get_stats()
+            await manager.stop()
+            return stats
+
+        stats = asyncio.run(scenario())
+
+        assert cycles["XAUUSD"] == 1
+        assert cycles["EURUSD"] >= 5
+        assert stats["XAUUSD"]["cycles"] == 0  # still inside its first cycle
+        assert stats["EURUSD"]["running"] is True
+
+    def test_jobs_run_on_symbol_queue_and_errors_are_isolated(self):
+        executed = []
+
+        async def cycle(symbol):
+            raise ValueError("price feed down")
+
+        async def job():
+            executed.append("close")
+
+        async def scenario():
+            manager = SymbolShardManager(cycle, interval=0.05)
+            assert manager.submit("EURUSD", job)
+            await asyncio.sleep(0.12)
+            stats = manager.get_stats()["EURUSD"]
+            await manager.stop()
+            return stats
+
+        stats = asyncio.run(scenario())
+
+        assert executed == ["close"]
+        assert stats["jobs"] == 1
+        assert stats["errors"] >= 1
+        assert stats["running"] is True
+
+    def test_idle_shards_retired(self):
+        async def cycle(symbol):
+            return None
+
+        async def scenario():
+            manager = SymbolShardManager(cycle, interval=1.0, idle_timeout=0.0)
+            manager.sync(["EURUSD", "GBPUSD"])
+            await asyncio.sleep(0)
+            manager.sync(["EURUSD"])
+            symbols = set(manager.shards)
+            await manager.stop()
+            return symbols
+
+        assert asyncio.run(scenario()) == {"EURUSD"}
+
+
+class TestPriceMonitorSharding:
+    """Test symbol filtering in PriceMonitorService"""
+
+    def test_select_symbols(self):
+        try:
+            from src.services.price_monitor_service import PriceMonitorService
+        except ImportError:
+            pytest.skip("PriceMonitorService not available for import")
+
+        pending = {"EURUSD": [], "XAUUSD": []}
+
+        assert PriceMonitorService._select_symbols(pending, None) == ["EURUSD", "XAUUSD"]
+        assert PriceMonitorService._select_symbols(pending, {"XAUUSD"}) == ["XAUUSD"]
@@ -0,0 +1,261 @@
+"""
+Telegram Webhook Ingress Tests
+
+Tests for:
+1. TelegramWebhookIngress - secret path/header validation, dedupe, ordering
+2. Handler dispatch - async handlers, blocking handlers in executor, backpressure
+3. FastAPI route mounting
+4. Update delivery selection - webhook when enabled, polling fallback
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.telegram.webhook_ingress import TelegramWebhookIngress, SECRET_HEADER
+
+
+def make_ingress(**config):
+    ingress = TelegramWebhookIngress(dict({'public_url': 'https://bot.example.com', 'secret': 's3cret'}, **config))
+    ingress.mounted = True
+    return ingress
+
+
+def body(update_id, text="/start"):
+    return json.dumps({'update_id': update_id, 'message': {'text': text, 'chat': {'id': 1}}}).encode()
+
+
+class TestValidation:
+    """Test request authentication and parsing"""
+
+    def test_paths_hide_token_and_differ_per_bot(self):
+        ingress = make_ingress()
+        ingress.register_bot('controller', '123:ABC', lambda u: None)
+        ingress.register_bot('analytics', '456:DEF', lambda u: None)
+
+        url = ingress.webhook_url('controller')
+        assert url.startswith('https://bot.example.com/telegram/controller/')
+        assert '123:ABC' not in url
+        assert ingress.bots['controller'].path_secret != ingress.bots['analytics'].path_secret
+
+    def test_rejects_bad_path_header_and_body(self):
+        ingress = make_ingress()
+        bot = ingress.register_bot('controller', '123:ABC', lambda u: None)
+
+        async def scenario():
+            return [
+                await ingress.handle_request('controller', 'wrong', bot.header_secret, body(1)),
+                await ingress.handle_request('unknown', bot.path_secret, bot.header_secret, body(1)),
+                await ingress.handle_request('controller', bot.path_secret, None, body(1)),
+                await ingress.handle_request('controller', bot.path_secret, bot.header_secret, b'not json'),
+                await ingress.handle_request('controller', bot.path_secret, bot.header_secret, b'{"x": 1}'),
+            ]
+
+        assert asyncio.run(scenario()) == [404, 404, 403, 400, 400]
+        assert ingress.bots['controller'].rejected == 3
+
+    def test_enabled_needs_url_and_route(self):
+        ingress = TelegramWebhookIngress({'public_url': 'https://bot.example.com'})
+        assert ingress.enabled is False
+        ingress.mounted = True
+        assert ingress.enabled is True
+        ingress.configure({})
+        assert ingress.enabled is False
+
+
+class TestDispatch:
+    """Test queueing into handlers"""
+
+    def test_updates_processed_in_order_and_deduplicated(self):
+        received = []
+        ingress = make_ingress()
+
+        async def handler(update):
+            await asyncio.sleep(0.01)
+            received.append(update['update_id'])
+
+        bot = ingress.register_bot('controller', '123:ABC', handler)
+
+        async def scenario():
+            statuses = []
+            for update_id in (1, 2, 2, 3):
+                statuses.append(await ingress.handle_request(
+                    'controller', bot.path_secret, bot.header_secret, body(update_id)))
+            await ingress.drain()
+            await ingress.stop()
+            return statuses
+
+        assert asyncio.run(scenario()) == [200, 200, 200, 200]
+        assert received == [1, 2, 3]
+        assert bot.duplicates == 1
+        assert bot.processed == 3
+
+    def test_blocking_handler_runs_off_the_event_loop(self):
+        threads = []
+        ingress = make_ingress()
+        bot = ingress.register_bot('legacy', '123:ABC',
+                                   lambda u: threads.append(threading.get_ident()),
+                                   run_in_thread=True)
+
+        async def scenario():
+            await ingress.handle_request('legacy', bot.path_secret, bot.header_secret, body(1))
+            await ingress.drain()
+            await ingress.stop()
+            return threading.get_ident()
+
+        loop_thread = asyncio.run(scenario())
+        assert threads and threads[0] != loop_thread
+
+    def test_handler_error_does_not_stop_worker(self):
+        received = []
+        ingress = make_ingress()
+
+        def handler(update):
+            if update['update_id'] == 1:
+                raise RuntimeError('boom')
+            received.append(update['update_id'])
+
+        bot = ingress.register_bot('controller', '123:ABC', handler)
+
+        async def scenario():
+            for update_id in (1, 2):
+                await ingress.handle_request('controller', bot.path_secret, bot.header_secret, body(update_id))
+            await ingress.drain()
+            await ingress.stop()
+
+        asyncio.run(scenario())
+        assert received == [2]
+        assert bot.errors == 1
+
+    def test_full_queue_asks_for_retry(self):
+        ingress = make_ingress(max_queue_size=1)
+        gate = None
+
+        async def handler(update):
+            await gate.wait()
+
+        bot = ingress.register_bot('controller', '123:ABC', handler)
+
+        async def scenario():
+            nonlocal gate
+            gate = asyncio.Event()
+            statuses = []
+            for update_id in (1, 2, 3):
+                statuses.append(await ingress.handle_request(
+                    'controller', bot.path_secret, bot.header_secret, body(update_id)))
+                await asyncio.sleep(0)
+            gate.set()
+            await ingress.drain()
+            retry = await ingress.handle_request('controller', bot.path_secret, bot.header_secret, body(3))
+            await ingress.drain()
+            await ingress.stop()
+            return statuses, retry
+
+        statuses, retry = asyncio.run(scenario())
+        assert statuses == [200, 200, 503]
+        assert retry == 200
+
+
+class TestServerRoute:
+    """Test the FastAPI route"""
+
+    def test_mounted_route_accepts_update(self):
+        try:
+            from fastapi import FastAPI
+            from fastapi.testclient import TestClient
+        except ImportError:
+            pytest.skip("FastAPI test client not available for import")
+
+        received = []
+        app = FastAPI()
+        ingress = TelegramWebhookIngress({'public_url': 'https://bot.example.com', 'secret': 'x'})
+        ingress.mount(app)
+        bot = ingress.register_bot('controller', '123:ABC', received.append)
+
+        with TestClient(app) as client:
+            ok = client.post(ingress.webhook_path('controller'), content=body(7),
+                             headers={SECRET_HEADER: bot.header_secret})
+            forbidden = client.post(ingress.webhook_path('controller'), content=body(8))
+
+        assert ingress.enabled is True
+        assert ok.status_code == 200
+        assert forbidden.status_code == 403
+
+    def test_route_follows_prefix_configured_after_mount(self):
+        try:
+            from fastapi import FastAPI
+            from fastapi.testclient import TestClient
+        except ImportError:
+            pytest.skip("FastAPI test client not available for import")
+
+        app = FastAPI()
+        ingress = TelegramWebhookIngress()
+        ingress.mount(app)  # Import time, default prefix
+        ingress.configure({'public_url': 'https://bot.example.com', 'path_prefix': '/hooks/tg',
+                           'secret': 'x'})
+        bot = ingress.register_bot('controller', '123:ABC', lambda update: None)
+        headers = {SECRET_HEADER: bot.header_secret}
+
+        with TestClient(app) as client:
+            configured = client.post(ingress.webhook_path('controller'), content=body(1), headers=headers)
+            stale = client.post(f"/telegram/controller/{bot.path_secret}", content=body(2), headers=headers)
+
+        assert ingress.webhook_url('controller').startswith('https://bot.example.com/hooks/tg/controller/')
+        assert configured.status_code == 200
+        assert stale.status_code == 404
+        assert len([r for r in app.router.routes if 'path_secret' in getattr(r, 'path', '')]) == 1
+
+
+class TestDeliverySelection:
+    """Test webhook vs polling selection"""
+
+    def test_simple_bot_answers_start(self):
+        from src.telegram.base_telegram_bot import BaseTelegramBot
+
+        bot = BaseTelegramBot('123:ABC', bot_name='NotifyBot')
+        bot.send_message = MagicMock()
+        bot.handle_simple_update({'update_id': 1, 'message': {'text': '/start', 'chat': {'id': 42}}}, 'hi')
+        bot.handle_simple_update({'update_id': 2, 'message': {'text': 'hello', 'chat': {'id': 42}}}, 'hi')
+
+        bot.send_message.assert_called_once_with('hi', chat_id=42)
+
+    def test_multi_bot_manager_falls_back_to_polling(self, monkeypatch):
+        try:
+            from src.telegram.core import multi_bot_manager as module
+        except Exception:
+            pytest.skip("MultiBotManager not available for import")
+
+        def make_bot(webhook_ok):
+            bot = MagicMock()
+            bot.is_active = True
+            bot.start_webhook = AsyncMock(return_value=webhook_ok)
+            bot.start_polling = AsyncMock()
+            return bot
+
+        manager = module.MultiBotManager.__new__(module.MultiBotManager)
+        shared = make_bot(True)
+        manager.controller_bot = shared
+        manager.notification_bot = shared
+        manager.analytics_bot = make_bot(False)
+
+        ingress = make_ingress()
+        monkeypatch.setattr(module, 'get_webhook_ingress', lambda: ingress)
+        asyncio.run(manager._start_update_delivery())
+
+        shared.start_webhook.assert_awaited_once()
+        shared.start_polling.assert_not_awaited()
+        manager.analytics_bot.start_polling.assert_awaited_once()
+
+        ingress.mounted = False
+        polled = make_bot(True)
+        manager.controller_bot = manager.notification_bot = manager.analytics_bot = polled
+        asyncio.run(manager._start_update_delivery())
+        polled.start_webhook.assert_not_awaited()
+        polled.start_polling.assert_awaited_once()
@@ -0,0 +1,204 @@
+"""
+Trend Analyzer Tests
+
+Tests for:
+1. TrendState - streaming SMA sums and rolling extrema match a full recompute
+2. TrendAnalyzer - scores cached until the next bar, incremental candle pulls
+3. score_all - batch scoring of watched symbols
+4. MT5Client.get_candles - rates from copy_rates_from_pos
+"""
+
+import os
+import random
+import sys
+from datetime import datetime
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.clock import VirtualClock
+from src.utils.trend_analyzer import TrendAnalyzer, TrendState, timeframe_seconds
+
+START = datetime(2026, 1, 14, 9, 0, 0)
+BAR = 900
+
+
+def reference_trend(bars):
+    """Original whole-window computation over the last 20 candles"""
+    close = np.array([b['close'] for b in bars[-20:]])
+    highs = np.array([b['high'] for b in bars[-20:]])
+    lows = np.array([b['low'] for b in bars[-20:]])
+    score = 0
+    sma_7, sma_14 = np.mean(close[-7:]), np.mean(close[-14:])
+    score += int(sma_7 > sma_14) - int(sma_7 < sma_14)
+    score += int(close[-1] > close[-2]) - int(close[-1] < close[-2])
+    score += int(highs[-1] >= np.max(highs[-5:-1])) - int(lows[-1] <= np.min(lows[-5:-1]))
+    return "BULLISH" if score >= 2 else "BEARISH" if score <= -2 else "NEUTRAL"
+
+
+def random_bars(count, start_time, seed, price=1.1000):
+    rng = random.Random(seed)
+    bars = []
+    for i in range(count):
+        close = price + rng.uniform(-0.002, 0.002)
+        bars.append({'time': start_time + i * BAR, 'close': close,
+                     'high': max(price, close) + rng.uniform(0, 0.001),
+                     'low': min(price, close) - rng.uniform(0, 0.001)})
+        price = close
+    return bars
+
+
+class CandleFeed:
+    """mt5_client stand-in serving the bars closed so far"""
+
+    def __init__(self, clock, bars):
+        self.clock = clock
+        self.bars = bars
+        self.calls = []
+
+    def get_candles(self, symbol, timeframe, count):
+        self.calls.append(count)
+        closed = [b for b in self.bars if b['time'] + BAR <= self.clock.time()]
+        return closed[-count:]
+
+
+class TestTrendState:
+    """Test streaming indicators"""
+
+    def test_streaming_matches_full_recompute(self):
+        bars = random_bars(500, 0, seed=43)
+        analyzer = TrendAnalyzer(mt5_client=None, clock=VirtualClock(start=START))
+
+        for i, bar in enumerate(bars):
+            analyzer.on_bar_close("EURUSD", "15m", bar)
+            if i >= 19:
+                assert analyzer.get_current_trend("EURUSD") == reference_trend(bars[:i + 1])
+
+    def test_forming_bar_replaced_in_place(self):
+        state = TrendState()
+        for i in range(3):
+            state.push(1.2, 1.0, 1.1, bar_time=i)
+        state.replace_last(1.3, 1.0, 1.25)
+
+        assert state.count == 3
+        assert round(state.sum_fast, 6) == round(1.1 + 1.1 + 1.25, 6)
+        assert state.latest == (1.3, 1.0)
+
+    def test_timeframe_seconds(self):
+        assert timeframe_seconds("15m") == 900
+        assert timeframe_seconds("H1") == 3600
+        assert timeframe_seconds("1d") == 86400
+
+
+class TestTrendCaching:
+    """Test per-bar caching and incremental pulls"""
+
+    def test_cached_until_next_bar_then_pulls_only_new_bars(self):
+        clock = VirtualClock(start=START)
+        first_bar = int(clock.time()) // BAR * BAR - 30 * BAR
+        feed = CandleFeed(clock, random_bars(40, first_bar, seed=7))
+        analyzer = TrendAnalyzer(feed, clock=clock)
+
+        trends = [analyzer.get_current_trend("EURUSD") for _ in range(50)]
+        clock.set(clock.time() + BAR)
+        analyzer.get_current_trend("EURUSD")
+
+        assert len(set(trends)) == 1
+        assert feed.calls == [20, 3]  # Cold start, then the new bars plus the last one held
+        assert analyzer.stats["hits"] == 49
+        closed = [b for b in feed.bars if b['time'] + BAR <= clock.time()]
+        assert analyzer.get_current_trend("EURUSD") == reference_trend(closed)
+
+    def test_forming_bar_gets_final_close(self):
+        clock = VirtualClock(start=START)
+        first_bar = int(clock.time()) // BAR * BAR - 29 * BAR
+        bars = random_bars(40, first_bar, seed=11)
+
+        class FormingFeed(CandleFeed):
+            """Like MT5: the last bar is still forming and carries a provisional close"""
+
+            def get_candles(self, symbol, timeframe, count):
+                self.calls.append(count)
+                served = [dict(b) for b in self.bars if b['time'] <= self.clock.time()][-count:]
+                if served[-1]['time'] + BAR > self.clock.time():
+                    served[-1]['close'] = 9.9
+                return served
+
+        feed = FormingFeed(clock, bars)
+        analyzer = TrendAnalyzer(feed, clock=clock)
+        analyzer.get_current_trend("EURUSD")
+        clock.set(clock.time() + BAR + 60)
+        analyzer.get_current_trend("EURUSD")
+        state = analyzer.states[("EURUSD", "15m")]
+
+        assert feed.calls == [20, 2]
+        assert state.closes[-2] == bars[29]['close']  # Provisional 9.9 overwritten
+        assert state.closes[-1] == 9.9 and state.count == 21
+
+    def test_missing_candles_is_neutral(self):
+        class NoCandles:
+            def get_candles(self, symbol, timeframe, count):
+                return []
+
+        analyzer = TrendAnalyzer(NoCandles(), clock=VirtualClock(start=START))
+
+        assert analyzer.get_current_trend("EURUSD") == "NEUTRAL"
+        assert not analyzer.is_aligned("buy", "NEUTRAL")
+
+
+class TestMT5Candles:
+    """Test MT5Client.get_candles"""
+
+    def test_rates_converted_oldest_first(self):
+        from unittest.mock import Mock, patch
+        import src.clients.mt5_client as mt5_module
+
+        rates = np.array([(1000, 1.1, 1.2, 1.0, 1.15, 5), (1900, 1.15, 1.3, 1.1, 1.25, 7)],
+                         dtype=[('time', 'i8'), ('open', 'f8'), ('high', 'f8'), ('low', 'f8'),
+                                ('close', 'f8'), ('tick_volume', 'i8')])
+        fake_mt5 = SimpleNamespace(TIMEFRAME_M15=15, TIMEFRAME_H1=16385,
+                                   copy_rates_from_pos=Mock(return_value=rates))
+
+        with patch.object(mt5_module, "MT5_AVAILABLE", True), \
+             patch.object(mt5_module, "mt5", fake_mt5, create=True):
+            client = mt5_module.MT5Client({"simulate_orders": False, "symbol_mapping": {"XAUUSD": "GOLD"}})
+            client.initialized = True
+            candles = client.get_candles("XAUUSD", "15m", 2)
+            client.get_candles("XAUUSD", "1h", 5)
+            unknown = client.get_candles("XAUUSD", "7x", 5)
+
+        assert candles[-1] == {'time': 1900, 'open': 1.15, 'high': 1.3, 'low': 1.1,
+                               'close': 1.25, 'tick_volume': 7}
+        assert fake_mt5.copy_rates_from_pos.call_args_list[0].args == ("GOLD", 15, 0, 2)
+        assert fake_mt5.copy_rates_from_pos.call_args_list[1].args == ("GOLD", 16385, 0, 5)
+        assert unknown == []
+
+    def test_simulation_has_no_candles(self):
+        from src.clients.mt5_client import MT5Client
+
+        client = MT5Client({"simulate_orders": True, "symbol_mapping": {}})
+        client.initialized = True
+
+        assert client.get_candles("EURUSD") == []
+
+
+class TestBatchScoring:
+    """Test vectorized scoring across symbols"""
+
+    def test_score_all_matches_individual_trends(self):
+        symbols = [f"SYM{i}" for i in range(25)]
+        analyzer = TrendAnalyzer(mt5_client=None, clock=VirtualClock(start=START))
+        history = {}
+        for i, symbol in enumerate(symbols):
+            history[symbol] = random_bars(30, 0, seed=i)
+            for bar in history[symbol]:
+                analyzer.on_bar_close(symbol, "15m", bar)
+        analyzer.watch(symbols)
+        analyzer.on_bar_close("COLD", "15m", history["SYM0"][0])
+
+        batch = analyzer.score_all()
+
+        assert batch == {s: reference_trend(history[s]) for s in symbols}
+        assert analyzer.score_all(symbols=["COLD"]) == {"COLD": "NEUTRAL"}
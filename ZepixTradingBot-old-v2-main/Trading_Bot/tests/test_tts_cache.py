@@ -0,0 +1,197 @@
+"""
+TTS Cache & Worker Tests
+
+Tests for:
+1. TTSCache - normalized keys, LRU eviction, pinned files, reload from disk
+2. TTSWorker - single engine on worker thread, render dedupe, prerender
+3. VoiceAlertSystem - telegram voice served from the cache, fixed phrases pre-rendered
+"""
+
+import asyncio
+import os
+import sys
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.modules.tts_cache import TTSCache, TTSWorker, normalize_tts_text
+
+
+class FakeEngine:
+    """pyttsx3 stand-in that writes text into the target file"""
+
+    instances = 0
+
+    def __init__(self):
+        FakeEngine.instances += 1
+        self.threads = set()
+        self._pending = []
+        self.spoken = []
+
+    def save_to_file(self, text, path):
+        self._pending.append((text, path))
+
+    def say(self, text):
+        self.spoken.append(text)
+
+    def runAndWait(self):
+        self.threads.add(threading.current_thread().name)
+        for text, path in self._pending:
+            with open(path, "w") as f:
+                f.write(text)
+        self._pending = []
+
+    def stop(self):
+        pass
+
+
+@pytest.fixture
+def engine():
+    FakeEngine.instances = 0
+    return FakeEngine()
+
+
+class TestTTSCache:
+    """Test disk cache behaviour"""
+
+    def test_normalized_key(self):
+        assert normalize_tts_text("  Stop  LOSS hit\n") == "stop loss hit"
+        assert TTSCache.key_for("Stop loss hit") == TTSCache.key_for("stop   loss HIT")
+
+    def test_lru_eviction(self, tmp_path):
+        cache = TTSCache(str(tmp_path), max_files=2)
+        for text in ("one", "two"):
+            with open(cache.path_for(text), "w") as f:
+                f.write(text)
+            cache.add(text)
+
+        assert cache.get("one")  # "two" is now least recently used
+        with open(cache.path_for("three"), "w") as f:
+            f.write("three")
+        cache.add("three")
+
+        assert cache.get("two") is None
+        assert cache.get("one") and cache.get("three")
+        assert not os.path.exists(cache.path_for("two"))
+
+    def test_held_file_survives_eviction(self, tmp_path):
+        cache = TTSCache(str(tmp_path), max_files=1)
+        with open(cache.path_for("sending"), "w") as f:
+            f.write("sending")
+        cache.add("sending")
+
+        with cache.hold("sending") as path:
+            with open(cache.path_for("newer"), "w") as f:
+                f.write("newer")
+            cache.add("newer")  # Over the cap, but "sending" is pinned
+            assert os.path.exists(path)
+            assert cache.get_stats()["files"] == 2
+        assert cache.get_stats() == {"files": 1, "bytes": 5, "pinned": 0, "hits": 1, "misses": 0}
+        assert not os.path.exists(path)
+
+        with cache.hold("missing") as path:
+            assert path is None
+
+    def test_reloads_existing_files(self, tmp_path):
+        cache = TTSCache(str(tmp_path))
+        with open(cache.path_for("hello"), "w") as f:
+            f.write("hello")
+        cache.add("hello")
+
+        reloaded = TTSCache(str(tmp_path))
+
+        assert reloaded.get("HELLO") == cache.path_for("hello")
+
+
+class TestTTSWorker:
+    """Test the dedicated worker thread"""
+
+    def test_single_engine_on_worker_thread(self, tmp_path, engine):
+        worker = TTSWorker(TTSCache(str(tmp_path)), engine_factory=lambda: engine)
+        paths = [worker.render(f"phrase {i}").result(timeout=5) for i in range(5)]
+        worker.stop()
+
+        assert all(os.path.exists(p) for p in paths)
+        assert FakeEngine.instances == 1
+        assert engine.threads == {"tts-worker"}
+
+    def test_cached_render_skips_engine(self, tmp_path, engine):
+        worker = TTSWorker(TTSCache(str(tmp_path)), engine_factory=lambda: engine)
+        first = worker.render("Take profit hit").result(timeout=5)
+        second = worker.render("take profit HIT")
+
+        assert second.done()
+        assert second.result() == first
+        worker.stop()
+
+    def test_prerender(self, tmp_path, engine):
+        worker = TTSWorker(TTSCache(str(tmp_path)), engine_factory=lambda: engine)
+        queued = worker.prerender(["alpha", "beta", ""])
+        worker.stop()
+
+        assert queued == 2
+        assert worker.cache.get("alpha") and worker.cache.get("beta")
+
+    def test_speak_replays_cached_file(self, tmp_path, engine):
+        played = []
+        worker = TTSWorker(TTSCache(str(tmp_path)), engine_factory=lambda: engine,
+                           player=lambda path: played.append(path) or True)
+
+        assert worker.speak("SL hit").result(timeout=5) is True
+        assert worker.speak("SL hit").result(timeout=5) is True
+        worker.stop()
+
+        assert len(played) == 2 and played[0] == played[1]
+        assert worker.cache.get_stats()["files"] == 1
+
+    def test_engine_failure_is_reported(self, tmp_path):
+        def broken():
+            raise RuntimeError("no espeak")
+
+        worker = TTSWorker(TTSCache(str(tmp_path)), engine_factory=broken)
+
+        assert worker.render("anything").result(timeout=5) is None
+        assert worker.speak("anything").result(timeout=5) is False
+        assert worker.engine_available is False
+        worker.stop()
+
+
+class TestVoiceAlertSystemCache:
+    """Test VoiceAlertSystem uses the worker and cache"""
+
+    def test_telegram_voice_uses_cache(self, tmp_path, engine):
+        try:
+            from src.modules.voice_alert_system import VoiceAlertSystem
+        except ImportError:
+            pytest.skip("VoiceAlertSystem not available for import")
+
+        bot = MagicMock()
+        system = VoiceAlertSystem(bot=bot, chat_id="1", tts_cache_dir=str(tmp_path))
+        system.tts_worker.stop()
+        system.tts_worker = TTSWorker(TTSCache(str(tmp_path)), engine_factory=lambda: engine)
+
+        async def run():
+            return [await system.send_via_telegram_voice("Stop loss hit on EURUSD.")
+                    for _ in range(3)]
+
+        assert asyncio.run(run()) == [True, True, True]
+        assert bot.send_voice.call_count == 3
+        assert system.tts_worker.cache.get_stats()["files"] == 1
+        assert os.path.exists(system.tts_worker.cache.path_for("Stop loss hit on EURUSD."))
+        system.tts_worker.stop()
+
+    def test_fixed_phrases_come_from_voice_text_generator(self):
+        try:
+            from src.telegram.voice_alert_integration import VoiceTextGenerator
+        except ImportError:
+            pytest.skip("VoiceTextGenerator not available for import")
+
+        phrases = VoiceTextGenerator.fixed_phrases()
+
+        assert VoiceTextGenerator.generate_bot_started_voice({}) in phrases
+        assert VoiceTextGenerator.generate_mt5_disconnect_voice({}) in phrases
+        assert VoiceTextGenerator.generate_generic_voice({}) in phrases
+        assert not any("unknown" in phrase for phrase in phrases)  # Templated phrases excluded